@@ -22,6 +22,7 @@ import types
 import warnings
 from abc import ABC
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from itertools import zip_longest
 
 try:
@@ -4075,6 +4076,41 @@ class PairwiseAligner(_pairwisealigner.PairwiseAligner):
     query             0 -A-CG 3
     <BLANKLINE>
 
+    For long, similar sequences, the dynamic programming matrix can be
+    restricted to a band of diagonals by setting the "band" attribute to the
+    maximum distance from the diagonal given by "band_offset" (the offset of
+    the query position relative to the target position; default 0).  Run time
+    and memory use then scale with the sequence length times the band width.
+    In global mode, the band is widened if needed to include the start and end
+    of both sequences.  Only alignments lying inside the band are found:
+
+    >>> aligner = Align.PairwiseAligner(mode="local", match_score=2, mismatch_score=-1, gap_score=-1)
+    >>> aligner.score("ACGTTTT", "TTTTACG")
+    8.0
+    >>> aligner.band = 1
+    >>> aligner.band_offset = 4
+    >>> aligner.score("ACGTTTT", "TTTTACG")
+    6.0
+    >>> print(aligner.align("ACGTTTT", "TTTTACG")[0])
+    target            0 ACG 3
+                      0 ||| 3
+    query             4 ACG 7
+    <BLANKLINE>
+
+    In local mode, setting the "xdrop" attribute additionally stops extending
+    the alignment into cells scoring more than xdrop below the best score seen
+    so far, as in BLAST.  Banded and X-drop alignment use the Gotoh algorithm
+    and are not available with gap score functions or FOGSAA.  Set "band" or
+    "xdrop" to None (the default) to disable them.
+
+    If all scores are integers, no gap score is positive, and no open gap score
+    is larger than the corresponding extend gap score, the "score" and
+    "score_many" methods calculate global and local alignment scores using a
+    striped SIMD algorithm with AVX2 or SSE2 instructions, if the processor
+    supports them.  Use the "simd" attribute ("auto" by default) to select the
+    instruction set ("avx2", "sse2", or "none"); the "score_kernel" attribute
+    reports the kernel used in the last score calculation.
+
     """
 
     codec = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
@@ -4215,110 +4251,151 @@ AlignmentCounts object returned by the .counts method of an Alignment object."""
 
     def align(self, seqA, seqB, strand="+"):
         """Return the alignments of two sequences using PairwiseAligner."""
-        if isinstance(seqA, (bytes, Seq, MutableSeq, SeqRecord)):
-            sA = bytes(seqA)
-            sA = np.frombuffer(sA, dtype=np.uint8).astype(np.int32)
-        elif isinstance(seqA, str):
-            sA = np.frombuffer(bytearray(seqA, self.codec), dtype=np.int32)
-        else:
-            try:
-                memoryview(seqA)
-            except TypeError:
-                substitution_matrix = self.substitution_matrix
-                if substitution_matrix is None:
-                    alphabet = []
-                    for item in seqA:
-                        if not any(item == letter for letter in alphabet):
-                            alphabet.append(item)
-                else:
-                    alphabet = substitution_matrix.alphabet
-                sA = np.fromiter(
-                    map(alphabet.index, seqA), dtype=np.int32, count=len(seqA)
-                )
-            else:
-                sA = seqA  # C code will check the dtype
+        alphabet = []
+        sA = self._encode(seqA, alphabet)
         if strand == "+":
-            sB = seqB
+            sB = self._encode(seqB, alphabet)
         else:  # strand == "-":
-            sB = reverse_complement(seqB)
-        if isinstance(seqB, (bytes, Seq, MutableSeq, SeqRecord)):
-            sB = bytes(sB)
-            sB = np.frombuffer(sB, dtype=np.uint8).astype(np.int32)
-        elif isinstance(seqB, str):
-            sB = np.frombuffer(bytearray(sB, self.codec), dtype=np.int32)
-        else:
-            try:
-                memoryview(seqB)
-            except TypeError:
-                substitution_matrix = self.substitution_matrix
-                if substitution_matrix is None:
-                    try:
-                        alphabet
-                    except NameError:
-                        alphabet = []
-                    for item in seqB:
-                        if not any(item == letter for letter in alphabet):
-                            alphabet.append(item)
-                else:
-                    alphabet = substitution_matrix.alphabet
-                sB = np.fromiter(
-                    map(alphabet.index, seqB), dtype=np.int32, count=len(seqB)
-                )
-            else:
-                sB = seqB  # C code will test the dtype
+            sB = self._encode(reverse_complement(seqB), alphabet)
         score, paths = super().align(sA, sB, strand)
         alignments = PairwiseAlignments(seqA, seqB, score, paths)
         return alignments
 
     def score(self, seqA, seqB, strand="+"):
         """Return the alignment score of two sequences using PairwiseAligner."""
-        if isinstance(seqA, (bytes, Seq, MutableSeq, SeqRecord)):
-            seqA = bytes(seqA)
-            seqA = np.frombuffer(seqA, dtype=np.uint8).astype(np.int32)
-        elif isinstance(seqA, str):
-            seqA = np.frombuffer(bytearray(seqA, self.codec), dtype="i")
-        else:
-            try:
-                memoryview(seqA)
-            except TypeError:
-                substitution_matrix = self.substitution_matrix
-                if substitution_matrix is None:
-                    alphabet = []
-                    for item in seqA:
-                        if not any(item == letter for letter in alphabet):
-                            alphabet.append(item)
-                else:
-                    alphabet = substitution_matrix.alphabet
-                seqA = np.fromiter(
-                    map(alphabet.index, seqA), dtype=np.int32, count=len(seqA)
-                )
+        alphabet = []
+        seqA = self._encode(seqA, alphabet)
         if strand == "-":
             seqB = reverse_complement(seqB)
-        if isinstance(seqB, (bytes, Seq, MutableSeq, SeqRecord)):
-            seqB = bytes(seqB)
-            seqB = np.frombuffer(seqB, dtype=np.uint8).astype(np.int32)
-        elif isinstance(seqB, str):
-            seqB = np.frombuffer(bytearray(seqB, self.codec), dtype="i")
-        else:
-            try:
-                memoryview(seqB)
-            except TypeError:
-                substitution_matrix = self.substitution_matrix
-                if substitution_matrix is None:
-                    try:
-                        alphabet
-                    except NameError:
-                        alphabet = []
-                    for item in seqB:
-                        if not any(item == letter for letter in alphabet):
-                            alphabet.append(item)
-                else:
-                    alphabet = substitution_matrix.alphabet
-                seqB = np.fromiter(
-                    map(alphabet.index, seqB), dtype=np.int32, count=len(seqB)
-                )
+        seqB = self._encode(seqB, alphabet)
         return super().score(seqA, seqB, strand)
 
+    def _encode(self, sequence, alphabet):
+        """Return the sequence as an array of integers (PRIVATE).
+
+        For sequences of arbitrary objects, the list alphabet is extended
+        with any new letters found if no substitution matrix is used, so
+        that it can be shared between sequences.
+        """
+        if isinstance(sequence, (bytes, Seq, MutableSeq, SeqRecord)):
+            sequence = bytes(sequence)
+            return np.frombuffer(sequence, dtype=np.uint8).astype(np.int32)
+        elif isinstance(sequence, str):
+            return np.frombuffer(bytearray(sequence, self.codec), dtype=np.int32)
+        try:
+            memoryview(sequence)
+        except TypeError:
+            substitution_matrix = self.substitution_matrix
+            if substitution_matrix is None:
+                for item in sequence:
+                    if not any(item == letter for letter in alphabet):
+                        alphabet.append(item)
+            else:
+                alphabet = substitution_matrix.alphabet
+            return np.fromiter(
+                map(alphabet.index, sequence), dtype=np.int32, count=len(sequence)
+            )
+        return sequence  # C code will check the dtype
+
+    def score_many(self, seqA, seqsB, strand="+", threads=None):
+        """Return the alignment scores of one sequence to each of many sequences.
+
+        Arguments:
+         - seqA    - the query sequence.
+         - seqsB   - an iterable of target sequences.
+         - strand  - "+" (default) or "-"; if "-", each target sequence is
+                     reverse-complemented before scoring.
+         - threads - number of threads to use (default: None, meaning to
+                     use a single thread).
+
+        The query sequence is encoded only once, and the dynamic programming
+        for all targets is run in compiled code, without holding the Global
+        Interpreter Lock for the Needleman-Wunsch, Smith-Waterman, and Gotoh
+        algorithms. With threads > 1, the targets are divided into chunks that
+        are scored in parallel. The scores are returned as a NumPy array of
+        float64 values, in the same order as the targets:
+
+        >>> from Bio.Align import PairwiseAligner
+        >>> aligner = PairwiseAligner()
+        >>> aligner.score_many("GAACT", ["GAT", "GAACT", "TTT"])
+        array([3., 5., 1.])
+        >>> aligner.score_many("GAACT", ["ATC", "AGTTC"], strand="-")
+        array([3., 5.])
+
+        """
+        alphabet = []
+        sA = self._encode(seqA, alphabet)
+        sequences = []
+        for seqB in seqsB:
+            if strand == "-":
+                seqB = reverse_complement(seqB)
+            sequences.append(self._encode(seqB, alphabet))
+        n = len(sequences)
+        scores = np.empty(n, np.float64)
+        if threads is None or threads <= 1 or n <= 1:
+            super().score_many(sA, sequences, scores, strand)
+            return scores
+        # Let each thread score a chunk of the targets; the C code releases
+        # the Global Interpreter Lock while calculating the scores.
+        size = -(-n // threads)
+        score_many = super().score_many
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [
+                executor.submit(
+                    score_many,
+                    sA,
+                    sequences[start : start + size],
+                    scores[start : start + size],
+                    strand,
+                )
+                for start in range(0, n, size)
+            ]
+            for future in futures:
+                future.result()
+        return scores
+
+    def align_many(self, pairs, strand="+"):
+        """Align each pair of sequences, and return an iterator of alignments.
+
+        Arguments:
+         - pairs  - an iterable of (seqA, seqB) tuples.
+         - strand - "+" (default) or "-"; if "-", seqB is reverse-complemented.
+
+        This returns an iterator yielding a PairwiseAlignments object for
+        each pair. If consecutive pairs share the same sequence object, such as
+        a query aligned to many targets, it is encoded only once:
+
+        >>> from Bio.Align import PairwiseAligner
+        >>> aligner = PairwiseAligner()
+        >>> query = "GAACT"
+        >>> for alignments in aligner.align_many([(query, "GAT"), (query, "GACT")]):
+        ...     print(alignments.score, len(alignments))
+        ...
+        3.0 2
+        4.0 2
+
+        """
+        alphabet = []
+        previousA = previousB = None
+        for seqA, seqB in pairs:
+            if seqA is not previousA:
+                previousA = seqA
+                encodedA = self._encode(seqA, alphabet)
+            if seqB is not previousB:
+                previousB = seqB
+                if strand == "-":
+                    encodedB = self._encode(reverse_complement(seqB), alphabet)
+                else:
+                    encodedB = self._encode(seqB, alphabet)
+            sA = encodedA
+            sB = encodedB
+            if self.substitution_matrix is not None:
+                # the C code maps letters to matrix indices in place
+                sA = np.array(sA, np.int32)
+                sB = np.array(sB, np.int32)
+            score, paths = _pairwisealigner.PairwiseAligner.align(self, sA, sB, strand)
+            yield PairwiseAlignments(seqA, seqB, score, paths)
+
     def __getstate__(self):
         state = {
             "wildcard": self.wildcard,
@@ -4335,6 +4412,9 @@ AlignmentCounts object returned by the .counts method of an Alignment object."""
             "open_right_deletion_score": self.open_right_deletion_score,
             "extend_right_deletion_score": self.extend_right_deletion_score,
             "mode": self.mode,
+            "band": self.band,
+            "band_offset": self.band_offset,
+            "xdrop": self.xdrop,
         }
         if self.substitution_matrix is None:
             state["match_score"] = self.match_score
@@ -4358,6 +4438,9 @@ AlignmentCounts object returned by the .counts method of an Alignment object."""
         self.open_right_deletion_score = state["open_right_deletion_score"]
         self.extend_right_deletion_score = state["extend_right_deletion_score"]
         self.mode = state["mode"]
+        self.band = state.get("band")
+        self.band_offset = state.get("band_offset", 0)
+        self.xdrop = state.get("xdrop")
         substitution_matrix = state.get("substitution_matrix")
         if substitution_matrix is None:
             self.match_score = state["match_score"]
@@ -4576,6 +4659,7 @@ class CodonAligner(_codonaligner.CodonAligner):
 # fmt: off
 formats = (
     "a2m",        # A2M files created by align2model or hmmscore
+    "bam",        # Binary Alignment/Map files
     "bed",        # BED (Browser Extensible Data) files
     "bigbed",     # bigBed format
     "bigmaf",     # MAF file saved as a bigBed file
@@ -4642,13 +4726,16 @@ def write(alignments, target, fmt, *args, **kwargs):
     return writer(target, *args, **kwargs).write(alignments)
 
 
-def parse(source, fmt):
+def parse(source, fmt, *args, **kwargs):
     """Parse an alignment file and return an iterator over alignments.
 
     Arguments:
      - source - File or file-like object to read from, or filename as string.
      - fmt    - String describing the file format (case-insensitive).
 
+    Any additional arguments are passed to the alignment iterator of the file
+    format; for example, ``Align.parse(filename, "sam", fields=["flag"])``.
+
     Typical usage, opening a file to read in, and looping over the alignments:
 
     >>> from Bio import Align
@@ -4671,7 +4758,7 @@ def parse(source, fmt):
     one alignment.
     """
     module = _load(fmt)
-    alignments = module.AlignmentIterator(source)
+    alignments = module.AlignmentIterator(source, *args, **kwargs)
     return alignments
 
 
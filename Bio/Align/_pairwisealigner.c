@@ -10,7 +10,10 @@
 #define PY_SSIZE_T_CLEAN
 #include "Python.h"
 #include <float.h>
+#include <limits.h>
+#include <math.h>
 #include <stdbool.h>
+#include <stdint.h>
 #include "_pairwisealigner.h"
 #include "substitution_matrices/_arraycore.h"
 
@@ -75,8 +78,15 @@ typedef struct {
     Algorithm algorithm;
     Py_ssize_t length;
     unsigned char strand;
+    int* band_start; /* first column stored in each row; NULL if not banded */
+    int* band_end; /* last column stored in each row; NULL if not banded */
 } PathGenerator;
 
+/* First and last column stored in row i of the trace matrices. Row i of a
+ * banded PathGenerator is empty if its band start is larger than its end. */
+#define BAND_START(self, i) ((self)->band_start ? (self)->band_start[i] : 0)
+#define BAND_END(self, i) ((self)->band_end ? (self)->band_end[i] : (self)->nB)
+
 static PyObject*
 PathGenerator_create_path(PathGenerator* self, int i, int j) {
     PyObject* tuple;
@@ -254,6 +264,8 @@ PathGenerator_gotoh_global_length(PathGenerator* self)
 {
     int i;
     int j;
+    int start;
+    int end;
     int trace;
     const int nA = self->nA;
     const int nB = self->nB;
@@ -282,13 +294,23 @@ PathGenerator_gotoh_global_length(PathGenerator* self)
         Iy_counts[j] = 1;
     }
     for (i = 1; i <= nA; i++) {
-        M_temp = M_counts[0];
-        M_counts[0] = 0;
-        Ix_temp = Ix_counts[0];
-        Ix_counts[0] = 1;
-        Iy_temp = Iy_counts[0];
-        Iy_counts[0] = 0;
-        for (j = 1; j <= nB; j++) {
+        start = BAND_START(self, i);
+        end = BAND_END(self, i);
+        if (start == 0) {
+            M_temp = M_counts[0];
+            M_counts[0] = 0;
+            Ix_temp = Ix_counts[0];
+            Ix_counts[0] = 1;
+            Iy_temp = Iy_counts[0];
+            Iy_counts[0] = 0;
+            start = 1;
+        }
+        else {
+            M_temp = M_counts[start-1];
+            Ix_temp = Ix_counts[start-1];
+            Iy_temp = Iy_counts[start-1];
+        }
+        for (j = start; j <= end; j++) {
             count = 0;
             trace = M[i][j].trace;
             if (trace & M_MATRIX) SAFE_ADD(M_temp, count);
@@ -328,6 +350,8 @@ PathGenerator_gotoh_local_length(PathGenerator* self)
 {
     int i;
     int j;
+    int start;
+    int end;
     int trace;
     const int nA = self->nA;
     const int nB = self->nB;
@@ -357,13 +381,23 @@ PathGenerator_gotoh_local_length(PathGenerator* self)
         Iy_counts[j] = 0;
     }
     for (i = 1; i <= nA; i++) {
-        M_temp = M_counts[0];
-        M_counts[0] = 1;
-        Ix_temp = Ix_counts[0];
-        Ix_counts[0] = 0;
-        Iy_temp = Iy_counts[0];
-        Iy_counts[0] = 0;
-        for (j = 1; j <= nB; j++) {
+        start = BAND_START(self, i);
+        end = BAND_END(self, i);
+        if (start == 0) {
+            M_temp = M_counts[0];
+            M_counts[0] = 1;
+            Ix_temp = Ix_counts[0];
+            Ix_counts[0] = 0;
+            Iy_temp = Iy_counts[0];
+            Iy_counts[0] = 0;
+            start = 1;
+        }
+        else {
+            M_temp = M_counts[start-1];
+            Ix_temp = Ix_counts[start-1];
+            Iy_temp = Iy_counts[start-1];
+        }
+        for (j = start; j <= end; j++) {
             count = 0;
             trace = M[i][j].trace;
             if (trace & M_MATRIX) SAFE_ADD(M_temp, count);
@@ -712,7 +746,7 @@ PathGenerator_dealloc(PathGenerator* self)
     if (M) {
         for (i = 0; i <= nA; i++) {
             if (!M[i]) break;
-            PyMem_Free(M[i]);
+            PyMem_Free(M[i] + BAND_START(self, i));
         }
         PyMem_Free(M);
     }
@@ -725,7 +759,7 @@ PathGenerator_dealloc(PathGenerator* self)
             if (gaps) {
                 for (i = 0; i <= nA; i++) {
                     if (!gaps[i]) break;
-                    PyMem_Free(gaps[i]);
+                    PyMem_Free(gaps[i] + BAND_START(self, i));
                 }
                 PyMem_Free(gaps);
             }
@@ -760,6 +794,8 @@ PathGenerator_dealloc(PathGenerator* self)
             PyErr_WriteUnraisable((PyObject*)self);
             break;
     }
+    if (self->band_start) PyMem_Free(self->band_start);
+    if (self->band_end) PyMem_Free(self->band_end);
     Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
@@ -1058,7 +1094,6 @@ static PyObject* PathGenerator_next_gotoh_local(PathGenerator* self)
     int iA = self->iA;
     int iB = self->iB;
     const int nA = self->nA;
-    const int nB = self->nB;
     Trace** M = self->M;
     TraceGapsGotoh** gaps = self->gaps.gotoh;
     int path = M[0][0].path;
@@ -1118,10 +1153,11 @@ static PyObject* PathGenerator_next_gotoh_local(PathGenerator* self)
     if (path == 0) {
         /* Find the end point for a new path. */
         while (1) {
-            if (iB < nB) iB++;
+            if (iB < BAND_END(self, iA)) iB++;
             else if (iA < nA) {
                 iA++;
-                iB = 0;
+                iB = BAND_START(self, iA);
+                if (iB > BAND_END(self, iA)) continue; /* empty row */
             }
             else {
                 /* we reached the end of the alignment without finding
@@ -1786,6 +1822,11 @@ Aligner_init(Aligner *self, PyObject *args, PyObject *kwds)
     self->algorithm = Unknown;
     self->alphabet = NULL;
     self->wildcard = -1;
+    self->band = -1;
+    self->band_offset = 0;
+    self->xdrop = -1;
+    self->simd = -1;
+    self->kernel = -1;
     return 0;
 }
 
@@ -1936,6 +1977,16 @@ Aligner_str(Aligner* self)
         p += sprintf(p, "  extend_right_deletion_score: %s\n", value);
         PyMem_Free(value);
     }
+    if (self->band >= 0) {
+        p += sprintf(p, "  band: %d\n", self->band);
+        p += sprintf(p, "  band_offset: %d\n", self->band_offset);
+    }
+    if (self->xdrop >= 0) {
+        value = PyOS_double_to_string(self->xdrop, 'f', 6, 0, NULL);
+        if (!value) goto exit;
+        p += sprintf(p, "  xdrop: %s\n", value);
+        PyMem_Free(value);
+    }
     switch (self->mode) {
         case Global: sprintf(p, "  mode: global\n"); break;
         case Local: sprintf(p, "  mode: local\n"); break;
@@ -3714,6 +3765,145 @@ Aligner_set_wildcard(Aligner* self, PyObject* value, void* closure)
     return 0;
 }
 
+static char Aligner_band__doc__[] = "half-width of the band of diagonals to align in (None: no band)";
+
+static PyObject*
+Aligner_get_band(Aligner* self, void* closure)
+{
+    if (self->band == -1) {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    return PyLong_FromLong(self->band);
+}
+
+static int
+Aligner_set_band(Aligner* self, PyObject* value, void* closure)
+{
+    long band;
+    if (value == Py_None) {
+        self->band = -1;
+        return 0;
+    }
+    band = PyLong_AsLong(value);
+    if (band == -1 && PyErr_Occurred()) return -1;
+    if (band < 0 || band > INT_MAX) {
+        PyErr_SetString(PyExc_ValueError,
+                        "band should be a non-negative integer, or None");
+        return -1;
+    }
+    self->band = (int) band;
+    return 0;
+}
+
+static char Aligner_band_offset__doc__[] = "diagonal at the center of the band";
+
+static PyObject*
+Aligner_get_band_offset(Aligner* self, void* closure)
+{
+    return PyLong_FromLong(self->band_offset);
+}
+
+static int
+Aligner_set_band_offset(Aligner* self, PyObject* value, void* closure)
+{
+    const long offset = PyLong_AsLong(value);
+    if (offset == -1 && PyErr_Occurred()) return -1;
+    if (offset < INT_MIN || offset > INT_MAX) {
+        PyErr_SetString(PyExc_OverflowError, "band_offset is too large");
+        return -1;
+    }
+    self->band_offset = (int) offset;
+    return 0;
+}
+
+static char Aligner_xdrop__doc__[] = "X-drop score threshold (None: no X-drop termination)";
+
+static PyObject*
+Aligner_get_xdrop(Aligner* self, void* closure)
+{
+    if (self->xdrop < 0) {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    return PyFloat_FromDouble(self->xdrop);
+}
+
+static int
+Aligner_set_xdrop(Aligner* self, PyObject* value, void* closure)
+{
+    double xdrop;
+    if (value == Py_None) {
+        self->xdrop = -1;
+        return 0;
+    }
+    xdrop = PyFloat_AsDouble(value);
+    if (xdrop == -1.0 && PyErr_Occurred()) return -1;
+    if (!(xdrop >= 0)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "xdrop should be a non-negative number, or None");
+        return -1;
+    }
+    self->xdrop = xdrop;
+    return 0;
+}
+
+static const char* kernel_names[] = {"scalar", "sse2", "avx2"};
+
+/* the fastest score kernel supported by this CPU; set in the module
+ * initialization function */
+static Kernel best_kernel = Scalar;
+
+static char Aligner_simd__doc__[] = "SIMD instruction set to use for calculating alignment scores ('auto', 'avx2', 'sse2', or 'none')";
+
+static PyObject*
+Aligner_get_simd(Aligner* self, void* closure)
+{
+    switch (self->simd) {
+        case -1: return PyUnicode_FromString("auto");
+        case Scalar: return PyUnicode_FromString("none");
+        default: return PyUnicode_FromString(kernel_names[self->simd]);
+    }
+}
+
+static int
+Aligner_set_simd(Aligner* self, PyObject* value, void* closure)
+{
+    int simd;
+    if (!PyUnicode_Check(value)) {
+        PyErr_SetString(PyExc_TypeError, "simd should be a string");
+        return -1;
+    }
+    if (PyUnicode_CompareWithASCIIString(value, "auto") == 0) simd = -1;
+    else if (PyUnicode_CompareWithASCIIString(value, "none") == 0) simd = Scalar;
+    else if (PyUnicode_CompareWithASCIIString(value, "sse2") == 0) simd = SSE2;
+    else if (PyUnicode_CompareWithASCIIString(value, "avx2") == 0) simd = AVX2;
+    else {
+        PyErr_SetString(PyExc_ValueError,
+                        "simd should be 'auto', 'avx2', 'sse2', or 'none'");
+        return -1;
+    }
+    if (simd > (int) best_kernel) {
+        PyErr_Format(PyExc_ValueError,
+                     "%U instructions are not available on this system", value);
+        return -1;
+    }
+    self->simd = simd;
+    return 0;
+}
+
+static char Aligner_score_kernel__doc__[] = "kernel used by the last call to score or score_many ('avx2', 'sse2', or 'scalar'), or None";
+
+static PyObject*
+Aligner_get_score_kernel(Aligner* self, void* closure)
+{
+    if (self->kernel < 0) {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    return PyUnicode_FromString(kernel_names[self->kernel]);
+}
+
 static char Aligner_algorithm__doc__[] = "alignment algorithm";
 
 static PyObject*
@@ -3986,6 +4176,26 @@ static PyGetSetDef Aligner_getset[] = {
         (getter)Aligner_get_wildcard,
         (setter)Aligner_set_wildcard,
         Aligner_wildcard__doc__, NULL},
+    {"band",
+        (getter)Aligner_get_band,
+        (setter)Aligner_set_band,
+        Aligner_band__doc__, NULL},
+    {"band_offset",
+        (getter)Aligner_get_band_offset,
+        (setter)Aligner_set_band_offset,
+        Aligner_band_offset__doc__, NULL},
+    {"xdrop",
+        (getter)Aligner_get_xdrop,
+        (setter)Aligner_set_xdrop,
+        Aligner_xdrop__doc__, NULL},
+    {"simd",
+        (getter)Aligner_get_simd,
+        (setter)Aligner_set_simd,
+        Aligner_simd__doc__, NULL},
+    {"score_kernel",
+        (getter)Aligner_get_score_kernel,
+        (setter)NULL,
+        Aligner_score_kernel__doc__, NULL},
     {"algorithm",
         (getter)Aligner_get_algorithm,
         (setter)NULL,
@@ -4442,13 +4652,12 @@ struct fogsaa_queue_node fogsaa_queue_pop(struct fogsaa_queue *queue) {
             right_gap_extend_B = self->extend_left_deletion_score; \
             break; \
         default: \
-            PyErr_SetString(PyExc_RuntimeError, "strand was neither '+' nor '-'"); \
-            return NULL; \
+            return -2; /* strand was neither '+' nor '-' */ \
     } \
 \
     /* Needleman-Wunsch algorithm */ \
-    row = PyMem_Malloc((nB+1)*sizeof(double)); \
-    if (!row) return PyErr_NoMemory(); \
+    row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
+    if (!row) return -1; \
 \
     /* The top row of the score matrix is a special case, \
      * as there are no previously aligned characters. \
@@ -4489,8 +4698,9 @@ struct fogsaa_queue_node fogsaa_queue_pop(struct fogsaa_queue *queue) {
     SELECT_SCORE_GLOBAL(temp + (align_score), \
                         row[nB] + right_gap_extend_B, \
                         row[nB-1] + right_gap_extend_A); \
-    PyMem_Free(row); \
-    return PyFloat_FromDouble(score);
+    PyMem_RawFree(row); \
+    *result = score; \
+    return 0;
 
 
 #define SMITHWATERMAN_SCORE(align_score) \
@@ -4506,8 +4716,8 @@ struct fogsaa_queue_node fogsaa_queue_pop(struct fogsaa_queue *queue) {
     double maximum = 0; \
 \
     /* Smith-Waterman algorithm */ \
-    row = PyMem_Malloc((nB+1)*sizeof(double)); \
-    if (!row) return PyErr_NoMemory(); \
+    row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
+    if (!row) return -1; \
 \
     /* The top row of the score matrix is a special case, \
      * as there are no previously aligned characters. \
@@ -4540,8 +4750,9 @@ struct fogsaa_queue_node fogsaa_queue_pop(struct fogsaa_queue *queue) {
     } \
     kB = sB[nB-1]; \
     SELECT_SCORE_LOCAL1(temp + (align_score)); \
-    PyMem_Free(row); \
-    return PyFloat_FromDouble(maximum);
+    PyMem_RawFree(row); \
+    *result = maximum; \
+    return 0;
 
 
 #define NEEDLEMANWUNSCH_ALIGN(align_score) \
@@ -4747,16 +4958,15 @@ struct fogsaa_queue_node fogsaa_queue_pop(struct fogsaa_queue *queue) {
             right_gap_extend_B = self->extend_left_deletion_score; \
             break; \
         default: \
-            PyErr_SetString(PyExc_RuntimeError, "strand was neither '+' nor '-'"); \
-            return NULL; \
+            return -2; /* strand was neither '+' nor '-' */ \
     } \
 \
     /* Gotoh algorithm with three states */ \
-    M_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    M_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!M_row) goto exit; \
-    Ix_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    Ix_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!Ix_row) goto exit; \
-    Iy_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    Iy_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!Iy_row) goto exit; \
 \
     /* The top row of the score matrix is a special case, \
@@ -4857,16 +5067,17 @@ struct fogsaa_queue_node fogsaa_queue_pop(struct fogsaa_queue *queue) {
     Iy_row[nB] = score; \
 \
     SELECT_SCORE_GLOBAL(M_row[nB], Ix_row[nB], Iy_row[nB]); \
-    PyMem_Free(M_row); \
-    PyMem_Free(Ix_row); \
-    PyMem_Free(Iy_row); \
-    return PyFloat_FromDouble(score); \
+    PyMem_RawFree(M_row); \
+    PyMem_RawFree(Ix_row); \
+    PyMem_RawFree(Iy_row); \
+    *result = score; \
+    return 0; \
 \
 exit: \
-    if (M_row) PyMem_Free(M_row); \
-    if (Ix_row) PyMem_Free(Ix_row); \
-    if (Iy_row) PyMem_Free(Iy_row); \
-    return PyErr_NoMemory(); \
+    if (M_row) PyMem_RawFree(M_row); \
+    if (Ix_row) PyMem_RawFree(Ix_row); \
+    if (Iy_row) PyMem_RawFree(Iy_row); \
+    return -1; \
 
 
 #define GOTOH_LOCAL_SCORE(align_score) \
@@ -4889,11 +5100,11 @@ exit: \
     double maximum = 0.0; \
 \
     /* Gotoh algorithm with three states */ \
-    M_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    M_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!M_row) goto exit; \
-    Ix_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    Ix_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!Ix_row) goto exit; \
-    Iy_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    Iy_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
     if (!Iy_row) goto exit; \
  \
     /* The top row of the score matrix is a special case, \
@@ -4969,15 +5180,16 @@ exit: \
                                    Ix_temp, \
                                    Iy_temp, \
                                    (align_score)); \
-    PyMem_Free(M_row); \
-    PyMem_Free(Ix_row); \
-    PyMem_Free(Iy_row); \
-    return PyFloat_FromDouble(maximum); \
+    PyMem_RawFree(M_row); \
+    PyMem_RawFree(Ix_row); \
+    PyMem_RawFree(Iy_row); \
+    *result = maximum; \
+    return 0; \
 exit: \
-    if (M_row) PyMem_Free(M_row); \
-    if (Ix_row) PyMem_Free(Ix_row); \
-    if (Iy_row) PyMem_Free(Iy_row); \
-    return PyErr_NoMemory(); \
+    if (M_row) PyMem_RawFree(M_row); \
+    if (Ix_row) PyMem_RawFree(Ix_row); \
+    if (Iy_row) PyMem_RawFree(Iy_row); \
+    return -1; \
 
 
 #define GOTOH_GLOBAL_ALIGN(align_score) \
@@ -5346,66 +5558,664 @@ exit: \
     return PyErr_NoMemory(); \
 
 
-#define WATERMANSMITHBEYER_ENTER_SCORE \
+/* Banded and X-drop alignment.
+ *
+ * These use the Gotoh algorithm with three states, which includes linear gap
+ * scores as the special case with equal open and extend gap scores, but only
+ * fill the cells inside the band of diagonals
+ *
+ *     kmin <= j - i <= kmax
+ *
+ * and, in local mode with X-drop termination, only the cells whose score does
+ * not drop more than xdrop below the best score found so far. Scores of cells
+ * outside this region are stored as -DBL_MAX; each row of the trace matrices
+ * only stores the columns band_start[i] to band_end[i].
+ */
+
+#define BANDED_SELECT_SCORE(score1, score2, score3) \
+    score = score1; \
+    temp = score2; \
+    if (temp > score) score = temp; \
+    temp = score3; \
+    if (temp > score) score = temp;
+
+#define BANDED_SELECT_TRACE(score1, score2, score3) \
+    trace = M_MATRIX; \
+    score = score1; \
+    temp = score2; \
+    if (temp > score + epsilon) { \
+        score = temp; \
+        trace = Ix_MATRIX; \
+    } \
+    else if (temp > score - epsilon) trace |= Ix_MATRIX; \
+    temp = score3; \
+    if (temp > score + epsilon) { \
+        score = temp; \
+        trace = Iy_MATRIX; \
+    } \
+    else if (temp > score - epsilon) trace |= Iy_MATRIX; \
+    if (score <= -DBL_MAX) trace = 0;
+
+#define BANDED_ENTER \
     int i; \
-    int j = 0; \
-    int k; \
+    int j; \
     int kA; \
     int kB; \
-    double** M = NULL; \
-    double** Ix = NULL; \
-    double** Iy = NULL; \
-    double score = 0.0; \
-    double gapscore = 0.0; \
+    int kmin; \
+    int kmax; \
+    int start; /* first column of the current row */ \
+    int end; /* last column of the current row */ \
+    int limit; /* columns beyond limit can only be reached by a gap */ \
+    int previous_start; \
+    int previous_end; \
+    int first; /* first column of the current row with a live cell */ \
+    int last; /* last column of the current row with a live cell */ \
+    const bool local = (self->mode == Local); \
+    const bool xdrop = (self->xdrop >= 0); \
+    const double epsilon = self->epsilon; \
+    double gap_open_A; \
+    double gap_extend_A; \
+    double gap_open_B; \
+    double gap_extend_B; \
+    double left_gap_open_A; \
+    double left_gap_open_B; \
+    double left_gap_extend_A; \
+    double left_gap_extend_B; \
+    double right_gap_open_A; \
+    double right_gap_open_B; \
+    double right_gap_extend_A; \
+    double right_gap_extend_B; \
+    double* M_row = NULL; \
+    double* Ix_row = NULL; \
+    double* Iy_row = NULL; \
+    double M_score; \
+    double Ix_score; \
+    double Iy_score; \
+    double score; \
     double temp; \
-    int ok = 1; \
-    PyObject* result = NULL; \
-\
-    /* Waterman-Smith-Beyer algorithm */ \
-    M = PyMem_Malloc((nA+1)*sizeof(double*)); \
-    if (!M) goto exit; \
-    Ix = PyMem_Malloc((nA+1)*sizeof(double*)); \
-    if (!Ix) goto exit; \
-    Iy = PyMem_Malloc((nA+1)*sizeof(double*)); \
-    if (!Iy) goto exit; \
-    for (i = 0; i <= nA; i++) { \
-        M[i] = PyMem_Malloc((nB+1)*sizeof(double)); \
-        if (!M[i]) goto exit; \
-        Ix[i] = PyMem_Malloc((nB+1)*sizeof(double)); \
-        if (!Ix[i]) goto exit; \
-        Iy[i] = PyMem_Malloc((nB+1)*sizeof(double)); \
-        if (!Iy[i]) goto exit; \
+    double M_temp; \
+    double Ix_temp; \
+    double Iy_temp; \
+    double maximum = 0; \
+    double threshold = -DBL_MAX; /* cells scoring less are dropped */ \
+    bool narrow; \
+    _get_band_limits(self, nA, nB, &kmin, &kmax);
+
+/* Select the end gap scores, which are swapped on the reverse strand. */
+#define BANDED_END_GAP_SCORES(strand_error) \
+    switch (strand) { \
+        case '+': \
+            left_gap_open_A = self->open_left_insertion_score; \
+            left_gap_open_B = self->open_left_deletion_score; \
+            left_gap_extend_A = self->extend_left_insertion_score; \
+            left_gap_extend_B = self->extend_left_deletion_score; \
+            right_gap_open_A = self->open_right_insertion_score; \
+            right_gap_open_B = self->open_right_deletion_score; \
+            right_gap_extend_A = self->extend_right_insertion_score; \
+            right_gap_extend_B = self->extend_right_deletion_score; \
+            break; \
+        case '-': \
+            left_gap_open_A = self->open_right_insertion_score; \
+            left_gap_open_B = self->open_right_deletion_score; \
+            left_gap_extend_A = self->extend_right_insertion_score; \
+            left_gap_extend_B = self->extend_right_deletion_score; \
+            right_gap_open_A = self->open_left_insertion_score; \
+            right_gap_open_B = self->open_left_deletion_score; \
+            right_gap_extend_A = self->extend_left_insertion_score; \
+            right_gap_extend_B = self->extend_left_deletion_score; \
+            break; \
+        default: \
+            strand_error; \
+    }
+
+/* Select the gap scores for gaps in row i, and for gaps in column j. */
+#define BANDED_ROW_GAP_SCORES \
+    if (local || (i > 0 && i < nA)) { \
+        gap_open_A = self->open_internal_insertion_score; \
+        gap_extend_A = self->extend_internal_insertion_score; \
     } \
+    else if (i == 0) { \
+        gap_open_A = left_gap_open_A; \
+        gap_extend_A = left_gap_extend_A; \
+    } \
+    else { \
+        gap_open_A = right_gap_open_A; \
+        gap_extend_A = right_gap_extend_A; \
+    }
 
+#define BANDED_COLUMN_GAP_SCORES \
+    if (local || j < nB) { \
+        gap_open_B = self->open_internal_deletion_score; \
+        gap_extend_B = self->extend_internal_deletion_score; \
+    } \
+    else { \
+        gap_open_B = right_gap_open_B; \
+        gap_extend_B = right_gap_extend_B; \
+    }
+
+/* Find the columns to be filled in row i, given the band and, for X-drop
+ * termination, the live cells in the previous row. Once the best score
+ * exceeds xdrop, cells with a score of zero are dropped, so new local
+ * alignments cannot start anymore, and a cell can only be reached from a
+ * live cell in the previous row, or by a gap from the cell to its left. */
+#define BANDED_ROW_RANGE \
+    start = i + kmin; \
+    if (start < 0) start = 0; \
+    end = i + kmax; \
+    if (end > nB) end = nB; \
+    limit = nB; \
+    narrow = (xdrop && threshold > 0); \
+    if (narrow) { \
+        if (start < first) start = first; \
+        limit = last + 1; \
+        if (first > last) end = start - 1; \
+    } \
+    if (start > nB + 1) start = nB + 1;
 
-#define WATERMANSMITHBEYER_GLOBAL_SCORE(align_score, query_gap_start) \
-    /* The top row of the score matrix is a special case, \
-     *  as there are no previously aligned characters. \
-     */ \
-    M[0][0] = 0; \
-    Ix[0][0] = -DBL_MAX; \
-    Iy[0][0] = -DBL_MAX; \
-    for (i = 1; i <= nA; i++) { \
-        M[i][0] = -DBL_MAX; \
-        Iy[i][0] = -DBL_MAX; \
-        ok = _call_deletion_score_function(self, query_gap_start, i, nB, &score); \
-        if (!ok) goto exit; \
-        Ix[i][0] = score; \
+/* Clear the cells that were filled in the previous row, but not in the
+ * current row, so that all cells outside the current row are -DBL_MAX. */
+#define BANDED_CLEAR_PREVIOUS_ROW \
+    for (j = previous_start; j <= previous_end && j < start; j++) { \
+        M_row[j] = -DBL_MAX; \
+        Ix_row[j] = -DBL_MAX; \
+        Iy_row[j] = -DBL_MAX; \
     } \
-    for (j = 1; j <= nB; j++) { \
-        M[0][j] = -DBL_MAX; \
-        Ix[0][j] = -DBL_MAX; \
-        ok = _call_insertion_score_function(self, 0, j, nA, &score); \
-        if (!ok) goto exit; \
-        Iy[0][j] = score; \
+    for (j = end + 1; j <= previous_end; j++) { \
+        if (j < previous_start) continue; \
+        M_row[j] = -DBL_MAX; \
+        Ix_row[j] = -DBL_MAX; \
+        Iy_row[j] = -DBL_MAX; \
     } \
-    for (i = 1; i <= nA; i++) { \
-        kA = sA[i-1]; \
-        for (j = 1; j <= nB; j++) { \
-            kB = sB[j-1]; \
-            SELECT_SCORE_GLOBAL(M[i-1][j-1], Ix[i-1][j-1], Iy[i-1][j-1]); \
-            M[i][j] = score + (align_score); \
-            score = -DBL_MAX; \
+    previous_start = start; \
+    previous_end = end;
+
+#define BANDED_SCORE(align_score) \
+    BANDED_ENTER \
+    BANDED_END_GAP_SCORES(return -2) \
+\
+    M_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
+    if (!M_row) goto exit; \
+    Ix_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
+    if (!Ix_row) goto exit; \
+    Iy_row = PyMem_RawMalloc((nB+1)*sizeof(double)); \
+    if (!Iy_row) goto exit; \
+    for (j = 0; j <= nB; j++) { \
+        M_row[j] = -DBL_MAX; \
+        Ix_row[j] = -DBL_MAX; \
+        Iy_row[j] = -DBL_MAX; \
+    } \
+\
+    /* The top row is a special case, as there are no previously aligned \
+     * characters; its first cell is always filled. */ \
+    end = (kmax < 0) ? 0 : kmax; \
+    if (local) { \
+        for (j = 0; j <= end; j++) M_row[j] = 0; \
+    } \
+    else { \
+        M_row[0] = 0; \
+        for (j = 1; j <= end; j++) \
+            Iy_row[j] = left_gap_open_A + left_gap_extend_A * (j-1); \
+    } \
+    previous_start = 0; \
+    previous_end = end; \
+    first = 0; \
+    last = end; \
+\
+    for (i = 1; i <= nA; i++) { \
+        BANDED_ROW_RANGE \
+        if (start > end) { \
+            /* no cells to fill in this row */ \
+            if (narrow) break; /* nor in any of the following rows */ \
+            BANDED_CLEAR_PREVIOUS_ROW \
+            first = nB + 1; \
+            last = -1; \
+            continue; \
+        } \
+        BANDED_ROW_GAP_SCORES \
+        kA = sA[i-1]; \
+        first = nB + 1; \
+        last = -1; \
+        if (start == 0) { \
+            M_temp = M_row[0]; \
+            Ix_temp = Ix_row[0]; \
+            Iy_temp = Iy_row[0]; \
+            Iy_row[0] = -DBL_MAX; \
+            if (local) { \
+                Ix_row[0] = -DBL_MAX; \
+                if (0 < threshold) M_row[0] = -DBL_MAX; \
+                else { \
+                    M_row[0] = 0; \
+                    first = 0; \
+                    last = 0; \
+                } \
+            } \
+            else { \
+                M_row[0] = -DBL_MAX; \
+                BANDED_SELECT_SCORE(M_temp + left_gap_open_B, \
+                                    Ix_temp + left_gap_extend_B, \
+                                    Iy_temp + left_gap_open_B); \
+                Ix_row[0] = score; \
+            } \
+            j = 1; \
+        } \
+        else { \
+            M_temp = M_row[start-1]; \
+            Ix_temp = Ix_row[start-1]; \
+            Iy_temp = Iy_row[start-1]; \
+            M_row[start-1] = -DBL_MAX; \
+            Ix_row[start-1] = -DBL_MAX; \
+            Iy_row[start-1] = -DBL_MAX; \
+            j = start; \
+        } \
+        for ( ; j <= end; j++) { \
+            kB = sB[j-1]; \
+            BANDED_COLUMN_GAP_SCORES \
+            BANDED_SELECT_SCORE(M_temp, Ix_temp, Iy_temp); \
+            if (score > -DBL_MAX) score += (align_score); \
+            M_score = score; \
+            M_temp = M_row[j]; \
+            Ix_temp = Ix_row[j]; \
+            Iy_temp = Iy_row[j]; \
+            BANDED_SELECT_SCORE(M_temp + gap_open_B, \
+                                Ix_temp + gap_extend_B, \
+                                Iy_temp + gap_open_B); \
+            Ix_score = score; \
+            BANDED_SELECT_SCORE(M_row[j-1] + gap_open_A, \
+                                Ix_row[j-1] + gap_open_A, \
+                                Iy_row[j-1] + gap_extend_A); \
+            Iy_score = score; \
+            if (local) { \
+                if (M_score < epsilon) M_score = 0; \
+                else if (M_score > maximum + epsilon) { \
+                    maximum = M_score; \
+                    if (xdrop) threshold = maximum - self->xdrop - epsilon; \
+                } \
+                if (Ix_score < epsilon || i == nA || j == nB) Ix_score = -DBL_MAX; \
+                if (Iy_score < epsilon || i == nA || j == nB) Iy_score = -DBL_MAX; \
+                if (M_score < threshold) M_score = -DBL_MAX; \
+                if (Ix_score < threshold) Ix_score = -DBL_MAX; \
+                if (Iy_score < threshold) Iy_score = -DBL_MAX; \
+            } \
+            M_row[j] = M_score; \
+            Ix_row[j] = Ix_score; \
+            Iy_row[j] = Iy_score; \
+            if (M_score > -DBL_MAX || Ix_score > -DBL_MAX || Iy_score > -DBL_MAX) { \
+                if (first > nB) first = j; \
+                last = j; \
+            } \
+            else if (j > limit) break; \
+        } \
+        if (j < end) end = j; \
+        BANDED_CLEAR_PREVIOUS_ROW \
+    } \
+\
+    if (local) *result = maximum; \
+    else { \
+        BANDED_SELECT_SCORE(M_row[nB], Ix_row[nB], Iy_row[nB]); \
+        *result = score; \
+    } \
+    PyMem_RawFree(M_row); \
+    PyMem_RawFree(Ix_row); \
+    PyMem_RawFree(Iy_row); \
+    return 0; \
+exit: \
+    if (M_row) PyMem_RawFree(M_row); \
+    if (Ix_row) PyMem_RawFree(Ix_row); \
+    if (Iy_row) PyMem_RawFree(Iy_row); \
+    return -1;
+
+#define BANDED_ALIGN(align_score) \
+    int trace; \
+    int M_trace; \
+    int Ix_trace; \
+    int Iy_trace; \
+    int im = nA; \
+    int jm = nB; \
+    Trace** M; \
+    TraceGapsGotoh** gaps; \
+    PathGenerator* paths; \
+    BANDED_ENTER \
+    BANDED_END_GAP_SCORES( \
+        PyErr_SetString(PyExc_RuntimeError, "strand was neither '+' nor '-'"); \
+        return NULL) \
+\
+    paths = PathGenerator_create_banded(nA, nB, self->mode, strand); \
+    if (!paths) return NULL; \
+    M = paths->M; \
+    gaps = paths->gaps.gotoh; \
+    M_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    if (!M_row) goto exit; \
+    Ix_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    if (!Ix_row) goto exit; \
+    Iy_row = PyMem_Malloc((nB+1)*sizeof(double)); \
+    if (!Iy_row) goto exit; \
+    for (j = 0; j <= nB; j++) { \
+        M_row[j] = -DBL_MAX; \
+        Ix_row[j] = -DBL_MAX; \
+        Iy_row[j] = -DBL_MAX; \
+    } \
+\
+    /* The top row is a special case, as there are no previously aligned \
+     * characters; its first cell is always filled. */ \
+    end = (kmax < 0) ? 0 : kmax; \
+    if (!PathGenerator_allocate_row(paths, 0, 0, end)) goto exit; \
+    gaps[0][0].Ix = 0; \
+    gaps[0][0].Iy = 0; \
+    if (local) { \
+        for (j = 0; j <= end; j++) { \
+            M_row[j] = 0; \
+            M[0][j].trace = STARTPOINT; \
+            gaps[0][j].Ix = 0; \
+            gaps[0][j].Iy = 0; \
+        } \
+    } \
+    else { \
+        M_row[0] = 0; \
+        M[0][0].trace = 0; \
+        for (j = 1; j <= end; j++) { \
+            Iy_row[j] = left_gap_open_A + left_gap_extend_A * (j-1); \
+            M[0][j].trace = 0; \
+            gaps[0][j].Ix = 0; \
+            gaps[0][j].Iy = (j == 1) ? M_MATRIX : Iy_MATRIX; \
+        } \
+    } \
+    M[0][0].path = 0; \
+    previous_start = 0; \
+    previous_end = end; \
+    first = 0; \
+    last = end; \
+\
+    for (i = 1; i <= nA; i++) { \
+        BANDED_ROW_RANGE \
+        if (start > end && narrow) break; /* no more cells to fill */ \
+        if (!PathGenerator_allocate_row(paths, i, start, end)) goto exit; \
+        if (start > end) { \
+            /* no cells to fill in this row */ \
+            BANDED_CLEAR_PREVIOUS_ROW \
+            first = nB + 1; \
+            last = -1; \
+            continue; \
+        } \
+        BANDED_ROW_GAP_SCORES \
+        kA = sA[i-1]; \
+        first = nB + 1; \
+        last = -1; \
+        if (start == 0) { \
+            M_temp = M_row[0]; \
+            Ix_temp = Ix_row[0]; \
+            Iy_temp = Iy_row[0]; \
+            Iy_row[0] = -DBL_MAX; \
+            gaps[i][0].Iy = 0; \
+            if (local) { \
+                Ix_row[0] = -DBL_MAX; \
+                gaps[i][0].Ix = 0; \
+                if (0 < threshold) { \
+                    M_row[0] = -DBL_MAX; \
+                    M[i][0].trace = 0; \
+                } \
+                else { \
+                    M_row[0] = 0; \
+                    M[i][0].trace = STARTPOINT; \
+                    first = 0; \
+                    last = 0; \
+                } \
+            } \
+            else { \
+                M_row[0] = -DBL_MAX; \
+                M[i][0].trace = 0; \
+                BANDED_SELECT_TRACE(M_temp + left_gap_open_B, \
+                                    Ix_temp + left_gap_extend_B, \
+                                    Iy_temp + left_gap_open_B); \
+                Ix_row[0] = score; \
+                gaps[i][0].Ix = trace; \
+            } \
+            j = 1; \
+        } \
+        else { \
+            M_temp = M_row[start-1]; \
+            Ix_temp = Ix_row[start-1]; \
+            Iy_temp = Iy_row[start-1]; \
+            M_row[start-1] = -DBL_MAX; \
+            Ix_row[start-1] = -DBL_MAX; \
+            Iy_row[start-1] = -DBL_MAX; \
+            j = start; \
+        } \
+        for ( ; j <= end; j++) { \
+            kB = sB[j-1]; \
+            BANDED_COLUMN_GAP_SCORES \
+            BANDED_SELECT_TRACE(M_temp, Ix_temp, Iy_temp); \
+            if (score > -DBL_MAX) score += (align_score); \
+            M_score = score; \
+            M_trace = trace; \
+            M_temp = M_row[j]; \
+            Ix_temp = Ix_row[j]; \
+            Iy_temp = Iy_row[j]; \
+            BANDED_SELECT_TRACE(M_temp + gap_open_B, \
+                                Ix_temp + gap_extend_B, \
+                                Iy_temp + gap_open_B); \
+            Ix_score = score; \
+            Ix_trace = trace; \
+            BANDED_SELECT_TRACE(M_row[j-1] + gap_open_A, \
+                                Ix_row[j-1] + gap_open_A, \
+                                Iy_row[j-1] + gap_extend_A); \
+            Iy_score = score; \
+            Iy_trace = trace; \
+            if (local) { \
+                if (M_score < epsilon) { \
+                    M_score = 0; \
+                    M_trace = STARTPOINT; \
+                } \
+                else if (M_score > maximum - epsilon) { \
+                    if (M_score > maximum + epsilon) { \
+                        maximum = M_score; \
+                        if (xdrop) threshold = maximum - self->xdrop - epsilon; \
+                        /* remove the previous end points */ \
+                        for ( ; im < i; im++, jm = paths->band_start[im]) \
+                            for ( ; jm <= paths->band_end[im]; jm++) \
+                                M[im][jm].trace &= ~ENDPOINT; \
+                        for ( ; jm < j; jm++) M[im][jm].trace &= ~ENDPOINT; \
+                        im = i; \
+                        jm = j; \
+                    } \
+                    M_trace |= ENDPOINT; \
+                } \
+                if (Ix_score < epsilon || i == nA || j == nB) { \
+                    Ix_score = -DBL_MAX; \
+                    Ix_trace = 0; \
+                } \
+                if (Iy_score < epsilon || i == nA || j == nB) { \
+                    Iy_score = -DBL_MAX; \
+                    Iy_trace = 0; \
+                } \
+                if (M_score < threshold) { \
+                    M_score = -DBL_MAX; \
+                    M_trace = 0; \
+                } \
+                if (Ix_score < threshold) { \
+                    Ix_score = -DBL_MAX; \
+                    Ix_trace = 0; \
+                } \
+                if (Iy_score < threshold) { \
+                    Iy_score = -DBL_MAX; \
+                    Iy_trace = 0; \
+                } \
+            } \
+            M_row[j] = M_score; \
+            Ix_row[j] = Ix_score; \
+            Iy_row[j] = Iy_score; \
+            M[i][j].trace = M_trace; \
+            gaps[i][j].Ix = Ix_trace; \
+            gaps[i][j].Iy = Iy_trace; \
+            if (M_score > -DBL_MAX || Ix_score > -DBL_MAX || Iy_score > -DBL_MAX) { \
+                if (first > nB) first = j; \
+                last = j; \
+            } \
+            else if (j > limit) break; \
+        } \
+        if (j < end) { \
+            end = j; \
+            PathGenerator_shrink_row(paths, i, end); \
+            M = paths->M; \
+            gaps = paths->gaps.gotoh; \
+        } \
+        BANDED_CLEAR_PREVIOUS_ROW \
+    } \
+\
+    if (local) { \
+        PyMem_Free(M_row); \
+        PyMem_Free(Ix_row); \
+        PyMem_Free(Iy_row); \
+        /* As we don't allow zero-score extensions to alignments, \
+         * we need to remove all traces towards an ENDPOINT. \
+         * In addition, some points then won't have any path to a STARTPOINT. \
+         * Here, use path as a temporary variable to indicate if the point \
+         * is reachable from a STARTPOINT. If it is unreachable, remove all \
+         * traces from it, and don't allow it to be an ENDPOINT. It may still \
+         * be a valid STARTPOINT. */ \
+        for (j = 0; j <= paths->band_end[0]; j++) M[0][j].path = M_MATRIX; \
+        for (i = 1; i <= nA; i++) { \
+            start = paths->band_start[i]; \
+            end = paths->band_end[i]; \
+            if (start > end) continue; \
+            if (start == 0) { \
+                M[i][0].path = M_MATRIX; \
+                start = 1; \
+            } \
+            for (j = start; j <= end; j++) { \
+                /* Remove traces to unreachable points. */ \
+                trace = M[i][j].trace; \
+                if (trace & M_MATRIX && !(M[i-1][j-1].path & M_MATRIX)) trace &= ~M_MATRIX; \
+                if (trace & Ix_MATRIX && !(M[i-1][j-1].path & Ix_MATRIX)) trace &= ~Ix_MATRIX; \
+                if (trace & Iy_MATRIX && !(M[i-1][j-1].path & Iy_MATRIX)) trace &= ~Iy_MATRIX; \
+                if (trace & (STARTPOINT | M_MATRIX | Ix_MATRIX | Iy_MATRIX)) { \
+                    /* The point is reachable. */ \
+                    if (trace & ENDPOINT) M[i][j].path = 0; /* no extensions after ENDPOINT */ \
+                    else M[i][j].path |= M_MATRIX; \
+                } \
+                else { \
+                    /* The point is not reachable. Then it is not a STARTPOINT, \
+                     * all traces from it can be removed, and it cannot act as \
+                     * an ENDPOINT. */ \
+                    M[i][j].path &= ~M_MATRIX; \
+                    trace = 0; \
+                } \
+                M[i][j].trace = trace; \
+                trace = gaps[i][j].Ix; \
+                if (trace & M_MATRIX && !(M[i-1][j].path & M_MATRIX)) trace &= ~M_MATRIX; \
+                if (trace & Ix_MATRIX && !(M[i-1][j].path & Ix_MATRIX)) trace &= ~Ix_MATRIX; \
+                if (trace & Iy_MATRIX && !(M[i-1][j].path & Iy_MATRIX)) trace &= ~Iy_MATRIX; \
+                if (trace & (M_MATRIX | Ix_MATRIX | Iy_MATRIX)) { \
+                    /* The point is reachable. */ \
+                    M[i][j].path |= Ix_MATRIX; \
+                } \
+                else { \
+                    /* The point is not reachable. Then \
+                     * all traces from it can be removed. */ \
+                    M[i][j].path &= ~Ix_MATRIX; \
+                    trace = 0; \
+                } \
+                gaps[i][j].Ix = trace; \
+                trace = gaps[i][j].Iy; \
+                if (trace & M_MATRIX && !(M[i][j-1].path & M_MATRIX)) trace &= ~M_MATRIX; \
+                if (trace & Ix_MATRIX && !(M[i][j-1].path & Ix_MATRIX)) trace &= ~Ix_MATRIX; \
+                if (trace & Iy_MATRIX && !(M[i][j-1].path & Iy_MATRIX)) trace &= ~Iy_MATRIX; \
+                if (trace & (M_MATRIX | Ix_MATRIX | Iy_MATRIX)) { \
+                    /* The point is reachable. */ \
+                    M[i][j].path |= Iy_MATRIX; \
+                } \
+                else { \
+                    /* The point is not reachable. Then \
+                     * all traces from it can be removed. */ \
+                    M[i][j].path &= ~Iy_MATRIX; \
+                    trace = 0; \
+                } \
+                gaps[i][j].Iy = trace; \
+            } \
+        } \
+        if (maximum == 0) M[0][0].path = DONE; \
+        else M[0][0].path = 0; \
+        return Py_BuildValue("fN", maximum, paths); \
+    } \
+\
+    /* traceback */ \
+    M[nA][nB].path = 0; \
+    BANDED_SELECT_SCORE(M_row[nB], Ix_row[nB], Iy_row[nB]); \
+    if (M_row[nB] < score - epsilon) M[nA][nB].trace = 0; \
+    if (Ix_row[nB] < score - epsilon) gaps[nA][nB].Ix = 0; \
+    if (Iy_row[nB] < score - epsilon) gaps[nA][nB].Iy = 0; \
+    PyMem_Free(M_row); \
+    PyMem_Free(Ix_row); \
+    PyMem_Free(Iy_row); \
+    return Py_BuildValue("fN", score, paths); \
+\
+exit: \
+    Py_DECREF(paths); \
+    if (M_row) PyMem_Free(M_row); \
+    if (Ix_row) PyMem_Free(Ix_row); \
+    if (Iy_row) PyMem_Free(Iy_row); \
+    return PyErr_NoMemory();
+
+
+#define WATERMANSMITHBEYER_ENTER_SCORE \
+    int i; \
+    int j = 0; \
+    int k; \
+    int kA; \
+    int kB; \
+    double** M = NULL; \
+    double** Ix = NULL; \
+    double** Iy = NULL; \
+    double score = 0.0; \
+    double gapscore = 0.0; \
+    double temp; \
+    int ok = 1; \
+    PyObject* result = NULL; \
+\
+    /* Waterman-Smith-Beyer algorithm */ \
+    M = PyMem_Malloc((nA+1)*sizeof(double*)); \
+    if (!M) goto exit; \
+    Ix = PyMem_Malloc((nA+1)*sizeof(double*)); \
+    if (!Ix) goto exit; \
+    Iy = PyMem_Malloc((nA+1)*sizeof(double*)); \
+    if (!Iy) goto exit; \
+    for (i = 0; i <= nA; i++) { \
+        M[i] = PyMem_Malloc((nB+1)*sizeof(double)); \
+        if (!M[i]) goto exit; \
+        Ix[i] = PyMem_Malloc((nB+1)*sizeof(double)); \
+        if (!Ix[i]) goto exit; \
+        Iy[i] = PyMem_Malloc((nB+1)*sizeof(double)); \
+        if (!Iy[i]) goto exit; \
+    } \
+
+
+#define WATERMANSMITHBEYER_GLOBAL_SCORE(align_score, query_gap_start) \
+    /* The top row of the score matrix is a special case, \
+     *  as there are no previously aligned characters. \
+     */ \
+    M[0][0] = 0; \
+    Ix[0][0] = -DBL_MAX; \
+    Iy[0][0] = -DBL_MAX; \
+    for (i = 1; i <= nA; i++) { \
+        M[i][0] = -DBL_MAX; \
+        Iy[i][0] = -DBL_MAX; \
+        ok = _call_deletion_score_function(self, query_gap_start, i, nB, &score); \
+        if (!ok) goto exit; \
+        Ix[i][0] = score; \
+    } \
+    for (j = 1; j <= nB; j++) { \
+        M[0][j] = -DBL_MAX; \
+        Ix[0][j] = -DBL_MAX; \
+        ok = _call_insertion_score_function(self, 0, j, nA, &score); \
+        if (!ok) goto exit; \
+        Iy[0][j] = score; \
+    } \
+    for (i = 1; i <= nA; i++) { \
+        kA = sA[i-1]; \
+        for (j = 1; j <= nB; j++) { \
+            kB = sB[j-1]; \
+            SELECT_SCORE_GLOBAL(M[i-1][j-1], Ix[i-1][j-1], Iy[i-1][j-1]); \
+            M[i][j] = score + (align_score); \
+            score = -DBL_MAX; \
             for (k = 1; k <= i; k++) { \
                 ok = _call_deletion_score_function(self, query_gap_start, k, nB, &gapscore); \
                 if (!ok) goto exit; \
@@ -6398,6 +7208,111 @@ exit:
     return NULL;
 }
 
+/* Find the band of diagonals kmin <= j - i <= kmax to be filled. In global
+ * mode, the band is widened if needed to include both the start and the end
+ * of the alignment. */
+static void
+_get_band_limits(const Aligner* self, int nA, int nB, int* kmin, int* kmax)
+{
+    Py_ssize_t lower = -nA;
+    Py_ssize_t upper = nB;
+    if (self->band >= 0) {
+        lower = (Py_ssize_t)self->band_offset - self->band;
+        upper = (Py_ssize_t)self->band_offset + self->band;
+        if (self->mode == Global) {
+            if (lower > 0) lower = 0;
+            if (lower > nB - nA) lower = nB - nA;
+            if (upper < 0) upper = 0;
+            if (upper < nB - nA) upper = nB - nA;
+        }
+        if (lower < -nA) lower = -nA;
+        else if (lower > nB + 1) lower = nB + 1;
+        if (upper > nB) upper = nB;
+        else if (upper < -nA - 1) upper = -nA - 1;
+    }
+    *kmin = (int) lower;
+    *kmax = (int) upper;
+}
+
+static PathGenerator*
+PathGenerator_create_banded(int nA, int nB, Mode mode, unsigned char strand)
+{
+    int i;
+    PathGenerator* paths;
+
+    paths = (PathGenerator*)PyType_GenericAlloc(&PathGenerator_Type, 0);
+    if (!paths) return NULL;
+
+    paths->iA = 0;
+    paths->iB = 0;
+    paths->nA = nA;
+    paths->nB = nB;
+    paths->M = NULL;
+    paths->gaps.gotoh = NULL;
+    paths->algorithm = Gotoh;
+    paths->mode = mode;
+    paths->length = 0;
+    paths->strand = strand;
+    paths->band_start = NULL;
+    paths->band_end = NULL;
+
+    /* The rows are allocated while filling the trace matrices. */
+    paths->M = PyMem_Malloc((nA+1)*sizeof(Trace*));
+    if (!paths->M) goto exit;
+    paths->gaps.gotoh = PyMem_Malloc((nA+1)*sizeof(TraceGapsGotoh*));
+    if (!paths->gaps.gotoh) goto exit;
+    paths->band_start = PyMem_Malloc((nA+1)*sizeof(int));
+    if (!paths->band_start) goto exit;
+    paths->band_end = PyMem_Malloc((nA+1)*sizeof(int));
+    if (!paths->band_end) goto exit;
+    for (i = 0; i <= nA; i++) {
+        paths->M[i] = NULL;
+        paths->gaps.gotoh[i] = NULL;
+        paths->band_start[i] = 0;
+        paths->band_end[i] = -1;
+    }
+    return paths;
+exit:
+    Py_DECREF(paths);
+    PyErr_SetNone(PyExc_MemoryError);
+    return NULL;
+}
+
+/* Allocate row i of a banded PathGenerator, storing columns start to end. */
+static bool
+PathGenerator_allocate_row(PathGenerator* self, int i, int start, int end)
+{
+    const size_t n = (end < start) ? 0 : end - start + 1;
+    Trace* row;
+    TraceGapsGotoh* gaps;
+
+    row = PyMem_Malloc(n * sizeof(Trace));
+    if (!row) return false;
+    self->band_start[i] = start;
+    self->band_end[i] = end;
+    self->M[i] = row - start;
+    gaps = PyMem_Malloc(n * sizeof(TraceGapsGotoh));
+    if (!gaps) return false;
+    self->gaps.gotoh[i] = gaps - start;
+    return true;
+}
+
+/* Release the memory for the columns beyond end in row i. */
+static void
+PathGenerator_shrink_row(PathGenerator* self, int i, int end)
+{
+    const int start = self->band_start[i];
+    const size_t n = end - start + 1;
+    Trace* row;
+    TraceGapsGotoh* gaps;
+
+    row = PyMem_Realloc(self->M[i] + start, n * sizeof(Trace));
+    if (row) self->M[i] = row - start;
+    gaps = PyMem_Realloc(self->gaps.gotoh[i] + start, n * sizeof(TraceGapsGotoh));
+    if (gaps) self->gaps.gotoh[i] = gaps - start;
+    self->band_end[i] = end;
+}
+
 static PathGenerator*
 PathGenerator_create_WSB(int nA, int nB, Mode mode, unsigned char strand)
 {
@@ -6537,11 +7452,12 @@ exit:
 #define COMPARE_SCORE (kA == wildcard || kB == wildcard) ? 0 : (kA == kB) ? match : mismatch
 
 
-static PyObject*
-Aligner_needlemanwunsch_score_compare(Aligner* self,
+static int
+Aligner_needlemanwunsch_score_compare(const Aligner* self,
                                       const int* sA, int nA,
                                       const int* sB, int nB,
-                                      unsigned char strand)
+                                      unsigned char strand,
+                                      double* result)
 {
     const double match = self->match;
     const double mismatch = self->mismatch;
@@ -6549,21 +7465,24 @@ Aligner_needlemanwunsch_score_compare(Aligner* self,
     NEEDLEMANWUNSCH_SCORE(COMPARE_SCORE);
 }
 
-static PyObject*
-Aligner_needlemanwunsch_score_matrix(Aligner* self,
+static int
+Aligner_needlemanwunsch_score_matrix(const Aligner* self,
                                      const int* sA, int nA,
                                      const int* sB, int nB,
-                                     unsigned char strand)
+                                     unsigned char strand,
+                                     double* result)
 {
     const Py_ssize_t n = self->substitution_matrix.shape[0];
     const double* substitution_matrix = self->substitution_matrix.buf;
     NEEDLEMANWUNSCH_SCORE(MATRIX_SCORE);
 }
 
-static PyObject*
-Aligner_smithwaterman_score_compare(Aligner* self,
+static int
+Aligner_smithwaterman_score_compare(const Aligner* self,
                                     const int* sA, int nA,
-                                    const int* sB, int nB)
+                                    const int* sB, int nB,
+                                    unsigned char strand,
+                                    double* result)
 {
     const double match = self->match;
     const double mismatch = self->mismatch;
@@ -6571,10 +7490,12 @@ Aligner_smithwaterman_score_compare(Aligner* self,
     SMITHWATERMAN_SCORE(COMPARE_SCORE);
 }
 
-static PyObject*
-Aligner_smithwaterman_score_matrix(Aligner* self,
+static int
+Aligner_smithwaterman_score_matrix(const Aligner* self,
                                    const int* sA, int nA,
-                                   const int* sB, int nB)
+                                   const int* sB, int nB,
+                                   unsigned char strand,
+                                   double* result)
 {
     const Py_ssize_t n = self->substitution_matrix.shape[0];
     const double* substitution_matrix = self->substitution_matrix.buf;
@@ -6627,11 +7548,12 @@ Aligner_smithwaterman_align_matrix(Aligner* self,
     SMITHWATERMAN_ALIGN(MATRIX_SCORE);
 }
 
-static PyObject*
-Aligner_gotoh_global_score_compare(Aligner* self,
+static int
+Aligner_gotoh_global_score_compare(const Aligner* self,
                                    const int* sA, int nA,
                                    const int* sB, int nB,
-                                   unsigned char strand)
+                                   unsigned char strand,
+                                   double* result)
 {
     const double match = self->match;
     const double mismatch = self->mismatch;
@@ -6639,21 +7561,24 @@ Aligner_gotoh_global_score_compare(Aligner* self,
     GOTOH_GLOBAL_SCORE(COMPARE_SCORE);
 }
 
-static PyObject*
-Aligner_gotoh_global_score_matrix(Aligner* self,
+static int
+Aligner_gotoh_global_score_matrix(const Aligner* self,
                                   const int* sA, int nA,
                                   const int* sB, int nB,
-                                  unsigned char strand)
+                                  unsigned char strand,
+                                  double* result)
 {
     const Py_ssize_t n = self->substitution_matrix.shape[0];
     const double* substitution_matrix = self->substitution_matrix.buf;
     GOTOH_GLOBAL_SCORE(MATRIX_SCORE);
 }
 
-static PyObject*
-Aligner_gotoh_local_score_compare(Aligner* self,
+static int
+Aligner_gotoh_local_score_compare(const Aligner* self,
                                   const int* sA, int nA,
-                                  const int* sB, int nB)
+                                  const int* sB, int nB,
+                                  unsigned char strand,
+                                  double* result)
 {
     const double match = self->match;
     const double mismatch = self->mismatch;
@@ -6661,10 +7586,12 @@ Aligner_gotoh_local_score_compare(Aligner* self,
     GOTOH_LOCAL_SCORE(COMPARE_SCORE);
 }
 
-static PyObject*
-Aligner_gotoh_local_score_matrix(Aligner* self,
+static int
+Aligner_gotoh_local_score_matrix(const Aligner* self,
                                  const int* sA, int nA,
-                                 const int* sB, int nB)
+                                 const int* sB, int nB,
+                                 unsigned char strand,
+                                 double* result)
 {
     const Py_ssize_t n = self->substitution_matrix.shape[0];
     const double* substitution_matrix = self->substitution_matrix.buf;
@@ -6718,12 +7645,60 @@ Aligner_gotoh_local_align_matrix(Aligner* self,
 }
 
 static int
-_call_deletion_score_function(Aligner* aligner, int i, int j, int n, double* score)
+Aligner_banded_score_compare(const Aligner* self,
+                             const int* sA, int nA,
+                             const int* sB, int nB,
+                             unsigned char strand,
+                             double* result)
 {
-    double value;
-    PyObject* result;
-    PyObject* function = aligner->deletion_score_function;
-    if (!function) {
+    const double match = self->match;
+    const double mismatch = self->mismatch;
+    const int wildcard = self->wildcard;
+    BANDED_SCORE(COMPARE_SCORE);
+}
+
+static int
+Aligner_banded_score_matrix(const Aligner* self,
+                            const int* sA, int nA,
+                            const int* sB, int nB,
+                            unsigned char strand,
+                            double* result)
+{
+    const Py_ssize_t n = self->substitution_matrix.shape[0];
+    const double* substitution_matrix = self->substitution_matrix.buf;
+    BANDED_SCORE(MATRIX_SCORE);
+}
+
+static PyObject*
+Aligner_banded_align_compare(Aligner* self,
+                             const int* sA, int nA,
+                             const int* sB, int nB,
+                             unsigned char strand)
+{
+    const double match = self->match;
+    const double mismatch = self->mismatch;
+    const int wildcard = self->wildcard;
+    BANDED_ALIGN(COMPARE_SCORE);
+}
+
+static PyObject*
+Aligner_banded_align_matrix(Aligner* self,
+                            const int* sA, int nA,
+                            const int* sB, int nB,
+                            unsigned char strand)
+{
+    const Py_ssize_t n = self->substitution_matrix.shape[0];
+    const double* substitution_matrix = self->substitution_matrix.buf;
+    BANDED_ALIGN(MATRIX_SCORE);
+}
+
+static int
+_call_deletion_score_function(Aligner* aligner, int i, int j, int n, double* score)
+{
+    double value;
+    PyObject* result;
+    PyObject* function = aligner->deletion_score_function;
+    if (!function) {
         if (i == 0) {
             value = aligner->open_left_deletion_score
                   + (j-1) * aligner->extend_left_deletion_score;
@@ -7139,7 +8114,7 @@ static bool _map_indices(Py_buffer* view, const int* mapping, Py_ssize_t m) {
     return true;
 }
 
-static bool _prepare_indices(Py_buffer* substitution_matrix, Py_buffer* bA, Py_buffer* bB)
+static bool _prepare_sequence(Py_buffer* substitution_matrix, Py_buffer* view)
 {
     if (PyObject_IsInstance(substitution_matrix->obj,
                             (PyObject*)Array_Type)) {
@@ -7150,13 +8125,16 @@ static bool _prepare_indices(Py_buffer* substitution_matrix, Py_buffer* bA, Py_b
         const int* mapping = buffer->buf;
         if (mapping) {
             const Py_ssize_t m = buffer->len / buffer->itemsize;
-            if (!_map_indices(bA, mapping, m)) return false;
-            if (!_map_indices(bB, mapping, m)) return false;
-            return true;
+            return _map_indices(view, mapping, m);
         }
     }
-    if (!_check_indices(bA, substitution_matrix)) return false;
-    if (!_check_indices(bB, substitution_matrix)) return false;
+    return _check_indices(view, substitution_matrix);
+}
+
+static bool _prepare_indices(Py_buffer* substitution_matrix, Py_buffer* bA, Py_buffer* bB)
+{
+    if (!_prepare_sequence(substitution_matrix, bA)) return false;
+    if (!_prepare_sequence(substitution_matrix, bB)) return false;
     return true;
 }
 
@@ -7222,117 +8200,730 @@ error:
     return 0;
 }
 
-static const char Aligner_score__doc__[] = "calculates the alignment score";
-
-static PyObject*
-Aligner_score(Aligner* self, PyObject* args, PyObject* keywords)
+/* Check if banded or X-drop alignment was requested, and if it is available
+ * for the current alignment mode and algorithm. */
+static bool
+_check_banded(Aligner* self)
 {
+    if (self->band < 0 && self->xdrop < 0) return true;
+    switch (_get_algorithm(self)) {
+        case NeedlemanWunschSmithWaterman:
+        case Gotoh:
+            if (self->xdrop >= 0 && self->mode != Local) {
+                PyErr_SetString(PyExc_ValueError,
+                    "X-drop termination is only available in local mode");
+                return false;
+            }
+            return true;
+        case WatermanSmithBeyer:
+            PyErr_SetString(PyExc_ValueError,
+                "banded and X-drop alignment are not available for the "
+                "Waterman-Smith-Beyer algorithm");
+            return false;
+        case FOGSAA:
+            PyErr_SetString(PyExc_ValueError,
+                "banded and X-drop alignment are not available for FOGSAA");
+            return false;
+        case Unknown:
+        default:
+            ERR_UNEXPECTED_ALGORITHM
+            return false;
+    }
+}
+
+typedef int (*ScoreFunction)(const Aligner* self,
+                             const int* sA, int nA,
+                             const int* sB, int nB,
+                             unsigned char strand,
+                             double* result);
+
+/* ----------------- striped score-only kernels ----------------- */
+
+/* Farrar's striped algorithm (Bioinformatics 23: 156-161, 2007) for
+ * calculating the global or local alignment score with affine gaps, using
+ * SSE2 or AVX2 instructions on 32-bit integer scores.  Sequence A is laid out
+ * over the vector lanes such that lane k holds rows k*S+1 to k*S+S, where S is
+ * the number of segments; the kernel loops over the columns (the letters in
+ * sequence B), and corrects the vertical gap scores crossing lane boundaries
+ * in a second "lazy F" loop.  These kernels are used only if all scores are
+ * integers, all gap scores are non-positive, and no open gap score is larger
+ * than the corresponding extend gap score; with these conditions, they give
+ * the same score as the scalar Needleman-Wunsch, Smith-Waterman, and Gotoh
+ * algorithms.
+ */
+
+#if defined(__x86_64__) || defined(_M_X64)
+#define STRIPED_X86
+#include <immintrin.h>
+#if defined(_MSC_VER) && !defined(__clang__)
+#include <intrin.h>
+#define TARGET_AVX2
+#else
+#define TARGET_AVX2 __attribute__((target("avx2")))
+#endif
+#endif
+
+/* scores are kept well away from INT32_MIN to avoid overflow */
+#define STRIPED_NEG (INT32_MIN / 2)
+#define STRIPED_MAX_SCORE (INT32_MAX / 4)
+/* the largest number of cached profiles in compare mode */
+#define STRIPED_PROFILES 256
+
+typedef struct {
+    bool local;
+    int32_t open_A;  /* insertions, rows 1 to nA-1 */
+    int32_t extend_A;
+    int32_t left_open_A;  /* insertions, row 0 */
+    int32_t left_extend_A;
+    int32_t right_open_A;  /* insertions, row nA */
+    int32_t right_extend_A;
+    int32_t open_B;  /* deletions, columns 1 to nB-1 */
+    int32_t extend_B;
+    int32_t left_open_B;  /* deletions, column 0 */
+    int32_t left_extend_B;
+    int32_t right_open_B;  /* deletions, column nB */
+    int32_t right_extend_B;
+} StripedParameters;
+
+typedef struct {
+    int lanes;
+    int segments;
     const int* sA;
-    const int* sB;
     int nA;
-    int nB;
-    Py_buffer bA = {0};
-    Py_buffer bB = {0};
-    const Mode mode = self->mode;
-    const Algorithm algorithm = _get_algorithm(self);
-    char strand = '+';
-    PyObject* result = NULL;
-    PyObject* substitution_matrix = self->substitution_matrix.obj;
+    const double* substitution_matrix;  /* NULL in compare mode */
+    Py_ssize_t n;
+    int32_t match;
+    int32_t mismatch;
+    int wildcard;
+    int32_t** profiles;
+    int nprofiles;
+    int32_t* scratch;
+} StripedProfile;
+
+/* Return the largest absolute value of the scores if the striped kernels can
+ * be used for this aligner, or -1 if not. */
+static double
+_get_striped_score_range(const Aligner* self)
+{
+    int i;
+    double value;
+    double maximum = 0;
+    const double gap_scores[][2] = {
+        {self->open_internal_insertion_score, self->extend_internal_insertion_score},
+        {self->open_left_insertion_score, self->extend_left_insertion_score},
+        {self->open_right_insertion_score, self->extend_right_insertion_score},
+        {self->open_internal_deletion_score, self->extend_internal_deletion_score},
+        {self->open_left_deletion_score, self->extend_left_deletion_score},
+        {self->open_right_deletion_score, self->extend_right_deletion_score},
+    };
+
+    for (i = 0; i < 6; i++) {
+        if (gap_scores[i][0] > gap_scores[i][1]) return -1;
+        if (gap_scores[i][1] > 0) return -1;
+        value = -gap_scores[i][0];
+        if (value != floor(value)) return -1;
+        if (value > maximum) maximum = value;
+        value = -gap_scores[i][1];
+        if (value != floor(value)) return -1;
+        if (value > maximum) maximum = value;
+    }
+    if (self->substitution_matrix.obj) {
+        const Py_ssize_t n = self->substitution_matrix.shape[0];
+        const double* scores = self->substitution_matrix.buf;
+        Py_ssize_t k;
+        for (k = 0; k < n * n; k++) {
+            value = fabs(scores[k]);
+            if (value != floor(value)) return -1;
+            if (value > maximum) maximum = value;
+        }
+    }
+    else {
+        value = fabs(self->match);
+        if (value != floor(value)) return -1;
+        if (value > maximum) maximum = value;
+        value = fabs(self->mismatch);
+        if (value != floor(value)) return -1;
+        if (value > maximum) maximum = value;
+    }
+    if (maximum > STRIPED_MAX_SCORE) return -1;
+    return maximum;
+}
 
-    static char *kwlist[] = {"sequenceA", "sequenceB", "strand", NULL};
+/* Return the profile (the scores of each letter in sequence A against letter
+ * kB, in the striped layout), calculating it if needed. */
+static const int32_t*
+_get_striped_profile(StripedProfile* profile, int kB)
+{
+    const int lanes = profile->lanes;
+    const int segments = profile->segments;
+    const int* sA = profile->sA;
+    const int nA = profile->nA;
+    const double* substitution_matrix = profile->substitution_matrix;
+    const Py_ssize_t n = profile->n;
+    int32_t* scores;
+    int i;
+    int k;
+    int s;
+    int kA;
+
+    if (kB >= 0 && kB < profile->nprofiles) {
+        scores = profile->profiles[kB];
+        if (scores) return scores;
+        scores = PyMem_RawMalloc(segments * lanes * sizeof(int32_t));
+        if (!scores) return NULL;
+        profile->profiles[kB] = scores;
+    }
+    else scores = profile->scratch;
+    for (s = 0; s < segments; s++) {
+        for (k = 0; k < lanes; k++) {
+            i = k * segments + s;
+            if (i >= nA) scores[s * lanes + k] = 0;
+            else {
+                kA = sA[i];
+                if (substitution_matrix)
+                    scores[s * lanes + k] = (int32_t) substitution_matrix[kA*n+kB];
+                else if (kA == profile->wildcard || kB == profile->wildcard)
+                    scores[s * lanes + k] = 0;
+                else if (kA == kB)
+                    scores[s * lanes + k] = profile->match;
+                else
+                    scores[s * lanes + k] = profile->mismatch;
+            }
+        }
+    }
+    return scores;
+}
+
+#define STRIPED_SCORE(ISA) \
+    const int lanes = ISA##_LANES; \
+    const int segments = profile->segments; \
+    const int nA = profile->nA; \
+    const bool local = parameters->local; \
+    const ISA##_VECTOR vZero = ISA##_SET1(0); \
+    const ISA##_VECTOR vNeg = ISA##_SET1(STRIPED_NEG); \
+    const ISA##_VECTOR vOpenA = ISA##_SET1(parameters->open_A); \
+    const ISA##_VECTOR vExtendA = ISA##_SET1(parameters->extend_A); \
+    const int last = ((nA - 1) % segments) * lanes + (nA - 1) / segments; \
+    ISA##_VECTOR vMaximum = vZero; \
+    ISA##_VECTOR vOpenB; \
+    ISA##_VECTOR vExtendB; \
+    ISA##_VECTOR vH; \
+    ISA##_VECTOR vE; \
+    ISA##_VECTOR vF; \
+    int32_t* buffer; \
+    int32_t* H_load; \
+    int32_t* H_store; \
+    int32_t* H_temp; \
+    int32_t* E; \
+    const int32_t* P; \
+    int32_t values[ISA##_LANES]; \
+    int32_t open_B; \
+    int32_t H_top; \
+    int32_t H_diagonal; \
+    int32_t E_last = 0; \
+    int32_t score; \
+    int i; \
+    int j; \
+    int k; \
+    int s; \
+\
+    buffer = PyMem_RawMalloc(3 * segments * lanes * sizeof(int32_t)); \
+    if (!buffer) return -1; \
+    H_load = buffer; \
+    H_store = H_load + segments * lanes; \
+    E = H_store + segments * lanes; \
+\
+    /* column 0 */ \
+    for (s = 0; s < segments; s++) { \
+        for (k = 0; k < lanes; k++) { \
+            i = k * segments + s + 1; \
+            if (local || i > nA) score = 0; \
+            else score = parameters->left_open_B \
+                       + (i - 1) * parameters->left_extend_B; \
+            H_store[s * lanes + k] = score; \
+            E[s * lanes + k] = score + parameters->open_A; \
+        } \
+    } \
+    if (!local) { \
+        E_last = H_store[last] + parameters->right_open_A; \
+        E[last] = E_last; \
+    } \
+\
+    for (j = 1; j <= nB; j++) { \
+        P = _get_striped_profile(profile, sB[j-1]); \
+        if (!P) { \
+            PyMem_RawFree(buffer); \
+            return -1; \
+        } \
+        if (local) { \
+            H_diagonal = 0; \
+            H_top = 0; \
+            open_B = parameters->open_B; \
+            vExtendB = ISA##_SET1(parameters->extend_B); \
+        } \
+        else { \
+            H_diagonal = (j == 1) ? 0 : parameters->left_open_A \
+                                      + (j - 2) * parameters->left_extend_A; \
+            H_top = parameters->left_open_A \
+                  + (j - 1) * parameters->left_extend_A; \
+            if (j == nB) { \
+                open_B = parameters->right_open_B; \
+                vExtendB = ISA##_SET1(parameters->right_extend_B); \
+            } \
+            else { \
+                open_B = parameters->open_B; \
+                vExtendB = ISA##_SET1(parameters->extend_B); \
+            } \
+        } \
+        vOpenB = ISA##_SET1(open_B); \
+        vF = ISA##_SHIFT(vNeg, H_top + open_B); \
+        vH = ISA##_SHIFT(ISA##_LOAD(H_store + (segments - 1) * lanes), \
+                         H_diagonal); \
+        H_temp = H_load; \
+        H_load = H_store; \
+        H_store = H_temp; \
+        for (s = 0; s < segments; s++) { \
+            vH = ISA##_ADD(vH, ISA##_LOAD(P + s * lanes)); \
+            vE = ISA##_LOAD(E + s * lanes); \
+            vH = ISA##_MAX(vH, vE); \
+            vH = ISA##_MAX(vH, vF); \
+            if (local) { \
+                vH = ISA##_MAX(vH, vZero); \
+                vMaximum = ISA##_MAX(vMaximum, vH); \
+            } \
+            ISA##_STORE(H_store + s * lanes, vH); \
+            vE = ISA##_MAX(ISA##_ADD(vE, vExtendA), ISA##_ADD(vH, vOpenA)); \
+            ISA##_STORE(E + s * lanes, vE); \
+            vF = ISA##_MAX(ISA##_ADD(vF, vExtendB), ISA##_ADD(vH, vOpenB)); \
+            vH = ISA##_LOAD(H_load + s * lanes); \
+        } \
+        /* lazy F loop */ \
+        for (k = 0; k < lanes; k++) { \
+            vF = ISA##_SHIFT(vF, STRIPED_NEG); \
+            for (s = 0; s < segments; s++) { \
+                vH = ISA##_LOAD(H_store + s * lanes); \
+                if (!ISA##_ANY_GT(vF, ISA##_ADD(vH, vOpenB))) goto done; \
+                vH = ISA##_MAX(vH, vF); \
+                if (local) vMaximum = ISA##_MAX(vMaximum, vH); \
+                ISA##_STORE(H_store + s * lanes, vH); \
+                vE = ISA##_MAX(ISA##_LOAD(E + s * lanes), \
+                               ISA##_ADD(vH, vOpenA)); \
+                ISA##_STORE(E + s * lanes, vE); \
+                vF = ISA##_ADD(vF, vExtendB); \
+            } \
+        } \
+done: \
+        if (!local) { \
+            /* insertions in the last row use the right gap scores */ \
+            score = H_store[last] + parameters->right_open_A; \
+            E_last += parameters->right_extend_A; \
+            if (score > E_last) E_last = score; \
+            E[last] = E_last; \
+        } \
+    } \
+\
+    if (local) { \
+        ISA##_STORE(values, vMaximum); \
+        score = 0; \
+        for (k = 0; k < lanes; k++) if (values[k] > score) score = values[k]; \
+    } \
+    else score = H_store[last]; \
+    PyMem_RawFree(buffer); \
+    *result = score; \
+    return 0;
 
-    if (!PyArg_ParseTupleAndKeywords(args, keywords, "O&O&O&", kwlist,
-                                     sequence_converter, &bA,
-                                     sequence_converter, &bB,
-                                     strand_converter, &strand))
-        return NULL;
+#ifdef STRIPED_X86
+
+#define SSE2_LANES 4
+#define SSE2_VECTOR __m128i
+#define SSE2_SET1(x) _mm_set1_epi32(x)
+#define SSE2_LOAD(p) _mm_loadu_si128((const __m128i*)(p))
+#define SSE2_STORE(p, v) _mm_storeu_si128((__m128i*)(p), v)
+#define SSE2_ADD(a, b) _mm_add_epi32(a, b)
+#define SSE2_MAX(a, b) _sse2_max(a, b)
+#define SSE2_ANY_GT(a, b) _mm_movemask_epi8(_mm_cmpgt_epi32(a, b))
+/* shift the lanes up by one, and insert x into lane 0 */
+#define SSE2_SHIFT(v, x) \
+    _mm_or_si128(_mm_slli_si128(v, 4), _mm_cvtsi32_si128(x))
+
+static inline __m128i
+_sse2_max(__m128i a, __m128i b)
+{
+    /* _mm_max_epi32 requires SSE4.1 */
+    const __m128i mask = _mm_cmpgt_epi32(a, b);
+    return _mm_or_si128(_mm_and_si128(mask, a), _mm_andnot_si128(mask, b));
+}
 
-    if (substitution_matrix) {
-        if (!_prepare_indices(&self->substitution_matrix, &bA, &bB)) goto exit;
+static int
+_striped_score_sse2(const StripedParameters* parameters,
+                    StripedProfile* profile,
+                    const int* sB, int nB,
+                    double* result)
+{
+    STRIPED_SCORE(SSE2)
+}
+
+#define AVX2_LANES 8
+#define AVX2_VECTOR __m256i
+#define AVX2_SET1(x) _mm256_set1_epi32(x)
+#define AVX2_LOAD(p) _mm256_loadu_si256((const __m256i*)(p))
+#define AVX2_STORE(p, v) _mm256_storeu_si256((__m256i*)(p), v)
+#define AVX2_ADD(a, b) _mm256_add_epi32(a, b)
+#define AVX2_MAX(a, b) _mm256_max_epi32(a, b)
+#define AVX2_ANY_GT(a, b) _mm256_movemask_epi8(_mm256_cmpgt_epi32(a, b))
+/* shift the lanes up by one, and insert x into lane 0 */
+#define AVX2_SHIFT(v, x) \
+    _mm256_blend_epi32( \
+        _mm256_permutevar8x32_epi32(v, _mm256_setr_epi32(7, 0, 1, 2, 3, 4, 5, 6)), \
+        _mm256_set1_epi32(x), 1)
+
+TARGET_AVX2
+static int
+_striped_score_avx2(const StripedParameters* parameters,
+                    StripedProfile* profile,
+                    const int* sB, int nB,
+                    double* result)
+{
+    STRIPED_SCORE(AVX2)
+}
+
+/* Find the fastest kernel supported by the CPU and the operating system. */
+static Kernel
+_find_best_kernel(void)
+{
+#if defined(_MSC_VER) && !defined(__clang__)
+    int info[4];
+    __cpuid(info, 0);
+    if (info[0] >= 7) {
+        __cpuid(info, 1);
+        /* OSXSAVE and AVX; check that the OS saves the YMM registers */
+        if ((info[2] & (1 << 27)) && (info[2] & (1 << 28))
+         && (_xgetbv(0) & 6) == 6) {
+            __cpuidex(info, 7, 0);
+            if (info[1] & (1 << 5)) return AVX2;
+        }
     }
+    return SSE2;
+#else
+    __builtin_cpu_init();
+    if (__builtin_cpu_supports("avx2")) return AVX2;
+    return SSE2;
+#endif
+}
 
-    nA = (int) (bA.len / bA.itemsize);
-    nB = (int) (bB.len / bB.itemsize);
-    if (nA != bA.len / bA.itemsize || nB != bB.len / bB.itemsize) {
-        PyErr_SetString(PyExc_ValueError, "sequences too long");
-        goto exit;
+#else
+
+static Kernel
+_find_best_kernel(void)
+{
+    return Scalar;
+}
+
+#endif
+
+static ScoreFunction _get_scalar_score_function(const Aligner* self);
+
+static int
+_striped_score(const Aligner* self,
+               const int* sA, int nA,
+               const int* sB, int nB,
+               unsigned char strand,
+               double* result,
+               Kernel kernel)
+{
+    StripedParameters parameters;
+    StripedProfile profile;
+    const double range = _get_striped_score_range(self);
+    int status = -1;
+    int k;
+
+    /* avoid integer overflow for very long sequences */
+    if ((nA + (double) nB + 2) * range >= STRIPED_MAX_SCORE) {
+        ScoreFunction function = _get_scalar_score_function(self);
+        return function(self, sA, nA, sB, nB, strand, result);
+    }
+    parameters.open_A = (int32_t) self->open_internal_insertion_score;
+    parameters.extend_A = (int32_t) self->extend_internal_insertion_score;
+    parameters.open_B = (int32_t) self->open_internal_deletion_score;
+    parameters.extend_B = (int32_t) self->extend_internal_deletion_score;
+    switch (self->mode) {
+        case Global:
+            parameters.local = false;
+            break;
+        case Local:
+            parameters.local = true;
+            break;
+        default:
+            return -2;
+    }
+    switch (strand) {
+        case '+':
+            parameters.left_open_A = (int32_t) self->open_left_insertion_score;
+            parameters.left_extend_A = (int32_t) self->extend_left_insertion_score;
+            parameters.right_open_A = (int32_t) self->open_right_insertion_score;
+            parameters.right_extend_A = (int32_t) self->extend_right_insertion_score;
+            parameters.left_open_B = (int32_t) self->open_left_deletion_score;
+            parameters.left_extend_B = (int32_t) self->extend_left_deletion_score;
+            parameters.right_open_B = (int32_t) self->open_right_deletion_score;
+            parameters.right_extend_B = (int32_t) self->extend_right_deletion_score;
+            break;
+        case '-':
+            parameters.left_open_A = (int32_t) self->open_right_insertion_score;
+            parameters.left_extend_A = (int32_t) self->extend_right_insertion_score;
+            parameters.right_open_A = (int32_t) self->open_left_insertion_score;
+            parameters.right_extend_A = (int32_t) self->extend_left_insertion_score;
+            parameters.left_open_B = (int32_t) self->open_right_deletion_score;
+            parameters.left_extend_B = (int32_t) self->extend_right_deletion_score;
+            parameters.right_open_B = (int32_t) self->open_left_deletion_score;
+            parameters.right_extend_B = (int32_t) self->extend_left_deletion_score;
+            break;
+        default:
+            return -2;
     }
-    sA = bA.buf;
-    sB = bB.buf;
 
-    switch (algorithm) {
+    profile.lanes = (kernel == AVX2) ? 8 : 4;
+    profile.segments = (nA + profile.lanes - 1) / profile.lanes;
+    profile.sA = sA;
+    profile.nA = nA;
+    if (self->substitution_matrix.obj) {
+        profile.substitution_matrix = self->substitution_matrix.buf;
+        profile.n = self->substitution_matrix.shape[0];
+        profile.nprofiles = (int) profile.n;
+    }
+    else {
+        profile.substitution_matrix = NULL;
+        profile.n = 0;
+        profile.nprofiles = STRIPED_PROFILES;
+    }
+    profile.match = (int32_t) self->match;
+    profile.mismatch = (int32_t) self->mismatch;
+    profile.wildcard = self->wildcard;
+    profile.profiles = PyMem_RawCalloc(profile.nprofiles, sizeof(int32_t*));
+    profile.scratch = PyMem_RawMalloc(profile.segments * profile.lanes
+                                      * sizeof(int32_t));
+    if (profile.profiles && profile.scratch) {
+        switch (kernel) {
+#ifdef STRIPED_X86
+            case AVX2:
+                status = _striped_score_avx2(&parameters, &profile, sB, nB, result);
+                break;
+            case SSE2:
+                status = _striped_score_sse2(&parameters, &profile, sB, nB, result);
+                break;
+#endif
+            default:
+                status = -2;
+                break;
+        }
+    }
+    if (profile.profiles) {
+        for (k = 0; k < profile.nprofiles; k++)
+            PyMem_RawFree(profile.profiles[k]);
+        PyMem_RawFree(profile.profiles);
+    }
+    PyMem_RawFree(profile.scratch);
+    return status;
+}
+
+static int
+Aligner_striped_score_sse2(const Aligner* self,
+                           const int* sA, int nA,
+                           const int* sB, int nB,
+                           unsigned char strand,
+                           double* result)
+{
+    return _striped_score(self, sA, nA, sB, nB, strand, result, SSE2);
+}
+
+static int
+Aligner_striped_score_avx2(const Aligner* self,
+                           const int* sA, int nA,
+                           const int* sB, int nB,
+                           unsigned char strand,
+                           double* result)
+{
+    return _striped_score(self, sA, nA, sB, nB, strand, result, AVX2);
+}
+
+/* Return the scalar function calculating the score for this aligner; the
+ * algorithm must have been determined already by _get_algorithm. */
+static ScoreFunction
+_get_scalar_score_function(const Aligner* self)
+{
+    const bool matrix = (self->substitution_matrix.obj != NULL);
+    switch (self->algorithm) {
         case NeedlemanWunschSmithWaterman:
-            switch (mode) {
+            switch (self->mode) {
                 case Global:
-                    if (substitution_matrix)
-                        result = Aligner_needlemanwunsch_score_matrix(self, sA, nA, sB, nB, strand);
-                    else
-                        result = Aligner_needlemanwunsch_score_compare(self, sA, nA, sB, nB, strand);
-                    break;
+                    if (matrix) return Aligner_needlemanwunsch_score_matrix;
+                    else return Aligner_needlemanwunsch_score_compare;
                 case Local:
-                    if (substitution_matrix)
-                        result = Aligner_smithwaterman_score_matrix(self, sA, nA, sB, nB);
-                    else
-                        result = Aligner_smithwaterman_score_compare(self, sA, nA, sB, nB);
-                    break;
+                    if (matrix) return Aligner_smithwaterman_score_matrix;
+                    else return Aligner_smithwaterman_score_compare;
                 default:
-                    ERR_UNEXPECTED_MODE
-                    goto exit;
+                    return NULL;
             }
-            break;
         case Gotoh:
-            switch (mode) {
+            switch (self->mode) {
                 case Global:
-                    if (substitution_matrix)
-                        result = Aligner_gotoh_global_score_matrix(self, sA, nA, sB, nB, strand);
-                    else
-                        result = Aligner_gotoh_global_score_compare(self, sA, nA, sB, nB, strand);
-                    break;
+                    if (matrix) return Aligner_gotoh_global_score_matrix;
+                    else return Aligner_gotoh_global_score_compare;
                 case Local:
-                    if (substitution_matrix)
-                        result = Aligner_gotoh_local_score_matrix(self, sA, nA, sB, nB);
-                    else
-                        result = Aligner_gotoh_local_score_compare(self, sA, nA, sB, nB);
-                    break;
+                    if (matrix) return Aligner_gotoh_local_score_matrix;
+                    else return Aligner_gotoh_local_score_compare;
                 default:
-                    ERR_UNEXPECTED_MODE
-                    goto exit;
+                    return NULL;
             }
-            break;
+        default:
+            return NULL;
+    }
+}
+
+/* Return the function calculating the score for this aligner without using
+ * the Python C API, so that it can run without holding the GIL. Returns NULL
+ * if no such function is available, for example for the Waterman-Smith-Beyer
+ * algorithm which may need to call Python gap score functions.  The kernel
+ * that will be used is stored in self->kernel.
+ */
+static ScoreFunction
+_get_score_function(Aligner* self)
+{
+    const bool matrix = (self->substitution_matrix.obj != NULL);
+    Kernel kernel = Scalar;
+    self->kernel = Scalar;
+    if (self->band >= 0 || self->xdrop >= 0) {
+        /* _check_banded has verified that the algorithm allows banding */
+        if (matrix) return Aligner_banded_score_matrix;
+        else return Aligner_banded_score_compare;
+    }
+    switch (_get_algorithm(self)) {
+        case NeedlemanWunschSmithWaterman:
+        case Gotoh:
+            if (self->simd != Scalar && _get_striped_score_range(self) >= 0)
+                kernel = (self->simd < 0) ? best_kernel : (Kernel) self->simd;
+            self->kernel = kernel;
+            switch (kernel) {
+                case AVX2: return Aligner_striped_score_avx2;
+                case SSE2: return Aligner_striped_score_sse2;
+                case Scalar:
+                default: return _get_scalar_score_function(self);
+            }
+        default:
+            return NULL;
+    }
+}
+
+static void
+_set_score_function_error(int status)
+{
+    if (status == -1) PyErr_NoMemory();
+    else PyErr_SetString(PyExc_RuntimeError, "strand was neither '+' nor '-'");
+}
+
+/* Calculate the alignment score for the algorithms which need the GIL. */
+static PyObject*
+_score_with_gil(Aligner* self,
+                const int* sA, int nA,
+                const int* sB, int nB,
+                unsigned char strand)
+{
+    const Mode mode = self->mode;
+    const Algorithm algorithm = _get_algorithm(self);
+    PyObject* substitution_matrix = self->substitution_matrix.obj;
+
+    switch (algorithm) {
         case WatermanSmithBeyer:
             switch (mode) {
                 case Global:
                     if (substitution_matrix)
-                        result = Aligner_watermansmithbeyer_global_score_matrix(self, sA, nA, sB, nB, strand);
+                        return Aligner_watermansmithbeyer_global_score_matrix(self, sA, nA, sB, nB, strand);
                     else
-                        result = Aligner_watermansmithbeyer_global_score_compare(self, sA, nA, sB, nB, strand);
-                    break;
+                        return Aligner_watermansmithbeyer_global_score_compare(self, sA, nA, sB, nB, strand);
                 case Local:
                     if (substitution_matrix)
-                        result = Aligner_watermansmithbeyer_local_score_matrix(self, sA, nA, sB, nB, strand);
+                        return Aligner_watermansmithbeyer_local_score_matrix(self, sA, nA, sB, nB, strand);
                     else
-                        result = Aligner_watermansmithbeyer_local_score_compare(self, sA, nA, sB, nB, strand);
-                    break;
+                        return Aligner_watermansmithbeyer_local_score_compare(self, sA, nA, sB, nB, strand);
                 default:
                     ERR_UNEXPECTED_MODE
-                    goto exit;
+                    return NULL;
             }
-            break;
         case FOGSAA:
             if (mode != FOGSAA_Mode) {
                 ERR_UNEXPECTED_MODE
-                goto exit;
+                return NULL;
             }
             if (substitution_matrix)
-                result = Aligner_fogsaa_score_matrix(self, sA, nA, sB, nB, strand);
+                return Aligner_fogsaa_score_matrix(self, sA, nA, sB, nB, strand);
             else
-                result = Aligner_fogsaa_score_compare(self, sA, nA, sB, nB, strand);
-            break;
+                return Aligner_fogsaa_score_compare(self, sA, nA, sB, nB, strand);
+        case NeedlemanWunschSmithWaterman:
+        case Gotoh:
+            ERR_UNEXPECTED_MODE
+            return NULL;
         case Unknown:
         default:
             ERR_UNEXPECTED_ALGORITHM
-            break;
+            return NULL;
     }
+}
+
+static const char Aligner_score__doc__[] = "calculates the alignment score";
+
+static PyObject*
+Aligner_score(Aligner* self, PyObject* args, PyObject* keywords)
+{
+    const int* sA;
+    const int* sB;
+    int nA;
+    int nB;
+    Py_buffer bA = {0};
+    Py_buffer bB = {0};
+    char strand = '+';
+    PyObject* result = NULL;
+    PyObject* substitution_matrix = self->substitution_matrix.obj;
+    ScoreFunction function;
+
+    static char *kwlist[] = {"sequenceA", "sequenceB", "strand", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywords, "O&O&O&", kwlist,
+                                     sequence_converter, &bA,
+                                     sequence_converter, &bB,
+                                     strand_converter, &strand))
+        return NULL;
+
+    if (!_check_banded(self)) goto exit;
+
+    if (substitution_matrix) {
+        if (!_prepare_indices(&self->substitution_matrix, &bA, &bB)) goto exit;
+    }
+
+    nA = (int) (bA.len / bA.itemsize);
+    nB = (int) (bB.len / bB.itemsize);
+    if (nA != bA.len / bA.itemsize || nB != bB.len / bB.itemsize) {
+        PyErr_SetString(PyExc_ValueError, "sequences too long");
+        goto exit;
+    }
+    sA = bA.buf;
+    sB = bB.buf;
+
+    function = _get_score_function(self);
+    if (function) {
+        /* Use a copy of the aligner, and keep a reference to the
+         * substitution matrix, so that changes to the aligner made by
+         * other threads while the GIL is released do not affect us. */
+        const Aligner aligner = *self;
+        double score;
+        int status;
+        Py_XINCREF(substitution_matrix);
+        Py_BEGIN_ALLOW_THREADS
+        status = function(&aligner, sA, nA, sB, nB, strand, &score);
+        Py_END_ALLOW_THREADS
+        Py_XDECREF(substitution_matrix);
+        if (status == 0) result = PyFloat_FromDouble(score);
+        else _set_score_function_error(status);
+    }
+    else result = _score_with_gil(self, sA, nA, sB, nB, strand);
 
 exit:
     sequence_converter(NULL, &bA);
@@ -7341,6 +8932,188 @@ exit:
     return result;
 }
 
+static int
+scores_converter(PyObject* argument, void* pointer)
+{
+    Py_buffer* view = pointer;
+    const int flag = PyBUF_FORMAT | PyBUF_C_CONTIGUOUS | PyBUF_WRITABLE;
+
+    if (argument == NULL) {
+        PyBuffer_Release(view);
+        return 1;
+    }
+
+    if (PyObject_GetBuffer(argument, view, flag) != 0) {
+        PyErr_SetString(PyExc_TypeError,
+                        "scores is not a writable contiguous array");
+        return 0;
+    }
+    if (view->ndim != 1) {
+        PyErr_Format(PyExc_ValueError,
+                     "scores has incorrect rank (%d expected 1)", view->ndim);
+        PyBuffer_Release(view);
+        return 0;
+    }
+    if (strcmp(view->format, "d") != 0 || view->itemsize != sizeof(double)) {
+        PyErr_Format(PyExc_ValueError,
+                     "scores has incorrect data type '%s'", view->format);
+        PyBuffer_Release(view);
+        return 0;
+    }
+    return Py_CLEANUP_SUPPORTED;
+}
+
+static const char Aligner_score_many__doc__[] =
+"calculates the alignment scores of one sequence to each of many sequences,\n"
+"storing them in the scores array";
+
+static PyObject*
+Aligner_score_many(Aligner* self, PyObject* args, PyObject* keywords)
+{
+    Py_buffer bA = {0};
+    Py_buffer bScores = {0};
+    Py_buffer view;
+    PyObject* sequences;
+    PyObject* items = NULL;
+    PyObject* item;
+    PyObject* value;
+    char strand = '+';
+    Py_ssize_t i;
+    Py_ssize_t n;
+    Py_ssize_t count;
+    Py_ssize_t total;
+    Py_ssize_t* offsets = NULL;
+    int* indices = NULL;
+    int nA;
+    int status = 0;
+    double* scores;
+    PyObject* result = NULL;
+    PyObject* substitution_matrix = self->substitution_matrix.obj;
+    ScoreFunction function;
+
+    static char *kwlist[] = {"sequenceA", "sequencesB", "scores", "strand", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywords, "O&OO&O&", kwlist,
+                                     sequence_converter, &bA,
+                                     &sequences,
+                                     scores_converter, &bScores,
+                                     strand_converter, &strand))
+        return NULL;
+
+    if (!_check_banded(self)) goto exit;
+
+    items = PySequence_Fast(sequences, "sequencesB should be a sequence");
+    if (!items) goto exit;
+    count = PySequence_Fast_GET_SIZE(items);
+    if (bScores.len / bScores.itemsize != count) {
+        PyErr_Format(PyExc_ValueError,
+                     "scores has length %zd, expected %zd",
+                     bScores.len / bScores.itemsize, count);
+        goto exit;
+    }
+    scores = bScores.buf;
+
+    /* Store a copy of sequence A followed by all B sequences, as we
+     * may need to map their letters to substitution matrix indices. */
+    offsets = PyMem_Malloc((count + 1) * sizeof(Py_ssize_t));
+    if (!offsets) {
+        PyErr_NoMemory();
+        goto exit;
+    }
+    total = bA.len / bA.itemsize;
+    if (total > INT_MAX) {
+        PyErr_SetString(PyExc_ValueError, "sequences too long");
+        goto exit;
+    }
+    nA = (int) total;
+    for (i = 0; i < count; i++) {
+        item = PySequence_Fast_GET_ITEM(items, i);
+        if (!sequence_converter(item, &view)) goto exit;
+        n = view.len / view.itemsize;
+        sequence_converter(NULL, &view);
+        if (n > INT_MAX) {
+            PyErr_SetString(PyExc_ValueError, "sequences too long");
+            goto exit;
+        }
+        offsets[i] = total;
+        total += n;
+    }
+    offsets[count] = total;
+    indices = PyMem_Malloc(total * sizeof(int));
+    if (!indices) {
+        PyErr_NoMemory();
+        goto exit;
+    }
+    memcpy(indices, bA.buf, bA.len);
+    for (i = 0; i < count; i++) {
+        item = PySequence_Fast_GET_ITEM(items, i);
+        if (!sequence_converter(item, &view)) goto exit;
+        n = view.len / view.itemsize;
+        if (offsets[i] + n != offsets[i+1]) {
+            sequence_converter(NULL, &view);
+            PyErr_SetString(PyExc_RuntimeError, "sequence length changed");
+            goto exit;
+        }
+        memcpy(indices + offsets[i], view.buf, view.len);
+        sequence_converter(NULL, &view);
+    }
+    if (substitution_matrix) {
+        view.buf = indices;
+        view.itemsize = sizeof(int);
+        view.len = nA * sizeof(int);
+        if (!_prepare_sequence(&self->substitution_matrix, &view)) goto exit;
+        for (i = 0; i < count; i++) {
+            view.buf = indices + offsets[i];
+            view.len = (offsets[i+1] - offsets[i]) * sizeof(int);
+            if (!_prepare_sequence(&self->substitution_matrix, &view)) goto exit;
+        }
+    }
+
+    function = _get_score_function(self);
+    if (function) {
+        const Aligner aligner = *self;
+        Py_XINCREF(substitution_matrix);
+        Py_BEGIN_ALLOW_THREADS
+        for (i = 0; i < count; i++) {
+            status = function(&aligner, indices, nA,
+                              indices + offsets[i],
+                              (int) (offsets[i+1] - offsets[i]),
+                              strand, &scores[i]);
+            if (status != 0) break;
+        }
+        Py_END_ALLOW_THREADS
+        Py_XDECREF(substitution_matrix);
+        if (status != 0) {
+            _set_score_function_error(status);
+            goto exit;
+        }
+    }
+    else {
+        for (i = 0; i < count; i++) {
+            value = _score_with_gil(self, indices, nA,
+                                    indices + offsets[i],
+                                    (int) (offsets[i+1] - offsets[i]),
+                                    strand);
+            if (!value) goto exit;
+            scores[i] = PyFloat_AsDouble(value);
+            Py_DECREF(value);
+            if (scores[i] == -1.0 && PyErr_Occurred()) goto exit;
+        }
+    }
+
+    Py_INCREF(Py_None);
+    result = Py_None;
+
+exit:
+    if (indices) PyMem_Free(indices);
+    if (offsets) PyMem_Free(offsets);
+    Py_XDECREF(items);
+    sequence_converter(NULL, &bA);
+    scores_converter(NULL, &bScores);
+
+    return result;
+}
+
 static const char Aligner_align__doc__[] = "align two sequences";
 
 static PyObject*
@@ -7366,6 +9139,8 @@ Aligner_align(Aligner* self, PyObject* args, PyObject* keywords)
                                     strand_converter, &strand))
         return NULL;
 
+    if (!_check_banded(self)) goto exit;
+
     if (substitution_matrix) {
         if (!_prepare_indices(&self->substitution_matrix, &bA, &bB)) goto exit;
     }
@@ -7379,6 +9154,14 @@ Aligner_align(Aligner* self, PyObject* args, PyObject* keywords)
     sA = bA.buf;
     sB = bB.buf;
 
+    if (self->band >= 0 || self->xdrop >= 0) {
+        if (substitution_matrix)
+            result = Aligner_banded_align_matrix(self, sA, nA, sB, nB, strand);
+        else
+            result = Aligner_banded_align_compare(self, sA, nA, sB, nB, strand);
+        goto exit;
+    }
+
     switch (algorithm) {
         case NeedlemanWunschSmithWaterman:
             switch (mode) {
@@ -7470,6 +9253,11 @@ static PyMethodDef Aligner_methods[] = {
      METH_VARARGS | METH_KEYWORDS,
      Aligner_score__doc__
     },
+    {"score_many",
+     (PyCFunction)Aligner_score_many,
+     METH_VARARGS | METH_KEYWORDS,
+     Aligner_score_many__doc__
+    },
     {"align",
      (PyCFunction)Aligner_align,
      METH_VARARGS | METH_KEYWORDS,
@@ -7520,6 +9308,8 @@ PyInit__pairwisealigner(void)
      || PyType_Ready(&PathGenerator_Type) < 0)
         return NULL;
 
+    best_kernel = _find_best_kernel();
+
     module = PyModule_Create(&moduledef);
     if (!module) return NULL;
 
@@ -21,6 +21,8 @@ typedef enum {NeedlemanWunschSmithWaterman,
 
 typedef enum {Global, Local, FOGSAA_Mode} Mode;
 
+typedef enum {Scalar, SSE2, AVX2} Kernel;
+
 typedef struct {
     PyObject_HEAD
     Mode mode;
@@ -45,4 +47,9 @@ typedef struct {
     Py_buffer substitution_matrix;
     PyObject* alphabet;
     int wildcard;
+    int band; /* -1 if the alignment is not banded */
+    int band_offset;
+    double xdrop; /* -1 if X-drop termination is not used */
+    int simd; /* requested score kernel; -1 to select it automatically */
+    int kernel; /* kernel used by the last score calculation, or -1 */
 } Aligner;
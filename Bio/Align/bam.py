@@ -0,0 +1,792 @@
+# Copyright 2026 by agent.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Bio.Align support for the "bam" pairwise alignment format.
+
+The Binary Alignment/Map (BAM) format is the binary, BGZF-compressed version of
+the Sequence Alignment/Map (SAM) format. The binary records are decoded
+directly, without converting them to SAM text lines first; each record is then
+returned as an Alignment object in the same way as for the "sam" format (see
+Bio.Align.sam).
+
+If the BAM file is sorted by coordinate, alignments overlapping a genomic region
+can be found quickly using a ``.bai`` index file (as created by
+``samtools index``, or by the build_bai and write_bai functions in this module);
+only the BGZF blocks containing alignments in the bins overlapping the region
+are then read and decompressed.
+
+See http://www.htslib.org/ for more information.
+
+You are expected to use this module via the Bio.Align functions.
+"""
+
+import io
+import os
+import struct
+
+import numpy as np
+
+from Bio import bgzf
+from Bio.Align import Alignment
+from Bio.Align import sam
+from Bio.Seq import Seq
+from Bio.Seq import UndefinedSequenceError
+from Bio.SeqRecord import SeqRecord
+
+_SEQUENCE_LETTERS = "=ACMGRSVTWYHKDBN"
+
+# Each byte in the BAM sequence encodes two letters
+_SEQUENCE_PAIRS = [a + b for a in _SEQUENCE_LETTERS for b in _SEQUENCE_LETTERS]
+_SEQUENCE_CODES = bytes(_SEQUENCE_LETTERS.find(chr(c).upper()) % 16 for c in range(256))
+
+# refID, pos, l_read_name, mapq, bin, n_cigar_op, flag, l_seq,
+# next_refID, next_pos, tlen
+_record_formatter = struct.Struct("<iiBBHHHiiii")
+
+_integer_types = {"c": "b", "C": "B", "s": "h", "S": "H", "i": "i", "I": "I"}
+_integer_formatters = {
+    letter: struct.Struct("<" + fmt) for letter, fmt in _integer_types.items()
+}
+_array_types = {
+    "c": np.int8,
+    "C": np.uint8,
+    "s": np.int16,
+    "S": np.uint16,
+    "i": np.int32,
+    "I": np.uint32,
+    "f": np.float32,
+}
+
+# the pseudo-bin storing the number of mapped and unmapped reads in .bai files
+_PSEUDO_BIN = 37450
+
+
+def _reg2bin(beg, end):
+    """Return the smallest bin containing the region [beg, end) (PRIVATE)."""
+    end -= 1
+    if beg >> 14 == end >> 14:
+        return ((1 << 15) - 1) // 7 + (beg >> 14)
+    if beg >> 17 == end >> 17:
+        return ((1 << 12) - 1) // 7 + (beg >> 17)
+    if beg >> 20 == end >> 20:
+        return ((1 << 9) - 1) // 7 + (beg >> 20)
+    if beg >> 23 == end >> 23:
+        return ((1 << 6) - 1) // 7 + (beg >> 23)
+    if beg >> 26 == end >> 26:
+        return ((1 << 3) - 1) // 7 + (beg >> 26)
+    return 0
+
+
+def _reg2bins(beg, end):
+    """Return the bins that may overlap the region [beg, end) (PRIVATE)."""
+    end -= 1
+    bins = [0]
+    for shift, offset in ((26, 1), (23, 9), (20, 73), (17, 585), (14, 4681)):
+        bins.extend(range(offset + (beg >> shift), offset + (end >> shift) + 1))
+    return bins
+
+
+def _reference_end(data, pos, n_cigar_op, offset):
+    """Return the end position on the reference of a BAM record (PRIVATE).
+
+    The end position is calculated from the CIGAR operations stored in data
+    starting at offset. As in samtools, records without any operations
+    consuming the reference are treated as having length 1.
+    """
+    length = 0
+    for value in struct.unpack_from("<%dI" % n_cigar_op, data, offset):
+        if value & 15 in (0, 2, 3, 7, 8):  # M, D, N, =, X
+            length += value >> 4
+    if length == 0:
+        length = 1
+    return pos + length
+
+
+def _read_references(handle):
+    """Read the BAM header from a BgzfReader, and return the references (PRIVATE).
+
+    Returns the SAM header text, and a list of (name, length) tuples of the
+    reference sequences.
+    """
+    magic = handle.read(4)
+    if magic != b"BAM\1":
+        raise ValueError("File does not start with the BAM magic string")
+    (l_text,) = struct.unpack("<i", handle.read(4))
+    text = handle.read(l_text).rstrip(b"\0").decode()
+    (n_ref,) = struct.unpack("<i", handle.read(4))
+    references = []
+    for i in range(n_ref):
+        (l_name,) = struct.unpack("<i", handle.read(4))
+        name = handle.read(l_name).rstrip(b"\0").decode()
+        (l_ref,) = struct.unpack("<i", handle.read(4))
+        references.append((name, l_ref))
+    return text, references
+
+
+def build_bai(handle):
+    """Build a ``.bai`` index for a BAM file sorted by coordinate.
+
+    Expects a BAM file opened in binary read mode using the builtin open
+    function. Returns the index as a list with one (bins, intervals) tuple
+    for each reference sequence, where bins is a dictionary mapping each bin
+    number to a list of (start, end) chunks of BGZF virtual offsets, and
+    intervals is the linear index, holding the virtual offset of the first
+    alignment overlapping each 16 kbp window of the reference sequence.
+    As in samtools, the pseudo-bin 37450 stores the virtual offsets of the
+    first and last alignment, and the number of mapped and unmapped reads.
+
+    >>> from builtins import open
+    >>> with open("SamBam/ex1_header.bam", "rb") as handle:
+    ...     index = build_bai(handle)
+    ...
+    >>> len(index)
+    2
+    >>> bins, intervals = index[0]
+    >>> sorted(bins)
+    [4681, 37450]
+    >>> bins[37450][1]  # number of mapped and unmapped reads
+    (1446, 18)
+
+    See also the write_bai and read_bai functions.
+    """
+    if isinstance(handle, bgzf.BgzfReader):
+        raise TypeError("Function build_bai expects a binary handle")
+    handle = bgzf.BgzfReader(fileobj=handle, mode="rb")
+    text, references = _read_references(handle)
+    index = [({}, []) for reference in references]
+    statistics = [None] * len(references)
+    previous = (0, -1)
+    while True:
+        start = handle.tell()
+        data = handle.read(4)
+        if not data:
+            break
+        (block_size,) = struct.unpack("<i", data)
+        data = handle.read(block_size)
+        if len(data) < block_size:
+            raise ValueError("Truncated BAM record")
+        end = handle.tell()
+        (refID, pos, l_read_name, mapq, bin_, n_cigar_op, flag) = (
+            _record_formatter.unpack_from(data)[:7]
+        )
+        if refID < 0:
+            # unplaced reads are stored at the end of the file
+            previous = (len(references), -1)
+            continue
+        if (refID, pos) < previous:
+            raise ValueError("BAM file is not sorted by coordinate")
+        previous = (refID, pos)
+        offset = _record_formatter.size + l_read_name
+        if pos < 0:
+            continue
+        reference_end = _reference_end(data, pos, n_cigar_op, offset)
+        bins, intervals = index[refID]
+        bin_ = _reg2bin(pos, reference_end)
+        chunks = bins.setdefault(bin_, [])
+        if chunks and chunks[-1][1] == start:
+            chunks[-1] = (chunks[-1][0], end)
+        else:
+            chunks.append((start, end))
+        for window in range(pos >> 14, ((reference_end - 1) >> 14) + 1):
+            if window >= len(intervals):
+                intervals.extend([None] * (window + 1 - len(intervals)))
+            if intervals[window] is None:
+                intervals[window] = start
+        if statistics[refID] is None:
+            statistics[refID] = [start, end, 0, 0]
+        else:
+            statistics[refID][1] = end
+        if flag & 0x4:
+            statistics[refID][3] += 1
+        else:
+            statistics[refID][2] += 1
+    for (bins, intervals), values in zip(index, statistics):
+        # windows without alignments point to the next alignment
+        offset = 0
+        for window in range(len(intervals) - 1, -1, -1):
+            if intervals[window] is None:
+                intervals[window] = offset
+            else:
+                offset = intervals[window]
+        if values is not None:
+            ref_beg, ref_end, n_mapped, n_unmapped = values
+            bins[_PSEUDO_BIN] = [(ref_beg, ref_end), (n_mapped, n_unmapped)]
+    return index
+
+
+def write_bai(filename, index):
+    """Write a samtools compatible ``.bai`` index file.
+
+    The index should be a list of (bins, intervals) tuples as returned by the
+    build_bai function, one for each reference sequence.
+    """
+    with open(filename, "wb") as handle:
+        handle.write(b"BAI\1")
+        handle.write(struct.pack("<i", len(index)))
+        for bins, intervals in index:
+            handle.write(struct.pack("<i", len(bins)))
+            for bin_ in sorted(bins):
+                chunks = bins[bin_]
+                handle.write(struct.pack("<Ii", bin_, len(chunks)))
+                for chunk in chunks:
+                    handle.write(struct.pack("<QQ", *chunk))
+            handle.write(struct.pack("<i", len(intervals)))
+            handle.write(struct.pack("<%dQ" % len(intervals), *intervals))
+
+
+def read_bai(filename):
+    """Read a samtools style ``.bai`` index file.
+
+    Returns a list with one (bins, intervals) tuple for each reference
+    sequence, as described for the build_bai function.
+    """
+    with open(filename, "rb") as handle:
+        data = handle.read()
+    if data[:4] != b"BAI\1":
+        raise ValueError("File does not start with the BAI magic string")
+    (n_ref,) = struct.unpack_from("<i", data, 4)
+    offset = 8
+    index = []
+    for i in range(n_ref):
+        (n_bin,) = struct.unpack_from("<i", data, offset)
+        offset += 4
+        bins = {}
+        for j in range(n_bin):
+            bin_, n_chunk = struct.unpack_from("<Ii", data, offset)
+            offset += 8
+            values = struct.unpack_from("<%dQ" % (2 * n_chunk), data, offset)
+            offset += 16 * n_chunk
+            bins[bin_] = list(zip(values[0::2], values[1::2]))
+        (n_intv,) = struct.unpack_from("<i", data, offset)
+        offset += 4
+        intervals = list(struct.unpack_from("<%dQ" % n_intv, data, offset))
+        offset += 8 * n_intv
+        index.append((bins, intervals))
+    return index
+
+
+class AlignmentWriter(sam.AlignmentWriter):
+    """Alignment file writer for the Binary Alignment/Map (BAM) file format."""
+
+    fmt = "BAM"
+    mode = "b"
+
+    def write_file(self, stream, alignments):
+        """Write the alignments to the file stream, and return the number of alignments.
+
+        alignments - A list or iterator returning Alignment objects
+        stream     - Output file stream.
+        """
+        handle = bgzf.BgzfWriter(fileobj=stream)
+        if not hasattr(alignments, "targets"):
+            # we need to know the reference sequences before writing the header
+            alignments = list(alignments)
+        self.write_header(handle, alignments)
+        count = self.write_alignments(handle, alignments)
+        handle.flush()
+        # write the BGZF end-of-file marker, without closing the stream
+        stream.write(bgzf._bgzf_eof)
+        return count
+
+    def write_header(self, stream, alignments):
+        """Write the BAM header."""
+        text = io.StringIO()
+        super().write_header(text, alignments)
+        text = text.getvalue().encode()
+        try:
+            targets = alignments.targets
+        except AttributeError:
+            # collect the reference sequences from the alignments
+            targets = {}
+            for alignment in alignments:
+                target = alignment.sequences[0]
+                if target is None:
+                    continue
+                try:
+                    name = target.id
+                except AttributeError:
+                    name = "target"
+                targets[name] = len(target)
+            targets = list(targets.items())
+        else:
+            targets = [(record.id, len(record)) for record in targets]
+        self._references = {name: i for i, (name, length) in enumerate(targets)}
+        data = [b"BAM\1", struct.pack("<i", len(text)), text]
+        data.append(struct.pack("<i", len(targets)))
+        for name, length in targets:
+            name = name.encode() + b"\0"
+            data.append(struct.pack("<i", len(name)))
+            data.append(name)
+            data.append(struct.pack("<i", length))
+        stream.write(b"".join(data))
+
+    def _format_tag(self, key, value):
+        """Return one optional field of a BAM record as bytes (PRIVATE)."""
+        tag = key.encode()
+        if len(tag) != 2:
+            raise ValueError(f"Tag '{key}' should consist of two characters")
+        if isinstance(value, (int, np.integer)):
+            value = int(value)
+            if value < 0:
+                if value >= -(1 << 7):
+                    letter = "c"
+                elif value >= -(1 << 15):
+                    letter = "s"
+                else:
+                    letter = "i"
+            elif value < (1 << 8):
+                letter = "C"
+            elif value < (1 << 16):
+                letter = "S"
+            else:
+                letter = "I"
+            return (
+                tag + letter.encode() + struct.pack("<" + _integer_types[letter], value)
+            )
+        if isinstance(value, float):
+            return tag + b"f" + struct.pack("<f", value)
+        if isinstance(value, str):
+            if len(value) == 1:
+                return tag + b"A" + value.encode()
+            return tag + b"Z" + value.encode() + b"\0"
+        if isinstance(value, bytes):
+            return tag + b"H" + value.hex().upper().encode() + b"\0"
+        if isinstance(value, np.ndarray):
+            if np.issubdtype(value.dtype, np.integer):
+                if len(value) == 0:
+                    letter = "i"
+                else:
+                    minimum = value.min()
+                    maximum = value.max()
+                    for letter in "cCsSiI":
+                        info = np.iinfo(_array_types[letter])
+                        if info.min <= minimum and maximum <= info.max:
+                            break
+                    else:
+                        raise ValueError(f"Integer out of range in tag '{key}'")
+            elif np.issubdtype(value.dtype, np.floating):
+                letter = "f"
+            else:
+                raise ValueError(
+                    f"Array of incompatible data type {value.dtype} in annotation '{key}'"
+                )
+            values = np.asarray(value, _array_types[letter]).astype(
+                np.dtype(_array_types[letter]).newbyteorder("<")
+            )
+            return (
+                tag
+                + b"B"
+                + letter.encode()
+                + struct.pack("<i", len(values))
+                + values.tobytes()
+            )
+        raise ValueError(f"Unable to store annotation '{key}' of type {type(value)}")
+
+    def _format_unmapped(self, alignment):
+        """Return the SAM fields of an unmapped read (PRIVATE).
+
+        As in samtools, an unmapped read is placed at the position of its
+        mate, if available, to keep the BAM file sorted.
+        """
+        target, query = alignment.sequences
+        try:
+            qname = query.id
+        except AttributeError:
+            qname = "query"
+            qual = "*"
+        else:
+            try:
+                phred = query.letter_annotations["phred_quality"]
+            except (AttributeError, KeyError):
+                qual = "*"
+            else:
+                qual = "".join(chr(value + 33) for value in phred)
+            query = query.seq
+        try:
+            seq = str(query)
+        except UndefinedSequenceError:
+            seq = "*"
+        flag = getattr(alignment, "flag", 0) | 0x4
+        mapq = getattr(alignment, "mapq", 255)
+        try:
+            rname = alignment.rnext
+        except AttributeError:
+            rname = "*"
+            pos = 0
+        else:
+            pos = getattr(alignment, "pnext", -1) + 1
+        rnext = "*" if rname == "*" else "="
+        return [qname, flag, rname, pos, mapq, "*", rnext, pos, 0, seq, qual]
+
+    def format_alignment(self, alignment, md=None):
+        """Return a single alignment as a BAM record (bytes)."""
+        if isinstance(alignment, Alignment) and alignment.coordinates is None:
+            fields = self._format_unmapped(alignment)
+        else:
+            line = super().format_alignment(alignment, md)
+            fields = line.rstrip("\n").split("\t")
+        qname, flag, rname, pos, mapq, cigar, rnext, pnext = fields[:8]
+        seq, qual = fields[9:11]
+        references = self._references
+        flag = int(flag)
+        pos = int(pos) - 1
+        if rname == "*":
+            refID = -1
+        else:
+            refID = references[rname]
+        if rnext == "*":
+            next_refID = -1
+        elif rnext == "=":
+            next_refID = refID
+        else:
+            next_refID = references[rnext]
+        operations = [
+            int(length) << 4 | sam._CIGAR_CODES[letter]
+            for length, letter in sam._CIGAR_PATTERN.findall(cigar)
+        ]
+        length = 0
+        for value in operations:
+            if value & 15 in (0, 2, 3, 7, 8):  # M, D, N, =, X
+                length += value >> 4
+        bin_ = _reg2bin(pos, pos + max(length, 1))
+        if seq == "*":
+            l_seq = 0
+            sequence = b""
+            quality = b""
+        else:
+            l_seq = len(seq)
+            codes = seq.encode().translate(_SEQUENCE_CODES)
+            if l_seq % 2:
+                codes += b"\0"
+            codes = np.frombuffer(codes, np.uint8)
+            sequence = (codes[0::2] << 4 | codes[1::2]).tobytes()
+            if qual == "*":
+                quality = b"\xff" * l_seq
+            else:
+                quality = bytes(c - 33 for c in qual.encode())
+        tags = []
+        if len(operations) > 0xFFFF:
+            # store the CIGAR in the CG tag, as done by samtools
+            tags.append(self._format_tag("CG", np.array(operations, np.uint32)))
+            operations = [l_seq << 4 | 4, length << 4 | 3]  # kSmN
+        for field in fields[11:]:
+            if field.startswith("MD:Z:"):
+                tags.append(b"MDZ" + field[5:].encode() + b"\0")
+        try:
+            score = alignment.score
+        except AttributeError:
+            pass
+        else:
+            tags.append(self._format_tag("AS", round(score)))
+        try:
+            annotations = alignment.annotations
+        except AttributeError:
+            pass
+        else:
+            for key, value in annotations.items():
+                tags.append(self._format_tag(key, value))
+        read_name = qname.encode() + b"\0"
+        data = b"".join(
+            [
+                _record_formatter.pack(
+                    refID,
+                    pos,
+                    len(read_name),
+                    int(mapq),
+                    bin_,
+                    len(operations),
+                    flag,
+                    l_seq,
+                    next_refID,
+                    int(pnext) - 1,
+                    getattr(alignment, "tlen", 0),
+                ),
+                read_name,
+                struct.pack("<%dI" % len(operations), *operations),
+                sequence,
+                quality,
+                *tags,
+            ]
+        )
+        return struct.pack("<i", len(data)) + data
+
+
+class AlignmentIterator(sam.AlignmentIterator):
+    """Alignment iterator for Binary Alignment/Map (BAM) files.
+
+    Each record in the BAM file contains one genomic alignment, which are
+    decoded and returned incrementally. The information is stored in the
+    same way as for SAM files; see Bio.Align.sam.AlignmentIterator.
+
+    Use the search method to find alignments overlapping a genomic region.
+    """
+
+    fmt = "BAM"
+    mode = "b"
+
+    def __init__(self, source, index=None):
+        """Create an AlignmentIterator object.
+
+        Arguments:
+         - source - input file stream, or path to input file
+         - index  - the file name of the ``.bai`` index file, or an index as
+                    returned by the read_bai or build_bai function, used by
+                    the search method. If None (default), the search method
+                    uses the index file named by appending ``.bai`` to the
+                    file name of the BAM file, or by replacing its ``.bam``
+                    extension by ``.bai``. If no index file is found, the
+                    index is built in memory the first time the search
+                    method is called.
+        """
+        self._bai = index
+        super().__init__(source)
+
+    def _read_header(self, stream):
+        handle = bgzf.BgzfReader(fileobj=stream, mode="rb")
+        text, references = _read_references(handle)
+        sam.AlignmentIterator._read_header(self, io.StringIO(text))
+        targets = []
+        for name, length in references:
+            index = self._target_indices.get(name)
+            if index is None:
+                sequence = Seq(None, length=length)
+                record = SeqRecord(sequence, id=name, description="")
+            else:
+                record = self.targets[index]
+            targets.append(record)
+        self.targets = targets
+        self._target_indices = {
+            record.id: index for index, record in enumerate(self.targets)
+        }
+        self._handle = handle
+        self._data_offset = handle.tell()
+
+    def _read_next_alignment(self, stream):
+        handle = self._handle
+        data = handle.read(4)
+        if not data:
+            return None
+        if len(data) < 4:
+            raise ValueError("Truncated BAM record")
+        (block_size,) = struct.unpack("<i", data)
+        data = handle.read(block_size)
+        if len(data) < block_size:
+            raise ValueError("Truncated BAM record")
+        return self._parse_record(data)
+
+    def _parse_record(self, data):
+        """Decode a BAM record, and return it as an Alignment object (PRIVATE)."""
+        (
+            refID,
+            pos,
+            l_read_name,
+            mapq,
+            bin_,
+            n_cigar_op,
+            flag,
+            l_seq,
+            next_refID,
+            next_pos,
+            tlen,
+        ) = _record_formatter.unpack_from(data)
+        i = _record_formatter.size
+        qname = data[i : i + l_read_name - 1].decode()
+        i += l_read_name
+        values = struct.unpack_from("<%dI" % n_cigar_op, data, i)
+        i += 4 * n_cigar_op
+        if l_seq == 0:
+            query = "*"
+            phred = None
+        else:
+            j = i + (l_seq + 1) // 2
+            query = "".join(map(_SEQUENCE_PAIRS.__getitem__, data[i:j]))[:l_seq]
+            i = j
+            j = i + l_seq
+            if data[i] == 0xFF:
+                phred = None
+            else:
+                phred = list(data[i:j])
+            i = j
+        md = None
+        score = None
+        annotations = {}
+        n = len(data)
+        while i < n:
+            tag = data[i : i + 2].decode()
+            letter = chr(data[i + 2])
+            i += 3
+            formatter = _integer_formatters.get(letter)
+            if formatter is not None:
+                (value,) = formatter.unpack_from(data, i)
+                i += formatter.size
+            elif letter == "A":
+                value = chr(data[i])
+                i += 1
+            elif letter == "f":
+                (value,) = struct.unpack_from("<f", data, i)
+                # use the same precision as samtools in SAM files
+                value = float("%g" % value)
+                i += 4
+            elif letter == "Z":
+                j = data.index(0, i)
+                value = data[i:j].decode()
+                i = j + 1
+            elif letter == "H":
+                j = data.index(0, i)
+                value = bytes.fromhex(data[i:j].decode())
+                i = j + 1
+            elif letter == "B":
+                letter = chr(data[i])
+                (count,) = struct.unpack_from("<i", data, i + 1)
+                i += 5
+                try:
+                    dtype = np.dtype(_array_types[letter]).newbyteorder("<")
+                except KeyError:
+                    raise ValueError(
+                        f"Unknown number type '{letter}' in tag '{tag}'"
+                    ) from None
+                value = np.frombuffer(data, dtype, count, i)
+                i += count * dtype.itemsize
+                if letter == "f":
+                    value = value.astype(float)
+                else:
+                    value = value.astype(int)
+            else:
+                raise ValueError(f"Unknown data type '{letter}' in tag '{tag}'")
+            if tag == "AS":
+                score = value
+            elif tag == "MD":
+                md = value
+            else:
+                annotations[tag] = value
+        if "CG" in annotations and n_cigar_op == 2 and values[0] >> 4 == l_seq:
+            # the CIGAR was too long, and is stored in the CG tag instead
+            values = annotations.pop("CG").tolist()
+        if refID < 0:
+            rname = "*"
+        else:
+            rname = self.targets[refID].id
+        if next_refID < 0:
+            rnext = "*"
+        else:
+            rnext = self.targets[next_refID].id
+        return self._create_alignment(
+            qname,
+            flag,
+            rname,
+            pos,
+            mapq,
+            values,
+            rnext,
+            next_pos,
+            tlen,
+            query,
+            phred,
+            md,
+            score,
+            annotations,
+        )
+
+    def _get_index(self):
+        """Return the index of the BAM file, loading or building it if needed (PRIVATE)."""
+        index = self._bai
+        if index is None:
+            try:
+                path = os.fspath(self.source)
+            except TypeError:
+                path = None
+            if path is not None:
+                for filename in (path + ".bai", os.path.splitext(path)[0] + ".bai"):
+                    if os.path.isfile(filename):
+                        index = filename
+                        break
+            if index is None:
+                self._stream.seek(0)
+                index = build_bai(self._stream)
+        if not isinstance(index, list):
+            index = read_bai(index)
+        if len(index) != len(self.targets):
+            raise ValueError(
+                "The index has %d reference sequences, but the BAM file has %d"
+                % (len(index), len(self.targets))
+            )
+        self._bai = index
+        return index
+
+    def search(self, chromosome=None, start=None, end=None):
+        """Iterate over alignments overlapping the specified chromosome region.
+
+        This method uses the ``.bai`` index to find alignments to the specified
+        chromosome that fully or partially overlap the chromosome region
+        between start and end; only the BGZF blocks that may contain such
+        alignments are read. The BAM file must be sorted by coordinate.
+
+        Arguments:
+         - chromosome - chromosome name. If None (default value), include all
+           alignments.
+         - start      - starting position on the chromosome. If None (default
+           value), use 0 as the starting position.
+         - end        - end position on the chromosome. If None (default value),
+           use the length of the chromosome as the end position.
+
+        Note that searching changes the current position of the iterator.
+        """
+        handle = self._handle
+        if chromosome is None:
+            if start is not None or end is not None:
+                raise ValueError(
+                    "start and end must both be None if chromosome is None"
+                )
+            handle.seek(self._data_offset)
+            while True:
+                alignment = self._read_next_alignment(self._stream)
+                if alignment is None:
+                    return
+                yield alignment
+        refID = self._target_indices.get(chromosome)
+        if refID is None:
+            raise ValueError("Failed to find %s in alignments" % chromosome)
+        if start is None:
+            if end is None:
+                start = 0
+                end = len(self.targets[refID])
+            else:
+                raise ValueError("end must be None if start is None")
+        elif end is None:
+            end = start + 1
+        bins, intervals = self._get_index()[refID]
+        window = start >> 14
+        if window >= len(intervals):
+            # no alignments start or end beyond this position
+            return
+        minimum = intervals[window]
+        chunks = []
+        for bin_ in _reg2bins(start, max(end, start + 1)):
+            for chunk in bins.get(bin_, ()):
+                if chunk[1] > minimum:
+                    chunks.append(chunk)
+        chunks.sort()
+        merged = []
+        for chunk_start, chunk_end in chunks:
+            if merged and chunk_start <= merged[-1][1]:
+                if chunk_end > merged[-1][1]:
+                    merged[-1][1] = chunk_end
+            else:
+                merged.append([chunk_start, chunk_end])
+        size = _record_formatter.size
+        for chunk_start, chunk_end in merged:
+            handle.seek(max(chunk_start, minimum))
+            while handle.tell() < chunk_end:
+                (block_size,) = struct.unpack("<i", handle.read(4))
+                data = handle.read(block_size)
+                (record_refID, pos, l_read_name, mapq, bin_, n_cigar_op) = (
+                    _record_formatter.unpack_from(data)[:6]
+                )
+                if record_refID != refID or pos >= end:
+                    # the BAM file is sorted, so we are done with this chunk
+                    break
+                if _reference_end(data, pos, n_cigar_op, size + l_read_name) > start:
+                    yield self._parse_record(data)
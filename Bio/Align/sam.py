@@ -23,6 +23,7 @@ with Python and other alignment formats.
 """
 
 import copy
+import re
 from itertools import chain
 
 import numpy as np
@@ -34,6 +35,11 @@ from Bio.Seq import Seq
 from Bio.Seq import UndefinedSequenceError
 from Bio.SeqRecord import SeqRecord
 
+# CIGAR operations, in the order of their numeric codes in BAM files
+_CIGAR_OPERATIONS = b"MIDNSHP=X"
+_CIGAR_CODES = {chr(letter): code for code, letter in enumerate(_CIGAR_OPERATIONS)}
+_CIGAR_PATTERN = re.compile(r"(\d+)([MIDNSHP=X])")
+
 
 class AlignmentWriter(interfaces.AlignmentWriter):
     """Alignment file writer for the Sequence Alignment/Map (SAM) file format."""
@@ -351,24 +357,111 @@ class AlignmentWriter(interfaces.AlignmentWriter):
                         datatype = "Z"
                 elif isinstance(value, bytes):
                     datatype = "H"
-                    value = "".join(map(str, value))
-                elif isinstance(value, np.array):
+                    value = value.hex().upper()
+                elif isinstance(value, np.ndarray):
                     datatype = "B"
                     if np.issubdtype(value.dtype, np.integer):
-                        pass
-                    elif np.issubdtype(value.dtype, float):
-                        pass
+                        letter = "i"
+                    elif np.issubdtype(value.dtype, np.floating):
+                        letter = "f"
                     else:
                         raise ValueError(
                             f"Array of incompatible data type {value.dtype} in annotation '{key}'"
                         )
-                    value = "".join(map(str, value))
+                    value = ",".join([letter, *map(str, value)])
                 field = f"{key}:{datatype}:{value}"
                 fields.append(field)
         line = "\t".join(fields) + "\n"
         return line
 
 
+class _LazyAlignment(Alignment):
+    """Alignment stored as the columns of a SAM line, decoded on demand (PRIVATE).
+
+    The FLAG, MAPQ, RNEXT, PNEXT, and TLEN columns are stored when the object
+    is created. The optional tags are decoded when the score or annotations
+    attribute is accessed for the first time, and the sequences and
+    coordinates when any other attribute is accessed for the first time.
+    Until then, the object refers to a copy of the iterator without its
+    stream, so that it does not keep the file open.
+    """
+
+    def __init__(self, iterator, words, fields):
+        self._iterator = iterator
+        self._words = words
+        self._fields = fields
+        if fields is None or "flag" in fields:
+            self.flag = int(words[1])
+        if fields is None or "mapq" in fields:
+            mapq = int(words[4])
+            if mapq != 255:
+                self.mapq = mapq
+        if fields is None or "rnext" in fields:
+            rnext = words[6]
+            if rnext == "=":
+                self.rnext = words[2]
+            elif rnext != "*":
+                self.rnext = rnext
+        if fields is None or "pnext" in fields:
+            pnext = int(words[7]) - 1
+            if pnext >= 0:
+                self.pnext = pnext
+        if fields is None or "tlen" in fields:
+            tlen = int(words[8])
+            if tlen != 0:
+                self.tlen = tlen
+
+    def _decode_tags(self):
+        """Decode the optional tags (PRIVATE)."""
+        md, score, annotations = self._iterator._parse_tags(
+            self._words[11:], self._fields
+        )
+        self._md = md
+        if score is not None:
+            self.__dict__.setdefault("score", score)
+        if annotations:
+            self.__dict__.setdefault("annotations", annotations)
+
+    def _decode(self):
+        """Decode the sequences and coordinates (PRIVATE)."""
+        if "_md" not in self.__dict__:
+            self._decode_tags()
+        fields = self._fields
+        if fields is None or "coordinates" in fields:
+            words = self._words
+            alignment = self._iterator._decode_record(words, self._md)
+            for key, value in alignment.__dict__.items():
+                if key not in ("flag", "mapq", "rnext", "pnext", "tlen"):
+                    self.__dict__.setdefault(key, value)
+        else:
+            self.sequences = [None, None]
+            self.coordinates = None
+        del self._iterator
+        del self._words
+        del self._fields
+        del self._md
+
+    def __getattr__(self, name):
+        if "_words" in self.__dict__:
+            if name not in ("score", "annotations"):
+                self._decode()
+                return object.__getattribute__(self, name)
+            # These are only set from the tags; no need to decode the rest
+            if "_md" not in self.__dict__:
+                self._decode_tags()
+                if name in self.__dict__:
+                    return self.__dict__[name]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def __getstate__(self):
+        # decode first, as the iterator and its stream cannot be pickled
+        if "_words" in self.__dict__:
+            self._decode()
+        return self.__dict__
+
+
 class AlignmentIterator(interfaces.AlignmentIterator):
     """Alignment iterator for Sequence Alignment/Map (SAM) files.
 
@@ -393,10 +486,58 @@ class AlignmentIterator(interfaces.AlignmentIterator):
 
     The sequence quality, if available, is stored as 'phred_quality' in the
     letter_annotations dictionary attribute of the query sequence record.
+
+    Decoding the tags and calculating the alignment coordinates from the CIGAR
+    string takes most of the time spent parsing a SAM file. If lazy is True,
+    the tags are decoded only when the score or annotations attribute of an
+    alignment is first accessed, and the sequences and coordinates only when
+    one of the other attributes is first accessed. To skip this work
+    entirely, use the fields argument to select the columns and tags to be
+    decoded; any other columns and tags are ignored:
+
+    >>> from Bio import Align
+    >>> alignments = Align.parse(
+    ...     "SamBam/ex1_header.sam", "sam", fields=["flag", "mapq", "NM"]
+    ... )
+    >>> alignment = next(alignments)  # an unmapped read without an NM tag
+    >>> alignment.flag, alignment.mapq
+    (69, 0)
+    >>> alignment = next(alignments)
+    >>> alignment.flag, alignment.mapq, alignment.annotations
+    (137, 73, {'NM': 0})
+    >>> print(alignment.coordinates)
+    None
+
     """
 
     fmt = "SAM"
 
+    _field_names = ("flag", "mapq", "rnext", "pnext", "tlen", "coordinates")
+
+    def __init__(self, source, lazy=False, fields=None):
+        """Create an AlignmentIterator object.
+
+        Arguments:
+         - source - input file stream, or path to input file
+         - lazy   - If True, decode the tags and the sequences and coordinates
+                    of each alignment on first access only.
+                    If False (default), decode them immediately.
+         - fields - The alignment attributes to store, as an iterable of
+                    names taken from "flag", "mapq", "rnext", "pnext", "tlen",
+                    and "coordinates" (storing the sequences and coordinates),
+                    and the two-letter names of the tags to be decoded ("AS"
+                    for the score; "MD" to reconstruct the target sequence).
+                    If None (default), store all attributes and tags.
+        """
+        if fields is not None:
+            fields = set(fields)
+            for field in fields:
+                if field not in self._field_names and len(field) != 2:
+                    raise ValueError(f"Unknown field '{field}'")
+        self._lazy = lazy
+        self._projection = fields
+        super().__init__(source)
+
     def _read_header(self, stream):
         self.metadata = {}
         self.targets = []
@@ -467,204 +608,223 @@ class AlignmentIterator(interfaces.AlignmentIterator):
             lines = chain([line], stream)
             del self._line
         for line in lines:
-            fields = line.split()
-            if len(fields) < 11:
+            words = line.split()
+            if len(words) < 11:
                 raise ValueError(
-                    "line has %d columns; expected at least 11" % len(fields)
+                    "line has %d columns; expected at least 11" % len(words)
                 )
-            qname = fields[0]
-            flag = int(fields[1])
-            rname = fields[2]
-            target_pos = int(fields[3]) - 1
-            mapq = int(fields[4])
-            cigar = fields[5]
-            rnext = fields[6]
-            pnext = int(fields[7]) - 1
-            tlen = int(fields[8])
-            query = fields[9]
-            qual = fields[10]
-            md = None
-            score = None
-            annotations = {}
-            for field in fields[11:]:
-                tag, datatype, value = field.split(":", 2)
-                if tag == "AS":
-                    assert datatype == "i"
-                    score = int(value)
-                elif tag == "MD":
-                    assert datatype == "Z"
-                    md = value
-                else:
-                    if datatype == "i":
-                        value = int(value)
-                    elif datatype == "f":
-                        value = float(value)
-                    elif datatype in ("A", "Z"):  # string
-                        pass
-                    elif datatype == "H":
-                        n = len(value)
-                        value = bytes(int(value[i : i + 2]) for i in range(0, n, 2))
-                    elif datatype == "B":
-                        letter = value[0]
-                        value = value[1:].split(",")
-                        if letter in "cCsSiI":
-                            dtype = int
-                        elif letter == "f":
-                            dtype = float
-                        else:
-                            raise ValueError(
-                                f"Unknown number type '{letter}' in tag '{field}'"
-                            )
-                        value = np.array(value, dtype)
-                    annotations[tag] = value
-            if flag & 0x10:
-                strand = "-"
+            fields = self._projection
+            if self._lazy:
+                return _LazyAlignment(self._get_decoder(), words, fields)
+            if fields is not None:
+                alignment = _LazyAlignment(self, words, fields)
+                alignment._decode()
+                return alignment
+            md, score, annotations = self._parse_tags(words[11:])
+            alignment = self._decode_record(words, md)
+            if score is not None:
+                alignment.score = score
+            if annotations:
+                alignment.annotations = annotations
+            return alignment
+
+    def _get_decoder(self):
+        """Return a copy of the iterator without its stream (PRIVATE).
+
+        Lazy alignments use it to decode their tags, sequences and coordinates,
+        which only needs the targets.
+        """
+        try:
+            return self._decoder
+        except AttributeError:
+            decoder = object.__new__(type(self))
+            decoder.targets = self.targets
+            decoder._target_indices = self._target_indices
+            self._decoder = decoder
+            return decoder
+
+    def _parse_tags(self, fields, tags=None):
+        """Decode the optional fields of a SAM line (PRIVATE).
+
+        Only the tags in tags are decoded, or all tags if tags is None.
+        Returns the MD tag, the alignment score (AS tag), and a dictionary
+        with the other tags.
+        """
+        md = None
+        score = None
+        annotations = {}
+        for field in fields:
+            tag, datatype, value = field.split(":", 2)
+            if tags is not None and tag not in tags:
+                continue
+            if tag == "AS":
+                assert datatype == "i"
+                score = int(value)
+            elif tag == "MD":
+                assert datatype == "Z"
+                md = value
             else:
-                strand = "+"
-            hard_clip_left = None
-            hard_clip_right = None
-            store_operations = False
-            if flag & 0x4:  # unmapped
-                target = None
-                coordinates = None
-            elif md is None:
-                query_pos = 0
-                coordinates = [[target_pos, query_pos]]
-                number = ""
-                operations = bytearray()
-                for letter in cigar:
-                    if letter == "M":
-                        # M: alignment match
-                        length = int(number)
-                        target_pos += length
-                        query_pos += length
-                    elif letter in "=X":
-                        # =: sequence match
-                        # X: sequence mismatch
-                        length = int(number)
-                        target_pos += length
-                        query_pos += length
-                        store_operations = True
-                    elif letter == "I":
-                        # I: insertion to the reference
-                        length = int(number)
-                        query_pos += length
-                    elif letter == "S":
-                        # S: soft clipping
-                        length = int(number)
-                        if query_pos == 0:
-                            coordinates[0][1] += length
-                        query_pos += length
-                        number = ""
-                        continue
-                    elif letter == "D":
-                        # D: deletion from the reference
-                        length = int(number)
-                        target_pos += length
-                    elif letter == "N":
-                        # N: skipped region from the reference
-                        length = int(number)
-                        target_pos += length
-                        store_operations = True
-                    elif letter == "H":  # hard clipping
-                        if query_pos == 0:
-                            hard_clip_left = int(number)
-                        else:
-                            hard_clip_right = int(number)
-                        number = ""
-                        continue
-                    elif letter == "P":  # padding
-                        raise NotImplementedError(
-                            "padding operator is not yet implemented"
-                        )
+                if datatype == "i":
+                    value = int(value)
+                elif datatype == "f":
+                    value = float(value)
+                elif datatype in ("A", "Z"):  # string
+                    pass
+                elif datatype == "H":
+                    value = bytes.fromhex(value)
+                elif datatype == "B":
+                    letter = value[0]
+                    value = value[2:].split(",")
+                    if letter in "cCsSiI":
+                        dtype = int
+                    elif letter == "f":
+                        dtype = float
                     else:
-                        number += letter
-                        continue
-                    coordinates.append([target_pos, query_pos])
-                    operations.append(ord(letter))
-                    number = ""
-                index = self._target_indices.get(rname)
-                if index is None:
-                    if self.targets:
-                        raise ValueError(f"Found target {rname} missing from header")
-                    target = SeqRecord(None, id=rname, description="")
-                else:
-                    target = self.targets[index]
-            else:
-                query_pos = 0
-                coordinates = [[target_pos, query_pos]]
+                        raise ValueError(
+                            f"Unknown number type '{letter}' in tag '{field}'"
+                        )
+                    value = np.array(value, dtype)
+                annotations[tag] = value
+        return md, score, annotations
+
+    def _decode_record(self, words, md):
+        """Create an Alignment object from the mandatory columns of a SAM line (PRIVATE)."""
+        qual = words[10]
+        if qual == "*":
+            phred = None
+        else:
+            phred = [ord(c) - 33 for c in qual]
+        return self._create_alignment(
+            words[0],
+            int(words[1]),
+            words[2],
+            int(words[3]) - 1,
+            int(words[4]),
+            [
+                int(length) << 4 | _CIGAR_CODES[letter]
+                for length, letter in _CIGAR_PATTERN.findall(words[5])
+            ],
+            words[6],
+            int(words[7]) - 1,
+            int(words[8]),
+            words[9],
+            phred,
+            md,
+            None,
+            {},
+        )
+
+    def _create_alignment(
+        self,
+        qname,
+        flag,
+        rname,
+        target_pos,
+        mapq,
+        cigar,
+        rnext,
+        pnext,
+        tlen,
+        query,
+        phred,
+        md,
+        score,
+        annotations,
+    ):
+        """Create an Alignment object from the fields of a SAM record (PRIVATE).
+
+        The fields are as in the SAM file, except that target_pos and pnext
+        are zero-based, phred is a list of quality scores, or None if not
+        available, and cigar is a sequence of CIGAR operations encoded as in
+        BAM files (the length shifted left by four bits, combined with the
+        operation code in the lower four bits).
+        """
+        if flag & 0x10:
+            strand = "-"
+        else:
+            strand = "+"
+        hard_clip_left = None
+        hard_clip_right = None
+        store_operations = False
+        if flag & 0x4:  # unmapped
+            target = None
+            coordinates = None
+        else:
+            query_pos = 0
+            coordinates = [[target_pos, query_pos]]
+            operations = bytearray()
+            if md is not None:
                 seq = query
                 target = ""
                 starts = [target_pos]
                 size = 0
                 sizes = []
-                number = ""
-                operations = bytearray()
-                for letter in cigar:
-                    if letter in "M":
-                        # M: alignment match
-                        length = int(number)
-                        target_pos += length
-                        query_pos += length
-                        target += seq[:length]
-                        seq = seq[length:]
-                        size += length
-                    elif letter in "=X":
-                        # =: sequence match
-                        # X: sequence mismatch
-                        length = int(number)
-                        target_pos += length
-                        query_pos += length
+            for value in cigar:
+                operation = value & 15
+                length = value >> 4
+                if operation == 0 or operation == 7 or operation == 8:
+                    # M: alignment match
+                    # =: sequence match
+                    # X: sequence mismatch
+                    target_pos += length
+                    query_pos += length
+                    if md is not None:
                         target += seq[:length]
                         seq = seq[length:]
                         size += length
+                    if operation != 0:
                         store_operations = True
-                    elif letter == "I":
-                        # I: insertion to the reference
-                        length = int(number)
-                        query_pos += length
+                elif operation == 1:
+                    # I: insertion to the reference
+                    query_pos += length
+                    if md is not None:
                         seq = seq[length:]
-                    elif letter == "S":
-                        # S: soft clipping
-                        length = int(number)
-                        if query_pos == 0:
-                            coordinates[0][1] += length
-                        query_pos += length
+                elif operation == 4:
+                    # S: soft clipping
+                    if query_pos == 0:
+                        coordinates[0][1] += length
+                    query_pos += length
+                    if md is not None:
                         seq = seq[length:]
-                        number = ""
-                        continue
-                    elif letter == "D":  # deletion from the reference
-                        length = int(number)
-                        target_pos += length
+                    continue
+                elif operation == 2:
+                    # D: deletion from the reference
+                    target_pos += length
+                    if md is not None:
                         size += length
                         starts.append(target_pos)
                         sizes.append(size)
                         size = 0
-                    elif letter == "N":  # skipped region from the reference
-                        length = int(number)
-                        target_pos += length
+                elif operation == 3:
+                    # N: skipped region from the reference
+                    target_pos += length
+                    if md is not None:
                         starts.append(target_pos)
                         sizes.append(size)
                         size = 0
-                        store_operations = True
-                    elif letter == "H":
-                        # hard clipping (clipped sequences not present in sequence)
-                        if query_pos == 0:
-                            hard_clip_left = int(number)
-                        else:
-                            hard_clip_right = int(number)
-                        number = ""
-                        continue
-                    elif letter == "P":  # padding
-                        raise NotImplementedError(
-                            "padding operator is not yet implemented"
-                        )
+                    store_operations = True
+                elif operation == 5:
+                    # H: hard clipping (clipped sequences not present in sequence)
+                    if query_pos == 0:
+                        hard_clip_left = length
                     else:
-                        number += letter
-                        continue
-                    coordinates.append([target_pos, query_pos])
-                    operations.append(ord(letter))
-                    number = ""
+                        hard_clip_right = length
+                    continue
+                elif operation == 6:  # padding
+                    raise NotImplementedError("padding operator is not yet implemented")
+                else:
+                    raise ValueError(f"Unknown CIGAR operation {operation}")
+                coordinates.append([target_pos, query_pos])
+                operations.append(_CIGAR_OPERATIONS[operation])
+            if md is None:
+                index = self._target_indices.get(rname)
+                if index is None:
+                    if self.targets:
+                        raise ValueError(f"Found target {rname} missing from header")
+                    target = SeqRecord(None, id=rname, description="")
+                else:
+                    target = self.targets[index]
+            else:
                 sizes.append(size)
                 seq = target
                 target = ""
@@ -716,50 +876,49 @@ class AlignmentIterator(interfaces.AlignmentIterator):
                         for key, val in rname_target.annotations.items()
                     },
                 )
-            if coordinates is not None:
-                coordinates = np.array(coordinates, np.intp).transpose()
-                if strand == "-":
-                    coordinates[1, :] = query_pos - coordinates[1, :]
-            if query == "*":
-                length = query_pos
-                sequence = Seq(None, length=length)
-            else:
-                sequence = Seq(query)
-                if not (flag & 0x4):  # not unmapped
-                    assert len(query) == query_pos
-                    if strand == "-":
-                        sequence = sequence.reverse_complement()
-            query = SeqRecord(sequence, id=qname, description="")
+        if coordinates is not None:
+            coordinates = np.array(coordinates, np.intp).transpose()
             if strand == "-":
-                hard_clip_left, hard_clip_right = hard_clip_right, hard_clip_left
-            if hard_clip_left is not None:
-                query.annotations["hard_clip_left"] = hard_clip_left
-            if hard_clip_right is not None:
-                query.annotations["hard_clip_right"] = hard_clip_right
-            if qual != "*":
-                phred = [ord(c) - 33 for c in qual]
-                query.letter_annotations["phred_quality"] = phred
-            records = [target, query]
-            alignment = Alignment(records, coordinates)
-            alignment.flag = flag
-            if mapq != 255:
-                alignment.mapq = mapq
-            if rnext == "=":
-                alignment.rnext = rname
-            elif rnext != "*":
-                alignment.rnext = rnext
-            if pnext >= 0:
-                alignment.pnext = pnext
-            if tlen != 0:
-                alignment.tlen = tlen
-            if score is not None:
-                alignment.score = score
-            if annotations:
-                alignment.annotations = annotations
-            if hard_clip_left is not None:
-                alignment.hard_clip_left = hard_clip_left
-            if hard_clip_right is not None:
-                alignment.hard_clip_right = hard_clip_right
-            if store_operations:
-                alignment.operations = operations
-            return alignment
+                coordinates[1, :] = query_pos - coordinates[1, :]
+        if query == "*":
+            length = query_pos
+            sequence = Seq(None, length=length)
+        else:
+            sequence = Seq(query)
+            if not (flag & 0x4):  # not unmapped
+                assert len(query) == query_pos
+                if strand == "-":
+                    sequence = sequence.reverse_complement()
+        query = SeqRecord(sequence, id=qname, description="")
+        if strand == "-":
+            hard_clip_left, hard_clip_right = hard_clip_right, hard_clip_left
+        if hard_clip_left is not None:
+            query.annotations["hard_clip_left"] = hard_clip_left
+        if hard_clip_right is not None:
+            query.annotations["hard_clip_right"] = hard_clip_right
+        if phred is not None:
+            query.letter_annotations["phred_quality"] = phred
+        records = [target, query]
+        alignment = Alignment(records, coordinates)
+        alignment.flag = flag
+        if mapq != 255:
+            alignment.mapq = mapq
+        if rnext == "=":
+            alignment.rnext = rname
+        elif rnext != "*":
+            alignment.rnext = rnext
+        if pnext >= 0:
+            alignment.pnext = pnext
+        if tlen != 0:
+            alignment.tlen = tlen
+        if score is not None:
+            alignment.score = score
+        if annotations:
+            alignment.annotations = annotations
+        if hard_clip_left is not None:
+            alignment.hard_clip_left = hard_clip_left
+        if hard_clip_right is not None:
+            alignment.hard_clip_right = hard_clip_right
+        if store_operations:
+            alignment.operations = operations
+        return alignment
@@ -13,10 +13,18 @@ indexing files. These are not intended for direct use.
 
 import collections.abc
 import contextlib
+import hashlib
 import itertools
+import mmap
 import os
+import struct
+import types
+import warnings
 from abc import ABC
 from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+
+from Bio import BiopythonWarning
 
 try:
     import sqlite3
@@ -172,14 +180,24 @@ class _IndexedSeqFileDict(collections.abc.Mapping):
     add or change values, pop values, nor clear the dictionary.
     """
 
-    def __init__(self, random_access_proxy, key_function, repr, obj_repr):
-        """Initialize the class."""
+    def __init__(self, random_access_proxy, key_function, repr, obj_repr, cache=None):
+        """Initialize the class.
+
+        If cache is given (an _IndexCache object), the keys and offsets are
+        loaded from it if it is up to date, or else saved to it once the
+        file has been scanned.
+        """
         # Use key_function=None for default value
         self._proxy = random_access_proxy
         self._key_function = key_function
         self._repr = repr
         self._obj_repr = obj_repr
         self._cached_prev_record = (None, None)  # (key, record)
+        if cache is not None:
+            offsets = cache.load()
+            if offsets is not None:
+                self._offsets = offsets
+                return
         if key_function:
             offset_iter = (
                 (key_function(key), offset, length)
@@ -204,6 +222,8 @@ class _IndexedSeqFileDict(collections.abc.Mapping):
             else:
                 offsets[key] = offset
         self._offsets = offsets
+        if cache is not None:
+            cache.save(offsets)
 
     def __repr__(self):
         """Return a string representation of the File object."""
@@ -253,6 +273,27 @@ class _IndexedSeqFileDict(collections.abc.Mapping):
         # Pass the offset to the proxy
         return self._proxy.get_raw(self._offsets[key])
 
+    def get_many(self, keys):
+        """Return a dictionary of the records for the specified keys.
+
+        The records are read in the order in which they appear in the file,
+        which reduces the seeking involved compared to looking them up one
+        by one. The dictionary returned follows the order of the keys given.
+        If any key is not found, a KeyError exception is raised.
+        """
+        offsets = {key: self._offsets[key] for key in keys}
+        records = {}
+        for key in sorted(offsets, key=offsets.__getitem__):
+            record = self._proxy.get(offsets[key])
+            if self._key_function:
+                key2 = self._key_function(record.id)
+            else:
+                key2 = record.id
+            if key != key2:
+                raise ValueError(f"Key did not match ({key} vs {key2})")
+            records[key] = record
+        return {key: records[key] for key in offsets}
+
     def close(self):
         """Close the file handle being used to read the data.
 
@@ -262,6 +303,249 @@ class _IndexedSeqFileDict(collections.abc.Mapping):
         all open handles to that file.
         """
         self._proxy._handle.close()
+        if isinstance(self._offsets, _CachedOffsets):
+            self._offsets.close()
+
+
+def _code_digest(code, digest):
+    """Add the bytecode, names and constants of a code object to a hash (PRIVATE)."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            _code_digest(constant, digest)
+        else:
+            digest.update(repr(constant).encode())
+
+
+def _key_function_identity(key_function):
+    """Return a string identifying a key function, or None if not possible (PRIVATE).
+
+    Built-in functions, methods and classes are identified by their name.
+    Python functions are identified by their name and a hash of their code
+    and default arguments, as all lambda functions have the same name.
+    Closures and other callable objects cannot be identified, as their
+    behaviour depends on state that is not recorded.
+    """
+    if key_function is None:
+        return ""
+    if isinstance(key_function, types.FunctionType):
+        if key_function.__closure__:
+            return None
+        digest = hashlib.sha256()
+        _code_digest(key_function.__code__, digest)
+        digest.update(repr(key_function.__defaults__).encode())
+        digest.update(repr(key_function.__kwdefaults__).encode())
+        name = f"{key_function.__module__}.{key_function.__qualname__}"
+        return f"{name}:{digest.hexdigest()}"
+    if isinstance(
+        key_function, (types.MethodDescriptorType, types.WrapperDescriptorType)
+    ):
+        # these have no __module__ attribute
+        module = key_function.__objclass__.__module__
+    elif isinstance(key_function, type) or (
+        isinstance(key_function, types.BuiltinFunctionType)
+        # bound methods of built-in objects depend on the object
+        and isinstance(key_function.__self__, (types.ModuleType, type(None)))
+    ):
+        module = key_function.__module__
+    else:
+        return None
+    return f"{module}.{key_function.__qualname__}"
+
+
+class _IndexCache:
+    """Sidecar file storing the keys and offsets of an indexed file (PRIVATE).
+
+    This is used by _IndexedSeqFileDict to avoid scanning the indexed file
+    again each time it is opened. The cache file records the size and the
+    modification time of the indexed file, the file format and the identity
+    of the key function, and is only used if they all match. Otherwise, the
+    file is scanned as usual and the cache is rewritten.
+
+    The cache file holds the offsets of the records and their keys (encoded
+    as UTF-8) in file order, followed by the order of the keys when sorted.
+    It is memory mapped when loaded, so the keys are looked up by a binary
+    search without reading the whole table, and the pages are shared by all
+    the processes using the same cache.
+    """
+
+    magic = b"BioIdx01"
+    header = struct.Struct("<8sQqQQQ")
+
+    def __init__(self, path, filename, format, key_function):
+        """Initialize the cache for the given file, format and key function."""
+        self.path = os.fspath(path)
+        self.filename = filename
+        name = _key_function_identity(key_function)
+        if name is None:
+            # The key function cannot be recognized again; don't use the cache
+            self.metadata = None
+        else:
+            self.metadata = f"{format}\0{name}".encode()
+
+    def _stat(self):
+        """Return the size and modification time of the indexed file (PRIVATE)."""
+        stat = os.stat(self.filename)
+        return stat.st_size, stat.st_mtime_ns
+
+    def load(self):
+        """Return the cached offsets as a mapping, or None if not up to date."""
+        if self.metadata is None:
+            return None
+        try:
+            with open(self.path, "rb") as handle:
+                data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Missing, unreadable or empty cache file
+            return None
+        try:
+            magic, size, mtime, count, keys_length, metadata_length = (
+                self.header.unpack_from(data)
+            )
+        except struct.error:
+            data.close()
+            return None
+        start = self.header.size + metadata_length
+        start += -start % 8
+        if (
+            magic != self.magic
+            or (size, mtime) != self._stat()
+            or data[self.header.size : self.header.size + metadata_length]
+            != self.metadata
+            or len(data) != start + 8 * (3 * count + 1) + keys_length
+        ):
+            data.close()
+            return None
+        return _CachedOffsets(data, start, count)
+
+    def save(self, offsets):
+        """Write the offsets of the keys (a dict) to the cache file."""
+        if self.metadata is None:
+            warnings.warn(
+                f"Index cache {self.path!r} not written, as the key function "
+                "cannot be identified (closures and callable objects are not "
+                "supported).",
+                BiopythonWarning,
+            )
+            return
+        keys = []
+        for key in offsets:
+            if not isinstance(key, str):
+                warnings.warn(
+                    f"Index cache {self.path!r} not written, as the keys are "
+                    "not strings.",
+                    BiopythonWarning,
+                )
+                return
+            keys.append(key.encode())
+        starts = list(itertools.accumulate(map(len, keys), initial=0))
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        size, mtime = self._stat()
+        header = self.header.pack(
+            self.magic, size, mtime, len(keys), starts[-1], len(self.metadata)
+        )
+        padding = bytes(-(len(header) + len(self.metadata)) % 8)
+        temp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temp, "wb") as handle:
+                handle.write(header)
+                handle.write(self.metadata)
+                handle.write(padding)
+                handle.write(struct.pack(f"<{len(keys)}Q", *offsets.values()))
+                handle.write(struct.pack(f"<{len(starts)}Q", *starts))
+                handle.write(struct.pack(f"<{len(order)}Q", *order))
+                handle.write(b"".join(keys))
+            # Atomic, so other processes see either the old or the new cache
+            os.replace(temp, self.path)
+        except OSError as error:
+            with contextlib.suppress(OSError):
+                os.remove(temp)
+            warnings.warn(
+                f"Could not write index cache {self.path!r}: {error}",
+                BiopythonWarning,
+            )
+
+
+class _CachedOffsets(collections.abc.Mapping):
+    """Read only mapping of keys to offsets in a memory mapped cache (PRIVATE).
+
+    Iterating gives the keys in file order, like the dict it replaces in
+    _IndexedSeqFileDict.
+    """
+
+    def __init__(self, data, start, count):
+        """Initialize the mapping from the memory mapped cache file."""
+        self._data = data
+        view = memoryview(data)
+        self._offsets = view[start : start + 8 * count].cast("Q")
+        start += 8 * count
+        self._starts = view[start : start + 8 * (count + 1)].cast("Q")
+        start += 8 * (count + 1)
+        self._order = view[start : start + 8 * count].cast("Q")
+        self._keys_start = start + 8 * count
+        self._count = count
+
+    def _key(self, index):
+        """Return the key of a record as bytes, given its index in the file (PRIVATE)."""
+        start = self._keys_start
+        return self._data[start + self._starts[index] : start + self._starts[index + 1]]
+
+    def __len__(self):
+        """Return the number of keys."""
+        return self._count
+
+    def __iter__(self):
+        """Iterate over the keys in file order."""
+        for index in range(self._count):
+            yield self._key(index).decode()
+
+    def __getitem__(self, key):
+        """Return the offset of the record with the given key."""
+        if not isinstance(key, str):
+            raise KeyError(key)
+        target = key.encode()
+        order = self._order
+        low = 0
+        high = self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(order[middle]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._key(order[low]) == target:
+            return self._offsets[order[low]]
+        raise KeyError(key)
+
+    def close(self):
+        """Release the memory mapped cache file."""
+        self._offsets.release()
+        self._starts.release()
+        self._order.release()
+        self._data.close()
+
+
+def _file_offsets(proxy_factory, fmt, filename, key_function):
+    """Iterate over the keys, offsets and lengths of the records in a file (PRIVATE)."""
+    random_access_proxy = proxy_factory(fmt, filename)
+    try:
+        if key_function:
+            for key, offset, length in random_access_proxy:
+                yield key_function(key), offset, length
+        else:
+            yield from random_access_proxy
+    finally:
+        random_access_proxy._handle.close()
+
+
+def _file_offsets_worker(proxy_factory, fmt, filename, key_function):
+    """Return the keys, offsets and lengths of the records in a file (PRIVATE).
+
+    This runs in the worker processes when building an SQLite index of
+    several files in parallel, so the arguments must be picklable.
+    """
+    return list(_file_offsets(proxy_factory, fmt, filename, key_function))
 
 
 class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
@@ -276,7 +560,12 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
 
     There are OS limits on the number of files that can be open at once,
     so a pool are kept. If a record is required from a closed file, then
-    one of the open handles is closed first.
+    the least recently used of the open handles is closed first.
+
+    When building a new index of several files, the files can be scanned
+    in parallel by a pool of worker processes, with the offsets found then
+    added to the database in the main process. This requires the proxy
+    factory and the key function to be picklable.
     """
 
     def __init__(
@@ -288,6 +577,7 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         key_function,
         repr,
         max_open=10,
+        workers=1,
     ):
         """Initialize the class."""
         # TODO? - Don't keep filename list in memory (just in DB)?
@@ -313,7 +603,9 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         self._proxy_factory = proxy_factory
         self._repr = repr
         self._max_open = max_open
-        self._proxies = {}
+        self._workers = workers
+        # Open proxies by file number, least recently used first
+        self._proxies = collections.OrderedDict()
 
         # Note if using SQLite :memory: trick index filename, this will
         # give $PWD as the relative path (which is fine).
@@ -434,8 +726,7 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         fmt = self._format
         key_function = self._key_function
         proxy_factory = self._proxy_factory
-        max_open = self._max_open
-        random_access_proxies = self._proxies
+        workers = self._workers
 
         if not fmt or not filenames:
             raise ValueError(
@@ -466,56 +757,66 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
             "CREATE TABLE offset_data (key TEXT, "
             "file_number INTEGER, offset INTEGER, length INTEGER);"
         )
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers == 1 or len(filenames) < 2:
+            executor = None
+            offset_lists = (
+                _file_offsets(proxy_factory, fmt, filename, key_function)
+                for filename in filenames
+            )
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            # Results come back in file order, while later files are scanned
+            offset_lists = executor.map(
+                _file_offsets_worker,
+                itertools.repeat(proxy_factory),
+                itertools.repeat(fmt),
+                filenames,
+                itertools.repeat(key_function),
+            )
         count = 0
-        for file_index, filename in enumerate(filenames):
-            # Default to storing as an absolute path,
-            f = os.path.abspath(filename)
-            if not os.path.isabs(filename) and not os.path.isabs(index_filename):
-                # Since user gave BOTH filename & index as relative paths,
-                # we will store this relative to the index file even though
-                # if it may now start ../ (meaning up a level)
-                # Note for cross platform use (e.g. shared drive over SAMBA),
-                # convert any Windows slash into Unix style for rel paths.
-                f = os.path.relpath(filename, relative_path).replace(os.path.sep, "/")
-            elif (os.path.dirname(os.path.abspath(filename)) + os.path.sep).startswith(
-                relative_path + os.path.sep
+        try:
+            for file_index, (filename, offsets) in enumerate(
+                zip(filenames, offset_lists)
             ):
-                # Since sequence file is in same directory or sub directory,
-                # might as well make this into a relative path:
-                f = os.path.relpath(filename, relative_path).replace(os.path.sep, "/")
-                assert not f.startswith("../"), f
-            # print("DEBUG - storing %r as [%r] %r" % (filename, relative_path, f))
-            con.execute(
-                "INSERT INTO file_data (file_number, name) VALUES (?,?);",
-                (file_index, f),
-            )
-            random_access_proxy = proxy_factory(fmt, filename)
-            if key_function:
-                offset_iter = (
-                    (key_function(key), file_index, offset, length)
-                    for (key, offset, length) in random_access_proxy
+                # Default to storing as an absolute path,
+                f = os.path.abspath(filename)
+                if not os.path.isabs(filename) and not os.path.isabs(index_filename):
+                    # Since user gave BOTH filename & index as relative paths,
+                    # we will store this relative to the index file even though
+                    # if it may now start ../ (meaning up a level)
+                    # Note for cross platform use (e.g. shared drive over SAMBA),
+                    # convert any Windows slash into Unix style for rel paths.
+                    f = os.path.relpath(filename, relative_path).replace(
+                        os.path.sep, "/"
+                    )
+                elif (
+                    os.path.dirname(os.path.abspath(filename)) + os.path.sep
+                ).startswith(relative_path + os.path.sep):
+                    # Since sequence file is in same directory or sub directory,
+                    # might as well make this into a relative path:
+                    f = os.path.relpath(filename, relative_path).replace(
+                        os.path.sep, "/"
+                    )
+                    assert not f.startswith("../"), f
+                # print("DEBUG - storing %r as [%r] %r" % (filename, relative_path, f))
+                con.execute(
+                    "INSERT INTO file_data (file_number, name) VALUES (?,?);",
+                    (file_index, f),
                 )
-            else:
-                offset_iter = (
-                    (key, file_index, offset, length)
-                    for (key, offset, length) in random_access_proxy
-                )
-            while True:
-                batch = list(itertools.islice(offset_iter, 100))
-                if not batch:
-                    break
-                # print("Inserting batch of %i offsets, %s ... %s"
-                #       % (len(batch), batch[0][0], batch[-1][0]))
-                con.executemany(
+                cursor = con.executemany(
                     "INSERT INTO offset_data (key,file_number,offset,length) VALUES (?,?,?,?);",
-                    batch,
+                    (
+                        (key, file_index, offset, length)
+                        for (key, offset, length) in offsets
+                    ),
                 )
                 con.commit()
-                count += len(batch)
-            if len(random_access_proxies) < max_open:
-                random_access_proxies[file_index] = random_access_proxy
-            else:
-                random_access_proxy._handle.close()
+                count += cursor.rowcount
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
         self._length = count
         # print("About to index %i entries" % count)
         try:
@@ -523,8 +824,6 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
                 "CREATE UNIQUE INDEX IF NOT EXISTS key_index ON offset_data(key);"
             )
         except sqlite3.IntegrityError as err:
-            self._proxies = random_access_proxies
-            self.close()
             con.close()
             raise ValueError(f"Duplicate key? {err}") from None
         con.execute("PRAGMA locking_mode=NORMAL")
@@ -554,6 +853,22 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         ):
             yield str(row[0])
 
+    def _get_proxy(self, file_number):
+        """Return the proxy for a file, opening it if needed (PRIVATE)."""
+        proxies = self._proxies
+        try:
+            proxy = proxies[file_number]
+        except KeyError:
+            if len(proxies) >= self._max_open:
+                # Close the least recently used handle...
+                proxies.popitem(last=False)[1]._handle.close()
+            # Open a new handle...
+            proxy = self._proxy_factory(self._format, self._filenames[file_number])
+            proxies[file_number] = proxy
+        else:
+            proxies.move_to_end(file_number)
+        return proxy
+
     def __getitem__(self, key):
         """Return record for the specified key."""
         # Pass the offset to the proxy
@@ -563,17 +878,7 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         if not row:
             raise KeyError
         file_number, offset = row
-        proxies = self._proxies
-        if file_number in proxies:
-            record = proxies[file_number].get(offset)
-        else:
-            if len(proxies) >= self._max_open:
-                # Close an old handle...
-                proxies.popitem()[1]._handle.close()
-            # Open a new handle...
-            proxy = self._proxy_factory(self._format, self._filenames[file_number])
-            record = proxy.get(offset)
-            proxies[file_number] = proxy
+        record = self._get_proxy(file_number).get(offset)
         if self._key_function:
             key2 = self._key_function(record.id)
         else:
@@ -594,30 +899,53 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         if not row:
             raise KeyError
         file_number, offset, length = row
-        proxies = self._proxies
-        if file_number in proxies:
-            if length:
-                # Shortcut if we have the length
-                h = proxies[file_number]._handle
-                h.seek(offset)
-                return h.read(length)
-            else:
-                return proxies[file_number].get_raw(offset)
+        proxy = self._get_proxy(file_number)
+        if length:
+            # Shortcut if we have the length
+            h = proxy._handle
+            h.seek(offset)
+            return h.read(length)
         else:
-            # This code is duplicated from __getitem__ to avoid a function call
-            if len(proxies) >= self._max_open:
-                # Close an old handle...
-                proxies.popitem()[1]._handle.close()
-            # Open a new handle...
-            proxy = self._proxy_factory(self._format, self._filenames[file_number])
-            proxies[file_number] = proxy
-            if length:
-                # Shortcut if we have the length
-                h = proxy._handle
-                h.seek(offset)
-                return h.read(length)
+            return proxy.get_raw(offset)
+
+    def get_many(self, keys):
+        """Return a dictionary of the records for the specified keys.
+
+        The offsets are looked up in the database in bulk rather than key by
+        key, and the records are then read sorted by file and offset, which
+        reduces the seeking and the reopening of files. The dictionary
+        returned follows the order of the keys given. If any key is not
+        found, a KeyError exception is raised.
+        """
+        keys = list(dict.fromkeys(keys))
+        rows = []
+        # Stay below the SQLite limit on the number of parameters
+        for start in range(0, len(keys), 500):
+            batch = keys[start : start + 500]
+            rows.extend(
+                self._con.execute(
+                    "SELECT key, file_number, offset FROM offset_data "
+                    "WHERE key IN (%s);" % ",".join("?" * len(batch)),
+                    batch,
+                )
+            )
+        if len(rows) < len(keys):
+            found = {row[0] for row in rows}
+            for key in keys:
+                if key not in found:
+                    raise KeyError(key)
+        rows.sort(key=lambda row: (row[1], row[2]))
+        records = {}
+        for key, file_number, offset in rows:
+            record = self._get_proxy(file_number).get(offset)
+            if self._key_function:
+                key2 = self._key_function(record.id)
             else:
-                return proxy.get_raw(offset)
+                key2 = record.id
+            if key != key2:
+                raise ValueError(f"Key did not match ({key} vs {key2})")
+            records[key] = record
+        return {key: records[key] for key in keys}
 
     def close(self):
         """Close any open file handles."""
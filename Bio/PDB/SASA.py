@@ -17,13 +17,14 @@ Reference:
 """
 
 import collections
+import itertools
 import math
+import os
 from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 
-from Bio.PDB.kdtrees import KDTree
-
 __all__ = ["ShrakeRupley"]
 
 _ENTITY_HIERARCHY = {
@@ -69,6 +70,121 @@ ATOMIC_RADII.update(
     }
 )
 
+# number of atoms, and of sphere points, processed together in each NumPy step
+_ATOM_BATCH_SIZE = 4096
+_POINT_BATCH_SIZE = 1 << 20
+
+# sphere points within this distance (in Angstrom) of the surface of a
+# neighboring atom are tested using the exact distance calculation
+_TOLERANCE = 1e-6
+
+
+def _find_overlapping_atoms(coords, radii, indices):
+    """Return all pairs of overlapping atoms (i, j), with i in indices (PRIVATE).
+
+    Atoms are assigned to cubic cells at least as wide as the largest possible
+    distance between overlapping atoms, so that only atoms in neighboring
+    cells need to be compared. The pairs are sorted by i.
+    """
+    twice_maxradii = np.max(radii) * 2
+    cells = ((coords - coords.min(axis=0)) // (twice_maxradii * 1.01)).astype(np.intp)
+    # add a layer of empty cells around the atoms, so neighbors never wrap
+    cells += 1
+    shape = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * shape[1] + cells[:, 1]) * shape[2] + cells[:, 2]
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    offsets = [
+        (dx * shape[1] + dy) * shape[2] + dz
+        for dx, dy, dz in itertools.product((-1, 0, 1), repeat=3)
+    ]
+    first = []
+    second = []
+    for offset in offsets:
+        neighbor_keys = keys[indices] + offset
+        starts = np.searchsorted(sorted_keys, neighbor_keys, "left")
+        counts = np.searchsorted(sorted_keys, neighbor_keys, "right") - starts
+        total = counts.sum()
+        positions = np.arange(total) + np.repeat(
+            starts - np.cumsum(counts) + counts, counts
+        )
+        first.append(np.repeat(indices, counts))
+        second.append(order[positions])
+    i = np.concatenate(first)
+    j = np.concatenate(second)
+    # Use the same floating point operations as the KDTree search, so that
+    # exactly the same neighbors are found.
+    delta = coords[i] - coords[j]
+    d2 = (
+        delta[:, 0] * delta[:, 0]
+        + delta[:, 1] * delta[:, 1]
+        + delta[:, 2] * delta[:, 2]
+    )
+    keep = (
+        (i != j)
+        & (d2 <= twice_maxradii * twice_maxradii)
+        & (np.sqrt(d2) < radii[i] + radii[j])
+    )
+    i = i[keep]
+    j = j[keep]
+    order = np.argsort(i, kind="stable")
+    return i[order], j[order]
+
+
+def _count_accessible_points(coords, radii, sphere, start, end):
+    """Return the number of accessible sphere points of atoms start to end (PRIVATE).
+
+    All atoms in coords are considered when testing if a sphere point is
+    buried, but only the sphere points of atoms start to end are tested.
+
+    A point s on the unit sphere of atom i is buried by atom j if
+    |s * r_i + c_i - c_j|**2 <= r_j**2, or equivalently if the dot product
+    s . (c_j - c_i) is at least (r_i**2 + d**2 - r_j**2) / (2 * r_i), where d
+    is the distance between the atoms. The dot products are calculated for
+    all sphere points at once by a matrix product; only points very close to
+    the threshold are tested using the distance itself, with the same floating
+    point operations as a KDTree search, to ensure that the results do not
+    depend on rounding errors.
+    """
+    n_points = len(sphere)
+    unit_sphere = np.asarray(sphere, np.float64).T
+    # allow for the sphere points not lying exactly on the unit sphere
+    norms = np.einsum("ij,ij->j", unit_sphere, unit_sphere)
+    tolerance = _TOLERANCE + np.max(radii) * np.max(np.abs(norms - 1))
+    counts = np.empty(end - start, np.int64)
+    pair_batch_size = max(1, _POINT_BATCH_SIZE // n_points)
+    for batch_start in range(start, end, _ATOM_BATCH_SIZE):
+        batch_end = min(batch_start + _ATOM_BATCH_SIZE, end)
+        indices = np.arange(batch_start, batch_end)
+        i, j = _find_overlapping_atoms(coords, radii, indices)
+        buried = np.zeros((batch_end - batch_start, n_points), bool)
+        for k in range(0, len(i), pair_batch_size):
+            ii = i[k : k + pair_batch_size]
+            jj = j[k : k + pair_batch_size]
+            r_i = radii[ii]
+            r_j = radii[jj]
+            vectors = coords[jj] - coords[ii]
+            d2 = np.einsum("ij,ij->i", vectors, vectors)
+            thresholds = (r_i * r_i + d2 - r_j * r_j) / (2 * r_i)
+            products = vectors @ unit_sphere
+            hits = products > (thresholds + tolerance)[:, None]
+            candidates = products >= (thresholds - tolerance)[:, None]
+            rows, columns = np.nonzero(candidates ^ hits)
+            if len(rows):
+                # move the sphere point to atom i, and test if it lies in atom j
+                points = sphere[columns] * r_i[rows, None] + coords[ii[rows]]
+                delta = coords[jj[rows]] - points
+                d2 = (
+                    delta[:, 0] * delta[:, 0]
+                    + delta[:, 1] * delta[:, 1]
+                    + delta[:, 2] * delta[:, 2]
+                )
+                hits[rows, columns] = d2 <= r_j[rows] * r_j[rows]
+            atoms, boundaries = np.unique(ii, return_index=True)
+            buried[atoms - batch_start] |= np.logical_or.reduceat(hits, boundaries)
+        counts[batch_start - start : batch_end - start] = n_points - buried.sum(axis=1)
+    return counts
+
 
 class ShrakeRupley:
     """Calculates SASAs using the Shrake-Rupley algorithm."""
@@ -141,7 +257,7 @@ class ShrakeRupley:
 
         return coords
 
-    def compute(self, entity, level="A"):
+    def compute(self, entity, level="A", workers=1):
         """Calculate surface accessibility surface area for an entity.
 
         The resulting atomic surface accessibility values are attached to the
@@ -158,6 +274,12 @@ class ShrakeRupley:
             values of its children. Defaults to "A".
         :type entity: Bio.PDB.Entity
 
+        :param workers: number of processes used to calculate the surface
+            accessibility, with the atoms of each chain processed as a
+            separate task. If None, use the number of CPUs. The results do
+            not depend on the number of processes. Defaults to 1.
+        :type workers: int
+
         >>> from Bio.PDB import PDBParser
         >>> from Bio.PDB.SASA import ShrakeRupley
         >>> p = PDBParser(QUIET=1)
@@ -194,41 +316,35 @@ class ShrakeRupley:
         # We trust DisorderedAtom and friends to pick representatives.
         coords = np.array([a.coord for a in atoms], dtype=np.float64)
 
-        # Pre-compute atom neighbors using KDTree
-        kdt = KDTree(coords, 10)
-
         # Pre-compute radius * probe table
         radii_dict = self.radii_dict
         radii = np.array([radii_dict[a.element] for a in atoms], dtype=np.float64)
         radii += self.probe_radius
-        twice_maxradii = np.max(radii) * 2
-
-        # Calculate ASAs
-        asa_array = np.zeros((n_atoms, 1), dtype=np.int64)
-        ptset = set(range(self.n_points))
-        for i in range(n_atoms):
-            r_i = radii[i]
-
-            # Move sphere to atom
-            s_on_i = (np.array(self._sphere, copy=True) * r_i) + coords[i]
-            available_set = ptset.copy()
-
-            # KDtree for sphere points
-            kdt_sphere = KDTree(s_on_i, 10)
-
-            # Iterate over neighbors of atom i
-            for jj in kdt.search(coords[i], twice_maxradii):
-                j = jj.index
-                if i == j:
-                    continue
-
-                if jj.radius < (r_i + radii[j]):
-                    # Remove overlapping points on sphere from available set
-                    available_set -= {
-                        pt.index for pt in kdt_sphere.search(coords[j], radii[j])
-                    }
-
-            asa_array[i] = len(available_set)  # update counts
+
+        # Count the accessible sphere points of each atom
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers == 1:
+            counts = _count_accessible_points(coords, radii, self._sphere, 0, n_atoms)
+        else:
+            # one task per chain; each chain is still buried by all atoms
+            chains = [atom.parent.parent for atom in atoms]
+            starts = [0]
+            starts.extend(
+                k for k in range(1, n_atoms) if chains[k] is not chains[k - 1]
+            )
+            ends = starts[1:] + [n_atoms]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(
+                    _count_accessible_points,
+                    itertools.repeat(coords),
+                    itertools.repeat(radii),
+                    itertools.repeat(self._sphere),
+                    starts,
+                    ends,
+                )
+                counts = np.concatenate(list(results))
+        asa_array = counts.reshape(n_atoms, 1)
 
         # Convert accessible point count to surface area in A**2
         f = radii * radii * (4 * np.pi / self.n_points)
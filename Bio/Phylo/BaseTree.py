@@ -17,6 +17,8 @@ import itertools
 import random
 import re
 
+import numpy as np
+
 # General tree-traversal algorithms
 
 
@@ -716,6 +718,184 @@ class TreeMixin:
             self.root.clades.append(clade)
 
 
+class TreeIndex:
+    """Precomputed structure of a tree for fast path and distance queries.
+
+    Use the ``build_index`` method of a tree to create one. The index holds
+    the parent of each clade, the distance of each clade from the root, and
+    an Euler tour of the tree with a sparse table of the shallowest clade in
+    each power-of-two range of the tour, giving the most recent common
+    ancestor of any two clades in constant time.
+
+    Targets are given as clades or as clade names. The index describes the
+    tree as it was when the index was built; if the tree is modified
+    afterwards (including changing branch lengths), call ``build_index``
+    again.
+    """
+
+    def __init__(self, root):
+        """Traverse the tree below the root clade."""
+        nodes = [root]
+        parents = [-1]
+        levels = [0]
+        distances = [0]
+        first = [0]
+        tour = [0]
+        stack = [(0, iter(root.clades))]
+        while stack:
+            position, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if stack:
+                    tour.append(stack[-1][0])
+                continue
+            first.append(len(tour))
+            tour.append(len(nodes))
+            stack.append((len(nodes), iter(child.clades)))
+            nodes.append(child)
+            parents.append(position)
+            levels.append(levels[position] + 1)
+            distances.append(distances[position] + (child.branch_length or 0))
+        self.root = root
+        self._nodes = nodes
+        self._parents = parents
+        # Clades hash by identity, so this survives copying and pickling
+        self._positions = {node: position for position, node in enumerate(nodes)}
+        self._names = {}
+        for position, node in enumerate(nodes):
+            if node.name is not None:
+                self._names.setdefault(node.name, position)
+        self._distances = np.array(distances, float)
+        self._first = np.array(first)
+        self._tour = np.array(tour)
+        # table[k][i] is the position in the tour of the shallowest clade in
+        # tour[i:i + 2 ** k]; rows are padded to the length of the tour
+        levels = np.array(levels)[self._tour]
+        size = len(tour)
+        table = [np.arange(size)]
+        span = 1
+        while 2 * span <= size:
+            previous = table[-1]
+            left = previous[: size - span]
+            right = previous[span:]
+            row = np.where(levels[right] < levels[left], right, left)
+            table.append(np.concatenate([row, previous[size - span :]]))
+            span *= 2
+        self._table = np.array(table)
+        self._levels = levels
+
+    def _find(self, target):
+        """Return the position of a clade or clade name (PRIVATE).
+
+        Raises a ValueError if the target is not in the tree.
+        """
+        if isinstance(target, str):
+            position = self._names.get(target)
+        else:
+            position = self._positions.get(target)
+        if position is None:
+            raise ValueError(f"target {target!r} is not in this tree")
+        return position
+
+    def _common_ancestor(self, position1, position2):
+        """Return the common ancestors of clades, as positions (PRIVATE).
+
+        The positions may be NumPy arrays of the same shape.
+        """
+        first = self._first
+        start = np.minimum(first[position1], first[position2])
+        end = np.maximum(first[position1], first[position2]) + 1
+        # the largest power of two not exceeding the length of each range
+        level = np.frexp(end - start)[1] - 1
+        left = self._table[level, start]
+        right = self._table[level, end - (1 << level)]
+        best = np.where(self._levels[right] < self._levels[left], right, left)
+        return self._tour[best]
+
+    def get_path(self, target):
+        """List the clades between the root and the target, as TreeMixin.get_path.
+
+        Returns None if the target is not in the tree.
+        """
+        try:
+            position = self._find(target)
+        except ValueError:
+            return None
+        path = []
+        while position > 0:
+            path.append(self._nodes[position])
+            position = self._parents[position]
+        path.reverse()
+        return path
+
+    def trace(self, start, finish):
+        """List the clades between two targets, as TreeMixin.trace."""
+        start = self._find(start)
+        finish = self._find(finish)
+        mrca = self._common_ancestor(start, finish)
+        fromstart = []
+        if start != mrca:
+            position = self._parents[start]
+            while position != mrca:
+                fromstart.append(self._nodes[position])
+                position = self._parents[position]
+        to = []
+        position = finish
+        while position != mrca:
+            to.append(self._nodes[position])
+            position = self._parents[position]
+        to.reverse()
+        return fromstart + [self._nodes[mrca]] + to
+
+    def common_ancestor(self, targets, *more_targets):
+        """Most recent common ancestor of the targets, as TreeMixin.common_ancestor."""
+        positions = [self._find(t) for t in _combine_args(targets, *more_targets)]
+        if not positions:
+            return self.root
+        mrca = positions[0]
+        for position in positions[1:]:
+            mrca = self._common_ancestor(mrca, position)
+        return self._nodes[mrca]
+
+    def distance(self, target1, target2=None):
+        """Calculate the sum of the branch lengths between two targets.
+
+        If only one target is specified, the other is the root of the tree.
+        """
+        position1 = self._find(target1)
+        position2 = 0 if target2 is None else self._find(target2)
+        mrca = self._common_ancestor(position1, position2)
+        distances = self._distances
+        return float(
+            (distances[position1] - distances[mrca])
+            + (distances[position2] - distances[mrca])
+        )
+
+    def distance_matrix(self):
+        """Return the distances between all pairs of terminals as a NumPy array.
+
+        The rows and columns follow the order of the terminals in the tree
+        (as given by its ``get_terminals`` method).
+        """
+        nodes = self._nodes
+        terminals = np.array(
+            [position for position, node in enumerate(nodes) if not node.clades],
+            int,
+        )
+        distances = self._distances
+        n = len(terminals)
+        matrix = np.empty((n, n))
+        step = max(1, (1 << 20) // max(n, 1))
+        for start in range(0, n, step):
+            rows = terminals[start : start + step, None]
+            mrca = self._common_ancestor(rows, terminals)
+            matrix[start : start + step] = (distances[rows] - distances[mrca]) + (
+                distances[terminals] - distances[mrca]
+            )
+        return matrix
+
+
 class Tree(TreeElement, TreeMixin):
     """A phylogenetic tree, containing global info for the phylogeny.
 
@@ -804,6 +984,47 @@ class Tree(TreeElement, TreeMixin):
 
         return Phylogeny.from_tree(self, **kwargs)
 
+    def build_index(self):
+        """Return a TreeIndex of this tree for fast path and distance queries.
+
+        The index holds the parent of each clade, the distance of each clade
+        from the root, and a table to find the most recent common ancestor of
+        any two clades in constant time. Its ``get_path``, ``trace``,
+        ``common_ancestor`` and ``distance`` methods answer the same queries
+        as the methods of the tree, for targets given as clades or names,
+        without searching the tree each time.
+
+        The index is not updated when the tree is modified, so build a new
+        one after any change to the tree.
+
+        >>> from io import StringIO
+        >>> from Bio import Phylo
+        >>> tree = Phylo.read(StringIO("((A:1,B:2):1,C:3);"), "newick")
+        >>> index = tree.build_index()
+        >>> index.distance("A", "C")
+        5.0
+        >>> index.common_ancestor("A", "B") == tree.clade[0]
+        True
+
+        """
+        return TreeIndex(self.root)
+
+    def distance_matrix(self):
+        """Return the distances between all pairs of terminals as a NumPy array.
+
+        The rows and columns follow the order of ``get_terminals()``.
+
+        >>> from io import StringIO
+        >>> from Bio import Phylo
+        >>> tree = Phylo.read(StringIO("((A:1,B:2):1,C:3);"), "newick")
+        >>> print(tree.distance_matrix())
+        [[0. 3. 5.]
+         [3. 0. 6.]
+         [5. 6. 0.]]
+
+        """
+        return TreeIndex(self.root).distance_matrix()
+
     def root_with_outgroup(
         self, outgroup_targets, *more_targets, outgroup_branch_length=None
     ):
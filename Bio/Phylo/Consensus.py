@@ -13,11 +13,17 @@ adam consensus.
 """
 
 import itertools
+import os
 import random
 from ast import literal_eval
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 from Bio.Align import MultipleSeqAlignment
 from Bio.Phylo import BaseTree
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
 
 
 class _BitString(str):
@@ -562,7 +568,55 @@ def bootstrap(msa, times):
         yield item
 
 
-def bootstrap_trees(alignment, times, tree_constructor):
+def _resample(alignment, cols):
+    """Return an alignment of the given columns of an alignment (PRIVATE)."""
+    if isinstance(alignment, MultipleSeqAlignment):
+        records = []
+        for record in alignment:
+            seq = str(record.seq)
+            records.append(
+                SeqRecord(
+                    Seq("".join([seq[col] for col in cols])),
+                    id=record.id,
+                    name=record.name,
+                    description=record.description,
+                )
+            )
+        return MultipleSeqAlignment(records)
+    return alignment[:, cols]
+
+
+def _alignment_length(alignment):
+    """Return the number of columns of an alignment (PRIVATE)."""
+    if isinstance(alignment, MultipleSeqAlignment):
+        return alignment.get_alignment_length()
+    return alignment.shape[1]
+
+
+def _bootstrap_tree(alignment, tree_constructor, seed):
+    """Build the tree of a bootstrap replicate drawn using the seed (PRIVATE)."""
+    length = _alignment_length(alignment)
+    cols = np.random.default_rng(seed).integers(0, length, length)
+    return tree_constructor.build_tree(_resample(alignment, cols.tolist()))
+
+
+# Alignment and tree constructor used by the worker processes.
+_bootstrap_worker_data = None
+
+
+def _init_bootstrap_worker(alignment, tree_constructor):
+    """Store the alignment and tree constructor in a worker process (PRIVATE)."""
+    global _bootstrap_worker_data
+    _bootstrap_worker_data = (alignment, tree_constructor)
+
+
+def _bootstrap_tree_worker(seed):
+    """Build the tree of a bootstrap replicate in a worker process (PRIVATE)."""
+    alignment, tree_constructor = _bootstrap_worker_data
+    return _bootstrap_tree(alignment, tree_constructor, seed)
+
+
+def bootstrap_trees(alignment, times, tree_constructor, workers=1, seed=None):
     """Generate bootstrap replicate trees from a multiple sequence alignment.
 
     :Parameters:
@@ -572,29 +626,50 @@ def bootstrap_trees(alignment, times, tree_constructor):
             number of bootstrap times.
         tree_constructor : TreeConstructor
             tree constructor to be used to build trees.
+        workers : int
+            number of processes used to build the trees (default 1); use
+            None for the number of CPUs. The trees are generated in the
+            order of the replicates.
+        seed : int
+            seed for the random number generator. Each replicate draws its
+            columns with its own seed derived from this one, so the trees
+            do not depend on the number of workers. If no seed is given, it
+            is taken from the ``random`` module when using several workers,
+            while a single process draws the columns from the ``random``
+            module directly, as in previous versions.
 
     """
-    if isinstance(alignment, MultipleSeqAlignment):
-        length = len(alignment[0])
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if seed is None and workers == 1:
+        length = _alignment_length(alignment)
         for i in range(times):
-            bootstrapped_alignment = None
-            for j in range(length):
-                col = random.randint(0, length - 1)
-                if bootstrapped_alignment is None:
-                    bootstrapped_alignment = alignment[:, col : col + 1]
-                else:
-                    bootstrapped_alignment += alignment[:, col : col + 1]
-            tree = tree_constructor.build_tree(bootstrapped_alignment)
-            yield tree
-    else:
-        n, m = alignment.shape
-        for i in range(times):
-            cols = [random.randint(0, m - 1) for j in range(m)]
-            tree = tree_constructor.build_tree(alignment[:, cols])
+            cols = [random.randint(0, length - 1) for j in range(length)]
+            tree = tree_constructor.build_tree(_resample(alignment, cols))
             yield tree
+        return
+    if seed is None:
+        seed = random.getrandbits(64)
+    seeds = np.random.SeedSequence(seed).spawn(times)
+    if workers == 1:
+        for seed in seeds:
+            yield _bootstrap_tree(alignment, tree_constructor, seed)
+        return
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_bootstrap_worker,
+        initargs=(alignment, tree_constructor),
+    )
+    try:
+        chunksize = max(1, times // (4 * workers))
+        yield from executor.map(_bootstrap_tree_worker, seeds, chunksize=chunksize)
+    finally:
+        executor.shutdown(cancel_futures=True)
 
 
-def bootstrap_consensus(alignment, times, tree_constructor, consensus):
+def bootstrap_consensus(
+    alignment, times, tree_constructor, consensus, workers=1, seed=None
+):
     """Consensus tree of a series of bootstrap trees for a multiple sequence alignment.
 
     :Parameters:
@@ -607,9 +682,14 @@ def bootstrap_consensus(alignment, times, tree_constructor, consensus):
         consensus : function
             Consensus method in this module: ``strict_consensus``,
             ``majority_consensus``, ``adam_consensus``.
+        workers : int
+            Number of processes used to build the trees, as in
+            ``bootstrap_trees``.
+        seed : int
+            Seed for the random number generator, as in ``bootstrap_trees``.
 
     """
-    trees = bootstrap_trees(alignment, times, tree_constructor)
+    trees = bootstrap_trees(alignment, times, tree_constructor, workers, seed)
     tree = consensus(trees)
     return tree
 
@@ -39,3 +39,72 @@ class Clade(BaseTree.Clade):
             confidence=confidence,
         )
         self.comment = comment
+
+
+class CompactTree:
+    """Newick tree stored in arrays, as generated by NewickIO in compact mode.
+
+    The nodes are numbered in the order they appear in the Newick text.
+    Converting the tree to a ``Tree`` object with the ``to_tree`` method
+    gives the same tree as parsing the text normally.
+
+    :Parameters:
+        parents : array
+            index of the parent of each node, or -1 for the root.
+        branch_lengths : array
+            branch length of each node, or NaN if it has none.
+        names : list
+            name of each node, or None.
+        confidences : dict
+            support values, by node index.
+        comments : dict
+            comments, by node index.
+        rooted : bool
+            Whether or not the tree is rooted.
+
+    """
+
+    def __init__(
+        self,
+        parents,
+        branch_lengths,
+        names,
+        confidences=None,
+        comments=None,
+        rooted=False,
+    ):
+        """Initialize parameters for a compact Newick tree object."""
+        self.parents = parents
+        self.branch_lengths = branch_lengths
+        self.names = names
+        self.confidences = confidences or {}
+        self.comments = comments or {}
+        self.rooted = rooted
+
+    def __len__(self):
+        """Return the number of nodes in the tree."""
+        return len(self.parents)
+
+    def to_tree(self):
+        """Return the tree as a Newick Tree object."""
+        confidences = self.confidences
+        comments = self.comments
+        clades = [
+            Clade(
+                None if length != length else length,
+                name,
+                None,
+                confidences.get(i),
+                comments.get(i),
+            )
+            for i, (length, name) in enumerate(
+                zip(self.branch_lengths.tolist(), self.names)
+            )
+        ]
+        root = None
+        for clade, parent in zip(clades, self.parents.tolist()):
+            if parent < 0:
+                root = clade
+            else:
+                clades[parent].clades.append(clade)
+        return Tree(root=root, rooted=self.rooted)
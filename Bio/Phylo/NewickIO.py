@@ -13,8 +13,12 @@ See: http://evolution.genetics.washington.edu/phylip/newick_doc.html
 """
 
 import re
+import warnings
 from io import StringIO
 
+import numpy as np
+
+from Bio import BiopythonDeprecationWarning
 from Bio.Phylo import Newick
 
 
@@ -44,6 +48,11 @@ token_dict = {name: re.compile(token) for token, name in tokens}
 def parse(handle, **kwargs):
     """Iterate over the trees in a Newick file handle.
 
+    The trees are read one at a time. With ``compact=True``, the trees are
+    generated as ``Bio.Phylo.Newick.CompactTree`` objects, and with
+    ``topology_only=True`` the comments, branch lengths and support values
+    are skipped; see ``Parser.parse``.
+
     :returns: generator of Bio.Phylo.Newick.Tree objects.
 
     """
@@ -102,6 +111,14 @@ class Parser:
         if handle.read(0) != "":
             raise ValueError("Newick files must be opened in text mode") from None
         self.handle = handle
+        for name in ("new_clade", "process_clade"):
+            if getattr(type(self), name) is not getattr(Parser, name):
+                warnings.warn(
+                    f"Overriding the method {name} is deprecated. Until it is "
+                    "removed, trees are parsed clade by clade to call it, "
+                    "which is slower and does not support compact=True.",
+                    BiopythonDeprecationWarning,
+                )
 
     @classmethod
     def from_string(cls, treetext):
@@ -110,25 +127,201 @@ class Parser:
         return cls(handle)
 
     def parse(
-        self, values_are_confidence=False, comments_are_confidence=False, rooted=False
+        self,
+        values_are_confidence=False,
+        comments_are_confidence=False,
+        rooted=False,
+        topology_only=False,
+        compact=False,
     ):
-        """Parse the text stream this object was initialized with."""
+        """Parse the text stream this object was initialized with.
+
+        The trees are read and generated one at a time, so that only the text
+        of the current tree is held in memory.
+
+        :Parameters:
+            values_are_confidence : bool
+                Store the values after colons as support values instead of
+                branch lengths.
+            comments_are_confidence : bool
+                Store the values in comments as support values.
+            rooted : bool
+                Whether the trees are rooted.
+            topology_only : bool
+                Skip the comments, branch lengths and support values, keeping
+                only the structure of the trees and the node labels.
+            compact : bool
+                Generate ``Newick.CompactTree`` objects, storing each tree in
+                a few arrays, instead of ``Newick.Tree`` objects. These can be
+                converted with their ``to_tree`` method.
+
+        """
         self.values_are_confidence = values_are_confidence
         self.comments_are_confidence = comments_are_confidence
         self.rooted = rooted
-        buf = ""
+        self.topology_only = topology_only
+        lines = []
         for line in self.handle:
-            buf += line.rstrip()
-            if buf.endswith(";"):
-                yield self._parse_tree(buf)
-                buf = ""
-        if buf:
+            line = line.rstrip()
+            lines.append(line)
+            if line.endswith(";"):
+                yield self._parse_tree("".join(lines), compact)
+                lines = []
+        text = "".join(lines)
+        if text:
             # Last tree is missing a terminal ';' character -- that's OK
-            yield self._parse_tree(buf)
+            yield self._parse_tree(text, compact)
+
+    def _parse_tree(self, text, compact=False):
+        """Parse the text representation into an Tree object (PRIVATE).
+
+        The nodes are numbered in the order they are found, and the tree is
+        built from the parent of each node, without recursion.
+        """
+        cls = type(self)
+        if (
+            cls.new_clade is not Parser.new_clade
+            or cls.process_clade is not Parser.process_clade
+        ):
+            # deprecated hooks overridden in a subclass
+            if compact:
+                raise ValueError(
+                    "compact=True cannot be used if new_clade or process_clade "
+                    "is overridden"
+                )
+            return self._parse_tree_by_clade(text)
+        tokens = re.finditer(tokenizer, text.strip())
+        topology_only = getattr(self, "topology_only", False)
+
+        names = [None]
+        parents = [-1]
+        lengths = [np.nan]
+        confidences = {}
+        comments = {}
+        root = current = 0
+
+        lp_count = 0
+        rp_count = 0
+        for match in tokens:
+            token = match.group()
+            first = token[0]
+
+            if first == ":":
+                # branch length or confidence
+                if topology_only:
+                    continue
+                value = float(token[1:])
+                if self.values_are_confidence:
+                    confidences[current] = value
+                else:
+                    lengths[current] = value
+
+            elif first == ",":
+                # if the current clade is the root, then the external parentheses
+                # are missing and a new root should be created
+                if current == root:
+                    root = parents[current] = len(parents)
+                    parents.append(-1)
+                    names.append(None)
+                    lengths.append(np.nan)
+                # start a new child clade at the same level as the current clade
+                parents.append(parents[current])
+                names.append(None)
+                lengths.append(np.nan)
+                current = len(parents) - 1
+
+            elif first == "(":
+                # start a new clade, which is a child of the current clade
+                parents.append(current)
+                names.append(None)
+                lengths.append(np.nan)
+                current = len(parents) - 1
+                lp_count += 1
+
+            elif first == ")":
+                # done adding children for this parent clade
+                current = parents[current]
+                if current < 0:
+                    raise NewickError("Parenthesis mismatch.")
+                rp_count += 1
+
+            elif first == "[":
+                # comment
+                if topology_only:
+                    continue
+                comment = comments[current] = token[1:-1]
+                if self.comments_are_confidence:
+                    # Try to use this comment as a numeric support value
+                    confidences[current] = _parse_confidence(comment)
 
-    def _parse_tree(self, text):
-        """Parse the text representation into an Tree object (PRIVATE)."""
+            elif first == "'":
+                # quoted label; add characters to clade name
+                if not names[current]:
+                    # This is almost always the case
+                    names[current] = token[1:-1]
+                else:
+                    # Hack to support labels with escaped quotes. Escaped quotes
+                    # are two consequtive quotes. To the parser, this just looks
+                    # like two quoted labels next to each other. See issue #4537
+                    names[current] += token[:-1]
+
+            elif first == ";":
+                break
+
+            elif first == "\n":
+                pass
+
+            else:
+                # unquoted node label
+                names[current] = token
+
+        if lp_count != rp_count:
+            raise NewickError(
+                f"Mismatch, {lp_count} open vs {rp_count} close parentheses."
+            )
+
+        # if ; token broke out of for loop, there should be no remaining tokens
+        try:
+            next_token = next(tokens)
+            raise NewickError(
+                f"Text after semicolon in Newick tree: {next_token.group()}"
+            )
+        except StopIteration:
+            pass
+
+        if not (
+            topology_only or self.values_are_confidence or self.comments_are_confidence
+        ):
+            # labels of internal nodes may be support values
+            internal = set(parents)
+            internal.discard(-1)
+            for node in internal:
+                if names[node] and confidences.get(node) is None:
+                    confidence = _parse_confidence(names[node])
+                    if confidence is not None:
+                        confidences[node] = confidence
+                        names[node] = None
+
+        tree = Newick.CompactTree(
+            np.array(parents, np.int32),
+            np.array(lengths),
+            names,
+            confidences,
+            comments,
+            rooted=self.rooted,
+        )
+        if compact:
+            return tree
+        return tree.to_tree()
+
+    def _parse_tree_by_clade(self, text):
+        """Parse the text into a Tree object, calling new_clade and process_clade (PRIVATE).
+
+        This is the parser used before the flat representation was added. It
+        is only used if a subclass overrides one of these deprecated methods.
+        """
         tokens = re.finditer(tokenizer, text.strip())
+        topology_only = getattr(self, "topology_only", False)
 
         new_clade = self.new_clade
         root_clade = new_clade()
@@ -154,6 +347,8 @@ class Parser:
 
             elif token.startswith("["):
                 # comment
+                if topology_only:
+                    continue
                 current_clade.comment = token[1:-1]
                 if self.comments_are_confidence:
                     # Try to use this comment as a numeric support value
@@ -190,6 +385,8 @@ class Parser:
 
             elif token.startswith(":"):
                 # branch length or confidence
+                if topology_only:
+                    continue
                 value = float(token[1:])
                 if self.values_are_confidence:
                     current_clade.confidence = value
@@ -222,17 +419,24 @@ class Parser:
         return Newick.Tree(root=root_clade, rooted=self.rooted)
 
     def new_clade(self, parent=None):
-        """Return new Newick.Clade, optionally with temporary reference to parent."""
+        """Return new Newick.Clade, optionally with temporary reference to parent.
+
+        Overriding this method in a subclass is deprecated.
+        """
         clade = Newick.Clade()
         if parent:
             clade.parent = parent
         return clade
 
     def process_clade(self, clade):
-        """Remove node's parent and return it. Final processing of parsed clade."""
+        """Remove node's parent and return it. Final processing of parsed clade.
+
+        Overriding this method in a subclass is deprecated.
+        """
         if (
             (clade.name)
             and not (self.values_are_confidence or self.comments_are_confidence)
+            and not getattr(self, "topology_only", False)
             and (clade.confidence is None)
             and (clade.clades)
         ):
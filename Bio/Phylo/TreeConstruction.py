@@ -10,6 +10,11 @@
 import itertools
 import copy
 import numbers
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
 from Bio.Phylo import BaseTree
 from Bio.Align import Alignment, MultipleSeqAlignment
 from Bio.Align import substitution_matrices
@@ -311,26 +316,391 @@ class _Matrix:
         return matrix_string.expandtabs(tabsize=4)
 
 
+class _DistanceMatrixRow(list):
+    """Row of a DistanceMatrix in lower triangular format (PRIVATE).
+
+    This is a list of the distances in the row, as previously used to store
+    them, except that setting an element also sets the distance stored in
+    the DistanceMatrix. The length of the row cannot be changed, and the
+    diagonal is always zero. Copies (including pickled copies) are lists.
+    """
+
+    __slots__ = ("_dm", "_index")
+
+    def __init__(self, dm, index, values):
+        super().__init__(values)
+        self._dm = dm
+        self._index = index
+
+    def __setitem__(self, j, value):
+        if isinstance(j, slice):
+            positions = range(*j.indices(len(self)))
+            value = list(value)
+            if len(value) != len(positions):
+                raise ValueError("The length of a row cannot be changed.")
+            for k, v in zip(positions, value):
+                self[k] = v
+            return
+        i = self._index
+        j = range(i + 1)[j]
+        if j == i:
+            if value != 0:
+                raise ValueError("The diagonal of a distance matrix must be zero.")
+            return
+        dm = self._dm
+        dm[i, j] = value
+        # this row may have been dropped from the rows cached by dm
+        list.__setitem__(self, j, dm[i, j])
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+class _DistanceMatrixRows(list):
+    """Rows of a DistanceMatrix in lower triangular format (PRIVATE).
+
+    This is what the matrix attribute of a DistanceMatrix returns. It is a
+    list of rows, which can be read and modified like the nested lists
+    previously used to store the distances; assigning a row sets the
+    distances in the DistanceMatrix. Rows cannot be added, removed or
+    reordered (use the insert method or del on the DistanceMatrix instead).
+    """
+
+    __slots__ = ()
+
+    def __setitem__(self, i, row):
+        if isinstance(i, slice):
+            rows = list(row)
+            positions = range(*i.indices(len(self)))
+            if len(rows) != len(positions):
+                raise ValueError("Rows cannot be added or removed.")
+            for k, row in zip(positions, rows):
+                self[k][:] = row
+        else:
+            self[i][:] = row
+
+    def __reduce__(self):
+        return (list, ([list(row) for row in self],))
+
+
+def _unsupported(message):
+    """Return a method raising ValueError with the given message (PRIVATE)."""
+
+    def method(self, *args, **kwargs):
+        raise ValueError(message)
+
+    return method
+
+
+# list methods changing the number or the order of the elements
+for _name in (
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "clear",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "reverse",
+    "sort",
+):
+    setattr(
+        _DistanceMatrixRow,
+        _name,
+        _unsupported("The length or order of a row cannot be changed."),
+    )
+    setattr(
+        _DistanceMatrixRows,
+        _name,
+        _unsupported("Rows cannot be added, removed or reordered."),
+    )
+del _name
+
+
 class DistanceMatrix(_Matrix):
     """Distance matrix class that can be used for distance based tree algorithms.
 
     All diagonal elements will be zero no matter what the users provide.
+
+    The distances are stored in a condensed NumPy array holding the lower
+    triangle of the matrix row by row, without the diagonal, so that large
+    matrices take a single block of memory. Besides a lower triangular list
+    of lists, the matrix may be given as a square NumPy array, of which the
+    lower triangle is used.
+
+    >>> import numpy as np
+    >>> from Bio.Phylo.TreeConstruction import DistanceMatrix
+    >>> dm = DistanceMatrix(['A', 'B', 'C'], np.array([[0, 1, 2], [1, 0, 3], [2, 3, 0]]))
+    >>> dm
+    DistanceMatrix(names=['A', 'B', 'C'], matrix=[[0], [1, 0], [2, 3, 0]])
+    >>> dm['A', 'C']
+    2
+    >>> dm['B']
+    [1, 0, 3]
     """
 
     def __init__(self, names, matrix=None):
         """Initialize the class."""
-        _Matrix.__init__(self, names, matrix)
-        self._set_zero_diagonal()
+        if isinstance(names, list) and all(isinstance(s, str) for s in names):
+            if len(set(names)) == len(names):
+                self.names = names
+            else:
+                raise ValueError("Duplicate names found")
+        else:
+            raise TypeError("'names' should be a list of strings")
+        n = len(names)
+        self._rows = None
+        if matrix is None:
+            self._distances = np.zeros(n * (n - 1) // 2, int)
+        elif isinstance(matrix, np.ndarray):
+            if matrix.shape != (n, n):
+                raise ValueError("'names' and 'matrix' should be the same size")
+            self._distances = _condense(matrix)
+        else:
+            self.matrix = matrix
+
+    @property
+    def matrix(self):
+        """Distances in lower triangular format, as a list of rows.
+
+        The rows are lists, which can be modified in place as before; any
+        changes are stored in this DistanceMatrix. Rows cannot be added or
+        removed this way. The rows are created on first access, and kept
+        up to date until a row is inserted or deleted.
+        """
+        rows = self._rows
+        if rows is None:
+            distances = self._distances.tolist()
+            rows = _DistanceMatrixRows(
+                _DistanceMatrixRow(
+                    self, i, distances[i * (i - 1) // 2 : i * (i + 1) // 2] + [0]
+                )
+                for i in range(len(self))
+            )
+            self._rows = rows
+        return rows
+
+    @matrix.setter
+    def matrix(self, matrix):
+        # check if all elements are numbers
+        if not (
+            isinstance(matrix, list)
+            and all(isinstance(row, list) for row in matrix)
+            and all(isinstance(item, numbers.Number) for row in matrix for item in row)
+        ):
+            raise TypeError("'matrix' should be a list of numerical lists")
+        # check if the same length with names
+        if len(matrix) != len(self.names):
+            raise ValueError("'names' and 'matrix' should be the same size")
+        # check if is lower triangle format
+        if [len(row) for row in matrix] != list(range(1, len(self) + 1)):
+            raise ValueError("'matrix' should be in lower triangle format")
+        values = list(itertools.chain.from_iterable(row[:-1] for row in matrix))
+        if values:
+            self._distances = np.array(values)
+        else:
+            self._distances = np.zeros(0, int)
+        self._rows = None
+
+    def _index(self, item):
+        """Return the index of a name or an index, checking its range (PRIVATE)."""
+        if isinstance(item, int):
+            index = item
+        elif isinstance(item, str):
+            if item in self.names:
+                index = self.names.index(item)
+            else:
+                raise ValueError("Item not found.")
+        else:
+            raise TypeError("Invalid index type.")
+        if index > len(self) - 1:
+            raise IndexError("Index out of range.")
+        return index
+
+    def _pair_index(self, item):
+        """Return the row and column of a pair in the lower triangle (PRIVATE).
+
+        Returns None for a diagonal element.
+        """
+        if len(item) != 2:
+            raise TypeError("Invalid index type.")
+        if all(isinstance(i, int) for i in item):
+            row_index, col_index = item
+        elif all(isinstance(i, str) for i in item):
+            row_name, col_name = item
+            if row_name in self.names and col_name in self.names:
+                row_index = self.names.index(row_name)
+                col_index = self.names.index(col_name)
+            else:
+                raise ValueError("Item not found.")
+        else:
+            raise TypeError("Invalid index type.")
+        if row_index > len(self) - 1 or col_index > len(self) - 1:
+            raise IndexError("Index out of range.")
+        # allow negative indices as for the nested lists
+        row_index %= len(self)
+        col_index %= len(self)
+        if row_index == col_index:
+            return None
+        if row_index < col_index:
+            row_index, col_index = col_index, row_index
+        return row_index, col_index
+
+    def _row_indices(self, index):
+        """Return the positions of a row in the condensed array (PRIVATE)."""
+        index %= len(self)
+        start = index * (index - 1) // 2
+        rows = np.arange(index + 1, len(self))
+        return start, rows * (rows - 1) // 2 + index
+
+    def __getitem__(self, item):
+        """Access value(s) by the index(s) or name(s).
+
+        For a DistanceMatrix object 'dm'::
+
+            dm[i]                   get a value list from the given 'i' to others;
+            dm[i, j]                get the value between 'i' and 'j';
+            dm['name']              map name to index first
+            dm['name1', 'name2']    map name to index first
+
+        """
+        distances = self._distances
+        if isinstance(item, (int, str)):
+            index = self._index(item)
+            start, upper = self._row_indices(index)
+            lower = distances[start : start + index % len(self)]
+            return lower.tolist() + [0] + distances[upper].tolist()
+        else:
+            pair = self._pair_index(item)
+            if pair is None:
+                return 0
+            row_index, col_index = pair
+            return distances[row_index * (row_index - 1) // 2 + col_index].item()
 
     def __setitem__(self, item, value):
-        """Set Matrix's items to values."""
-        _Matrix.__setitem__(self, item, value)
-        self._set_zero_diagonal()
+        """Set value by the index(s) or name(s).
 
-    def _set_zero_diagonal(self):
-        """Set all diagonal elements to zero (PRIVATE)."""
-        for i in range(0, len(self)):
-            self.matrix[i][i] = 0
+        Similar to __getitem__::
+
+            dm[1] = [1, 0, 3, 4]    set values from '1' to others;
+            dm[i, j] = 2            set the value from 'i' to 'j'
+
+        Values on the diagonal are ignored.
+        """
+        if isinstance(item, (int, str)):
+            index = self._index(item)
+            # check and assign value
+            if not (
+                isinstance(value, list)
+                and all(isinstance(n, numbers.Number) for n in value)
+            ):
+                raise TypeError("Invalid value type.")
+            if len(value) != len(self):
+                raise ValueError("Value not the same size.")
+            index %= len(self)
+            values = np.array(value[:index] + value[index + 1 :])
+            self._upcast(values)
+            start, upper = self._row_indices(index)
+            self._distances[start : start + index] = values[:index]
+            self._distances[upper] = values[index:]
+            rows = self._rows
+            if rows is not None:
+                row = self[index]
+                list.__setitem__(rows[index], slice(None, index), row[:index])
+                for j in range(index + 1, len(self)):
+                    list.__setitem__(rows[j], index, row[j])
+        else:
+            pair = self._pair_index(item)
+            if not isinstance(value, numbers.Number):
+                raise TypeError("Invalid value type.")
+            if pair is not None:
+                row_index, col_index = pair
+                position = row_index * (row_index - 1) // 2 + col_index
+                self._upcast(np.array(value))
+                self._distances[position] = value
+                rows = self._rows
+                if rows is not None:
+                    value = self._distances[position].item()
+                    list.__setitem__(rows[row_index], col_index, value)
+
+    def _upcast(self, values):
+        """Convert the distances to a type that can store the values (PRIVATE).
+
+        All distances then have the same type; for example, storing a float
+        in a matrix of integers converts all its distances to floats.
+        """
+        dtype = np.result_type(self._distances, values)
+        if dtype != self._distances.dtype:
+            self._distances = self._distances.astype(dtype)
+            # the rows hold the values with their previous type
+            self._rows = None
+
+    def __delitem__(self, item):
+        """Delete related distances by the index or name."""
+        if isinstance(item, int):
+            index = item
+        elif isinstance(item, str):
+            index = self.names.index(item)
+        else:
+            raise TypeError("Invalid index type.")
+        index %= len(self)
+        start, upper = self._row_indices(index)
+        self._distances = np.delete(
+            self._distances, np.concatenate([np.arange(start, start + index), upper])
+        )
+        self._rows = None
+        # remove name
+        del self.names[index]
+
+    def insert(self, name, value, index=None):
+        """Insert distances given the name and value.
+
+        :Parameters:
+            name : str
+                name of a row/col to be inserted
+            value : list
+                a row/col of values to be inserted
+
+        """
+        if isinstance(name, str):
+            # insert at the given index or at the end
+            if index is None:
+                index = len(self)
+            if not isinstance(index, int):
+                raise TypeError("Invalid index type.")
+            square = self._square(self._distances.dtype)
+            square = np.insert(square, index, 0, axis=0)
+            square = np.insert(square, index, 0, axis=1)
+            # insert name
+            self.names.insert(index, name)
+            self._distances = _condense(square)
+            self._rows = None
+            # assign value
+            self[index] = value
+        else:
+            raise TypeError("Invalid name type.")
+
+    def __len__(self):
+        """Matrix length."""
+        return len(self.names)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_rows"] = None
+        return state
+
+    def _square(self, dtype=float):
+        """Return the distances as a square NumPy array (PRIVATE)."""
+        n = len(self)
+        distances = self._distances
+        square = np.zeros((n, n), dtype)
+        for i in range(1, n):
+            row = distances[i * (i - 1) // 2 : i * (i + 1) // 2]
+            square[i, :i] = row
+            square[:i, i] = row
+        return square
 
     def format_phylip(self, handle):
         """Write data in Phylip format to a given file-like object or handle.
@@ -348,19 +718,90 @@ class DistanceMatrix(_Matrix):
         handle.write(f"    {len(self.names)}\n")
         # Phylip needs space-separated, vertically aligned columns
         name_width = max(12, max(map(len, self.names)) + 1)
-        value_fmts = ("{" + str(x) + ":.4f}" for x in range(1, len(self.matrix) + 1))
+        value_fmts = ("{" + str(x) + ":.4f}" for x in range(1, len(self) + 1))
         row_fmt = "{0:" + str(name_width) + "s}" + "  ".join(value_fmts) + "\n"
-        for i, (name, values) in enumerate(zip(self.names, self.matrix)):
-            # Mirror the matrix values across the diagonal
-            mirror_values = (self.matrix[j][i] for j in range(i + 1, len(self.matrix)))
-            fields = itertools.chain([name], values, mirror_values)
+        for i, name in enumerate(self.names):
+            fields = itertools.chain([name], self[i])
             handle.write(row_fmt.format(*fields))
 
 
+def _condense(square):
+    """Return the lower triangle of a square array as a condensed array (PRIVATE)."""
+    n = len(square)
+    if n < 2:
+        return np.zeros(0, square.dtype)
+    return np.concatenate([square[i, :i] for i in range(1, n)])
+
+
 # Shim for compatibility with Biopython<1.70 (#1304)
 _DistanceMatrix = DistanceMatrix
 
 
+# Approximate number of alignment letters in each block of columns processed
+# at once by the vectorized distance calculation.
+_DISTANCE_BLOCK_SIZE = 1 << 22
+
+# Alignment encoded as an array, used by the worker processes.
+_distance_worker_data = None
+
+
+def _distance_scores(codes, skip, table, start, end):
+    """Score rows start to end of an encoded alignment against all rows (PRIVATE).
+
+    Arguments:
+     - codes - alignment as a uint8 array of shape (sequences, columns)
+     - skip - boolean array of size 256, True for letters to skip
+     - table - None to score identical letters, or a 256 x 256 array of
+       substitution scores indexed by the letter codes
+     - start, end - the rows to score
+
+    Returns the score of each row against each other row, summed over the
+    columns where neither letter is skipped, and for a substitution matrix
+    also the score of each row against itself over these columns. Each
+    block of columns is scored with one matrix product per letter.
+    """
+    n, length = codes.shape
+    scores = np.zeros((end - start, n))
+    if table is None:
+        max_scores = None
+        # single precision is exact for counts up to 2**24
+        if length <= 1 << 24:
+            dtype = np.float32
+        else:
+            dtype = np.float64
+    else:
+        max_scores = np.zeros((end - start, n))
+    block = max(1, _DISTANCE_BLOCK_SIZE // max(n, 1))
+    for k in range(0, length, block):
+        columns = codes[:, k : k + block]
+        valid = ~skip[columns]
+        letters = np.unique(columns[valid])
+        if table is None:
+            for letter in letters:
+                x = (columns == letter).astype(dtype)
+                scores += x[start:end] @ x.T
+        else:
+            v = valid.astype(float)
+            for letter in letters:
+                x = (columns == letter).astype(float)
+                y = table[letter][columns] * v
+                scores += x[start:end] @ y.T
+            y = table[columns, columns] * v
+            max_scores += y[start:end] @ v.T
+    return scores, max_scores
+
+
+def _init_distance_worker(codes, skip, table):
+    """Store the encoded alignment in a worker process (PRIVATE)."""
+    global _distance_worker_data
+    _distance_worker_data = (codes, skip, table)
+
+
+def _distance_scores_worker(rows):
+    """Score a block of rows in a worker process (PRIVATE)."""
+    return _distance_scores(*_distance_worker_data, *rows)
+
+
 class DistanceCalculator:
     """Calculates the distance matrix from a DNA or protein sequence alignment.
 
@@ -375,6 +816,19 @@ class DistanceCalculator:
             The attribute ``dna_models`` contains the available model
             names for DNA sequences and ``protein_models`` for protein
             sequences.
+        skip_letters : tuple of str
+            Letters ignored when comparing sequences. By default, gaps
+            ("-") and stop codons ("*") are skipped for substitution
+            matrices, and no letters are skipped for the identity model.
+        workers : int
+            Number of processes used to calculate the distances. If None,
+            the number of CPUs is used. By default, the distances are
+            calculated in the current process.
+
+    The alignment is encoded once as an array of letters, and the scores
+    of all pairs of sequences are calculated together using matrix products
+    on blocks of alignment columns. If workers is larger than one, blocks
+    of rows of the distance matrix are distributed over a pool of processes.
 
     Examples
     --------
@@ -480,8 +934,9 @@ class DistanceCalculator:
 
     models = ["identity"] + dna_models + protein_models
 
-    def __init__(self, model="identity", skip_letters=None):
+    def __init__(self, model="identity", skip_letters=None, workers=1):
         """Initialize with a distance model."""
+        self.workers = workers
         # Shim for backward compatibility (#491)
         if skip_letters:
             self.skip_letters = skip_letters
@@ -556,23 +1011,102 @@ class DistanceCalculator:
         """
         if isinstance(msa, Alignment):
             names = [s.id for s in msa.sequences]
-            dm = DistanceMatrix(names)
-            n = len(names)
-            for i1 in range(n):
-                for i2 in range(i1):
-                    dm[names[i1], names[i2]] = self._pairwise(msa[i1], msa[i2])
         elif isinstance(msa, MultipleSeqAlignment):
             names = [s.id for s in msa]
-            dm = DistanceMatrix(names)
-            for seq1, seq2 in itertools.combinations(msa, 2):
-                dm[seq1.id, seq2.id] = self._pairwise(seq1, seq2)
         else:
             raise TypeError(
                 "Must provide an Alignment object or a MultipleSeqAlignment object."
             )
-
+        alphabet = None
+        if self.scoring_matrix is not None:
+            alphabet = self.scoring_matrix.alphabet
+        if isinstance(alphabet, tuple):
+            # Matrices such as codon substitution matrices cannot be applied
+            # letter by letter to the encoded alignment.
+            dm = DistanceMatrix(names)
+            if isinstance(msa, Alignment):
+                n = len(names)
+                for i1 in range(n):
+                    for i2 in range(i1):
+                        dm[names[i1], names[i2]] = self._pairwise(msa[i1], msa[i2])
+            else:
+                for seq1, seq2 in itertools.combinations(msa, 2):
+                    dm[seq1.id, seq2.id] = self._pairwise(seq1, seq2)
+            return dm
+        n = len(names)
+        if isinstance(msa, Alignment):
+            length = msa.length
+            codes = np.array(msa, "S1").view(np.uint8)
+        else:
+            length = msa.get_alignment_length()
+            codes = b"".join(bytes(record.seq) for record in msa)
+            codes = np.frombuffer(codes, np.uint8)
+        codes = codes.reshape(n, length)
+        scores, max_scores = self._get_scores(codes, names)
+        # The first sequence is the later one for an Alignment, and the
+        # earlier one for a MultipleSeqAlignment, as in previous versions.
+        if isinstance(msa, Alignment):
+            scores = np.tril(scores) + np.triu(scores.T, 1)
+        else:
+            scores = np.tril(scores.T) + np.triu(scores, 1)
+        if max_scores is None:
+            max_scores = np.full((n, n), float(length))
+        else:
+            # Take the higher score if the matrix is asymmetrical
+            max_scores = np.maximum(max_scores, max_scores.T)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            distances = 1 - scores / max_scores
+        distances[max_scores == 0] = 1  # max possible scaled distance
+        dm = DistanceMatrix(names, distances)
         return dm
 
+    def _get_scores(self, codes, names):
+        """Calculate the scores of all pairs of encoded sequences (PRIVATE)."""
+        skip = np.zeros(256, bool)
+        for letter in self.skip_letters:
+            if len(letter) == 1 and ord(letter) < 256:
+                skip[ord(letter)] = True
+        if self.scoring_matrix is None:
+            table = None
+        else:
+            alphabet = np.frombuffer(
+                self.scoring_matrix.alphabet.encode("latin-1"), np.uint8
+            )
+            known = np.zeros(256, bool)
+            known[alphabet] = True
+            valid = ~skip[codes]
+            bad = valid & ~known[codes]
+            # letters are only scored if another sequence has a letter there
+            bad &= valid.sum(axis=0) > 1
+            if bad.any():
+                i, k = np.argwhere(bad)[0]
+                raise ValueError(
+                    f"Bad letter '{chr(codes[i, k])}' in sequence '{names[i]}' "
+                    f"at position '{k}'"
+                )
+            table = np.zeros((256, 256))
+            table[np.ix_(alphabet, alphabet)] = np.array(self.scoring_matrix)
+        n = len(codes)
+        workers = self.workers
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers == 1 or n < 2:
+            return _distance_scores(codes, skip, table, 0, n)
+        # Distribute blocks of rows over the processes
+        step = -(-n // (4 * workers))
+        rows = [(start, min(start + step, n)) for start in range(0, n, step)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_distance_worker,
+            initargs=(codes, skip, table),
+        ) as executor:
+            results = list(executor.map(_distance_scores_worker, rows))
+        scores = np.concatenate([result[0] for result in results])
+        if table is None:
+            return scores, None
+        max_scores = np.concatenate([result[1] for result in results])
+        return scores, max_scores
+
 
 class TreeConstructor:
     """Base class for all tree constructor."""
@@ -719,23 +1253,24 @@ class DistanceTreeConstructor(TreeConstructor):
         if not isinstance(distance_matrix, DistanceMatrix):
             raise TypeError("Must provide a DistanceMatrix object.")
 
-        # make a copy of the distance matrix to be used
-        dm = copy.deepcopy(distance_matrix)
         # init terminal clades
-        clades = [BaseTree.Clade(None, name) for name in dm.names]
-        # init minimum index
-        min_i = 0
-        min_j = 0
+        clades = [BaseTree.Clade(None, name) for name in distance_matrix.names]
+        heights = [0] * len(clades)
+        d, alive, minima, argmins = _joining_matrix(distance_matrix)
         inner_count = 0
-        while len(dm) > 1:
-            min_dist = dm[1, 0]
-            # find minimum index
-            for i in range(1, len(dm)):
-                for j in range(0, i):
-                    if min_dist >= dm[i, j]:
-                        min_dist = dm[i, j]
-                        min_i = i
-                        min_j = j
+        m = len(clades)
+        while m > 1:
+            if 2 * m <= len(d):
+                keep = np.flatnonzero(alive)
+                clades = [clades[k] for k in keep]
+                heights = [heights[k] for k in keep]
+                d, alive, minima, argmins = _compact_joining_matrix(d, keep)
+            # find the minimum index, taking the last minimum pair in the
+            # order of the rows and columns of the lower triangle
+            min_dist = minima.min()
+            min_i = np.flatnonzero(minima == min_dist)[-1]
+            min_j = np.flatnonzero(d[min_i, :min_i] == min_dist)[-1]
+            min_dist = min_dist.item()
 
             # create clade
             clade1 = clades[min_i]
@@ -745,28 +1280,37 @@ class DistanceTreeConstructor(TreeConstructor):
             inner_clade.clades.append(clade1)
             inner_clade.clades.append(clade2)
             # assign branch length
-            clade1.branch_length = min_dist * 1.0 / 2 - self._height_of(clade1)
-            clade2.branch_length = min_dist * 1.0 / 2 - self._height_of(clade2)
+            clade1.branch_length = min_dist * 1.0 / 2 - heights[min_i]
+            clade2.branch_length = min_dist * 1.0 / 2 - heights[min_j]
+            heights[min_j] = max(
+                heights[min_i] + clade1.branch_length,
+                heights[min_j] + clade2.branch_length,
+            )
 
             # update node list
             clades[min_j] = inner_clade
-            del clades[min_i]
+            clades[min_i] = None
 
-            # rebuild distance matrix,
             # set the distances of new node at the index of min_j
-            for k in range(0, len(dm)):
-                if k != min_i and k != min_j:
-                    dm[min_j, k] = (dm[min_i, k] + dm[min_j, k]) / 2
-
-            dm.names[min_j] = "Inner" + str(inner_count)
-
-            del dm[min_i]
+            row = (d[min_i] + d[min_j]) / 2
+            _join_rows(d, alive, minima, argmins, min_i, min_j, row)
+            m -= 1
         inner_clade.branch_length = 0
         return BaseTree.Tree(inner_clade)
 
     def nj(self, distance_matrix):
         """Construct and return a Neighbor Joining tree.
 
+        As in RapidNJ, each row of the distance matrix is sorted, and only
+        scanned as far as the bound on the Q matrix allows, so that only the
+        few pairs that may hold the minimum of the Q matrix are evaluated.
+        The rows are sorted by the distance minus the node distance of each
+        column at the time of sorting, and sorted again once the node
+        distances have changed too much, which keeps the bound tight. The
+        time taken for each join is then close to linear in the number of
+        nodes. The distances are held in a square array of 8 bytes per
+        entry, with two more arrays of the same shape for the sorted rows.
+
         :Parameters:
             distance_matrix : DistanceMatrix
                 The distance matrix for tree construction.
@@ -775,12 +1319,9 @@ class DistanceTreeConstructor(TreeConstructor):
         if not isinstance(distance_matrix, DistanceMatrix):
             raise TypeError("Must provide a DistanceMatrix object.")
 
-        # make a copy of the distance matrix to be used
-        dm = copy.deepcopy(distance_matrix)
+        dm = distance_matrix
         # init terminal clades
         clades = [BaseTree.Clade(None, name) for name in dm.names]
-        # init node distance
-        node_dist = [0] * len(dm)
         # init minimum index
         min_i = 0
         min_j = 0
@@ -805,25 +1346,96 @@ class DistanceTreeConstructor(TreeConstructor):
             root = clades[0]
 
             return BaseTree.Tree(root, rooted=False)
-        while len(dm) > 2:
-            # calculate nodeDist
-            for i in range(0, len(dm)):
-                node_dist[i] = 0
-                for j in range(0, len(dm)):
-                    node_dist[i] += dm[i, j]
-                node_dist[i] = node_dist[i] / (len(dm) - 2)
-
-            # find minimum distance pair
-            min_dist = dm[1, 0] - node_dist[1] - node_dist[0]
-            min_i = 0
-            min_j = 1
-            for i in range(1, len(dm)):
-                for j in range(0, i):
-                    temp = dm[i, j] - node_dist[i] - node_dist[j]
-                    if min_dist > temp:
-                        min_dist = temp
-                        min_i = i
-                        min_j = j
+        n = len(dm)
+        # The row sums are updated after each join instead of being
+        # recalculated; the bound on their rounding error decides which
+        # pairs are compared using the exact node distances.
+        d, alive, minima, argmins = _joining_matrix(dm)
+        np.fill_diagonal(d, 0)
+        sums = d.sum(axis=1)
+        np.fill_diagonal(d, np.inf)
+        eps = np.finfo(float).eps
+        scale = float(np.abs(dm._distances).max())
+        error = eps * n * n * scale
+        # As in RapidNJ, each row is sorted once, and scanned only as far as
+        # the bound on the Q matrix allows. The row of a new node holds the
+        # nodes present when it was created; later pairs are in later rows.
+        # Rows are sorted by the distance minus a reference node distance of
+        # each column, so that the bound only has to allow for the change of
+        # the node distances since then, rather than for their whole range.
+        created = np.zeros(n, int)
+        reference = None
+        m = n
+        while m > 2:
+            if 2 * m <= len(d):
+                keep = np.flatnonzero(alive)
+                clades = [clades[k] for k in keep]
+                sums = sums[keep]
+                d, alive, minima, argmins = _compact_joining_matrix(d, keep)
+                reference = None
+            # approximate node distances, zero for the joined nodes
+            node_dist = sums / (m - 2)
+            if reference is not None:
+                change = (node_dist - reference)[alive]
+                spread = node_dist[alive].max() - node_dist[alive].min()
+                if change.max() - change.min() > spread / 4:
+                    reference = None
+            if reference is None:
+                reference = node_dist.copy()
+                values, columns = _sorted_rows(d, reference)
+                created = np.zeros(len(d), int)
+            change = (node_dist - reference)[alive].max()
+            tolerance = 2 * (error + eps * m * m * scale) / (m - 2)
+            tolerance += 4 * eps * (scale + 2 * np.abs(node_dist).max())
+            tolerance += 4 * eps * np.abs(reference).max()
+            # the minimum of each row gives an upper bound on the minimum of Q
+            best = (minima - node_dist - node_dist[argmins]).min()
+            rows = np.flatnonzero(alive)
+            # the first few entries of each sorted row usually give a much
+            # better bound, as the minimum of Q is mostly among them
+            head_cols = columns[rows, :4]
+            head = values[rows, :4] - node_dist[rows, None] - change
+            head_valid = alive[head_cols] & (created[head_cols] <= created[rows, None])
+            head_valid &= head <= best
+            if head_valid.any():
+                head_cols = head_cols[head_valid]
+                head_rows = np.broadcast_to(rows[:, None], head_valid.shape)[head_valid]
+                head_q = (
+                    d[head_rows, head_cols]
+                    - node_dist[head_rows]
+                    - node_dist[head_cols]
+                )
+                best = min(best, head_q.min())
+            limits = best + 2 * tolerance + node_dist[rows] + change
+            counts = _count_sorted(values, rows, limits)
+            rows = np.repeat(rows, counts)
+            starts = np.repeat(np.cumsum(counts) - counts, counts)
+            positions = np.arange(len(rows)) - starts
+            cols = columns[rows, positions]
+            valid = alive[cols] & (created[cols] <= created[rows])
+            rows = rows[valid]
+            cols = cols[valid]
+            q = d[rows, cols] - node_dist[rows] - node_dist[cols]
+            selected = q <= q.min() + 2 * tolerance
+            pairs = zip(rows[selected].tolist(), cols[selected].tolist())
+            pairs = sorted({(max(i, j), min(i, j)) for i, j in pairs})
+
+            # find minimum distance pair using the exact node distances
+            order = np.flatnonzero(alive)
+            exact = {}
+            for i in {i for pair in pairs for i in pair}:
+                distances = d[i, order]
+                distances[np.searchsorted(order, i)] = 0
+                exact[i] = np.cumsum(distances)[-1].item() / (m - 2)
+            min_dist = None
+            for i, j in pairs:
+                temp = d[i, j].item() - exact[i] - exact[j]
+                if min_dist is None or min_dist > temp:
+                    min_dist = temp
+                    min_i = i
+                    min_j = j
+            if min_i == order[1] and min_j == order[0]:
+                min_i, min_j = min_j, min_i
             # create clade
             clade1 = clades[min_i]
             clade2 = clades[min_j]
@@ -832,38 +1444,45 @@ class DistanceTreeConstructor(TreeConstructor):
             inner_clade.clades.append(clade1)
             inner_clade.clades.append(clade2)
             # assign branch length
-            clade1.branch_length = (
-                dm[min_i, min_j] + node_dist[min_i] - node_dist[min_j]
-            ) / 2.0
-            clade2.branch_length = dm[min_i, min_j] - clade1.branch_length
+            dist = d[min_i, min_j].item()
+            clade1.branch_length = (dist + exact[min_i] - exact[min_j]) / 2.0
+            clade2.branch_length = dist - clade1.branch_length
 
             # update node list
             clades[min_j] = inner_clade
-            del clades[min_i]
+            clades[min_i] = None
 
-            # rebuild distance matrix,
             # set the distances of new node at the index of min_j
-            for k in range(0, len(dm)):
-                if k != min_i and k != min_j:
-                    dm[min_j, k] = (
-                        dm[min_i, k] + dm[min_j, k] - dm[min_i, min_j]
-                    ) / 2.0
-
-            dm.names[min_j] = "Inner" + str(inner_count)
-            del dm[min_i]
+            row = (d[min_i] + d[min_j] - dist) / 2.0
+            others = alive.copy()
+            others[min_i] = others[min_j] = False
+            sums[others] += row[others] - d[min_i, others] - d[min_j, others]
+            sums[min_j] = row[others].sum()
+            sums[min_i] = 0
+            if others.any():
+                scale = max(scale, float(np.abs(row[others]).max()))
+            error += 2 * eps * (m + 4) * scale
+            _join_rows(d, alive, minima, argmins, min_i, min_j, row)
+            reference[min_j] = sums[min_j] / max(m - 3, 1)
+            keys = row - reference
+            columns[min_j] = np.argsort(keys)
+            values[min_j] = keys[columns[min_j]]
+            created[min_j] = n - m + 1
+            m -= 1
 
         # set the last clade as one of the child of the inner_clade
+        i, j = np.flatnonzero(alive)
         root = None
-        if clades[0] == inner_clade:
-            clades[0].branch_length = 0
-            clades[1].branch_length = dm[1, 0]
-            clades[0].clades.append(clades[1])
-            root = clades[0]
+        if clades[i] is inner_clade:
+            clades[i].branch_length = 0
+            clades[j].branch_length = d[j, i].item()
+            clades[i].clades.append(clades[j])
+            root = clades[i]
         else:
-            clades[0].branch_length = dm[1, 0]
-            clades[1].branch_length = 0
-            clades[1].clades.append(clades[0])
-            root = clades[1]
+            clades[i].branch_length = d[j, i].item()
+            clades[j].branch_length = 0
+            clades[j].clades.append(clades[i])
+            root = clades[j]
 
         return BaseTree.Tree(root, rooted=False)
 
@@ -877,6 +1496,92 @@ class DistanceTreeConstructor(TreeConstructor):
         return height
 
 
+def _joining_matrix(distance_matrix):
+    """Prepare a distance matrix for joining pairs of nodes (PRIVATE).
+
+    Returns the distances as a square array with infinity on the diagonal,
+    a mask of the rows in use, and the minimum of each row with its index.
+    Joined nodes are removed by setting their row and column to infinity.
+    """
+    d = distance_matrix._square()
+    np.fill_diagonal(d, np.inf)
+    alive = np.ones(len(d), bool)
+    return d, alive, d.min(axis=1), d.argmin(axis=1)
+
+
+def _compact_joining_matrix(d, keep):
+    """Remove the rows and columns of joined nodes from the matrix (PRIVATE)."""
+    d = d[np.ix_(keep, keep)]
+    alive = np.ones(len(d), bool)
+    return d, alive, d.min(axis=1), d.argmin(axis=1)
+
+
+def _join_rows(d, alive, minima, argmins, i, j, row):
+    """Replace nodes i and j of the matrix by a node with distances row (PRIVATE).
+
+    The new node is stored at index j, and the row minima are updated.
+    """
+    d[j] = row
+    d[:, j] = row
+    d[j, j] = np.inf
+    d[i] = np.inf
+    d[:, i] = np.inf
+    alive[i] = False
+    minima[i] = np.inf
+    stale = alive & ((argmins == i) | (argmins == j))
+    stale[j] = True
+    closer = alive & ~stale & (row < minima)
+    minima[closer] = row[closer]
+    argmins[closer] = j
+    stale = np.flatnonzero(stale)
+    minima[stale] = d[stale].min(axis=1)
+    argmins[stale] = d[stale].argmin(axis=1)
+
+
+def _sorted_rows(d, offsets):
+    """Sort each row of a matrix minus offsets, returning values and columns (PRIVATE).
+
+    The offsets are subtracted from each row, to sort by d[i, j] - offsets[j].
+    """
+    columns = np.empty(d.shape, np.int32)
+    values = np.empty(d.shape)
+    step = max(1, (1 << 22) // max(len(d), 1))
+    for start in range(0, len(d), step):
+        block = d[start : start + step] - offsets
+        columns[start : start + step] = np.argsort(block, axis=1)
+        values[start : start + step] = np.take_along_axis(
+            block, columns[start : start + step], axis=1
+        )
+    return values, columns
+
+
+def _count_sorted(values, rows, limits):
+    """Count the values up to the limit of each row of a sorted matrix (PRIVATE).
+
+    As the counts are mostly small, the rows are searched from the start in
+    steps of increasing size, and then by bisection within the last step.
+    """
+    size = values.shape[1]
+    low = np.zeros(len(rows), int)
+    high = np.full(len(rows), size)
+    active = np.arange(len(rows))
+    end = 1
+    while len(active) and end <= size:
+        below = values[rows[active], end - 1] <= limits[active]
+        high[active[~below]] = end - 1
+        active = active[below]
+        low[active] = end
+        end *= 2
+    active = np.flatnonzero(low < high)
+    while len(active):
+        middle = (low[active] + high[active]) // 2
+        below = values[rows[active], middle] <= limits[active]
+        low[active[below]] = middle[below] + 1
+        high[active[~below]] = middle[~below]
+        active = active[low[active] < high[active]]
+    return low
+
+
 # #################### Tree Scoring and Searching Classes #####################
 
 
@@ -87,6 +87,8 @@ import re
 import string
 import warnings
 
+import numpy as np
+
 from Bio import BiopythonWarning
 from Bio.Restriction.PrintFormat import PrintFormat
 from Bio.Restriction.Restriction_Dictionary import rest_dict as enzymedict
@@ -220,12 +222,23 @@ class FormattedSeq:
         Pattern is the regular expression pattern corresponding to the
         enzyme restriction site.
         Size is the size of the restriction enzyme recognition-site size.
+
+        In a circular sequence the sites spanning the origin are searched
+        in the junction of the two ends only, instead of in a copy of the
+        whole sequence.
         """
+        data = self.data
         if self.is_linear():
-            data = self.data
-        else:
-            data = self.data + self.data[1:size]
-        return [(i.start(), i.group) for i in re.finditer(pattern, data)]
+            return [(i.start(), i.group) for i in re.finditer(pattern, data)]
+        if size > len(data):
+            # site longer than the sequence, wrap the whole sequence.
+            data = data + data[1:size]
+            return [(i.start(), i.group) for i in re.finditer(pattern, data)]
+        sites = [(i.start(), i.group) for i in re.finditer(pattern, data)]
+        offset = len(data) - size + 1
+        junction = data[offset:] + data[1:size]
+        sites += [(offset + i.start(), i.group) for i in re.finditer(pattern, junction)]
+        return sites
 
     def __getitem__(self, i):
         """Return substring of ``FormattedSeq``.
@@ -245,6 +258,176 @@ class FormattedSeq:
         return self.klass(self.data[i])
 
 
+class _SiteIndex:
+    """Index of a FormattedSeq to search many recognition sites at once (PRIVATE).
+
+    For internal use only.
+
+    The sequence is read once to build a table giving, for each word of
+    ``wordsize`` letters, the locations where this word starts. The
+    recognition sites of the enzymes are then looked up in this table using
+    their most specific word. The candidate locations are finally checked
+    against the other positions of the site, all the locations of an enzyme
+    at the same time.
+
+    The locations found are the same as the ones given by
+    ``FormattedSeq.finditer`` with the site of the enzyme. Circular sequences
+    are handled by wrapping the indices around the origin.
+    """
+
+    min_length = 5000
+    _alternatives = {}
+
+    def __init__(self, fseq, wordsize=6):
+        """Initialize the index with the sequence to search."""
+        data = fseq.data
+        self.length = length = len(data) - 1
+        self.linear = fseq.is_linear()
+        letters = np.frombuffer(data.encode("ASCII"), dtype=np.uint8)
+        (present,) = np.nonzero(np.bincount(letters, minlength=256))
+        self.alphabet = "".join(chr(c) for c in present)
+        # the last code is a padding used past the end of linear sequences.
+        self.base = base = len(present) + 1
+        while wordsize > 1 and base**wordsize > 1 << 20:
+            wordsize -= 1
+        self.wordsize = wordsize
+        lookup = np.zeros(256, dtype=np.uint8)
+        lookup[present] = np.arange(len(present))
+        self.codes = codes = lookup[letters]
+        words = np.zeros(length + 1, dtype=np.int32)
+        for i in range(wordsize):
+            words *= base
+            end = max(length + 1 - i, 0)
+            words[:end] += codes[i:]
+            if self.linear:
+                words[end:] += base - 1
+            else:
+                tail = np.arange(end, length + 1) + i
+                words[end:] += codes[(tail - 1) % length + 1]
+        self.order = np.argsort(words, kind="stable")
+        counts = np.bincount(words, minlength=base**wordsize)
+        self.bounds = np.concatenate(([0], np.cumsum(counts)))
+        self._masks = {}
+
+    @classmethod
+    def _parse(cls, pattern):
+        """Return the alternatives of a site pattern as lists of letters (PRIVATE).
+
+        Return None if the pattern is not made of named lookaheads with
+        letters, letter sets and dots only.
+        """
+        try:
+            return cls._alternatives[pattern]
+        except KeyError:
+            pass
+        sites = re.findall(r"\(\?=\(\?P<(\w+)>([^()]*)\)\)", pattern)
+        alternatives = []
+        for name, site in sites:
+            columns = re.findall(r"\[[A-Z]+\]|[A-Z]|\.", site)
+            if "".join(columns) != site:
+                alternatives = None
+                break
+            alternatives.append((name, [c.strip("[]") for c in columns]))
+        if "|".join(f"(?=(?P<{name}>{site}))" for name, site in sites) != pattern:
+            alternatives = None
+        cls._alternatives[pattern] = alternatives
+        return alternatives
+
+    def _mask(self, letters):
+        """Return the codes of the sequence matching a site position (PRIVATE)."""
+        try:
+            return self._masks[letters]
+        except KeyError:
+            pass
+        if letters == ".":
+            mask = np.array([c != "\n" for c in self.alphabet] + [False])
+        else:
+            mask = np.array([c in letters for c in self.alphabet] + [False])
+        self._masks[letters] = mask
+        return mask
+
+    def _find(self, columns):
+        """Return the sorted start locations of a site given as columns (PRIVATE)."""
+        length = self.length
+        size = len(columns)
+        if self.linear:
+            last = length + 1 - size
+        else:
+            last = length + min(size - 1, length) + 1 - size
+        if last < 0:
+            return np.zeros(0, dtype=np.intp)
+        masks = [self._mask(letters) for letters in columns]
+        wordsize = min(self.wordsize, size)
+        # use the word of the site matching the fewest words of the sequence.
+        counts = [int(np.count_nonzero(mask)) for mask in masks]
+        offset = min(
+            range(size - wordsize + 1),
+            key=lambda i: np.prod(counts[i : i + wordsize], dtype=float),
+        )
+        words = np.zeros(1, dtype=np.int64)
+        for mask in masks[offset : offset + wordsize]:
+            (allowed,) = np.nonzero(mask)
+            words = (words[:, None] * self.base + allowed).ravel()
+        span = self.base ** (self.wordsize - wordsize)
+        words *= span
+        starts = self.bounds[words]
+        ends = self.bounds[words + span]
+        locations = [self.order[i:j] for i, j in zip(starts, ends) if j > i]
+        if not locations:
+            return np.zeros(0, dtype=np.intp)
+        locations = np.sort(np.concatenate(locations)) - offset
+        if not self.linear:
+            # a word found at r starts the sites at r + k * length - offset
+            wrapped = [locations]
+            k = 1
+            while locations[0] + k * length <= last:
+                wrapped.append(locations[locations >= 1 - offset] + k * length)
+                k += 1
+            if len(wrapped) > 1:
+                locations = np.sort(np.concatenate(wrapped))
+        locations = locations[(locations >= 0) & (locations <= last)]
+        for i, mask in enumerate(masks):
+            if offset <= i < offset + wordsize or mask[:-1].all():
+                continue
+            indices = locations + i
+            if not self.linear:
+                indices = np.where(
+                    indices > length, (indices - 1) % length + 1, indices
+                )
+            locations = locations[mask[self.codes[indices]]]
+        return locations
+
+    def sites(self, enzyme):
+        """Return the locations of the sites of the enzyme on each strand.
+
+        Return a tuple of two sorted lists, the locations of the sites in the
+        same orientation as the enzyme site and the locations of the sites in
+        the reverse orientation. For palindromic enzymes, all the locations
+        are in the first list. Return None if the site of the enzyme cannot
+        be searched with the index.
+        """
+        alternatives = self._parse(enzyme.compsite.pattern)
+        if not alternatives:
+            return None
+        name = str(enzyme)
+        forward = []
+        reverse = []
+        found = np.zeros(0, dtype=np.intp)
+        for group, columns in alternatives:
+            # re only reports the first alternative matching at a location.
+            locations = np.setdiff1d(self._find(columns), found, assume_unique=True)
+            found = np.union1d(found, locations)
+            if group == name:
+                forward.append(locations)
+            else:
+                reverse.append(locations)
+        if enzyme.is_palindromic():
+            return found.tolist(), []
+        forward = np.sort(np.concatenate(forward)) if forward else found[:0]
+        reverse = np.sort(np.concatenate(reverse)) if reverse else found[:0]
+        return forward.tolist(), reverse.tolist()
+
+
 class RestrictionType(type):
     """RestrictionType. Type from which all enzyme classes are derived.
 
@@ -972,7 +1155,19 @@ class Palindromic(AbstractCut):
         Implement the search method for palindromic enzymes.
         """
         siteloc = cls.dna.finditer(cls.compsite, cls.size)
-        cls.results = [r for s, g in siteloc for r in cls._modify(s)]
+        return cls._cut_sites([s for s, g in siteloc], [])
+
+    @classmethod
+    def _cut_sites(cls, forward, reverse):
+        """Return the cutting sites for the given recognition sites (PRIVATE).
+
+        For internal use only.
+
+        forward and reverse are the sorted locations of the recognition
+        sites found on each strand. As the site of a palindromic enzyme is
+        the same on both strands, all the locations are given in forward.
+        """
+        cls.results = [r for s in forward for r in cls._modify(s)]
         if cls.results:
             cls._drop()
         return cls.results
@@ -1001,17 +1196,29 @@ class NonPalindromic(AbstractCut):
         Implement the search method for non palindromic enzymes.
         """
         iterator = cls.dna.finditer(cls.compsite, cls.size)
-        cls.results = []
-        modif = cls._modify
-        revmodif = cls._rev_modify
+        forward = []
+        reverse = []
         s = str(cls)
-        cls.on_minus = []
-
         for start, group in iterator:
             if group(s):
-                cls.results += list(modif(start))
+                forward.append(start)
             else:
-                cls.on_minus += list(revmodif(start))
+                reverse.append(start)
+        return cls._cut_sites(forward, reverse)
+
+    @classmethod
+    def _cut_sites(cls, forward, reverse):
+        """Return the cutting sites for the given recognition sites (PRIVATE).
+
+        For internal use only.
+
+        forward and reverse are the sorted locations of the recognition
+        sites found on the current and on the antiparallel strand.
+        """
+        modif = cls._modify
+        revmodif = cls._rev_modify
+        cls.results = [r for start in forward for r in modif(start)]
+        cls.on_minus = [r for start in reverse for r in revmodif(start)]
         cls.results += cls.on_minus
 
         if cls.results:
@@ -2230,17 +2437,37 @@ class RestrictionBatch(set):
             else:
                 self.already_mapped = str(dna), linear
                 fseq = FormattedSeq(dna, linear)
-                self.mapping = {x: x.search(fseq) for x in self}
+                self.mapping = self._search_all(fseq)
                 return self.mapping
         elif isinstance(dna, FormattedSeq):
             if (str(dna), dna.linear) == self.already_mapped:
                 return self.mapping
             else:
                 self.already_mapped = str(dna), dna.linear
-                self.mapping = {x: x.search(dna) for x in self}
+                self.mapping = self._search_all(dna)
                 return self.mapping
         raise TypeError(f"Expected Seq or MutableSeq instance, got {type(dna)} instead")
 
+    def _search_all(self, fseq):
+        """Return a dict of cutting sites for all the enzymes of the batch (PRIVATE).
+
+        Short sequences are searched by each enzyme in turn. Longer ones are
+        read only once to build a _SiteIndex in which the sites of all the
+        enzymes are looked up.
+        """
+        if len(self) < 2 or len(fseq) < _SiteIndex.min_length:
+            return {x: x.search(fseq) for x in self}
+        index = _SiteIndex(fseq)
+        mapping = {}
+        for enzyme in self:
+            sites = index.sites(enzyme)
+            if sites is None:
+                mapping[enzyme] = enzyme.search(fseq)
+            else:
+                enzyme.dna = fseq
+                mapping[enzyme] = enzyme._cut_sites(*sites)
+        return mapping
+
 
 ###############################################################################
 #                                                                             #
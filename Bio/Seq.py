@@ -21,8 +21,10 @@ See also the Seq_ wiki and the chapter in our tutorial:
 """
 
 import collections
+import itertools
 import numbers
 import warnings
+import weakref
 from abc import ABC
 from abc import abstractmethod
 from typing import Optional
@@ -1617,7 +1619,7 @@ class _SeqAbstractBaseClass(ABC):
             return Seq(None, n // 3)
 
         return self.__class__(
-            _translate_str(str(self), table, stop_symbol, to_stop, cds, gap=gap)
+            _translate_str(data, table, stop_symbol, to_stop, cds, gap=gap)
         )
 
     def complement(self, inplace=False):
@@ -2733,6 +2735,234 @@ def back_transcribe(rna):
         return rna.replace("U", "T").replace("u", "t")
 
 
+def _get_codon_table(table):
+    """Return the CodonTable object for a table name, NCBI identifier or object (PRIVATE)."""
+    try:
+        table_id = int(table)
+    except ValueError:
+        # Assume it's a table name
+        # The same table can be used for RNA or DNA
+        try:
+            return CodonTable.ambiguous_generic_by_name[table]
+        except KeyError:
+            if isinstance(table, str):
+                raise ValueError(
+                    "The Bio.Seq translate methods and function DO NOT "
+                    "take a character string mapping table like the python "
+                    "string object's translate method. "
+                    "Use str(my_seq).translate(...) instead."
+                ) from None
+            else:
+                raise TypeError("table argument must be integer or string") from None
+    except (AttributeError, TypeError):
+        # Assume it's a CodonTable object
+        if isinstance(table, CodonTable.CodonTable):
+            return table
+        else:
+            raise ValueError("Bad table argument") from None
+    else:
+        # Assume it's a table ID
+        # The same table can be used for RNA or DNA
+        return CodonTable.ambiguous_generic_by_id[table_id]
+
+
+def _valid_codon_letters(codon_table):
+    """Return the set of letters which may form a (possible stop) codon (PRIVATE)."""
+    if codon_table.nucleotide_alphabet is not None:
+        return set(codon_table.nucleotide_alphabet.upper())
+    else:
+        # Assume the worst case, ambiguous DNA or RNA:
+        return set(
+            IUPACData.ambiguous_dna_letters.upper()
+            + IUPACData.ambiguous_rna_letters.upper()
+        )
+
+
+# Sequences shorter than this are translated codon by codon, as setting up
+# the NumPy arrays for the lookup table would take longer:
+_MIN_LOOKUP_LENGTH = 240
+
+# Special values in the _CodonLookup codes array, other values are the
+# amino acid letters as bytes:
+_CODON_STOP = 0
+_CODON_POSSIBLE_STOP = 1
+_CODON_GAP = 2
+_CODON_INVALID = 3
+_CODON_UNRESOLVED = 255
+
+
+class _CodonLookup:
+    """Lookup table to translate all codons of a sequence at once (PRIVATE).
+
+    Each letter is first mapped to a small integer index (lower and upper
+    case to the same index), and each codon to a single index into an
+    array of amino acid letters (as bytes) or the special values above.
+    The array is filled in lazily using the CodonTable, so each distinct
+    codon is only looked up once per table.
+    """
+
+    def __init__(self, codon_table):
+        import numpy as np
+
+        # Include any letter which could appear in a valid codon:
+        letters = set(
+            IUPACData.ambiguous_dna_letters.upper()
+            + IUPACData.ambiguous_rna_letters.upper()
+        )
+        if codon_table.nucleotide_alphabet is not None:
+            letters.update(codon_table.nucleotide_alphabet.upper())
+        forward_table = codon_table.forward_table
+        if isinstance(forward_table, CodonTable.AmbiguousForwardTable):
+            letters.update(forward_table.ambiguous_nucleotide)
+            forward_table = forward_table.forward_table
+        for codon in itertools.chain(
+            forward_table, codon_table.start_codons, codon_table.stop_codons
+        ):
+            letters.update(codon)
+        letters = "".join(sorted({letter.upper() for letter in letters}))
+        # Reserve the last two indices for a gap and for anything else:
+        size = len(letters) + 2
+        index = np.full(256, size - 1, np.uint8)
+        self.usable = size < 256
+        for i, letter in enumerate(letters):
+            if len(letter) != 1 or ord(letter) > 255:
+                self.usable = False
+                break
+            index[ord(letter)] = i
+            index[ord(letter.lower())] = i
+        self.letters = letters
+        self.size = size
+        self.index = index
+        self.codes = np.full(size**3, _CODON_UNRESOLVED, np.uint8)
+        self.valid_letters = _valid_codon_letters(codon_table)
+
+    def _resolve(self, codon_table, values):
+        """Fill in the codes array for the given codon indices (PRIVATE).
+
+        If the table gives something other than a single letter for an
+        amino acid, which this lookup cannot represent, the usable
+        attribute is set to False.
+        """
+        letters = self.letters
+        size = self.size
+        gap_index = size - 2
+        forward_table = codon_table.forward_table
+        stop_codons = codon_table.stop_codons
+        codes = self.codes
+        for value in values.tolist():
+            indices = (value // (size * size), value // size % size, value % size)
+            if max(indices) >= gap_index:
+                if indices == (gap_index, gap_index, gap_index):
+                    codes[value] = _CODON_GAP
+                else:
+                    codes[value] = _CODON_INVALID
+                continue
+            codon = "".join(letters[i] for i in indices)
+            try:
+                amino_acid = forward_table[codon]
+            except (KeyError, CodonTable.TranslationError):
+                if codon in stop_codons:
+                    codes[value] = _CODON_STOP
+                elif self.valid_letters.issuperset(codon):
+                    codes[value] = _CODON_POSSIBLE_STOP
+                else:
+                    codes[value] = _CODON_INVALID
+            else:
+                if len(amino_acid) != 1 or not (
+                    _CODON_INVALID < ord(amino_acid) < _CODON_UNRESOLVED
+                ):
+                    self.usable = False
+                    return
+                codes[value] = ord(amino_acid)
+
+    def codes_for(self, data, codon_table, gap=None):
+        """Return an array of codes for each codon in the bytes data (PRIVATE).
+
+        Returns None if the codon table cannot be represented this way.
+        """
+        import numpy as np
+
+        index = self.index
+        if (
+            gap is not None
+            and len(gap) == 1
+            and ord(gap) < 256
+            and gap not in self.valid_letters
+        ):
+            # Only a codon of three gaps can be translated (as a gap)
+            index = index.copy()
+            index[ord(gap)] = self.size - 2
+        letters = index[np.frombuffer(data, np.uint8)].astype(np.intp)
+        size = self.size
+        values = letters[0::3] * (size * size)
+        values += letters[1::3] * size
+        values += letters[2::3]
+        codes = self.codes[values]
+        unresolved = codes == _CODON_UNRESOLVED
+        if unresolved.any():
+            self._resolve(codon_table, np.unique(values[unresolved]))
+            if not self.usable:
+                return None
+            codes = self.codes[values]
+        return codes
+
+    def translate(self, data, codon_table, stop_symbol, to_stop, cds, pos_stop, gap):
+        """Translate the bytes data (a whole number of codons) into a string (PRIVATE).
+
+        Returns None if the codon table cannot be represented this way.
+        """
+        import numpy as np
+
+        codes = self.codes_for(data, codon_table, gap)
+        if codes is None:
+            return None
+        n = len(codes)
+        stops = np.flatnonzero(codes == _CODON_STOP)
+        first_stop = stops[0] if len(stops) else n
+        invalid = np.flatnonzero(codes == _CODON_INVALID)
+        first_invalid = invalid[0] if len(invalid) else n
+        if (cds or to_stop) and first_stop < first_invalid:
+            if cds:
+                codon = data[3 * first_stop : 3 * first_stop + 3].decode("latin-1")
+                raise CodonTable.TranslationError(
+                    f"Extra in frame stop codon '{codon}' found."
+                )
+            codes = codes[:first_stop]
+        elif first_invalid < n:
+            codon = data[3 * first_invalid : 3 * first_invalid + 3].decode("latin-1")
+            raise CodonTable.TranslationError(f"Codon '{codon}' is invalid")
+        return (
+            codes.tobytes()
+            .decode("latin-1")
+            .translate(
+                {
+                    _CODON_STOP: stop_symbol,
+                    _CODON_POSSIBLE_STOP: pos_stop,
+                    _CODON_GAP: gap,
+                }
+            )
+        )
+
+
+_codon_lookups = weakref.WeakKeyDictionary()  # CodonTable to _CodonLookup
+
+
+def _get_codon_lookup(codon_table):
+    """Return the cached _CodonLookup for this CodonTable, or None (PRIVATE).
+
+    Returns None if the codon table cannot be represented as a lookup
+    table (e.g. it translates a codon to more than one letter).
+    """
+    try:
+        lookup = _codon_lookups[codon_table]
+    except KeyError:
+        lookup = _CodonLookup(codon_table)
+        _codon_lookups[codon_table] = lookup
+    if lookup.usable:
+        return lookup
+    return None
+
+
 def _translate_str(
     sequence, table, stop_symbol="*", to_stop=False, cds=False, pos_stop="X", gap=None
 ):
@@ -2798,45 +3028,12 @@ def _translate_str(
        ...
     Bio.Data.CodonTable.TranslationError: Extra in frame stop codon 'TAG' found.
     """
-    try:
-        table_id = int(table)
-    except ValueError:
-        # Assume it's a table name
-        # The same table can be used for RNA or DNA
-        try:
-            codon_table = CodonTable.ambiguous_generic_by_name[table]
-        except KeyError:
-            if isinstance(table, str):
-                raise ValueError(
-                    "The Bio.Seq translate methods and function DO NOT "
-                    "take a character string mapping table like the python "
-                    "string object's translate method. "
-                    "Use str(my_seq).translate(...) instead."
-                ) from None
-            else:
-                raise TypeError("table argument must be integer or string") from None
-    except (AttributeError, TypeError):
-        # Assume it's a CodonTable object
-        if isinstance(table, CodonTable.CodonTable):
-            codon_table = table
-        else:
-            raise ValueError("Bad table argument") from None
-    else:
-        # Assume it's a table ID
-        # The same table can be used for RNA or DNA
-        codon_table = CodonTable.ambiguous_generic_by_id[table_id]
+    codon_table = _get_codon_table(table)
     sequence = sequence.upper()
     amino_acids = []
     forward_table = codon_table.forward_table
     stop_codons = codon_table.stop_codons
-    if codon_table.nucleotide_alphabet is not None:
-        valid_letters = set(codon_table.nucleotide_alphabet.upper())
-    else:
-        # Assume the worst case, ambiguous DNA or RNA:
-        valid_letters = set(
-            IUPACData.ambiguous_dna_letters.upper()
-            + IUPACData.ambiguous_rna_letters.upper()
-        )
+    valid_letters = _valid_codon_letters(codon_table)
     n = len(sequence)
 
     # Check for tables with 'ambiguous' (dual-coding) stop codons:
@@ -2886,6 +3083,21 @@ def _translate_str(
         elif len(gap) > 1:
             raise ValueError("Gap character should be a single character string.")
 
+    if n >= _MIN_LOOKUP_LENGTH:
+        try:
+            data = sequence[: n - n % 3].encode("latin-1")
+        except UnicodeEncodeError:
+            pass  # Fall back on translating codon by codon
+        else:
+            lookup = _get_codon_lookup(codon_table)
+            if lookup is not None:
+                protein = lookup.translate(
+                    data, codon_table, stop_symbol, to_stop, cds, pos_stop, gap
+                )
+                if protein is not None:
+                    amino_acids.append(protein)
+                    return "".join(amino_acids)
+
     for i in range(0, n - n % 3, 3):
         codon = sequence[i : i + 3]
         try:
@@ -3016,6 +3228,59 @@ def translate(
         return _translate_str(sequence, table, stop_symbol, to_stop, cds, gap=gap)
 
 
+def translate_six_frames(
+    sequence, table="Standard", stop_symbol="*", to_stop=False, gap=None
+):
+    """Translate a nucleotide sequence in all six reading frames.
+
+    Returns a tuple of six translations, the three forward frames (starting
+    at the first, second and third letter) followed by the three frames of
+    the reverse complement. Each frame is trimmed to a whole number of
+    codons, so there are no partial codon warnings. If given a string, the
+    translations are strings; given a Seq or MutableSeq, they are Seq
+    objects.
+
+    The table, stop_symbol, to_stop and gap arguments are as for the
+    translate function (there is no cds argument, as at most one frame
+    could be a complete CDS). Long sequences are translated using a
+    lookup table for all the codons in each frame at once, rather than
+    codon by codon.
+
+    >>> for frame in translate_six_frames("ATGGCCATTGTAATGGGCCGCTGAAAGGGTGCC"):
+    ...     print(frame)
+    MAIVMGR*KGA
+    WPL*WAAERV
+    GHCNGPLKGC
+    GTLSAAHYNGH
+    APFQRPITMA
+    HPFSGPLQWP
+    >>> translate_six_frames(Seq("ATGGCCTAAAGG"), to_stop=True)[0]
+    Seq('MA')
+    """
+    if isinstance(sequence, (Seq, MutableSeq)):
+        sequence = Seq(sequence)
+        strands = (sequence, sequence.reverse_complement())
+        return tuple(
+            strand[offset : len(strand) - (len(strand) - offset) % 3].translate(
+                table, stop_symbol, to_stop, gap=gap
+            )
+            for strand in strands
+            for offset in range(3)
+        )
+    strands = (sequence, reverse_complement(sequence))
+    return tuple(
+        _translate_str(
+            strand[offset : len(strand) - (len(strand) - offset) % 3],
+            table,
+            stop_symbol,
+            to_stop,
+            gap=gap,
+        )
+        for strand in strands
+        for offset in range(3)
+    )
+
+
 def reverse_complement(sequence, inplace=False):
     """Return the reverse complement as a DNA sequence.
 
@@ -11,11 +11,22 @@
 """Bio.SeqIO support for the "fasta" (aka FastA or Pearson) file format.
 
 You are expected to use this module via the Bio.SeqIO functions.
+
+The exception is the FastaIndexedReader class, which gives random access to
+regions of the sequences in a (possibly BGZF compressed) FASTA file using a
+samtools style ``.fai`` index.
 """
 
+import collections.abc
+import os
+
+from Bio import bgzf
+from Bio.File import _open_for_random_access
 from Bio.Seq import Seq
+from Bio.Seq import SequenceDataAbstractBaseClass
 from Bio.SeqRecord import SeqRecord
 from Bio import BiopythonDeprecationWarning
+from Bio import BiopythonWarning
 
 
 from .Interfaces import _clean
@@ -651,6 +662,277 @@ class FastaTwoLineWriter(FastaWriter):
         return f">{title}\n{data}\n"
 
 
+def build_fai(handle):
+    """Return a samtools style index of a FASTA file, as a list of tuples.
+
+    Arguments:
+     - handle - input stream opened in binary mode, either a plain file or
+       a BGZF compressed file opened with Bio.bgzf in binary mode.
+
+    For each record a tuple (name, length, offset, linebases, linewidth) is
+    returned, as in the columns of a ``.fai`` file written by ``samtools
+    faidx``: the record name (the first word of the title line), the
+    sequence length, the (uncompressed) offset of the first letter of the
+    sequence, the number of letters on each line, and the number of bytes on
+    each line including the line ending. See also the write_fai and read_fai
+    functions.
+
+    All lines of a sequence except the last must be of the same length, or a
+    ValueError is raised:
+
+    >>> with open("GenBank/NC_005816.fna", "rb") as handle:
+    ...     for name, length, offset, linebases, linewidth in build_fai(handle):
+    ...         print(name, length, offset, linebases, linewidth)
+    gi|45478711|ref|NC_005816.1| 9609 106 70 71
+
+    """
+    index = []
+    names = set()
+    name = None
+    length = offset = linebases = linewidth = 0
+    last = False
+    position = 0
+    for line in handle:
+        width = len(line)
+        position += width
+        if line.startswith(b">"):
+            if name is not None:
+                index.append((name, length, offset, linebases, linewidth))
+            words = line[1:].split(None, 1)
+            name = words[0].decode() if words else ""
+            if name in names:
+                raise ValueError(f"Duplicate sequence name '{name}'")
+            names.add(name)
+            length = 0
+            offset = position
+            linebases = 0
+            linewidth = 0
+            last = False
+            continue
+        bases = len(line.rstrip(b"\r\n"))
+        if name is None:
+            if bases:
+                raise ValueError("Expected FASTA record starting with '>' character")
+            continue
+        if bases == 0:
+            # Allow for blank lines at the end of a record
+            last = True
+            continue
+        if linebases == 0:
+            linebases = bases
+            linewidth = width
+        elif last or bases > linebases:
+            raise ValueError(f"Different line length in sequence '{name}'")
+        if bases < linebases or width != linewidth:
+            last = True
+        length += bases
+    if name is not None:
+        index.append((name, length, offset, linebases, linewidth))
+    return index
+
+
+def write_fai(filename, index):
+    """Write a samtools compatible FASTA ``.fai`` index file.
+
+    The index should be a list of (name, length, offset, linebases,
+    linewidth) tuples, as returned by the build_fai function.
+    """
+    with open(filename, "w") as handle:
+        for name, length, offset, linebases, linewidth in index:
+            handle.write(f"{name}\t{length}\t{offset}\t{linebases}\t{linewidth}\n")
+
+
+def read_fai(filename):
+    """Read a samtools style FASTA ``.fai`` index file.
+
+    Returns a list of (name, length, offset, linebases, linewidth) tuples,
+    one for each record, as returned by the build_fai function.
+    """
+    index = []
+    with open(filename) as handle:
+        for line in handle:
+            words = line.rstrip("\r\n").split("\t")
+            if len(words) != 5:
+                raise ValueError(
+                    "FASTA .fai index lines should have 5 columns, found %i"
+                    % len(words)
+                )
+            name = words[0]
+            length, offset, linebases, linewidth = (int(word) for word in words[1:])
+            index.append((name, length, offset, linebases, linewidth))
+    return index
+
+
+class _FastaIndexedSequenceData(SequenceDataAbstractBaseClass):
+    """Stores information needed to retrieve sequence data from a FASTA file (PRIVATE).
+
+    Objects of this class store the file position at which the sequence data
+    start, the sequence length, and the number of letters and bytes on each
+    line, as found in a ``.fai`` index.
+
+    Only two methods are provided: __len__ and __getitem__. The former will
+    return the length of the sequence, while the latter returns the sequence
+    (as a bytes object) for the requested region. The byte offsets of the
+    region are calculated from the line length, so only the requested region
+    is read from the file.
+    """
+
+    __slots__ = ("stream", "offset", "length", "linebases", "linewidth")
+
+    def __init__(self, stream, offset, length, linebases, linewidth):
+        """Initialize the file stream and file position of the sequence data."""
+        self.stream = stream
+        self.offset = offset
+        self.length = length
+        self.linebases = linebases
+        self.linewidth = linewidth
+        super().__init__()
+
+    def _position(self, index):
+        """Return the file offset of the letter at the given index (PRIVATE)."""
+        line, column = divmod(index, self.linebases)
+        return self.offset + line * self.linewidth + column
+
+    def __getitem__(self, key):
+        """Return the sequence contents (as a bytes object) for the requested region."""
+        length = self.length
+        if isinstance(key, slice):
+            indices = range(*key.indices(length))
+            if len(indices) == 0:
+                return b""
+        else:
+            if key < 0:
+                key += length
+            if key < 0 or key >= length:
+                raise IndexError("index out of range")
+            indices = range(key, key + 1)
+        start = min(indices[0], indices[-1])
+        end = max(indices[0], indices[-1]) + 1
+        first = self._position(start)
+        last = self._position(end - 1) + 1
+        stream = self.stream
+        try:
+            if isinstance(stream, bgzf.BgzfReader):
+                stream.seek(first, uncompressed=True)
+            else:
+                stream.seek(first)
+        except ValueError as exception:
+            if str(exception) == "seek of closed file":
+                raise ValueError("cannot retrieve sequence: file is closed") from None
+            raise
+        data = stream.read(last - first)
+        if self.linewidth > self.linebases:
+            data = data.replace(b"\n", b"").replace(b"\r", b"")
+        if len(data) != end - start:
+            raise ValueError("Sequence data do not match the FASTA index")
+        if indices.step != 1:
+            data = data[indices[0] - start :: indices.step]
+        if isinstance(key, slice):
+            return data
+        else:  # single letter
+            return data[0]
+
+    def __len__(self):
+        """Get the sequence length."""
+        return self.length
+
+
+class FastaIndexedReader(collections.abc.Mapping):
+    """Random access to the sequences of a FASTA file with a samtools index.
+
+    This reads a samtools style ``.fai`` index of the FASTA file, and gives
+    dictionary-like access to the records by name. Only the sequence region
+    requested is read from the file, so for example taking a short slice of
+    the sequence of a chromosome does not load the whole chromosome. BGZF
+    compressed FASTA files (as written by ``bgzip``) are also supported,
+    using a samtools style ``.gzi`` index of the compressed blocks.
+
+    Arguments:
+     - filename - the FASTA file, either plain text or BGZF compressed.
+     - fai - optional filename of the ``.fai`` index, by default the FASTA
+       filename with ``.fai`` appended.
+     - gzi - optional filename of the ``.gzi`` index of a BGZF compressed
+       file, by default the FASTA filename with ``.gzi`` appended.
+
+    If an index file does not exist, the FASTA file is scanned to build it,
+    and the index is saved for next time (as ``samtools faidx`` would do).
+
+    The records returned only have an id (the sequence name) and a sequence,
+    as the ``.fai`` index does not store the rest of the title line. Their
+    sequence data are read from the file on demand, so the reader should only
+    be closed once they are no longer needed.
+    """
+
+    def __init__(self, filename, fai=None, gzi=None):
+        """Open the FASTA file and load or build its indices."""
+        filename = os.fspath(filename)
+        if fai is None:
+            fai = filename + ".fai"
+        stream = _open_for_random_access(filename)
+        try:
+            if isinstance(stream, bgzf.BgzfReader):
+                handle = stream._handle
+                if gzi is None:
+                    gzi = filename + ".gzi"
+                if os.path.isfile(gzi):
+                    blocks = bgzf.read_gzi(gzi)
+                else:
+                    handle.seek(0)
+                    blocks = bgzf.build_gzi(handle)
+                    self._save(bgzf.write_gzi, gzi, blocks)
+                handle.seek(0)
+                stream = bgzf.BgzfReader(mode="rb", fileobj=handle, gzi=blocks)
+            if os.path.isfile(fai):
+                index = read_fai(fai)
+            else:
+                index = build_fai(stream)
+                self._save(write_fai, fai, index)
+        except Exception:
+            stream.close()
+            raise
+        self.stream = stream
+        self.sequences = {}
+        for name, length, offset, linebases, linewidth in index:
+            data = _FastaIndexedSequenceData(
+                stream, offset, length, linebases, linewidth
+            )
+            self.sequences[name] = Seq(data)
+
+    @staticmethod
+    def _save(function, filename, index):
+        """Write an index file, warning if that is not possible (PRIVATE)."""
+        try:
+            function(filename, index)
+        except OSError as error:
+            warnings.warn(
+                f"Could not write index file {filename!r}: {error}",
+                BiopythonWarning,
+            )
+
+    def __getitem__(self, name):
+        """Return sequence associated with given name as a SeqRecord object."""
+        sequence = self.sequences[name]
+        return SeqRecord(sequence, id=name)
+
+    def __iter__(self):
+        """Iterate over the names of the sequences in file order."""
+        return iter(self.sequences)
+
+    def __len__(self):
+        """Return number of sequences."""
+        return len(self.sequences)
+
+    def close(self):
+        """Close the FASTA file."""
+        self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 def as_fasta(record):
     """Turn a SeqRecord into a FASTA formatted string."""
     warnings.warn(
@@ -372,8 +372,11 @@ from collections.abc import Sequence
 from typing import Union
 from collections.abc import Iterable
 import array
+import itertools
 from dataclasses import dataclass
 
+import numpy as np
+
 from Bio import BiopythonParserWarning
 from Bio import BiopythonWarning
 from Bio import BiopythonDeprecationWarning
@@ -396,6 +399,14 @@ INVALID_CHAR_CODE = 200
 INVALID_CHAR = bytes((INVALID_CHAR_CODE,))
 
 
+def _check_quality_type(quality_type: str) -> None:
+    """Check the quality_type argument of the parsers (PRIVATE)."""
+    if quality_type not in ("list", "array", "numpy"):
+        raise ValueError(
+            f"quality_type should be 'list', 'array' or 'numpy', not {quality_type!r}"
+        )
+
+
 def solexa_quality_from_phred(phred_quality: float) -> float:
     """Convert a PHRED quality (range 0 to about 90) to a Solexa quality.
 
@@ -560,6 +571,37 @@ def _get_phred_quality(record: SeqRecord) -> list[float] | list[int]:
         ) from None
 
 
+def _quality_table(mapping: dict[int, str]) -> bytes:
+    """Turn a mapping of quality scores to letters into a translation table (PRIVATE).
+
+    The table translates quality scores held in signed bytes, using their
+    value modulo 256. Scores which are not in the mapping become zero.
+    """
+    table = bytearray(256)
+    for quality, letter in mapping.items():
+        table[quality % 256] = ord(letter)
+    return bytes(table)
+
+
+def _encode_quality_bytes(qualities: Sequence[Any], table: bytes) -> str | None:
+    """Encode quality scores held in signed bytes with a translation table (PRIVATE).
+
+    This handles the array.array("b") and NumPy int8 arrays stored by the
+    parsers with the quality_type argument, without looping over the scores
+    in Python. Returns None for other types, or if a score is not in the
+    table, in which case the caller should fall back on the general code.
+    """
+    if isinstance(qualities, array.array):
+        if qualities.typecode != "b":
+            return None
+    elif not (isinstance(qualities, np.ndarray) and qualities.dtype == np.int8):
+        return None
+    encoded = qualities.tobytes().translate(table)
+    if 0 in encoded:
+        return None
+    return encoded.decode()
+
+
 # Only map 0 to 93, we need to give a warning on truncating at 93
 _phred_to_sanger_quality_str = {
     qp: chr(min(126, qp + SANGER_SCORE_OFFSET)) for qp in range(93 + 1)
@@ -569,6 +611,8 @@ _solexa_to_sanger_quality_str = {
     qs: chr(min(126, int(round(phred_quality_from_solexa(qs)) + SANGER_SCORE_OFFSET)))
     for qs in range(-5, 93 + 1)
 }
+_phred_to_sanger_quality_table = _quality_table(_phred_to_sanger_quality_str)
+_solexa_to_sanger_quality_table = _quality_table(_solexa_to_sanger_quality_str)
 
 
 def _get_sanger_quality_str(record: SeqRecord) -> str:
@@ -640,6 +684,9 @@ def _get_sanger_quality_str(record: SeqRecord) -> str:
         # Fall back on solexa scores...
         pass
     else:
+        encoded = _encode_quality_bytes(qualities, _phred_to_sanger_quality_table)
+        if encoded is not None:
+            return encoded
         # Try and use the precomputed mapping:
         try:
             return "".join(_phred_to_sanger_quality_str[qp] for qp in qualities)
@@ -664,6 +711,9 @@ def _get_sanger_quality_str(record: SeqRecord) -> str:
             "No suitable quality scores found in "
             "letter_annotations of SeqRecord (id=%s)." % record.id
         ) from None
+    encoded = _encode_quality_bytes(qualities, _solexa_to_sanger_quality_table)
+    if encoded is not None:
+        return encoded
     # Try and use the precomputed mapping:
     try:
         return "".join(_solexa_to_sanger_quality_str[qs] for qs in qualities)
@@ -695,6 +745,8 @@ _solexa_to_illumina_quality_str = {
     qs: chr(int(round(phred_quality_from_solexa(qs))) + SOLEXA_SCORE_OFFSET)
     for qs in range(-5, 62 + 1)
 }
+_phred_to_illumina_quality_table = _quality_table(_phred_to_illumina_quality_str)
+_solexa_to_illumina_quality_table = _quality_table(_solexa_to_illumina_quality_str)
 
 
 def _get_illumina_quality_str(record: SeqRecord) -> str:
@@ -715,6 +767,9 @@ def _get_illumina_quality_str(record: SeqRecord) -> str:
         # Fall back on solexa scores...
         pass
     else:
+        encoded = _encode_quality_bytes(qualities, _phred_to_illumina_quality_table)
+        if encoded is not None:
+            return encoded
         # Try and use the precomputed mapping:
         try:
             return "".join(_phred_to_illumina_quality_str[qp] for qp in qualities)
@@ -739,6 +794,9 @@ def _get_illumina_quality_str(record: SeqRecord) -> str:
             "No suitable quality scores found in "
             "letter_annotations of SeqRecord (id=%s)." % record.id
         ) from None
+    encoded = _encode_quality_bytes(qualities, _solexa_to_illumina_quality_table)
+    if encoded is not None:
+        return encoded
     # Try and use the precomputed mapping:
     try:
         return "".join(_solexa_to_illumina_quality_str[qs] for qs in qualities)
@@ -770,6 +828,8 @@ _phred_to_solexa_quality_str = {
     qp: chr(min(126, int(round(solexa_quality_from_phred(qp))) + SOLEXA_SCORE_OFFSET))
     for qp in range(62 + 1)
 }
+_solexa_to_solexa_quality_table = _quality_table(_solexa_to_solexa_quality_str)
+_phred_to_solexa_quality_table = _quality_table(_phred_to_solexa_quality_str)
 
 
 def _get_solexa_quality_str(record: SeqRecord) -> str:
@@ -790,6 +850,9 @@ def _get_solexa_quality_str(record: SeqRecord) -> str:
         # Fall back on PHRED scores...
         pass
     else:
+        encoded = _encode_quality_bytes(qualities, _solexa_to_solexa_quality_table)
+        if encoded is not None:
+            return encoded
         # Try and use the precomputed mapping:
         try:
             return "".join(_solexa_to_solexa_quality_str[qs] for qs in qualities)
@@ -814,6 +877,9 @@ def _get_solexa_quality_str(record: SeqRecord) -> str:
             "No suitable quality scores found in "
             "letter_annotations of SeqRecord (id=%s)." % record.id
         ) from None
+    encoded = _encode_quality_bytes(qualities, _phred_to_solexa_quality_table)
+    if encoded is not None:
+        return encoded
     # Try and use the precomputed mapping:
     try:
         return "".join(_phred_to_solexa_quality_str[qp] for qp in qualities)
@@ -1017,17 +1083,22 @@ class FastqIteratorAbstractBaseClass(SequenceIterator[str]):
         """Key name (string) of the quality values in record.letter_annotations."""
         pass
 
-    def __init__(self, source):
+    def __init__(self, source, quality_type="list"):
         """Iterate over FASTQ records as SeqRecord objects.
 
         Arguments:
          - source - input stream opened in text mode, or a path to a file
+         - quality_type - how to store the quality values, "list" (a list
+           of integers, default), "array" (an array.array of signed bytes)
+           or "numpy" (a NumPy int8 array)
 
         The quality values are stored in the `letter_annotations` dictionary
         attribute under the key `q_key`.
         """
+        _check_quality_type(quality_type)
         super().__init__(source, fmt="Fastq")
         self.line = None
+        self.quality_type = quality_type
 
     def __next__(self) -> SeqRecord:
         """Parse the file and generate SeqRecord objects."""
@@ -1113,7 +1184,13 @@ class FastqIteratorAbstractBaseClass(SequenceIterator[str]):
             raise InvalidCharError(quality_string, invalid_index, details)
 
         # Pass through (standard library) array to handle negative scores from old quality formats
-        qualities = array.array("b", byte_scores).tolist()
+        quality_type = self.quality_type
+        if quality_type == "list":
+            qualities = array.array("b", byte_scores).tolist()
+        elif quality_type == "array":
+            qualities = array.array("b", byte_scores)
+        else:
+            qualities = np.frombuffer(byte_scores, np.int8).copy()
 
         # SeqRecord._from_validated avoids length/type checking
         # .encode isn't strictly necessary (Seq init can handle a string), but it is faster to pre-encode
@@ -1151,12 +1228,16 @@ class FastqPhredIterator(FastqIteratorAbstractBaseClass):
         self,
         source: _TextIOSource,
         alphabet: None = None,
+        quality_type: str = "list",
     ):
         """Iterate over FASTQ records as SeqRecord objects.
 
         Arguments:
          - source - input stream opened in text mode, or a path to a file
          - alphabet - optional alphabet, no longer used. Leave as None.
+         - quality_type - how to store the quality values, "list" (a list
+           of integers, default), "array" (an array.array of signed bytes)
+           or "numpy" (a NumPy int8 array)
 
         For each sequence in a (Sanger style) FASTQ file there is a matching string
         encoding the PHRED qualities (integers between 0 and about 90) using ASCII
@@ -1228,7 +1309,7 @@ class FastqPhredIterator(FastqIteratorAbstractBaseClass):
         """
         if alphabet is not None:
             raise ValueError("The alphabet argument is no longer supported")
-        super().__init__(source)
+        super().__init__(source, quality_type)
 
 
 class FastqSolexaIterator(FastqIteratorAbstractBaseClass):
@@ -1253,12 +1334,16 @@ class FastqSolexaIterator(FastqIteratorAbstractBaseClass):
         self,
         source: _TextIOSource,
         alphabet: None = None,
+        quality_type: str = "list",
     ):
         r"""Iterate over FASTQ records as SeqRecord objects.
 
         Arguments:
          - source - input stream opened in text mode, or a path to a file
          - alphabet - optional alphabet, no longer used. Leave as None.
+         - quality_type - how to store the quality values, "list" (a list
+           of integers, default), "array" (an array.array of signed bytes)
+           or "numpy" (a NumPy int8 array)
 
         For each sequence in Solexa/Illumina FASTQ files there is a matching
         string encoding the Solexa integer qualities using ASCII values with an
@@ -1393,7 +1478,7 @@ class FastqSolexaIterator(FastqIteratorAbstractBaseClass):
         """
         if alphabet is not None:
             raise ValueError("The alphabet argument is no longer supported")
-        super().__init__(source)
+        super().__init__(source, quality_type)
 
 
 class FastqIlluminaIterator(FastqIteratorAbstractBaseClass):
@@ -1417,12 +1502,16 @@ class FastqIlluminaIterator(FastqIteratorAbstractBaseClass):
         self,
         source: _TextIOSource,
         alphabet: None = None,
+        quality_type: str = "list",
     ):
         """Iterate over FASTQ records as SeqRecord objects.
 
         Arguments:
          - source - input stream opened in text mode, or a path to a file
          - alphabet - optional alphabet, no longer used. Leave as None.
+         - quality_type - how to store the quality values, "list" (a list
+           of integers, default), "array" (an array.array of signed bytes)
+           or "numpy" (a NumPy int8 array)
 
         For each sequence in Illumina 1.3+ FASTQ files there is a matching
         string encoding PHRED integer qualities using ASCII values with an
@@ -1453,7 +1542,161 @@ class FastqIlluminaIterator(FastqIteratorAbstractBaseClass):
         """
         if alphabet is not None:
             raise ValueError("The alphabet argument is no longer supported")
-        super().__init__(source)
+        super().__init__(source, quality_type)
+
+
+@dataclass
+class FastqBatch:
+    """A batch of FASTQ records stored in NumPy arrays, see FastqBatchIterator.
+
+    Main attributes:
+     - titles     - title lines of the records, without the "@" (list of str)
+     - sequences  - letters of all the sequences, concatenated (uint8 array)
+     - qualities  - quality scores of all the letters, concatenated (int8 array)
+     - offsets    - start of each record in sequences and qualities, followed
+       by their total length (int64 array)
+     - q_key      - key of the qualities in the letter_annotations of a record
+
+    The sequence of record i is sequences[offsets[i]:offsets[i + 1]], and
+    likewise for its quality scores. The arrays are read-only.
+    """
+
+    titles: list[str]
+    sequences: np.ndarray
+    qualities: np.ndarray
+    offsets: np.ndarray
+    q_key: str
+
+    def __len__(self) -> int:
+        """Return the number of records in the batch."""
+        return len(self.titles)
+
+    def __getitem__(self, index: int) -> SeqRecord:
+        """Return record index of the batch as a SeqRecord.
+
+        The record is the same as the one given by the SeqRecord based
+        FASTQ iterators.
+        """
+        title = self.titles[index]
+        if index < 0:
+            index += len(self.titles)
+        start, end = self.offsets[index : index + 2]
+        id = title.split()[0]
+        return SeqRecord._from_validated(
+            Seq(self.sequences[start:end].tobytes()),
+            id=id,
+            name=id,
+            description=title,
+            letter_annotations={self.q_key: self.qualities[start:end].tolist()},
+        )
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Return the lengths of the records as an int64 array."""
+        return np.diff(self.offsets)
+
+    def mean_qualities(self) -> np.ndarray:
+        """Return the mean quality score of each record as a float array.
+
+        The mean of an empty record is NaN.
+        """
+        sums = np.concatenate(([0], np.cumsum(self.qualities, dtype=np.int64)))
+        sums = sums[self.offsets[1:]] - sums[self.offsets[:-1]]
+        with np.errstate(invalid="ignore"):
+            return sums / self.lengths
+
+
+def FastqBatchIterator(
+    source: _TextIOSource, fmt: str = "fastq", batch_size: int = 100000
+) -> Iterator[FastqBatch]:
+    """Iterate over FASTQ records in batches of NumPy arrays.
+
+    Arguments:
+     - source - input stream opened in text mode, or a path to a file
+     - fmt - FASTQ variant, "fastq" (or "fastq-sanger"), "fastq-solexa" or
+       "fastq-illumina", as in Bio.SeqIO
+     - batch_size - number of records per batch (the last one may be smaller)
+
+    Instead of a SeqRecord with a list of quality scores for each read, this
+    returns FastqBatch objects holding the letters and the quality scores of
+    batch_size records in two arrays, with an array of offsets giving where
+    each record starts. The quality scores are decoded with the same mapping
+    as the SeqRecord based iterators. This avoids creating Python objects for
+    each read, and allows quality control over millions of reads using NumPy:
+
+    >>> for batch in FastqBatchIterator("Quality/example.fastq", batch_size=2):
+    ...     print(len(batch), batch.lengths, batch.mean_qualities())
+    ...
+    2 [25 25] [25.28 24.52]
+    1 [25] [23.4]
+
+    Individual records can still be retrieved as SeqRecord objects:
+
+    >>> record = batch[0]
+    >>> print("%s %s" % (record.id, record.seq))
+    EAS54_6_R1_2_1_443_348 GTTGCTTCTGGCGTGGGTGGGGGGG
+    >>> print(record.letter_annotations["phred_quality"])
+    [26, 26, 26, 26, 26, 26, 26, 26, 26, 26, 26, 24, 26, 22, 26, 26, 13, 22, 26, 18, 24, 18, 18, 18, 18]
+
+    The records of a batch are validated together, so an invalid record may
+    only be reported once the complete batch has been read.
+    """
+    try:
+        iterator = _fastq_batch_iterators[fmt.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown FASTQ format {fmt!r}") from None
+    if batch_size < 1:
+        raise ValueError("batch_size should be a positive integer")
+    q_mapping = iterator.q_mapping
+    records = FastqGeneralIterator(source)
+    while True:
+        batch = list(itertools.islice(records, batch_size))
+        if not batch:
+            return
+        titles, seq_strings, quality_strings = zip(*batch)
+        offsets = np.zeros(len(batch) + 1, np.int64)
+        np.cumsum([len(seq_string) for seq_string in seq_strings], out=offsets[1:])
+        seq_string = "".join(seq_strings)
+        quality_string = "".join(quality_strings)
+
+        # Note: str.isprintable is False for ASCII characters 0-32 and 127
+        if not seq_string.isprintable() or " " in seq_string:
+            raise ValueError("Whitespace is not allowed in the sequence.")
+        if not seq_string.isascii():
+            raise ValueError("Non-ASCII characters are not allowed in the sequence.")
+
+        if not quality_string.isascii():
+            # Look for invalid non-ascii characters
+            index = _find_index_where(quality_string, lambda c: not c.isascii())
+            i = np.searchsorted(offsets, index, "right") - 1
+            details = "is not an ASCII character"
+            raise InvalidCharError(quality_strings[i], index - int(offsets[i]), details)
+
+        byte_scores = quality_string.encode().translate(q_mapping)
+
+        if INVALID_CHAR in byte_scores:
+            # Look for invalid but still ascii characters
+            index = byte_scores.find(INVALID_CHAR_CODE)
+            i = np.searchsorted(offsets, index, "right") - 1
+            details = "not in correct range (are you sure you're using the right QualityIO parser?)"
+            raise InvalidCharError(quality_strings[i], index - int(offsets[i]), details)
+
+        yield FastqBatch(
+            list(titles),
+            np.frombuffer(seq_string.encode(), np.uint8),
+            # Interpret as signed bytes for the negative scores of Solexa files
+            np.frombuffer(byte_scores, np.int8),
+            offsets,
+            iterator.q_key,
+        )
+
+
+_fastq_batch_iterators = {
+    "fastq": FastqPhredIterator,
+    "fastq-sanger": FastqPhredIterator,
+    "fastq-solexa": FastqSolexaIterator,
+    "fastq-illumina": FastqIlluminaIterator,
+}
 
 
 class QualPhredIterator(SequenceIterator):
@@ -1465,6 +1708,7 @@ class QualPhredIterator(SequenceIterator):
         self,
         source: _TextIOSource,
         alphabet: None = None,
+        quality_type: str = "list",
     ) -> None:
         """For QUAL files which include PHRED quality scores, but no sequence.
 
@@ -1518,10 +1762,16 @@ class QualPhredIterator(SequenceIterator):
         As of Biopython 1.59, this parser will accept files with negatives quality
         scores but will replace them with the lowest possible PHRED score of zero.
         This will trigger a warning, previously it raised a ValueError exception.
+
+        The quality_type argument selects how the quality scores are stored, as
+        a list of integers ("list", default), an array.array of signed bytes
+        ("array") or a NumPy int8 array ("numpy").
         """
         if alphabet is not None:
             raise ValueError("The alphabet argument is no longer supported")
+        _check_quality_type(quality_type)
         super().__init__(source, fmt="QUAL")
+        self.quality_type = quality_type
         # Skip any text before the first record (e.g. blank lines, comments)
         for line in self.stream:
             if line[0] == ">":
@@ -1541,7 +1791,7 @@ class QualPhredIterator(SequenceIterator):
             id = descr.split()[0]
             name = id
 
-            qualities: list[int] = []
+            qualities: Any = []
             for line in self.stream:
                 if line[0] == ">":
                     break
@@ -1558,6 +1808,17 @@ class QualPhredIterator(SequenceIterator):
                 )
                 qualities = [max(0, q) for q in qualities]
 
+            if self.quality_type != "list":
+                if qualities and max(qualities) > 127:
+                    raise ValueError(
+                        "Quality score %i too large for quality_type=%r"
+                        % (max(qualities), self.quality_type)
+                    )
+                if self.quality_type == "array":
+                    qualities = array.array("b", qualities)
+                else:
+                    qualities = np.array(qualities, np.int8)
+
             # Return the record and then continue...
             sequence = Seq(None, length=len(qualities))
 
@@ -619,7 +619,7 @@ def write(
     raise ValueError(f"Unknown format '{format}'")
 
 
-def parse(handle, format, alphabet=None):
+def parse(handle, format, alphabet=None, **kwargs):
     r"""Turn a sequence file into an iterator returning SeqRecords.
 
     Arguments:
@@ -627,6 +627,10 @@ def parse(handle, format, alphabet=None):
      - format   - lower case string describing the file format.
      - alphabet - no longer used, should be None.
 
+    Any additional keyword arguments are passed to the parser of the format,
+    for example quality_type for the FASTQ formats and "qual" (see
+    Bio.SeqIO.QualityIO).
+
     Typical usage, opening a file to read in, and looping over the record(s):
 
     >>> from Bio import SeqIO
@@ -671,12 +675,12 @@ def parse(handle, format, alphabet=None):
 
     iterator_generator = _FormatToIterator.get(format)
     if iterator_generator:
-        return iterator_generator(handle)
+        return iterator_generator(handle, **kwargs)
 
     raise ValueError(f"Unknown format '{format}'")
 
 
-def read(handle, format, alphabet=None):
+def read(handle, format, alphabet=None, **kwargs):
     """Turn a sequence file into a single SeqRecord.
 
     Arguments:
@@ -685,6 +689,9 @@ def read(handle, format, alphabet=None):
      - format   - string describing the file format.
      - alphabet - no longer used, should be None.
 
+    Any additional keyword arguments are passed to the parser, as for the
+    Bio.SeqIO.parse(...) function.
+
     This function is for use parsing sequence files containing
     exactly one record.  For example, reading a GenBank file:
 
@@ -716,7 +723,7 @@ def read(handle, format, alphabet=None):
     Use the Bio.SeqIO.parse(handle, format) function if you want
     to read multiple records from the handle.
     """
-    with parse(handle, format, alphabet) as records:
+    with parse(handle, format, alphabet, **kwargs) as records:
         try:
             record = next(records)
         except StopIteration:
@@ -803,7 +810,7 @@ def to_dict(sequences, key_function=None):
     return d
 
 
-def index(filename, format, alphabet=None, key_function=None):
+def index(filename, format, alphabet=None, key_function=None, cache=None):
     """Indexes a sequence file and returns a dictionary like object.
 
     Arguments:
@@ -813,6 +820,8 @@ def index(filename, format, alphabet=None, key_function=None):
      - key_function - Optional callback function which when given a
        SeqRecord identifier string should return a unique key for the
        dictionary.
+     - cache - Optional filename of a sidecar file in which to save the
+       index (see below).
 
     This indexing function will return a dictionary like object, giving the
     SeqRecord objects as values.
@@ -907,6 +916,18 @@ def index(filename, format, alphabet=None, key_function=None):
     to be completely parsed while building the index. Right now this is
     usually avoided.
 
+    For large files, scanning the file each time it is indexed can take a
+    while. If you give the name of a cache file, the keys and offsets found
+    are saved there, and loaded from there instead the next time the same
+    file is indexed with the same format and key function. The cache records
+    the size and modification time of the indexed file, and is rebuilt if
+    either has changed. The cache file is memory mapped rather than read in,
+    so opening the index is fast however many records there are, and the
+    memory is shared between processes using the same cache. Only string
+    keys can be cached. Key functions written in Python are identified by
+    their name and their code; the cache is not used with closures or
+    other callable objects, as they cannot be recognized again.
+
     See Also: Bio.SeqIO.index_db() and Bio.SeqIO.to_dict()
 
     """
@@ -921,6 +942,7 @@ def index(filename, format, alphabet=None, key_function=None):
         raise ValueError("The alphabet argument is no longer supported")
 
     # Map the file format to a sequence iterator:
+    from Bio.File import _IndexCache
     from Bio.File import _IndexedSeqFileDict
 
     from ._index import _FormatToRandomAccess  # Lazy import
@@ -935,6 +957,8 @@ def index(filename, format, alphabet=None, key_function=None):
         alphabet,
         key_function,
     )
+    if cache is not None:
+        repr = f"{repr[:-1]}, cache={cache!r})"
 
     try:
         random_access_proxy = proxy_class(filename, format)
@@ -943,11 +967,20 @@ def index(filename, format, alphabet=None, key_function=None):
             "Need a string or path-like object for the filename (not a handle)"
         ) from None
 
-    return _IndexedSeqFileDict(random_access_proxy, key_function, repr, "SeqRecord")
+    if cache is not None:
+        cache = _IndexCache(cache, filename, format, key_function)
+    return _IndexedSeqFileDict(
+        random_access_proxy, key_function, repr, "SeqRecord", cache
+    )
 
 
 def index_db(
-    index_filename, filenames=None, format=None, alphabet=None, key_function=None
+    index_filename,
+    filenames=None,
+    format=None,
+    alphabet=None,
+    key_function=None,
+    workers=1,
 ):
     """Index several sequence files and return a dictionary like object.
 
@@ -965,6 +998,10 @@ def index_db(
      - key_function - Optional callback function which when given a
        SeqRecord identifier string should return a unique
        key for the dictionary.
+     - workers - Number of processes used to scan the files when building
+       a new index (default 1; use None for the number of CPUs). To use
+       more than one, the key_function must be picklable (e.g. a function
+       defined at module level, not a lambda).
 
     This indexing function will return a dictionary like object, giving the
     SeqRecord objects as values:
@@ -988,6 +1025,19 @@ def index_db(
 
     In this example the two files contain 85 and 10 records respectively.
 
+    To fetch many records at once, use the get_many method. This looks up
+    all the keys in the database together, and reads the records in file
+    order, which is faster than looking them up one at a time:
+
+    >>> records = SeqIO.index_db(idx_name, files, "fasta")
+    >>> selected = records.get_many(["gi|45478717|ref|NP_995572.1|",
+    ...                              "gi|7525076|ref|NP_051101.1|"])
+    >>> for key, record in selected.items():
+    ...     print(key, len(record))
+    gi|45478717|ref|NP_995572.1| 357
+    gi|7525076|ref|NP_051101.1| 2294
+    >>> records.close()
+
     BGZF compressed files are supported, and detected automatically. Ordinary
     GZIP compressed files are not supported.
 
@@ -1027,8 +1077,6 @@ def index_db(
     # Map the file format to a sequence iterator:
     from Bio.File import _SQLiteManySeqFilesDict
 
-    from ._index import _FormatToRandomAccess  # Lazy import
-
     repr = "SeqIO.index_db(%r, filenames=%r, format=%r, key_function=%r)" % (
         index_filename,
         filenames,
@@ -1036,18 +1084,31 @@ def index_db(
         key_function,
     )
 
-    def proxy_factory(format, filename=None):
-        """Given a filename returns proxy object, else boolean if format OK."""
-        if filename:
-            return _FormatToRandomAccess[format](filename, format)
-        else:
-            return format in _FormatToRandomAccess
-
     return _SQLiteManySeqFilesDict(
-        index_filename, filenames, proxy_factory, format, key_function, repr
+        index_filename,
+        filenames,
+        _index_db_proxy_factory,
+        format,
+        key_function,
+        repr,
+        workers=workers,
     )
 
 
+def _index_db_proxy_factory(format, filename=None):
+    """Given a filename returns proxy object, else boolean if format OK (PRIVATE).
+
+    This is a module level function so that it can be sent to the worker
+    processes used by index_db.
+    """
+    from ._index import _FormatToRandomAccess  # Lazy import
+
+    if filename:
+        return _FormatToRandomAccess[format](filename, format)
+    else:
+        return format in _FormatToRandomAccess
+
+
 # TODO? - Handling aliases explicitly would let us shorten this list:
 _converter = {
     ("genbank", "fasta"): InsdcIO._genbank_convert_fasta,
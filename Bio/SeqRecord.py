@@ -111,6 +111,31 @@ class _RestrictedDict(dict[str, Sequence[Any]]):
             self[key] = value
 
 
+def _concatenate(left: Sequence[Any], right: Sequence[Any]) -> Sequence[Any]:
+    """Concatenate two per-letter annotations (PRIVATE).
+
+    Python sequences (including array.array objects) are concatenated with
+    the + operator, which would instead add NumPy arrays element-wise.
+    """
+    if hasattr(left, "__array__") or hasattr(right, "__array__"):
+        import numpy as np
+
+        return np.concatenate((left, right))
+    return left + right  # type: ignore
+
+
+def _slice(value: Sequence[Any], index: slice) -> Sequence[Any]:
+    """Slice a per-letter annotation (PRIVATE).
+
+    Slicing a NumPy array gives a view sharing its memory, so unlike Python
+    sequences (including array.array objects) the slice is copied.
+    """
+    value = value[index]
+    if hasattr(value, "__array__"):
+        value = value.copy()  # type: ignore
+    return value
+
+
 class SeqRecord:
     """A SeqRecord object holds a sequence and information about it.
 
@@ -596,7 +621,7 @@ class SeqRecord:
             # Slice all the values to match the sliced sequence
             # (this should also work with strides, even negative strides):
             for key, value in self.letter_annotations.items():
-                answer.letter_annotations[key] = value[index]
+                answer.letter_annotations[key] = _slice(value, index)
 
             return answer
         raise ValueError("Invalid index")
@@ -1030,7 +1055,7 @@ class SeqRecord:
             for k, v in self.letter_annotations.items():  # type: ignore
                 if k in other.letter_annotations:
                     # avoid length checks, but otherwise equivalent to answer.letter_annotations[k] = v + other.letter_annotations[k]
-                    dict.__setitem__(answer.letter_annotations, k, v + other.letter_annotations[k])  # type: ignore
+                    dict.__setitem__(answer.letter_annotations, k, _concatenate(v, other.letter_annotations[k]))  # type: ignore
         except TypeError:
             print("Failed while try to concatenate letter annotations")
             raise
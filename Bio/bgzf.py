@@ -247,11 +247,16 @@ If your data is in UTF-8 or any other incompatible encoding, you must use
 binary mode, and decode the appropriate fragments yourself.
 """
 
+import bisect
 import io
+import os
 import struct
 import sys
 import zlib
 from builtins import open as _open
+from collections import OrderedDict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 _bgzf_magic = b"\x1f\x8b\x08\x04"
 _bgzf_header = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00\x42\x43\x02\x00"
@@ -429,12 +434,160 @@ def BgzfBlocks(handle):
         data_start += data_len
 
 
+def build_gzi(handle):
+    """Return a list of (compressed, uncompressed) offsets for each BGZF block.
+
+    Expects a BGZF compressed file opened in binary read mode using the
+    builtin open function, as for the BgzfBlocks function. Only the block
+    headers and footers are parsed, the data is not decompressed.
+
+    This is the same information held in a samtools style ``.gzi`` index,
+    see the write_gzi and read_gzi functions.
+
+    >>> from builtins import open
+    >>> with open("SamBam/ex1_refresh.bam", "rb") as handle:
+    ...     for coffset, uoffset in build_gzi(handle)[:4]:
+    ...         print("Raw start %i, data start %i" % (coffset, uoffset))
+    Raw start 0, data start 0
+    Raw start 53, data start 38
+    Raw start 18248, data start 65472
+    Raw start 36438, data start 130881
+
+    """
+    if isinstance(handle, BgzfReader):
+        raise TypeError("Function build_gzi expects a binary handle")
+    index = []
+    data_start = 0
+    while True:
+        start_offset = handle.tell()
+        try:
+            block_size, deflated, expected_crc, data_len = _read_bgzf_block(handle)
+        except StopIteration:
+            break
+        index.append((start_offset, data_start))
+        data_start += data_len
+    if not index:
+        index.append((0, 0))
+    return index
+
+
+def write_gzi(filename, index):
+    """Write a samtools compatible BGZF ``.gzi`` index file.
+
+    The index should be a list of (compressed, uncompressed) offset pairs
+    for the BGZF blocks, as returned by the build_gzi function. As in
+    samtools, the implicit first entry (0, 0) is not recorded in the file.
+    The file holds the number of entries, followed by each pair of offsets,
+    all as little endian unsigned 64 bit integers.
+    """
+    if not index or tuple(index[0]) != (0, 0):
+        raise ValueError("The index should start with (0, 0) for the first block")
+    with _open(filename, "wb") as handle:
+        handle.write(struct.pack("<Q", len(index) - 1))
+        for coffset, uoffset in index[1:]:
+            handle.write(struct.pack("<QQ", coffset, uoffset))
+
+
+def read_gzi(filename):
+    """Read a samtools style BGZF ``.gzi`` index file.
+
+    Returns a list of (compressed, uncompressed) offset pairs, one for each
+    BGZF block, starting with (0, 0) for the first block. See also the
+    build_gzi and write_gzi functions.
+    """
+    with _open(filename, "rb") as handle:
+        data = handle.read()
+    if len(data) < 8:
+        raise ValueError("Truncated BGZF .gzi index file")
+    (count,) = struct.unpack("<Q", data[:8])
+    if len(data) != 8 + 16 * count:
+        raise ValueError(
+            "BGZF .gzi index file should have %i entries, but size is %i bytes"
+            % (count, len(data))
+        )
+    values = struct.unpack("<%iQ" % (2 * count), data[8:])
+    index = [(0, 0)]
+    index.extend(zip(values[0::2], values[1::2]))
+    return index
+
+
+def decompress_range(handle, start, end, index=None, executor=None):
+    """Decompress a range of the uncompressed data, using multiple blocks in parallel.
+
+    Arguments:
+     - handle - BGZF compressed file opened in binary read mode using the
+       builtin open function (as for BgzfBlocks).
+     - start, end - uncompressed offsets of the data wanted, as in a
+       Python slice ``data[start:end]``.
+     - index - list of (compressed, uncompressed) offset pairs for the
+       BGZF blocks, as returned by read_gzi or build_gzi. If omitted, the
+       block headers are scanned using build_gzi (without decompression).
+     - executor - optional ``concurrent.futures`` executor used to
+       decompress the blocks, e.g. a ``ProcessPoolExecutor``. By default
+       a temporary thread pool is used (zlib releases the GIL).
+
+    The compressed blocks are read from the handle on the calling thread,
+    while the decompression is spread over the executor's workers.
+
+    >>> from builtins import open
+    >>> with open("SamBam/ex1.bam", "rb") as handle:
+    ...     data = decompress_range(handle, 65530, 65540)
+    >>> len(data)
+    10
+    """
+    if isinstance(handle, BgzfReader):
+        raise TypeError("Function decompress_range expects a binary handle")
+    if start < 0 or end < start:
+        raise ValueError("Require 0 <= start <= end, got %i and %i" % (start, end))
+    if start == end:
+        return b""
+    if index is None:
+        handle.seek(0)
+        index = build_gzi(handle)
+    # Find the last block starting at or before the requested start
+    i = bisect.bisect_right([uoffset for coffset, uoffset in index], start) - 1
+    coffset, data_start = index[i]
+    handle.seek(coffset)
+    blocks = []
+    data_end = data_start
+    while data_end < end:
+        try:
+            block = _read_bgzf_block(handle)
+        except StopIteration:
+            break
+        blocks.append(block[1:])
+        data_end += block[3]
+    if not blocks:
+        return b""
+    if executor is None:
+        workers = min(len(blocks), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            data = b"".join(pool.map(_inflate_bgzf_block, *zip(*blocks)))
+    else:
+        data = b"".join(executor.map(_inflate_bgzf_block, *zip(*blocks), chunksize=16))
+    return data[start - data_start : end - data_start]
+
+
 def _load_bgzf_block(handle, text_mode=False):
     """Load the next BGZF block of compressed data (PRIVATE).
 
     Returns a tuple (block size and data), or at end of file
     will raise StopIteration.
     """
+    block_size, deflated, expected_crc, expected_size = _read_bgzf_block(handle)
+    return block_size, _inflate_bgzf_block(
+        deflated, expected_crc, expected_size, text_mode
+    )
+
+
+def _read_bgzf_block(handle):
+    """Read the next BGZF block without decompressing it (PRIVATE).
+
+    Returns a tuple (block size, raw deflate data, CRC bytes, and the
+    expected decompressed length), or at end of file will raise
+    StopIteration. Only the gzip header is parsed, so this is cheap
+    compared to the decompression done by _inflate_bgzf_block.
+    """
     magic = handle.read(4)
     if not magic:
         # End of file - should we signal this differently now?
@@ -468,10 +621,20 @@ def _load_bgzf_block(handle, text_mode=False):
         raise ValueError("Missing BC, this isn't a BGZF file!")
     # Now comes the compressed data, CRC, and length of uncompressed data.
     deflate_size = block_size - 1 - extra_len - 19
-    d = zlib.decompressobj(-15)  # Negative window size means no headers
-    data = d.decompress(handle.read(deflate_size)) + d.flush()
+    deflated = handle.read(deflate_size)
     expected_crc = handle.read(4)
     expected_size = struct.unpack("<I", handle.read(4))[0]
+    return block_size, deflated, expected_crc, expected_size
+
+
+def _inflate_bgzf_block(deflated, expected_crc, expected_size, text_mode=False):
+    """Decompress and check the raw data of a BGZF block (PRIVATE).
+
+    This does no file IO, and zlib releases the GIL while decompressing,
+    so it is safe and worthwhile to call this from a worker thread.
+    """
+    d = zlib.decompressobj(-15)  # Negative window size means no headers
+    data = d.decompress(deflated) + d.flush()
     if expected_size != len(data):
         raise RuntimeError("Decompressed to %i, not %i" % (len(data), expected_size))
     # Should cope with a mix of Python platforms...
@@ -485,9 +648,16 @@ def _load_bgzf_block(handle, text_mode=False):
     if text_mode:
         # Note ISO-8859-1 aka Latin-1 preserves first 256 chars
         # (i.e. ASCII), but critically is a single byte encoding
-        return block_size, data.decode("latin-1")
+        return data.decode("latin-1")
     else:
-        return block_size, data
+        return data
+
+
+def _read_ahead_block(block_size, deflated, expected_crc, expected_size, text_mode):
+    """Decompress a block for BgzfReader's read-ahead threads (PRIVATE)."""
+    return block_size, _inflate_bgzf_block(
+        deflated, expected_crc, expected_size, text_mode
+    )
 
 
 class BgzfReader:
@@ -553,9 +723,32 @@ class BgzfReader:
     block can be up to 64kb, the default cache could take up to 6MB of
     RAM. The cache is not important for reading through the file in one
     pass, but is important for improving performance of random access.
+    The least recently used block is discarded first, and the attributes
+    cache_hits and cache_misses count how often a block was (or was not)
+    already in the cache:
+
+    >>> handle = BgzfReader("SamBam/ex1.bam", "rb", max_cache=2)
+    >>> for start in (0, 18239, 0, 36462, 0, 18239):
+    ...     offset = handle.seek(make_virtual_offset(start, 0))
+    >>> handle.cache_hits, handle.cache_misses
+    (2, 4)
+    >>> handle.close()
+
+    For reading through a large file in one pass, the readahead argument
+    can be used to decompress the next few blocks in background threads
+    while you are parsing the current block.
     """
 
-    def __init__(self, filename=None, mode="r", fileobj=None, max_cache=100):
+    def __init__(
+        self,
+        filename=None,
+        mode="r",
+        fileobj=None,
+        max_cache=100,
+        max_cache_bytes=None,
+        readahead=0,
+        gzi=None,
+    ):
         r"""Initialize the class for reading a BGZF file.
 
         You would typically use the top level ``bgzf.open(...)`` function
@@ -581,11 +774,31 @@ class BgzfReader:
         cache in memory. Each can be up to 64kb thus the default of 100 blocks
         could take up to 6MB of RAM. This is important for efficient random
         access, a small value is fine for reading the file in one pass.
+        Blocks are discarded from the cache in least recently used order.
+
+        Argument ``max_cache_bytes`` optionally also limits the total size
+        of the decompressed data held in the cache. The block currently
+        being read is always kept, even if it alone exceeds this limit.
+
+        Argument ``readahead`` sets the number of BGZF blocks following the
+        current block which are decompressed ahead of time using a pool of
+        background threads (default 0, meaning no read-ahead). Since zlib
+        releases the GIL, this speeds up reading a file sequentially. The
+        file itself is only ever read from the calling thread.
+
+        Argument ``gzi`` is optionally a samtools style ``.gzi`` index
+        filename, or a list of (compressed, uncompressed) offset pairs as
+        returned by the read_gzi and build_gzi functions. This allows the
+        seek method to also accept plain uncompressed offsets.
         """
         # TODO - Assuming we can seek, check for 28 bytes EOF empty block
         # and if missing warn about possible truncation (as in samtools)?
         if max_cache < 1:
             raise ValueError("Use max_cache with a minimum of 1")
+        if max_cache_bytes is not None and max_cache_bytes < 0:
+            raise ValueError("Use max_cache_bytes with a minimum of 0")
+        if readahead < 0:
+            raise ValueError("Use readahead with a minimum of 0")
         # Must open the BGZF file in binary mode, but we may want to
         # treat the contents as either text or binary (unicode or
         # bytes under Python 3)
@@ -610,7 +823,23 @@ class BgzfReader:
             self._newline = b"\n"
         self._handle = handle
         self.max_cache = max_cache
-        self._buffers = {}
+        self.max_cache_bytes = max_cache_bytes
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._buffers = OrderedDict()
+        self._cache_bytes = 0
+        self._readahead = readahead
+        self._pending = {}
+        self._readahead_offset = None
+        if readahead:
+            self._executor = ThreadPoolExecutor(max_workers=readahead)
+        else:
+            self._executor = None
+        if isinstance(gzi, str):
+            gzi = read_gzi(gzi)
+        self._gzi = gzi
+        if gzi is not None:
+            self._gzi_uoffsets = [uoffset for coffset, uoffset in gzi]
         self._block_start_offset = None
         self._block_raw_length = None
         self._load_block(handle.tell())
@@ -625,33 +854,102 @@ class BgzfReader:
             self._within_block_offset = 0
             return
         elif start_offset in self._buffers:
-            # Already in cache
+            # Already in cache, now the most recently used block
+            self._buffers.move_to_end(start_offset)
             self._buffer, self._block_raw_length = self._buffers[start_offset]
             self._within_block_offset = 0
             self._block_start_offset = start_offset
+            self.cache_hits += 1
             return
-        # Must hit the disk... first check cache limits,
-        while len(self._buffers) >= self.max_cache:
-            # TODO - Implement LRU cache removal?
-            self._buffers.popitem()
-        # Now load the block
-        handle = self._handle
-        if start_offset is not None:
+        self.cache_misses += 1
+        if start_offset in self._pending:
+            # Already being decompressed by the read-ahead threads
+            block_size, self._buffer = self._pending.pop(start_offset).result()
+            self._block_start_offset = start_offset
+        else:
+            # Must hit the disk... any read-ahead was for the wrong place
+            self._cancel_readahead()
+            handle = self._handle
             handle.seek(start_offset)
-        self._block_start_offset = handle.tell()
-        try:
-            block_size, self._buffer = _load_bgzf_block(handle, self._text)
-        except StopIteration:
-            # EOF
-            block_size = 0
-            if self._text:
-                self._buffer = ""
-            else:
-                self._buffer = b""
+            self._block_start_offset = handle.tell()
+            try:
+                block_size, self._buffer = _load_bgzf_block(handle, self._text)
+            except StopIteration:
+                # EOF
+                block_size = 0
+                if self._text:
+                    self._buffer = ""
+                else:
+                    self._buffer = b""
+            self._readahead_offset = self._block_start_offset + block_size
         self._within_block_offset = 0
         self._block_raw_length = block_size
-        # Finally save the block in our cache,
-        self._buffers[self._block_start_offset] = self._buffer, block_size
+        # Save the block in our cache, discarding the least recently used
+        # blocks if over the cache limits,
+        buffers = self._buffers
+        size = len(self._buffer)
+        max_cache_bytes = self.max_cache_bytes
+        while buffers and (
+            len(buffers) >= self.max_cache
+            or (
+                max_cache_bytes is not None
+                and self._cache_bytes + size > max_cache_bytes
+            )
+        ):
+            old_buffer, old_block_size = buffers.popitem(last=False)[1]
+            self._cache_bytes -= len(old_buffer)
+        buffers[self._block_start_offset] = self._buffer, block_size
+        self._cache_bytes += size
+        # Finally queue up decompression of the following blocks,
+        if self._readahead:
+            self._schedule_readahead()
+
+    def _schedule_readahead(self):
+        """Queue the next few blocks for decompression in the background (PRIVATE).
+
+        The compressed data is read here on the calling thread, leaving only
+        the decompression (which releases the GIL) to the worker threads.
+        """
+        handle = self._handle
+        pending = self._pending
+        while len(pending) < self._readahead and self._readahead_offset is not None:
+            start_offset = self._readahead_offset
+            cached = self._buffers.get(start_offset)
+            if cached is not None:
+                # Already decompressed, just skip over it (unless at EOF)
+                if cached[1]:
+                    self._readahead_offset += cached[1]
+                else:
+                    self._readahead_offset = None
+                continue
+            handle.seek(start_offset)
+            try:
+                block_size, deflated, expected_crc, expected_size = _read_bgzf_block(
+                    handle
+                )
+            except StopIteration:
+                self._readahead_offset = None
+                break
+            except ValueError:
+                # Leave it to _load_block to report this if we get there
+                self._readahead_offset = None
+                break
+            pending[start_offset] = self._executor.submit(
+                _read_ahead_block,
+                block_size,
+                deflated,
+                expected_crc,
+                expected_size,
+                self._text,
+            )
+            self._readahead_offset = start_offset + block_size
+
+    def _cancel_readahead(self):
+        """Discard any blocks queued for decompression in the background (PRIVATE)."""
+        for future in self._pending.values():
+            future.cancel()
+        self._pending = {}
+        self._readahead_offset = None
 
     def tell(self):
         """Return a 64-bit unsigned BGZF virtual offset."""
@@ -670,8 +968,22 @@ class BgzfReader:
             # TODO - Include bounds checking as in make_virtual_offset?
             return (self._block_start_offset << 16) | self._within_block_offset
 
-    def seek(self, virtual_offset):
-        """Seek to a 64-bit unsigned BGZF virtual offset."""
+    def seek(self, virtual_offset, uncompressed=False):
+        """Seek to a 64-bit unsigned BGZF virtual offset.
+
+        If the reader was given a ``.gzi`` index, using uncompressed=True
+        allows seeking to a plain offset in the decompressed data instead.
+        """
+        if uncompressed:
+            if self._gzi is None:
+                raise ValueError(
+                    "Seeking to an uncompressed offset requires a gzi index"
+                )
+            offset = virtual_offset
+            i = bisect.bisect_right(self._gzi_uoffsets, offset) - 1
+            start_offset, data_start = self._gzi[i]
+            self.seek(make_virtual_offset(start_offset, offset - data_start))
+            return offset
         # Do this inline to avoid a function call,
         # start_offset, within_block = split_virtual_offset(virtual_offset)
         start_offset = virtual_offset >> 16
@@ -765,6 +1077,10 @@ class BgzfReader:
 
     def close(self):
         """Close BGZF file."""
+        if self._executor is not None:
+            self._cancel_readahead()
+            self._executor.shutdown(wait=True)
+            self._executor = None
         self._handle.close()
         self._buffer = None
         self._block_start_offset = None
@@ -791,11 +1107,69 @@ class BgzfReader:
         self.close()
 
 
+def _compress_bgzf_block(block, compresslevel):
+    """Compress data as a single complete BGZF block (PRIVATE).
+
+    Returns the bytes to be written to file, including the header and
+    footer. This does no file IO, and zlib releases the GIL while
+    compressing, so this can be called from a worker thread.
+    """
+    # print("Saving %i bytes" % len(block))
+    if len(block) > 65536:
+        raise ValueError(f"{len(block)} Block length > 65536")
+    # Giving a negative window bits means no gzip/zlib headers,
+    # -15 used in samtools
+    c = zlib.compressobj(compresslevel, zlib.DEFLATED, -15, zlib.DEF_MEM_LEVEL, 0)
+    compressed = c.compress(block) + c.flush()
+    del c
+    if len(compressed) > 65536:
+        raise RuntimeError("TODO - Didn't compress enough, try less data in this block")
+    bsize = struct.pack("<H", len(compressed) + 25)  # includes -1
+    crc = struct.pack("<I", zlib.crc32(block) & 0xFFFFFFFF)
+    uncompressed_length = struct.pack("<I", len(block))
+    # Fixed 16 bytes,
+    # gzip magic bytes (4) mod time (4),
+    # gzip flag (1), os (1), extra length which is six (2),
+    # sub field which is BC (2), sub field length of two (2),
+    # Variable data,
+    # 2 bytes: block length as BC sub field (2)
+    # X bytes: the data
+    # 8 bytes: crc (4), uncompressed data length (4)
+    return _bgzf_header + bsize + compressed + crc + uncompressed_length
+
+
 class BgzfWriter:
-    """Define a BGZFWriter object."""
+    """Define a BGZFWriter object.
+
+    Using the threads argument, the BGZF blocks can be compressed in
+    parallel by a pool of worker threads (zlib releases the GIL while
+    compressing). The blocks are still written to file in order, so the
+    output is identical to that produced using a single thread:
+
+    >>> import io
+    >>> handle = io.BytesIO()
+    >>> writer = BgzfWriter(fileobj=handle, threads=4)
+    >>> writer.write(b"ACGT" * 100000)
+    >>> block_start, within_block = split_virtual_offset(writer.tell())
+    >>> within_block
+    6784
+    >>> writer.close()
+
+    Note that calling the tell method has to wait until all the preceding
+    blocks have been compressed and written, so calling it after every
+    record will limit the benefit of using multiple threads.
+    """
 
-    def __init__(self, filename=None, mode="w", fileobj=None, compresslevel=6):
-        """Initialize the class."""
+    def __init__(
+        self, filename=None, mode="w", fileobj=None, compresslevel=6, threads=1
+    ):
+        """Initialize the class.
+
+        Argument ``threads`` sets the number of threads used to compress
+        the BGZF blocks (default 1, meaning compress on the calling thread).
+        """
+        if threads < 1:
+            raise ValueError("Use threads with a minimum of 1")
         if filename and fileobj:
             raise ValueError("Supply either filename or fileobj, not both")
         if fileobj:
@@ -818,42 +1192,31 @@ class BgzfWriter:
         self._handle = handle
         self._buffer = b""
         self.compresslevel = compresslevel
+        self.threads = threads
+        self._pending = deque()
+        if threads > 1:
+            self._executor = ThreadPoolExecutor(max_workers=threads)
+        else:
+            self._executor = None
 
     def _write_block(self, block):
         """Write provided data to file as a single BGZF compressed block (PRIVATE)."""
-        # print("Saving %i bytes" % len(block))
-        if len(block) > 65536:
-            raise ValueError(f"{len(block)} Block length > 65536")
-        # Giving a negative window bits means no gzip/zlib headers,
-        # -15 used in samtools
-        c = zlib.compressobj(
-            self.compresslevel, zlib.DEFLATED, -15, zlib.DEF_MEM_LEVEL, 0
+        if self._executor is None:
+            self._handle.write(_compress_bgzf_block(block, self.compresslevel))
+            return
+        pending = self._pending
+        pending.append(
+            self._executor.submit(_compress_bgzf_block, block, self.compresslevel)
         )
-        compressed = c.compress(block) + c.flush()
-        del c
-        if len(compressed) > 65536:
-            raise RuntimeError(
-                "TODO - Didn't compress enough, try less data in this block"
-            )
-        crc = zlib.crc32(block)
-        # Should cope with a mix of Python platforms...
-        if crc < 0:
-            crc = struct.pack("<i", crc)
-        else:
-            crc = struct.pack("<I", crc)
-        bsize = struct.pack("<H", len(compressed) + 25)  # includes -1
-        crc = struct.pack("<I", zlib.crc32(block) & 0xFFFFFFFF)
-        uncompressed_length = struct.pack("<I", len(block))
-        # Fixed 16 bytes,
-        # gzip magic bytes (4) mod time (4),
-        # gzip flag (1), os (1), extra length which is six (2),
-        # sub field which is BC (2), sub field length of two (2),
-        # Variable data,
-        # 2 bytes: block length as BC sub field (2)
-        # X bytes: the data
-        # 8 bytes: crc (4), uncompressed data length (4)
-        data = _bgzf_header + bsize + compressed + crc + uncompressed_length
-        self._handle.write(data)
+        # Limit how many compressed blocks can be waiting in memory
+        while len(pending) > 2 * self.threads:
+            self._handle.write(pending.popleft().result())
+
+    def _write_pending(self):
+        """Wait for and write out all blocks being compressed (PRIVATE)."""
+        pending = self._pending
+        while pending:
+            self._handle.write(pending.popleft().result())
 
     def write(self, data):
         """Write method for the class."""
@@ -884,6 +1247,7 @@ class BgzfWriter:
             self._buffer = self._buffer[65535:]
         self._write_block(self._buffer)
         self._buffer = b""
+        self._write_pending()
         self._handle.flush()
 
     def close(self):
@@ -896,12 +1260,18 @@ class BgzfWriter:
         """
         if self._buffer:
             self.flush()
+        self._write_pending()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
         self._handle.write(_bgzf_eof)
         self._handle.flush()
         self._handle.close()
 
     def tell(self):
         """Return a BGZF 64-bit virtual offset."""
+        # The offset depends on the size of all the compressed blocks so far
+        self._write_pending()
         return make_virtual_offset(self._handle.tell(), len(self._buffer))
 
     def seekable(self):
@@ -60,6 +60,60 @@ calculate(const char sequence[], Py_ssize_t m, double* matrix, Py_ssize_t n,
     }
 }
 
+static void
+calculate_both(const char sequence[], Py_ssize_t m, double* matrix,
+               Py_ssize_t n, float* scores, float* rcscores)
+{
+    Py_ssize_t i, j;
+    int k;
+    double score;
+    double rcscore;
+    int ok;
+    float* p = scores;
+    float* q = rcscores;
+    const double* last = matrix + (m-1)*4;
+#ifndef NAN
+    float NAN = 0.0;
+    NAN /= NAN;
+#endif
+
+    for (i = 0; i < n; i++)
+    {
+        score = 0.0;
+        rcscore = 0.0;
+        ok = 1;
+        for (j = 0; j < m; j++)
+        {
+            switch (sequence[i+j])
+            {
+                case 'A':
+                case 'a': k = 0; break;
+                case 'C':
+                case 'c': k = 1; break;
+                case 'G':
+                case 'g': k = 2; break;
+                case 'T':
+                case 't': k = 3; break;
+                default: ok = 0; continue;
+            }
+            score += matrix[j*4+k];
+            /* The reverse complement of the matrix scores the complementary
+               letter (3-k) at the mirrored position (m-1-j). */
+            rcscore += last[3-k-j*4];
+        }
+        if (ok) {
+            *p = (float)score;
+            *q = (float)rcscore;
+        }
+        else {
+            *p = NAN;
+            *q = NAN;
+        }
+        p++;
+        q++;
+    }
+}
+
 static int
 matrix_converter(PyObject* object, void* address)
 {
@@ -149,30 +203,32 @@ static char calculate__doc__[] =
 "\n"
 "This function calculates the position-weight matrix scores for all\n"
 "positions along the sequence for position-weight matrix pwm, and stores\n"
-"them in the provided numpy array scores.\n";
+"them in the provided numpy array scores. The sequence can be any\n"
+"bytes-like object, such as a memoryview of a memory map.\n";
 
 static PyObject*
 py_calculate(PyObject* self, PyObject* args, PyObject* keywords)
 {
-    const char* sequence;
     static char* kwlist[] = {"sequence", "matrix", "scores", NULL};
     Py_ssize_t m;
     Py_ssize_t n;
-    Py_ssize_t s;
     PyObject* result = NULL;
+    Py_buffer sequence;
     Py_buffer scores;
     Py_buffer matrix;
 
     matrix.obj = NULL;
     scores.obj = NULL;
-    if (!PyArg_ParseTupleAndKeywords(args, keywords, "y#O&O&", kwlist,
-                                     &sequence, &s,
+    if (!PyArg_ParseTupleAndKeywords(args, keywords, "y*O&O&", kwlist,
+                                     &sequence,
                                      matrix_converter, &matrix,
                                      scores_converter, &scores)) return NULL;
     m = matrix.shape[0];
     n = scores.shape[0];
-    if (n == s - m + 1) {
-        calculate(sequence, m, matrix.buf, n, scores.buf);
+    if (n == sequence.len - m + 1) {
+        Py_BEGIN_ALLOW_THREADS
+        calculate(sequence.buf, m, matrix.buf, n, scores.buf);
+        Py_END_ALLOW_THREADS
         Py_INCREF(Py_None);
         result = Py_None;
     }
@@ -180,11 +236,72 @@ py_calculate(PyObject* self, PyObject* args, PyObject* keywords)
         PyErr_Format(PyExc_RuntimeError,
                     "size of scores array is inconsistent "
                     "(sequence length is %zd, "
-                    "motif length is %zd, scores length is %zd", s, m, n);
+                    "motif length is %zd, scores length is %zd",
+                    sequence.len, m, n);
+    }
+
+    PyBuffer_Release(&sequence);
+    matrix_converter(NULL, &matrix);
+    scores_converter(NULL, &scores);
+    return result;
+}
+
+static char calculate_both__doc__[] =
+"    calculate_both(sequence, pwm, scores, rcscores)\n"
+"\n"
+"This function calculates the position-weight matrix scores for all\n"
+"positions along the sequence for position-weight matrix pwm and for its\n"
+"reverse complement in a single pass over the sequence, and stores them in\n"
+"the provided numpy arrays scores and rcscores, respectively. The sequence\n"
+"can be any bytes-like object, such as a memoryview of a memory map.\n";
+
+static PyObject*
+py_calculate_both(PyObject* self, PyObject* args, PyObject* keywords)
+{
+    static char* kwlist[] = {"sequence", "matrix", "scores", "rcscores", NULL};
+    Py_ssize_t m;
+    Py_ssize_t n;
+    PyObject* result = NULL;
+    Py_buffer sequence;
+    Py_buffer matrix;
+    Py_buffer scores;
+    Py_buffer rcscores;
+
+    matrix.obj = NULL;
+    scores.obj = NULL;
+    rcscores.obj = NULL;
+    if (!PyArg_ParseTupleAndKeywords(args, keywords, "y*O&O&O&", kwlist,
+                                     &sequence,
+                                     matrix_converter, &matrix,
+                                     scores_converter, &scores,
+                                     scores_converter, &rcscores)) return NULL;
+    m = matrix.shape[0];
+    n = scores.shape[0];
+    if (n != sequence.len - m + 1) {
+        PyErr_Format(PyExc_RuntimeError,
+                    "size of scores array is inconsistent "
+                    "(sequence length is %zd, "
+                    "motif length is %zd, scores length is %zd",
+                    sequence.len, m, n);
+    }
+    else if (rcscores.shape[0] != n) {
+        PyErr_Format(PyExc_RuntimeError,
+                    "size of rcscores array is inconsistent "
+                    "(%zd, expected %zd)", rcscores.shape[0], n);
+    }
+    else {
+        Py_BEGIN_ALLOW_THREADS
+        calculate_both(sequence.buf, m, matrix.buf, n, scores.buf,
+                       rcscores.buf);
+        Py_END_ALLOW_THREADS
+        Py_INCREF(Py_None);
+        result = Py_None;
     }
 
+    PyBuffer_Release(&sequence);
     matrix_converter(NULL, &matrix);
     scores_converter(NULL, &scores);
+    scores_converter(NULL, &rcscores);
     return result;
 }
 
@@ -194,6 +311,11 @@ static struct PyMethodDef methods[] = {
     METH_VARARGS | METH_KEYWORDS,
     PyDoc_STR(calculate__doc__),
    },
+   {"calculate_both",
+    (PyCFunction)py_calculate_both,
+    METH_VARARGS | METH_KEYWORDS,
+    PyDoc_STR(calculate_both__doc__),
+   },
    {NULL, NULL, 0, NULL} /* sentinel */
 };
 
@@ -21,6 +21,25 @@ from Bio.Seq import Seq
 from . import _pwm  # type: ignore
 
 
+def _as_bytes(sequence):
+    """Return the sequence as a bytes-like object for the C code (PRIVATE)."""
+    try:
+        return bytes(sequence)
+    except TypeError:  # str
+        try:
+            return bytes(sequence, "ASCII")
+        except TypeError:
+            raise ValueError(
+                "sequence should be a Seq, MutableSeq, string, or bytes-like object"
+            ) from None
+        except UnicodeEncodeError:
+            raise ValueError("sequence should contain ASCII characters only") from None
+    except Exception:
+        raise ValueError(
+            "sequence should be a Seq, MutableSeq, string, or bytes-like object"
+        ) from None
+
+
 class GenericPositionMatrix(dict):
     """Base class for the support of position matrix operations."""
 
@@ -399,6 +418,17 @@ class PositionWeightMatrix(GenericPositionMatrix):
 class PositionSpecificScoringMatrix(GenericPositionMatrix):
     """Class for the support of Position Specific Scoring Matrix calculations."""
 
+    def _logodds(self):
+        """Return the log-odds scores as an array of shape (length, 4) (PRIVATE)."""
+        # TODO - Code itself tolerates ambiguous bases (as NaN).
+        if sorted(self.alphabet) != ["A", "C", "G", "T"]:
+            raise ValueError(
+                "PSSM has wrong alphabet: %s - Use only with DNA motifs" % self.alphabet
+            )
+        return np.array(
+            [[self[letter][i] for letter in "ACGT"] for i in range(self.length)], float
+        )
+
     def calculate(self, sequence):
         """Return the PWM score for a given sequence for all positions.
 
@@ -410,41 +440,18 @@ class PositionSpecificScoringMatrix(GenericPositionMatrix):
          - otherwise, the result is a one-dimensional numpy array
 
         """
-        # TODO - Code itself tolerates ambiguous bases (as NaN).
-        if sorted(self.alphabet) != ["A", "C", "G", "T"]:
-            raise ValueError(
-                "PSSM has wrong alphabet: %s - Use only with DNA motifs" % self.alphabet
-            )
+        logodds = self._logodds()
 
         # NOTE: The C code handles mixed case input as this could be large
         # (e.g. contig or chromosome), so requiring it be all upper or lower
         # case would impose an overhead to allocate the extra memory.
-        try:
-            sequence = bytes(sequence)
-        except TypeError:  # str
-            try:
-                sequence = bytes(sequence, "ASCII")
-            except TypeError:
-                raise ValueError(
-                    "sequence should be a Seq, MutableSeq, string, or bytes-like object"
-                ) from None
-            except UnicodeEncodeError:
-                raise ValueError(
-                    "sequence should contain ASCII characters only"
-                ) from None
-        except Exception:
-            raise ValueError(
-                "sequence should be a Seq, MutableSeq, string, or bytes-like object"
-            ) from None
+        sequence = _as_bytes(sequence)
 
         n = len(sequence)
         m = self.length
         # Create the numpy arrays here; the C module then does not rely on numpy
         # Use a float32 for the scores array to save space
         scores = np.empty(n - m + 1, np.float32)
-        logodds = np.array(
-            [[self[letter][i] for letter in "ACGT"] for i in range(m)], float
-        )
         _pwm.calculate(sequence, logodds, scores)
 
         if len(scores) == 1:
@@ -456,34 +463,55 @@ class PositionSpecificScoringMatrix(GenericPositionMatrix):
         """Find hits with PWM score above given threshold.
 
         A generator function, returning found hits in the given sequence
-        with the pwm score higher than the threshold.
+        with the pwm score higher than the threshold. Each hit is a tuple of
+        the position and the score; hits on the reverse strand (if both is
+        True) have a negative position, counted from the end of the sequence.
+
+        The sequence is scanned in windows of chunksize positions, scoring
+        both strands in a single pass, and is never converted to upper case
+        as a whole. It can therefore be a chromosome which is not loaded in
+        memory, such as the (lazy) sequence of a record read from a 2bit file,
+        or a memory map of a file containing the sequence letters only::
+
+            with open(filename, "rb") as handle:
+                data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                hits = list(pssm.search(data, threshold=3.0))
+
+        Objects supporting the buffer protocol (bytes, mmap) are scanned
+        without copying; other sequences are sliced one window at a time.
         """
-        sequence = sequence.upper()
-        seq_len = len(sequence)
+        logodds = self._logodds()
+        try:
+            data = memoryview(sequence).cast("B")
+        except TypeError:
+            data = sequence
+        seq_len = len(data)
         motif_l = self.length
-        chunk_starts = np.arange(0, seq_len, chunksize)
-        if both:
-            rc = self.reverse_complement()
-        for chunk_start in chunk_starts:
-            subseq = sequence[chunk_start : chunk_start + chunksize + motif_l - 1]
-            pos_scores = self.calculate(subseq)
-            pos_ind = pos_scores >= threshold
-            pos_positions = np.where(pos_ind)[0] + chunk_start
-            pos_scores = pos_scores[pos_ind]
+        for chunk_start in range(0, seq_len - motif_l + 1, chunksize):
+            subseq = data[chunk_start : chunk_start + chunksize + motif_l - 1]
+            if not isinstance(subseq, memoryview):
+                subseq = _as_bytes(subseq)
+            pos_scores = np.empty(len(subseq) - motif_l + 1, np.float32)
+            if both:
+                neg_scores = np.empty_like(pos_scores)
+                _pwm.calculate_both(subseq, logodds, pos_scores, neg_scores)
+            else:
+                _pwm.calculate(subseq, logodds, pos_scores)
+            (pos_positions,) = np.nonzero(pos_scores >= threshold)
+            pos_scores = pos_scores[pos_positions]
             if both:
-                neg_scores = rc.calculate(subseq)
-                neg_ind = neg_scores >= threshold
-                neg_positions = np.where(neg_ind)[0] + chunk_start
-                neg_scores = neg_scores[neg_ind]
+                (neg_positions,) = np.nonzero(neg_scores >= threshold)
+                neg_scores = neg_scores[neg_positions]
+                positions = np.concatenate((pos_positions, neg_positions))
+                order = np.argsort(positions, kind="stable")
+                chunk_positions = np.concatenate(
+                    (pos_positions, neg_positions - seq_len)
+                )[order]
+                chunk_scores = np.concatenate((pos_scores, neg_scores))[order]
             else:
-                neg_positions = np.empty((0), dtype=int)
-                neg_scores = np.empty((0), dtype=int)
-            chunk_positions = np.append(pos_positions, neg_positions - seq_len)
-            chunk_scores = np.append(pos_scores, neg_scores)
-            order = np.argsort(np.append(pos_positions, neg_positions))
-            chunk_positions = chunk_positions[order]
-            chunk_scores = chunk_scores[order]
-            yield from zip(chunk_positions, chunk_scores)
+                chunk_positions = pos_positions
+                chunk_scores = pos_scores
+            yield from zip(chunk_positions + chunk_start, chunk_scores)
 
     @property
     def max(self):
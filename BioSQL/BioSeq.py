@@ -153,109 +153,120 @@ def _retrieve_seq(adaptor, primary_id):
         return Seq(None, length=length)
 
 
+# Number of bioentries retrieved together by the set-based queries below;
+# this keeps the number of SQL parameters well below the database limits.
+_BATCH_SIZE = 500
+
+
+def _batches(primary_ids):
+    """Split the primary ids into batches for set-based queries (PRIVATE).
+
+    Yields each batch as a list, together with a string of SQL placeholders
+    for use in an IN clause.
+    """
+    for i in range(0, len(primary_ids), _BATCH_SIZE):
+        batch = primary_ids[i : i + _BATCH_SIZE]
+        yield batch, ", ".join(["%s"] * len(batch))
+
+
 def _retrieve_dbxrefs(adaptor, primary_id):
     """Retrieve the database cross references for the sequence (PRIVATE)."""
-    _dbxrefs = []
-    dbxrefs = adaptor.execute_and_fetchall(
-        "SELECT dbname, accession, version"
-        " FROM bioentry_dbxref join dbxref using (dbxref_id)"
-        " WHERE bioentry_id = %s"
-        ' ORDER BY "rank"',
-        (primary_id,),
-    )
-    for dbname, accession, version in dbxrefs:
-        if version and version != "0":
-            v = f"{accession}.{version}"
-        else:
-            v = accession
-        _dbxrefs.append(f"{dbname}:{v}")
+    return _retrieve_many_dbxrefs(adaptor, [primary_id])[int(primary_id)]
+
+
+def _retrieve_many_dbxrefs(adaptor, primary_ids):
+    """Retrieve the database cross references for many sequences (PRIVATE).
+
+    Returns a dictionary mapping each (integer) primary id to its list of
+    database cross references.
+    """
+    primary_ids = [int(primary_id) for primary_id in primary_ids]
+    _dbxrefs = {primary_id: [] for primary_id in primary_ids}
+    for batch, placeholders in _batches(primary_ids):
+        dbxrefs = adaptor.execute_and_fetchall(
+            "SELECT bioentry_id, dbname, accession, version"
+            " FROM bioentry_dbxref join dbxref using (dbxref_id)"
+            f" WHERE bioentry_id IN ({placeholders})"
+            ' ORDER BY "rank"',
+            batch,
+        )
+        for primary_id, dbname, accession, version in dbxrefs:
+            if version and version != "0":
+                v = f"{accession}.{version}"
+            else:
+                v = accession
+            _dbxrefs[primary_id].append(f"{dbname}:{v}")
     return _dbxrefs
 
 
 def _retrieve_features(adaptor, primary_id):
-    sql = (
-        'SELECT seqfeature_id, type.name, "rank"'
-        " FROM seqfeature join term type on (type_term_id = type.term_id)"
-        " WHERE bioentry_id = %s"
-        ' ORDER BY "rank"'
-    )
-    results = adaptor.execute_and_fetchall(sql, (primary_id,))
-    seq_feature_list = []
-    for seqfeature_id, seqfeature_type, seqfeature_rank in results:
+    return _retrieve_many_features(adaptor, [primary_id])[int(primary_id)]
+
+
+def _retrieve_many_features(adaptor, primary_ids):
+    """Retrieve the features of many sequences (PRIVATE).
+
+    Rather than querying the qualifiers and locations of each feature
+    separately, this runs a fixed number of queries for each batch of
+    bioentries, joining the feature tables on the bioentry id. Returns a
+    dictionary mapping each (integer) primary id to its list of features.
+    """
+    primary_ids = [int(primary_id) for primary_id in primary_ids]
+    seq_feature_lists = {primary_id: [] for primary_id in primary_ids}
+    for batch, placeholders in _batches(primary_ids):
+        condition = f"seqfeature.bioentry_id IN ({placeholders})"
+        features = adaptor.execute_and_fetchall(
+            "SELECT bioentry_id, seqfeature_id, type.name"
+            " FROM seqfeature join term type on (type_term_id = type.term_id)"
+            f" WHERE {condition}"
+            ' ORDER BY seqfeature."rank"',
+            batch,
+        )
         # Get qualifiers [except for db_xref which is stored separately]
+        qualifiers = {seqfeature_id: {} for _, seqfeature_id, _ in features}
         qvs = adaptor.execute_and_fetchall(
-            "SELECT name, value"
-            " FROM seqfeature_qualifier_value  join term using (term_id)"
-            " WHERE seqfeature_id = %s"
-            ' ORDER BY "rank"',
-            (seqfeature_id,),
+            "SELECT seqfeature_id, name, value"
+            " FROM seqfeature_qualifier_value join term using (term_id)"
+            " join seqfeature using (seqfeature_id)"
+            f" WHERE {condition}"
+            ' ORDER BY seqfeature_qualifier_value."rank"',
+            batch,
         )
-        qualifiers = {}
-        for qv_name, qv_value in qvs:
-            qualifiers.setdefault(qv_name, []).append(qv_value)
+        for seqfeature_id, qv_name, qv_value in qvs:
+            qualifiers[seqfeature_id].setdefault(qv_name, []).append(qv_value)
         # Get db_xrefs [special case of qualifiers]
         qvs = adaptor.execute_and_fetchall(
-            "SELECT dbxref.dbname, dbxref.accession"
+            "SELECT seqfeature_id, dbxref.dbname, dbxref.accession"
             " FROM dbxref join seqfeature_dbxref using (dbxref_id)"
-            " WHERE seqfeature_dbxref.seqfeature_id = %s"
-            ' ORDER BY "rank"',
-            (seqfeature_id,),
+            " join seqfeature using (seqfeature_id)"
+            f" WHERE {condition}"
+            ' ORDER BY seqfeature_dbxref."rank"',
+            batch,
         )
-        for qv_name, qv_value in qvs:
+        for seqfeature_id, qv_name, qv_value in qvs:
             value = f"{qv_name}:{qv_value}"
-            qualifiers.setdefault("db_xref", []).append(value)
-        # Get locations
+            qualifiers[seqfeature_id].setdefault("db_xref", []).append(value)
+        # Get locations, with any remote reference information
+        locations = {seqfeature_id: [] for _, seqfeature_id, _ in features}
+        lookup = {}
         results = adaptor.execute_and_fetchall(
-            "SELECT location_id, start_pos, end_pos, strand"
-            " FROM location"
-            " WHERE seqfeature_id = %s"
-            ' ORDER BY "rank"',
-            (seqfeature_id,),
-        )
-        locations = []
-        # convert to Python standard form
-        # Convert strand = 0 to strand = None
-        # re: comment in Loader.py:
-        # Biopython uses None when we don't know strand information but
-        # BioSQL requires something (non null) and sets this as zero
-        # So we'll use the strand or 0 if Biopython spits out None
-        for location_id, start, end, strand in results:
-            if start:
-                start -= 1
-            if strand == 0:
-                strand = None
-            if strand not in (+1, -1, None):
-                raise ValueError(
-                    "Invalid strand %s found in database for "
-                    "seqfeature_id %s" % (strand, seqfeature_id)
-                )
-            if start is not None and end is not None and end < start:
-                import warnings
-
-                from Bio import BiopythonWarning
-
-                warnings.warn(
-                    "Inverted location start/end (%i and %i) for "
-                    "seqfeature_id %s" % (start, end, seqfeature_id),
-                    BiopythonWarning,
-                )
-
-            # For SwissProt unknown positions (?)
-            if start is None:
-                start = SeqFeature.UnknownPosition()
-            if end is None:
-                end = SeqFeature.UnknownPosition()
-
-            locations.append((location_id, start, end, strand))
-        # Get possible remote reference information
-        remote_results = adaptor.execute_and_fetchall(
-            "SELECT location_id, dbname, accession, version"
-            " FROM location join dbxref using (dbxref_id)"
-            " WHERE seqfeature_id = %s",
-            (seqfeature_id,),
+            "SELECT seqfeature_id, location_id, start_pos, end_pos, strand,"
+            " dbxref.dbname, dbxref.accession, dbxref.version"
+            " FROM location join seqfeature using (seqfeature_id)"
+            " left join dbxref on (location.dbxref_id = dbxref.dbxref_id)"
+            f" WHERE {condition}"
+            ' ORDER BY location."rank"',
+            batch,
         )
-        lookup = {}
-        for location_id, dbname, accession, version in remote_results:
+        for row in results:
+            seqfeature_id, location_id, start, end, strand = row[:5]
+            dbname, accession, version = row[5:]
+            locations[seqfeature_id].append(
+                _make_location(seqfeature_id, location_id, start, end, strand)
+            )
+            if accession is None:
+                # no remote reference
+                continue
             if version and version != "0":
                 v = f"{accession}.{version}"
             else:
@@ -265,155 +276,258 @@ def _retrieve_features(adaptor, primary_id):
             if dbname == "":
                 dbname = None
             lookup[location_id] = (dbname, v)
-
-        feature = SeqFeature.SeqFeature(type=seqfeature_type)
-        # Store the key as a private property
-        feature._seqfeature_id = seqfeature_id
-        feature.qualifiers = qualifiers
-        if len(locations) == 0:
-            pass
-        elif len(locations) == 1:
-            location_id, start, end, strand = locations[0]
-            # See Bug 2677, we currently don't record the location_operator
-            # For consistency with older versions Biopython, default to "".
-            feature.location_operator = _retrieve_location_qualifier_value(
-                adaptor, location_id
+        location_qualifier_values = {}
+        results = adaptor.execute_and_fetchall(
+            "SELECT location_id, value"
+            " FROM location_qualifier_value join location using (location_id)"
+            " join seqfeature using (seqfeature_id)"
+            f" WHERE {condition}",
+            batch,
+        )
+        for location_id, value in results:
+            location_qualifier_values.setdefault(location_id, value)
+        for primary_id, seqfeature_id, seqfeature_type in features:
+            feature = _make_feature(
+                seqfeature_id,
+                seqfeature_type,
+                qualifiers[seqfeature_id],
+                locations[seqfeature_id],
+                lookup,
+                location_qualifier_values,
             )
+            seq_feature_lists[primary_id].append(feature)
+    return seq_feature_lists
+
+
+def _make_location(seqfeature_id, location_id, start, end, strand):
+    """Convert a row of the location table to Python standard form (PRIVATE)."""
+    # Convert strand = 0 to strand = None
+    # re: comment in Loader.py:
+    # Biopython uses None when we don't know strand information but
+    # BioSQL requires something (non null) and sets this as zero
+    # So we'll use the strand or 0 if Biopython spits out None
+    if start:
+        start -= 1
+    if strand == 0:
+        strand = None
+    if strand not in (+1, -1, None):
+        raise ValueError(
+            "Invalid strand %s found in database for "
+            "seqfeature_id %s" % (strand, seqfeature_id)
+        )
+    if start is not None and end is not None and end < start:
+        import warnings
+
+        from Bio import BiopythonWarning
+
+        warnings.warn(
+            "Inverted location start/end (%i and %i) for "
+            "seqfeature_id %s" % (start, end, seqfeature_id),
+            BiopythonWarning,
+        )
+
+    # For SwissProt unknown positions (?)
+    if start is None:
+        start = SeqFeature.UnknownPosition()
+    if end is None:
+        end = SeqFeature.UnknownPosition()
+
+    return (location_id, start, end, strand)
+
+
+def _make_feature(
+    seqfeature_id,
+    seqfeature_type,
+    qualifiers,
+    locations,
+    lookup,
+    location_qualifier_values,
+):
+    """Create a SeqFeature from the values retrieved from the database (PRIVATE)."""
+    feature = SeqFeature.SeqFeature(type=seqfeature_type)
+    # Store the key as a private property
+    feature._seqfeature_id = seqfeature_id
+    feature.qualifiers = qualifiers
+    if len(locations) == 0:
+        pass
+    elif len(locations) == 1:
+        location_id, start, end, strand = locations[0]
+        # See Bug 2677, we currently don't record the location_operator
+        # For consistency with older versions Biopython, default to "".
+        feature.location_operator = location_qualifier_values.get(location_id, "")
+        dbname, version = lookup.get(location_id, (None, None))
+        feature.location = SeqFeature.SimpleLocation(start, end)
+        feature.location.strand = strand
+        feature.location.ref_db = dbname
+        feature.location.ref = version
+    else:
+        locs = []
+        for location in locations:
+            location_id, start, end, strand = location
             dbname, version = lookup.get(location_id, (None, None))
-            feature.location = SeqFeature.SimpleLocation(start, end)
-            feature.location.strand = strand
-            feature.location.ref_db = dbname
-            feature.location.ref = version
-        else:
-            locs = []
-            for location in locations:
-                location_id, start, end, strand = location
-                dbname, version = lookup.get(location_id, (None, None))
-                locs.append(
-                    SeqFeature.SimpleLocation(
-                        start, end, strand=strand, ref=version, ref_db=dbname
-                    )
+            locs.append(
+                SeqFeature.SimpleLocation(
+                    start, end, strand=strand, ref=version, ref_db=dbname
                 )
-            # Locations are typically in biological in order (see negative
-            # strands below), but because of remote locations for
-            # sub-features they are not necessarily in numerical order:
-            strands = {_.strand for _ in locs}
-            if len(strands) == 1 and -1 in strands:
-                # Evil hack time for backwards compatibility
-                # TODO - Check if BioPerl and (old) Biopython did the same,
-                # we may have an existing incompatibility lurking here...
-                locs = locs[::-1]
-            feature.location = SeqFeature.CompoundLocation(locs, "join")
-            # TODO - See Bug 2677 - we don't yet record location operator,
-            # so for consistency with older versions of Biopython default
-            # to assuming its a join.
-        seq_feature_list.append(feature)
-    return seq_feature_list
-
-
-def _retrieve_location_qualifier_value(adaptor, location_id):
-    value = adaptor.execute_and_fetch_col0(
-        "SELECT value FROM location_qualifier_value WHERE location_id = %s",
-        (location_id,),
-    )
-    try:
-        return value[0]
-    except IndexError:
-        return ""
+            )
+        # Locations are typically in biological in order (see negative
+        # strands below), but because of remote locations for
+        # sub-features they are not necessarily in numerical order:
+        strands = {_.strand for _ in locs}
+        if len(strands) == 1 and -1 in strands:
+            # Evil hack time for backwards compatibility
+            # TODO - Check if BioPerl and (old) Biopython did the same,
+            # we may have an existing incompatibility lurking here...
+            locs = locs[::-1]
+        feature.location = SeqFeature.CompoundLocation(locs, "join")
+        # TODO - See Bug 2677 - we don't yet record location operator,
+        # so for consistency with older versions of Biopython default
+        # to assuming its a join.
+    return feature
 
 
 def _retrieve_annotations(adaptor, primary_id, taxon_id):
+    return _retrieve_many_annotations(adaptor, [(primary_id, taxon_id)])[
+        int(primary_id)
+    ]
+
+
+def _retrieve_many_annotations(adaptor, entries):
+    """Retrieve the annotations of many sequences (PRIVATE).
+
+    Argument entries is a list of (primary id, taxon id) tuples. The taxonomy
+    of each taxon id is retrieved only once. Returns a dictionary mapping
+    each (integer) primary id to its annotations dictionary.
+    """
+    primary_ids = [int(primary_id) for primary_id, taxon_id in entries]
+    alphabets = _retrieve_many_alphabets(adaptor, primary_ids)
+    qualifiers = _retrieve_many_qualifier_values(adaptor, primary_ids)
+    references = _retrieve_many_references(adaptor, primary_ids)
+    comments = _retrieve_many_comments(adaptor, primary_ids)
+    taxa = {}
     annotations = {}
-    annotations.update(_retrieve_alphabet(adaptor, primary_id))
-    annotations.update(_retrieve_qualifier_value(adaptor, primary_id))
-    annotations.update(_retrieve_reference(adaptor, primary_id))
-    annotations.update(_retrieve_taxon(adaptor, primary_id, taxon_id))
-    annotations.update(_retrieve_comment(adaptor, primary_id))
+    for primary_id, (_, taxon_id) in zip(primary_ids, entries):
+        if taxon_id not in taxa:
+            taxa[taxon_id] = _retrieve_taxon(adaptor, primary_id, taxon_id)
+        a = {}
+        a.update(alphabets[primary_id])
+        a.update(qualifiers[primary_id])
+        a.update(references[primary_id])
+        # Each record gets its own copy of the taxonomy list
+        a.update(
+            {
+                key: list(value) if isinstance(value, list) else value
+                for key, value in taxa[taxon_id].items()
+            }
+        )
+        a.update(comments[primary_id])
+        annotations[primary_id] = a
     return annotations
 
 
 def _retrieve_alphabet(adaptor, primary_id):
-    results = adaptor.execute_and_fetchall(
-        "SELECT alphabet FROM biosequence WHERE bioentry_id = %s", (primary_id,)
-    )
-    if len(results) != 1:
-        raise ValueError(f"Expected 1 response, got {len(results)}.")
-    alphabets = results[0]
-    if len(alphabets) != 1:
-        raise ValueError(f"Expected 1 alphabet in response, got {len(alphabets)}.")
-    alphabet = alphabets[0]
-    if alphabet == "dna":
-        molecule_type = "DNA"
-    elif alphabet == "rna":
-        molecule_type = "RNA"
-    elif alphabet == "protein":
-        molecule_type = "protein"
-    else:
-        molecule_type = None
-    if molecule_type is not None:
-        return {"molecule_type": molecule_type}
-    else:
-        return {}
+    return _retrieve_many_alphabets(adaptor, [primary_id])[int(primary_id)]
+
+
+def _retrieve_many_alphabets(adaptor, primary_ids):
+    primary_ids = [int(primary_id) for primary_id in primary_ids]
+    molecule_types = {}
+    for batch, placeholders in _batches(primary_ids):
+        results = adaptor.execute_and_fetchall(
+            "SELECT bioentry_id, alphabet FROM biosequence"
+            f" WHERE bioentry_id IN ({placeholders})",
+            batch,
+        )
+        counts = dict.fromkeys(batch, 0)
+        for primary_id, alphabet in results:
+            counts[primary_id] += 1
+            if alphabet == "dna":
+                molecule_type = "DNA"
+            elif alphabet == "rna":
+                molecule_type = "RNA"
+            elif alphabet == "protein":
+                molecule_type = "protein"
+            else:
+                molecule_type = None
+            if molecule_type is not None:
+                molecule_types[primary_id] = {"molecule_type": molecule_type}
+            else:
+                molecule_types[primary_id] = {}
+        for count in counts.values():
+            if count != 1:
+                raise ValueError(f"Expected 1 response, got {count}.")
+    return molecule_types
 
 
 def _retrieve_qualifier_value(adaptor, primary_id):
-    qvs = adaptor.execute_and_fetchall(
-        "SELECT name, value"
-        " FROM bioentry_qualifier_value JOIN term USING (term_id)"
-        " WHERE bioentry_id = %s"
-        ' ORDER BY "rank"',
-        (primary_id,),
-    )
-    qualifiers = {}
-    for name, value in qvs:
-        if name == "keyword":
-            name = "keywords"
-        # See handling of "date" in Loader.py
-        elif name == "date_changed":
-            name = "date"
-        elif name == "secondary_accession":
-            name = "accessions"
-        qualifiers.setdefault(name, []).append(value)
+    return _retrieve_many_qualifier_values(adaptor, [primary_id])[int(primary_id)]
+
+
+def _retrieve_many_qualifier_values(adaptor, primary_ids):
+    primary_ids = [int(primary_id) for primary_id in primary_ids]
+    qualifiers = {primary_id: {} for primary_id in primary_ids}
+    for batch, placeholders in _batches(primary_ids):
+        qvs = adaptor.execute_and_fetchall(
+            "SELECT bioentry_id, name, value"
+            " FROM bioentry_qualifier_value JOIN term USING (term_id)"
+            f" WHERE bioentry_id IN ({placeholders})"
+            ' ORDER BY "rank"',
+            batch,
+        )
+        for primary_id, name, value in qvs:
+            if name == "keyword":
+                name = "keywords"
+            # See handling of "date" in Loader.py
+            elif name == "date_changed":
+                name = "date"
+            elif name == "secondary_accession":
+                name = "accessions"
+            qualifiers[primary_id].setdefault(name, []).append(value)
     return qualifiers
 
 
 def _retrieve_reference(adaptor, primary_id):
-    # XXX dbxref_qualifier_value
+    return _retrieve_many_references(adaptor, [primary_id])[int(primary_id)]
 
-    refs = adaptor.execute_and_fetchall(
-        "SELECT start_pos, end_pos, "
-        " location, title, authors,"
-        " dbname, accession"
-        " FROM bioentry_reference"
-        " JOIN reference USING (reference_id)"
-        " LEFT JOIN dbxref USING (dbxref_id)"
-        " WHERE bioentry_id = %s"
-        ' ORDER BY "rank"',
-        (primary_id,),
-    )
-    references = []
-    for start, end, location, title, authors, dbname, accession in refs:
-        reference = SeqFeature.Reference()
-        # If the start/end are missing, reference.location is an empty list
-        if (start is not None) or (end is not None):
-            if start is not None:
-                start -= 1  # python counting
-            reference.location = [SeqFeature.SimpleLocation(start, end)]
-        # Don't replace the default "" with None.
-        if authors:
-            reference.authors = authors
-        if title:
-            reference.title = title
-        reference.journal = location
-        if dbname == "PUBMED":
-            reference.pubmed_id = accession
-        elif dbname == "MEDLINE":
-            reference.medline_id = accession
-        references.append(reference)
-    if references:
-        return {"references": references}
-    else:
-        return {}
+
+def _retrieve_many_references(adaptor, primary_ids):
+    # XXX dbxref_qualifier_value
+    primary_ids = [int(primary_id) for primary_id in primary_ids]
+    references = {primary_id: [] for primary_id in primary_ids}
+    for batch, placeholders in _batches(primary_ids):
+        refs = adaptor.execute_and_fetchall(
+            "SELECT bioentry_id, start_pos, end_pos, "
+            " location, title, authors,"
+            " dbname, accession"
+            " FROM bioentry_reference"
+            " JOIN reference USING (reference_id)"
+            " LEFT JOIN dbxref USING (dbxref_id)"
+            f" WHERE bioentry_id IN ({placeholders})"
+            ' ORDER BY "rank"',
+            batch,
+        )
+        for primary_id, start, end, location, title, authors, dbname, accession in refs:
+            reference = SeqFeature.Reference()
+            # If the start/end are missing, reference.location is an empty list
+            if (start is not None) or (end is not None):
+                if start is not None:
+                    start -= 1  # python counting
+                reference.location = [SeqFeature.SimpleLocation(start, end)]
+            # Don't replace the default "" with None.
+            if authors:
+                reference.authors = authors
+            if title:
+                reference.title = title
+            reference.journal = location
+            if dbname == "PUBMED":
+                reference.pubmed_id = accession
+            elif dbname == "MEDLINE":
+                reference.medline_id = accession
+            references[primary_id].append(reference)
+    return {
+        primary_id: {"references": refs} if refs else {}
+        for primary_id, refs in references.items()
+    }
 
 
 def _retrieve_taxon(adaptor, primary_id, taxon_id):
@@ -472,16 +586,82 @@ def _retrieve_taxon(adaptor, primary_id, taxon_id):
 
 
 def _retrieve_comment(adaptor, primary_id):
-    qvs = adaptor.execute_and_fetchall(
-        'SELECT comment_text FROM comment WHERE bioentry_id=%s ORDER BY "rank"',
-        (primary_id,),
-    )
-    comments = [comm[0] for comm in qvs]
+    return _retrieve_many_comments(adaptor, [primary_id])[int(primary_id)]
+
+
+def _retrieve_many_comments(adaptor, primary_ids):
+    primary_ids = [int(primary_id) for primary_id in primary_ids]
+    comments = {primary_id: [] for primary_id in primary_ids}
+    for batch, placeholders in _batches(primary_ids):
+        qvs = adaptor.execute_and_fetchall(
+            "SELECT bioentry_id, comment_text FROM comment"
+            f" WHERE bioentry_id IN ({placeholders})"
+            ' ORDER BY "rank"',
+            batch,
+        )
+        for primary_id, comment in qvs:
+            comments[primary_id].append(comment)
     # Don't want to add an empty list...
-    if comments:
-        return {"comment": comments}
-    else:
-        return {}
+    return {
+        primary_id: {"comment": comment} if comment else {}
+        for primary_id, comment in comments.items()
+    }
+
+
+def _retrieve_records(adaptor, primary_ids):
+    """Retrieve many DBSeqRecord objects with their annotations (PRIVATE).
+
+    The bioentries, their features, annotations and database cross
+    references are retrieved using a fixed number of queries per batch of
+    primary ids, instead of several queries per record and per feature.
+    The sequences themselves are still retrieved on demand. Returns a list
+    of DBSeqRecord objects in the same order as the primary ids; a missing
+    primary id raises a KeyError.
+    """
+    primary_ids = [int(primary_id) for primary_id in primary_ids]
+    rows = {}
+    lengths = {}
+    for batch, placeholders in _batches(primary_ids):
+        results = adaptor.execute_and_fetchall(
+            "SELECT bioentry_id, biodatabase_id, taxon_id, name, accession,"
+            " version, identifier, division, description"
+            " FROM bioentry"
+            f" WHERE bioentry_id IN ({placeholders})",
+            batch,
+        )
+        for row in results:
+            rows[row[0]] = row[1:]
+        results = adaptor.execute_and_fetchall(
+            "SELECT bioentry_id, length FROM biosequence"
+            f" WHERE bioentry_id IN ({placeholders})",
+            batch,
+        )
+        for primary_id, length in results:
+            lengths[primary_id] = int(length)
+    records = []
+    for primary_id in primary_ids:
+        try:
+            row = rows[primary_id]
+        except KeyError:
+            raise KeyError(f"Entry {primary_id} not found") from None
+        record = DBSeqRecord.__new__(DBSeqRecord)
+        record._adaptor = adaptor
+        record._primary_id = primary_id
+        record._set_bioentry(row, lengths.get(primary_id))
+        records.append(record)
+    dbxrefs = _retrieve_many_dbxrefs(adaptor, primary_ids)
+    features = _retrieve_many_features(adaptor, primary_ids)
+    annotations = _retrieve_many_annotations(
+        adaptor, [(record._primary_id, record._taxon_id) for record in records]
+    )
+    for record in records:
+        primary_id = record._primary_id
+        # Records listed more than once must not share their annotations
+        if primary_id in dbxrefs:
+            record._dbxrefs = dbxrefs.pop(primary_id)
+            record._features = features.pop(primary_id)
+            record._set_annotations(annotations.pop(primary_id))
+    return records
 
 
 class DBSeqRecord(SeqRecord):
@@ -500,6 +680,19 @@ class DBSeqRecord(SeqRecord):
         self._adaptor = adaptor
         self._primary_id = primary_id
 
+        row = self._adaptor.execute_one(
+            "SELECT biodatabase_id, taxon_id, name, accession, version,"
+            " identifier, division, description"
+            " FROM bioentry"
+            " WHERE bioentry_id = %s",
+            (self._primary_id,),
+        )
+        # We do NOT want to load the sequence from the DB here!
+        length = _retrieve_seq_len(adaptor, primary_id)
+        self._set_bioentry(row, length)
+
+    def _set_bioentry(self, row, length):
+        """Store the bioentry table row and the sequence length (PRIVATE)."""
         (
             self._biodatabase_id,
             self._taxon_id,
@@ -509,13 +702,7 @@ class DBSeqRecord(SeqRecord):
             self._identifier,
             self._division,
             self.description,
-        ) = self._adaptor.execute_one(
-            "SELECT biodatabase_id, taxon_id, name, accession, version,"
-            " identifier, division, description"
-            " FROM bioentry"
-            " WHERE bioentry_id = %s",
-            (self._primary_id,),
-        )
+        ) = row
         if version and version != "0":
             self.id = f"{accession}.{version}"
         else:
@@ -523,8 +710,6 @@ class DBSeqRecord(SeqRecord):
         # We don't yet record any per-letter-annotations in the
         # BioSQL database, but we should set this property up
         # for completeness (and the __str__ method).
-        # We do NOT want to load the sequence from the DB here!
-        length = _retrieve_seq_len(adaptor, primary_id)
         self._per_letter_annotations = _RestrictedDict(length=length)
 
     def __get_seq(self):
@@ -573,13 +758,9 @@ class DBSeqRecord(SeqRecord):
     def annotations(self) -> SeqRecord._AnnotationsDict:
         """Annotations."""
         if not hasattr(self, "_annotations"):
-            self._annotations = _retrieve_annotations(
-                self._adaptor, self._primary_id, self._taxon_id
+            self._set_annotations(
+                _retrieve_annotations(self._adaptor, self._primary_id, self._taxon_id)
             )
-            if self._identifier:
-                self._annotations["gi"] = self._identifier
-            if self._division:
-                self._annotations["data_file_division"] = self._division
         return self._annotations
 
     @annotations.setter
@@ -592,3 +773,11 @@ class DBSeqRecord(SeqRecord):
     @annotations.deleter
     def annotations(self) -> None:
         del self._annotations
+
+    def _set_annotations(self, annotations):
+        """Store the annotations retrieved from the database (PRIVATE)."""
+        if self._identifier:
+            annotations["gi"] = self._identifier
+        if self._division:
+            annotations["data_file_division"] = self._division
+        self._annotations = annotations
@@ -17,6 +17,8 @@ database, and is compatible with the BioSQL standards.
 """
 
 import os
+import time
+from collections import OrderedDict
 
 from . import BioSeq
 from . import DBUtils
@@ -233,6 +235,7 @@ class DBServer:
         db_id = self.adaptor.fetch_dbid_by_dbname(name)
         remover = Loader.DatabaseRemover(self.adaptor, db_id)
         remover.remove()
+        self.adaptor.clear_subseq_cache()
 
     def new_database(self, db_name, authority=None, description=None):
         """Add a new database to the server and return it."""
@@ -339,8 +342,19 @@ class Adaptor:
     Most database calls in BioSQL are done indirectly though this adaptor
     class. This provides helper methods for fetching data and executing
     sql.
+
+    Sequence data are retrieved from the database in chunks of
+    subseq_chunk_size letters, aligned on multiples of subseq_chunk_size,
+    and the subseq_cache_size most recently used chunks are kept in memory.
+    Set subseq_cache_size to zero to disable this cache.
     """
 
+    subseq_chunk_size = 65536
+    subseq_cache_size = 128
+    # Maximum number of parameters in a single SQL query (the lowest limit is
+    # that of SQLite before version 3.32)
+    _max_query_parameters = 999
+
     def __init__(self, conn, dbutils, wrap_cursor=False):
         """Create an Adaptor object.
 
@@ -356,6 +370,7 @@ class Adaptor:
         else:
             self.cursor = conn.cursor()
         self.dbutils = dbutils
+        self._subseq_cache = OrderedDict()
 
     def last_id(self, table):
         """Return the last row id for the selected table."""
@@ -371,12 +386,23 @@ class Adaptor:
 
     def rollback(self):
         """Roll-back the current transaction."""
+        self.clear_subseq_cache()
         return self.conn.rollback()
 
     def close(self):
         """Close the connection. No further activity possible."""
+        self.clear_subseq_cache()
         return self.conn.close()
 
+    def clear_subseq_cache(self):
+        """Remove all sequence chunks from the cache.
+
+        This is done automatically when entries are deleted using the
+        BioSeqDatabase and DBServer objects, and on a roll-back, but is
+        needed if the sequences in the database are modified otherwise.
+        """
+        self._subseq_cache.clear()
+
     def fetch_dbid_by_dbname(self, dbname):
         """Return the internal id for the sub-database using its name."""
         self.execute(
@@ -562,17 +588,108 @@ class Adaptor:
          - end - The end position of the sequence
 
         """
-        length = end - start
-        # XXX Check this on MySQL and PostgreSQL. substr should be general,
-        # does it need dbutils?
-        # return self.execute_one(
-        #    """select SUBSTRING(seq FROM %s FOR %s)
-        #             from biosequence where bioentry_id = %s""",
-        #    (start+1, length, seqid))[0]
-        return self.execute_one(
-            "SELECT SUBSTR(seq, %s, %s) FROM biosequence WHERE bioentry_id = %s",
-            (start + 1, length, seqid),
-        )[0]
+        chunk_size = self.subseq_chunk_size
+        if end <= start:
+            return ""
+        chunks = range(start // chunk_size, (end - 1) // chunk_size + 1)
+        if len(chunks) > self.subseq_cache_size:
+            # Too long to keep in the cache; retrieve it directly
+            return self._fetch_substrings(seqid, [(start, end)])[0]
+        self._load_chunks(seqid, chunks)
+        return self._join_chunks(seqid, start, end)
+
+    def fetch_subseqs(self, seqid, ranges):
+        """Return a list of substrings of a sequence.
+
+        Arguments:
+         - seqid - The internal id for the sequence
+         - ranges - A list of (start, end) tuples; 0-indexed
+
+        The sequence chunks covering all the ranges are retrieved together
+        (with a single query per 499 separate regions of the sequence) and
+        stored in the cache, so this can be used to retrieve the sequences
+        of many features at once. If the ranges cover more sequence than
+        fits in the cache, the substrings are retrieved directly.
+        """
+        ranges = [(int(start), int(end)) for start, end in ranges]
+        chunk_size = self.subseq_chunk_size
+        chunks = set()
+        for start, end in ranges:
+            if end > start:
+                chunks.update(range(start // chunk_size, (end - 1) // chunk_size + 1))
+        if len(chunks) > self.subseq_cache_size:
+            return self._fetch_substrings(seqid, ranges)
+        self._load_chunks(seqid, sorted(chunks))
+        return [
+            self._join_chunks(seqid, start, end) if end > start else ""
+            for start, end in ranges
+        ]
+
+    def _fetch_substrings(self, seqid, ranges):
+        """Retrieve substrings of a sequence from the database (PRIVATE).
+
+        Each query retrieves as many substrings as its number of parameters
+        allows, with two for each substring and one for the bioentry id.
+        """
+        substrings = []
+        batch_size = (self._max_query_parameters - 1) // 2
+        for i in range(0, len(ranges), batch_size):
+            batch = ranges[i : i + batch_size]
+            columns = ", ".join(["SUBSTR(seq, %s, %s)"] * len(batch))
+            args = []
+            for start, end in batch:
+                args.append(start + 1)
+                args.append(max(end - start, 0))
+            args.append(seqid)
+            # XXX Check this on MySQL and PostgreSQL. substr should be general,
+            # does it need dbutils?
+            substrings.extend(
+                self.execute_one(
+                    f"SELECT {columns} FROM biosequence WHERE bioentry_id = %s",
+                    args,
+                )
+            )
+        return substrings
+
+    def _load_chunks(self, seqid, chunks):
+        """Ensure that the given sorted sequence chunks are in the cache (PRIVATE)."""
+        cache = self._subseq_cache
+        chunk_size = self.subseq_chunk_size
+        # Retrieve the missing chunks, combining consecutive chunks
+        runs = []
+        for chunk in chunks:
+            if (seqid, chunk) in cache:
+                continue
+            if runs and runs[-1][1] == chunk:
+                runs[-1][1] = chunk + 1
+            else:
+                runs.append([chunk, chunk + 1])
+        if runs:
+            ranges = [(first * chunk_size, last * chunk_size) for first, last in runs]
+            substrings = self._fetch_substrings(seqid, ranges)
+            for (first, last), substring in zip(runs, substrings):
+                if substring is None:
+                    substring = ""
+                for chunk in range(first, last):
+                    offset = (chunk - first) * chunk_size
+                    cache[(seqid, chunk)] = substring[offset : offset + chunk_size]
+        for chunk in chunks:
+            cache.move_to_end((seqid, chunk))
+        while len(cache) > self.subseq_cache_size:
+            cache.popitem(last=False)
+
+    def _join_chunks(self, seqid, start, end):
+        """Return a substring of a sequence from the cached chunks (PRIVATE)."""
+        chunk_size = self.subseq_chunk_size
+        first = start // chunk_size
+        last = (end - 1) // chunk_size
+        offset = first * chunk_size
+        if first == last:
+            return self._subseq_cache[(seqid, first)][start - offset : end - offset]
+        sequence = "".join(
+            self._subseq_cache[(seqid, chunk)] for chunk in range(first, last + 1)
+        )
+        return sequence[start - offset : end - offset]
 
     def execute_and_fetch_col0(self, sql, args=None):
         """Return a list of values from the first column in the row."""
@@ -716,6 +833,29 @@ class BioSeqDatabase:
             raise KeyError(f"Entry {key!r} does exist, but not in current name space")
         return record
 
+    def get_records(self, keys):
+        """Return a list of DBSeqRecord objects with their annotation loaded.
+
+        Arguments:
+         - keys - A list of internal ids for the sequences
+
+        Unlike looking up each record with db[key], this retrieves the
+        features, annotations and database cross references of all the
+        records using a fixed number of SQL queries per batch of records,
+        rather than several queries per record and per feature. The
+        sequences themselves are still retrieved on demand.
+
+        Example: records = db.get_records(list(db.keys())[:100])
+        """
+        keys = list(keys)
+        records = BioSeq._retrieve_records(self.adaptor, keys)
+        for key, record in zip(keys, records):
+            if record._biodatabase_id != self.dbid:
+                raise KeyError(
+                    f"Entry {key!r} does exist, but not in current name space"
+                )
+        return records
+
     def __delitem__(self, key):
         """Remove an entry and all its annotation."""
         if key not in self:
@@ -725,6 +865,7 @@ class BioSeqDatabase:
         # Assuming this will automatically cascade to the other tables...
         sql = "DELETE FROM bioentry WHERE biodatabase_id=%s AND bioentry_id=%s;"
         self.adaptor.execute(sql, (self.dbid, key))
+        self.adaptor.clear_subseq_cache()
 
     def __len__(self):
         """Return number of records in this namespace (sub database)."""
@@ -786,7 +927,14 @@ class BioSeqDatabase:
         seqid = lookup_func(self.dbid, v)
         return BioSeq.DBSeqRecord(self.adaptor, seqid)
 
-    def load(self, record_iterator, fetch_NCBI_taxonomy=False):
+    def load(
+        self,
+        record_iterator,
+        fetch_NCBI_taxonomy=False,
+        bulk=False,
+        chunk_size=1000,
+        progress=None,
+    ):
         """Load a set of SeqRecords into the BioSQL database.
 
         record_iterator is either a list of SeqRecord objects, or an
@@ -804,10 +952,38 @@ class BioSeqDatabase:
             from Bio import SeqIO
             count = db.load(SeqIO.parse(open(filename), format))
 
+        For loading large numbers of records, use bulk=True. The loader then
+        keeps the ontology terms, database cross references and literature
+        references it has seen in memory, rather than looking them up for
+        every record, and inserts the qualifiers, locations and cross
+        references in batches. In this mode the records are committed to
+        the database in chunks of chunk_size records; after each chunk the
+        optional progress function is called with the number of records
+        loaded so far and the number of records loaded per second::
+
+            def report(count, rate):
+                print(f"{count} records loaded ({rate:.1f} records/sec)")
+
+            count = db.load(records, bulk=True, chunk_size=500, progress=report)
+
+        Note that if loading fails, the chunks already committed remain in
+        the database.
+
         Returns the number of records loaded.
         """
-        db_loader = Loader.DatabaseLoader(self.adaptor, self.dbid, fetch_NCBI_taxonomy)
+        if bulk:
+            if chunk_size < 1:
+                raise ValueError(f"chunk_size must be positive, not {chunk_size}")
+            db_loader = Loader.BulkDatabaseLoader(
+                self.adaptor, self.dbid, fetch_NCBI_taxonomy
+            )
+            start_time = time.perf_counter()
+        else:
+            db_loader = Loader.DatabaseLoader(
+                self.adaptor, self.dbid, fetch_NCBI_taxonomy
+            )
         num_records = 0
+        num_committed = 0
         global _POSTGRES_RULES_PRESENT
         for cur_record in record_iterator:
             num_records += 1
@@ -840,4 +1016,26 @@ class BioSeqDatabase:
                     )
             # End of hack
             db_loader.load_seqrecord(cur_record)
+            if bulk and num_records % chunk_size == 0:
+                num_committed = self._commit_chunk(
+                    db_loader, num_records, start_time, progress
+                )
+        if bulk and num_committed < num_records:
+            self._commit_chunk(db_loader, num_records, start_time, progress)
+        return num_records
+
+    def _commit_chunk(self, db_loader, num_records, start_time, progress):
+        """Write and commit the records collected by the bulk loader (PRIVATE).
+
+        Returns the number of records loaded so far.
+        """
+        db_loader.flush()
+        self.adaptor.commit()
+        if progress is not None:
+            elapsed = time.perf_counter() - start_time
+            if elapsed > 0:
+                rate = num_records / elapsed
+            else:
+                rate = float("inf")
+            progress(num_records, rate)
         return num_records
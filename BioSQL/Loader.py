@@ -19,6 +19,8 @@ a database object.
 """
 
 # standard modules
+from itertools import groupby
+from operator import itemgetter
 from time import gmtime
 from time import strftime
 
@@ -71,6 +73,14 @@ class DatabaseLoader:
             seq_feature = record.features[seq_feature_num]
             self._load_seqfeature(seq_feature, seq_feature_num, bioentry_id)
 
+    def _insert(self, table, sql, args):
+        """Insert a row no other row refers to, into the given table (PRIVATE).
+
+        The BulkDatabaseLoader overrides this to collect these rows, and to
+        insert them in batches.
+        """
+        self.adaptor.execute(sql, args)
+
     def _get_ontology_id(self, name, definition=None):
         """Return identifier for the named ontology (PRIVATE).
 
@@ -698,7 +708,7 @@ class DatabaseLoader:
             ' (bioentry_id, term_id, value, "rank")'
             " VALUES (%s, %s, %s, 1)"
         )
-        self.adaptor.execute(sql, (bioentry_id, date_id, date))
+        self._insert("bioentry_qualifier_value", sql, (bioentry_id, date_id, date))
 
     def _load_biosequence(self, record, bioentry_id):
         """Record SeqRecord's sequence and alphabet in DB (PRIVATE).
@@ -758,7 +768,7 @@ class DatabaseLoader:
                 'INSERT INTO comment (bioentry_id, comment_text, "rank")'
                 " VALUES (%s, %s, %s)"
             )
-            self.adaptor.execute(sql, (bioentry_id, comment, index + 1))
+            self._insert("comment", sql, (bioentry_id, comment, index + 1))
 
     def _load_annotations(self, record, bioentry_id):
         """Record a SeqRecord's misc annotations in the database (PRIVATE).
@@ -794,14 +804,20 @@ class DatabaseLoader:
                     if isinstance(entry, (str, int)):
                         # Easy case
                         rank += 1
-                        self.adaptor.execute(
-                            many_sql, (bioentry_id, term_id, str(entry), rank)
+                        self._insert(
+                            "bioentry_qualifier_value",
+                            many_sql,
+                            (bioentry_id, term_id, str(entry), rank),
                         )
                     else:
                         pass
             elif isinstance(value, (str, int)):
                 # Have a simple single entry, leave rank as the DB default
-                self.adaptor.execute(mono_sql, (bioentry_id, term_id, str(value)))
+                self._insert(
+                    "bioentry_qualifier_value",
+                    mono_sql,
+                    (bioentry_id, term_id, str(value)),
+                )
             else:
                 pass
                 # print("Ignoring annotation '%s' entry of type '%s'" \
@@ -814,6 +830,29 @@ class DatabaseLoader:
          - record - a SeqRecord object with annotated references
          - bioentry_id - corresponding database identifier
 
+        """
+        reference_id = self._get_reference_id(reference)
+
+        if reference.location:
+            start = 1 + int(str(reference.location[0].start))
+            end = int(str(reference.location[0].end))
+        else:
+            start = None
+            end = None
+
+        sql = (
+            "INSERT INTO bioentry_reference (bioentry_id, reference_id,"
+            ' start_pos, end_pos, "rank") VALUES (%s, %s, %s, %s, %s)'
+        )
+        self._insert(
+            "bioentry_reference", sql, (bioentry_id, reference_id, start, end, rank + 1)
+        )
+
+    def _get_reference_id(self, reference):
+        """Return the id of the reference, adding it if needed (PRIVATE).
+
+        The reference is looked up by its MEDLINE or PubMed identifier, or
+        by a checksum of its authors, title and journal.
         """
         refs = None
         if reference.medline_id:
@@ -856,22 +895,8 @@ class DatabaseLoader:
                 " VALUES (%s, %s, %s, %s, %s)",
                 (dbxref_id, journal, title, authors, crc),
             )
-            reference_id = self.adaptor.last_id("reference")
-        else:
-            reference_id = refs[0]
-
-        if reference.location:
-            start = 1 + int(str(reference.location[0].start))
-            end = int(str(reference.location[0].end))
-        else:
-            start = None
-            end = None
-
-        sql = (
-            "INSERT INTO bioentry_reference (bioentry_id, reference_id,"
-            ' start_pos, end_pos, "rank") VALUES (%s, %s, %s, %s, %s)'
-        )
-        self.adaptor.execute(sql, (bioentry_id, reference_id, start, end, rank + 1))
+            return self.adaptor.last_id("reference")
+        return refs[0]
 
     def _load_seqfeature(self, feature, feature_rank, bioentry_id):
         """Load a biopython SeqFeature into the database (PRIVATE)."""
@@ -1011,8 +1036,10 @@ class DatabaseLoader:
             'start_pos, end_pos, strand, "rank") '
             "VALUES (%s, %s, %s, %s, %s, %s, %s)"
         )
-        self.adaptor.execute(
-            sql, (seqfeature_id, dbxref_id, loc_term_id, start, end, strand, rank)
+        self._insert(
+            "location",
+            sql,
+            (seqfeature_id, dbxref_id, loc_term_id, start, end, strand, rank),
         )
 
         """
@@ -1066,7 +1093,8 @@ class DatabaseLoader:
                         ' (seqfeature_id, term_id, "rank", value) VALUES'
                         " (%s, %s, %s, %s)"
                     )
-                    self.adaptor.execute(
+                    self._insert(
+                        "seqfeature_qualifier_value",
                         sql,
                         (
                             seqfeature_id,
@@ -1170,7 +1198,7 @@ class DatabaseLoader:
             '(seqfeature_id, dbxref_id, "rank") VALUES'
             "(%s, %s, %s)"
         )
-        self.adaptor.execute(sql, (seqfeature_id, dbxref_id, rank))
+        self._insert("seqfeature_dbxref", sql, (seqfeature_id, dbxref_id, rank))
         return (seqfeature_id, dbxref_id)
 
     def _load_dbxrefs(self, record, bioentry_id):
@@ -1231,10 +1259,116 @@ class DatabaseLoader:
             '(bioentry_id,dbxref_id,"rank") VALUES '
             "(%s, %s, %s)"
         )
-        self.adaptor.execute(sql, (bioentry_id, dbxref_id, rank))
+        self._insert("bioentry_dbxref", sql, (bioentry_id, dbxref_id, rank))
         return (bioentry_id, dbxref_id)
 
 
+class BulkDatabaseLoader(DatabaseLoader):
+    """Object used to load many SeqRecord objects into a BioSQL database.
+
+    This loads the records in the same way as the DatabaseLoader, but keeps
+    the ontology, term, database cross reference and reference ids it has
+    seen in memory, rather than looking them up again for each record, and
+    collects the rows of the qualifier, location, comment and cross
+    reference tables to insert them in batches using executemany. The
+    collected rows are written to the database by calling the flush method.
+
+    Creating a BulkDatabaseLoader object is normally handled via the load
+    method of a BioSeqDatabase object, using bulk=True.
+    """
+
+    def __init__(self, adaptor, dbid, fetch_NCBI_taxonomy=False):
+        """Initialize with connection information for the database."""
+        super().__init__(adaptor, dbid, fetch_NCBI_taxonomy)
+        self._ontology_ids = {}
+        self._term_ids = {}
+        self._dbxref_ids = {}
+        self._reference_ids = {}
+        self._rows = {}
+        self._dbxref_pairs = set()
+
+    def flush(self):
+        """Insert the rows collected so far into the database."""
+        for rows in self._rows.values():
+            # Keep the rows of each table in order, as the retrieval of
+            # values with the same rank depends on the insertion order.
+            for sql, args in groupby(rows, key=itemgetter(0)):
+                self.adaptor.executemany(sql, [arg for _, arg in args])
+        self._rows.clear()
+        # The cross reference pairs can only refer to the bioentries and
+        # seqfeatures of the current record, so there is no need to keep them.
+        self._dbxref_pairs.clear()
+
+    def _insert(self, table, sql, args):
+        """Collect a row to be inserted into the given table (PRIVATE)."""
+        self._rows.setdefault(table, []).append((sql, args))
+
+    def _get_ontology_id(self, name, definition=None):
+        """Return identifier for the named ontology, using a cache (PRIVATE)."""
+        try:
+            return self._ontology_ids[name]
+        except KeyError:
+            pass
+        ontology_id = super()._get_ontology_id(name, definition)
+        self._ontology_ids[name] = ontology_id
+        return ontology_id
+
+    def _get_term_id(self, name, ontology_id=None, definition=None, identifier=None):
+        """Get the id that corresponds to a term, using a cache (PRIVATE)."""
+        key = (name, ontology_id)
+        try:
+            return self._term_ids[key]
+        except KeyError:
+            pass
+        term_id = super()._get_term_id(name, ontology_id, definition, identifier)
+        self._term_ids[key] = term_id
+        return term_id
+
+    def _get_dbxref_id(self, db, accession):
+        """Get DB cross-reference for accession, using a cache (PRIVATE)."""
+        key = (db, accession)
+        try:
+            return self._dbxref_ids[key]
+        except KeyError:
+            pass
+        dbxref_id = super()._get_dbxref_id(db, accession)
+        self._dbxref_ids[key] = dbxref_id
+        return dbxref_id
+
+    def _get_reference_id(self, reference):
+        """Return the id of the reference, using a cache (PRIVATE)."""
+        key = (
+            reference.medline_id,
+            reference.pubmed_id,
+            reference.authors,
+            reference.title,
+            reference.journal,
+        )
+        try:
+            return self._reference_ids[key]
+        except KeyError:
+            pass
+        reference_id = super()._get_reference_id(reference)
+        self._reference_ids[key] = reference_id
+        return reference_id
+
+    def _get_seqfeature_dbxref(self, seqfeature_id, dbxref_id, rank):
+        """Add the DB cross-reference unless already present (PRIVATE)."""
+        key = ("seqfeature", seqfeature_id, dbxref_id)
+        if key in self._dbxref_pairs:
+            return (seqfeature_id, dbxref_id)
+        self._dbxref_pairs.add(key)
+        return self._add_seqfeature_dbxref(seqfeature_id, dbxref_id, rank)
+
+    def _get_bioentry_dbxref(self, bioentry_id, dbxref_id, rank):
+        """Add the DB cross-reference unless already present (PRIVATE)."""
+        key = ("bioentry", bioentry_id, dbxref_id)
+        if key in self._dbxref_pairs:
+            return (bioentry_id, dbxref_id)
+        self._dbxref_pairs.add(key)
+        return self._add_bioentry_dbxref(bioentry_id, dbxref_id, rank)
+
+
 class DatabaseRemover:
     """Complement the Loader functionality by fully removing a database.
 
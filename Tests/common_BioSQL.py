@@ -357,6 +357,8 @@ class MultiReadTest(unittest.TestCase):
         for db2_id in db2.keys():
             with self.assertRaises(KeyError):
                 db[db2_id]
+        with self.assertRaises(KeyError):
+            db.get_records(list(db2.keys()))
 
 
 class ReadTest(unittest.TestCase):
@@ -422,6 +424,35 @@ class ReadTest(unittest.TestCase):
         self.db.lookup(primary_id="16353")
         self.assertRaises(IndexError, self.db.lookup, primary_id="Not Real")
 
+    def test_get_records(self):
+        """Test retrieval of many records with their annotation at once."""
+        keys = list(self.db.keys())
+        records = self.db.get_records(keys)
+        self.assertEqual(len(records), len(keys))
+        for key, record in zip(keys, records):
+            expected = self.db[key]
+            self.assertEqual(record.id, expected.id)
+            self.assertEqual(record.name, expected.name)
+            self.assertEqual(record.description, expected.description)
+            self.assertEqual(record.dbxrefs, expected.dbxrefs)
+            self.assertEqual(len(record.annotations), len(expected.annotations))
+            for k, v in expected.annotations.items():
+                if k == "references":
+                    self.assertEqual(
+                        [str(r) for r in record.annotations[k]], [str(r) for r in v]
+                    )
+                else:
+                    self.assertEqual(record.annotations[k], v)
+            self.assertEqual(len(record.features), len(expected.features))
+            for feature, expected_feature in zip(record.features, expected.features):
+                self.assertEqual(feature.type, expected_feature.type)
+                self.assertEqual(feature.location, expected_feature.location)
+                self.assertEqual(feature.qualifiers, expected_feature.qualifiers)
+            self.assertEqual(record.seq, expected.seq)
+        self.assertEqual(self.db.get_records([]), [])
+        with self.assertRaises(KeyError):
+            self.db.get_records([keys[0], -1])
+
 
 class SeqInterfaceTest(unittest.TestCase):
     """Make sure the BioSQL objects implement the expected biopython interface."""
@@ -535,6 +566,53 @@ class SeqInterfaceTest(unittest.TestCase):
         self.assertEqual(test_seq[1], "T")
         self.assertEqual(test_seq[-10:][5:], "TTATA")
 
+    def test_subseq_cache(self):
+        """Check the retrieval of sequences using the sequence chunk cache."""
+        adaptor = self.db.adaptor
+        primary_id = self.item._primary_id
+        expected = str(self.item.seq)
+        adaptor.clear_subseq_cache()
+        adaptor.subseq_chunk_size = 100
+        adaptor.subseq_cache_size = 4
+        self.assertEqual(
+            adaptor.get_subseq_as_string(primary_id, 150, 250), expected[150:250]
+        )
+        self.assertEqual(len(adaptor._subseq_cache), 2)
+        self.assertEqual(
+            adaptor.get_subseq_as_string(primary_id, 199, 200), expected[199]
+        )
+        self.assertEqual(adaptor.get_subseq_as_string(primary_id, 5, 5), "")
+        # more chunks than fit in the cache are retrieved directly
+        self.assertEqual(adaptor.get_subseq_as_string(primary_id, 0, 880), expected)
+        self.assertEqual(len(adaptor._subseq_cache), 2)
+        self.assertEqual(
+            adaptor.get_subseq_as_string(primary_id, 550, 880), expected[550:]
+        )
+        self.assertEqual(len(adaptor._subseq_cache), 4)
+        self.assertNotIn((primary_id, 1), adaptor._subseq_cache)
+        ranges = [(10, 20), (850, 880), (0, 0), (795, 805), (860, 900)]
+        self.assertEqual(
+            adaptor.fetch_subseqs(primary_id, ranges),
+            [expected[start:end] for start, end in ranges],
+        )
+        ranges = [(start, start + 7) for start in range(0, 880, 50)]
+        self.assertEqual(
+            adaptor.fetch_subseqs(primary_id, ranges),
+            [expected[start:end] for start, end in ranges],
+        )
+        # substrings retrieved directly in several queries
+        adaptor._max_query_parameters = 5
+        try:
+            self.assertEqual(
+                adaptor.fetch_subseqs(primary_id, ranges),
+                [expected[start:end] for start, end in ranges],
+            )
+        finally:
+            del adaptor._max_query_parameters
+        self.assertEqual("".join(self.item.seq), expected)
+        for feature in self.item.features:
+            self.assertEqual(feature.extract(self.item.seq), feature.extract(expected))
+
     def test_record_slicing(self):
         """Check that slices of DBSeqRecord are retrieved properly."""
         new_rec = self.item[400:]
@@ -936,6 +1014,36 @@ class LoaderTest(unittest.TestCase):
             ],
         )
 
+    def test_bulk_load_database(self):
+        """Load SeqRecord objects into a BioSQL database in bulk."""
+        records = list(self.iterator)
+        reports = []
+        count = self.db.load(
+            records,
+            bulk=True,
+            chunk_size=4,
+            progress=lambda n, rate: reports.append(n),
+        )
+        self.assertEqual(count, 6)
+        self.assertEqual(reports, [4, 6])
+        self.assertEqual(len(self.db), 6)
+        for record in records:
+            item = self.db.lookup(name=record.name)
+            self.assertEqual(item.id, record.id)
+            self.assertEqual(item.seq, record.seq)
+            self.assertEqual(item.dbxrefs, record.dbxrefs)
+            self.assertEqual(
+                len(item.annotations["references"]),
+                len(record.annotations["references"]),
+            )
+            self.assertEqual(len(item.features), len(record.features))
+            for new, old in zip(item.features, record.features):
+                self.assertEqual(new.type, old.type)
+                self.assertEqual(new.location, old.location)
+                self.assertEqual(new.qualifiers, old.qualifiers)
+        with self.assertRaises(ValueError):
+            self.db.load(records, bulk=True, chunk_size=0)
+
 
 class DeleteTest(unittest.TestCase):
     """Test proper deletion of entries from a database."""
@@ -0,0 +1,250 @@
+# Copyright 2026 by agent.  All rights reserved.
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+"""Tests for Align.bam module."""
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+from Bio import Align
+from Bio.Align import Alignment
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+
+try:
+    import numpy as np
+except ImportError:
+    from Bio import MissingPythonDependencyError
+
+    raise MissingPythonDependencyError(
+        "Install numpy if you want to use Bio.Align.bam."
+    ) from None
+
+from Bio.Align import bam
+
+
+class TestAlign_bam(unittest.TestCase):
+    def assertAlignmentsEqual(self, alignments1, alignments2):
+        alignments1 = list(alignments1)
+        alignments2 = list(alignments2)
+        self.assertEqual(len(alignments1), len(alignments2))
+        for alignment1, alignment2 in zip(alignments1, alignments2):
+            target1, query1 = alignment1.sequences
+            target2, query2 = alignment2.sequences
+            self.assertEqual(query1.id, query2.id)
+            self.assertEqual(query1.seq, query2.seq)
+            self.assertEqual(query1.letter_annotations, query2.letter_annotations)
+            if alignment1.coordinates is None:
+                self.assertIsNone(alignment2.coordinates)
+                self.assertIsNone(target1)
+                self.assertIsNone(target2)
+            else:
+                self.assertEqual(target1.id, target2.id)
+                self.assertTrue(
+                    np.array_equal(alignment1.coordinates, alignment2.coordinates)
+                )
+            for key in ("flag", "mapq", "rnext", "pnext", "tlen", "score"):
+                self.assertEqual(
+                    getattr(alignment1, key, None), getattr(alignment2, key, None)
+                )
+
+    def test_ex1_header(self):
+        alignments = Align.parse("SamBam/ex1_header.bam", "bam")
+        self.assertEqual(alignments.metadata["HD"], {"VN": "1.3", "SO": "coordinate"})
+        self.assertEqual(len(alignments.targets), 2)
+        self.assertEqual(alignments.targets[0].id, "chr1")
+        self.assertEqual(len(alignments.targets[0].seq), 1575)
+        self.assertEqual(alignments.targets[1].id, "chr2")
+        self.assertEqual(len(alignments.targets[1].seq), 1584)
+        n = 0
+        for alignment in alignments:
+            n += 1
+        self.assertEqual(n, 3270)
+        self.assertEqual(alignment.sequences[0].id, "chr2")
+        self.assertEqual(alignment.sequences[1].id, "EAS114_26:7:37:79:581")
+        self.assertEqual(
+            alignment.sequences[1].seq, "TTTTCTGGCATGAAAAAAAAAAAAAAAAAAAAAAA"
+        )
+        self.assertEqual(alignment.flag, 83)
+        self.assertEqual(alignment.mapq, 68)
+        self.assertTrue(
+            np.array_equal(alignment.coordinates, np.array([[1532, 1567], [35, 0]]))
+        )
+        self.assertEqual(alignment.rnext, "chr2")
+        self.assertEqual(alignment.pnext, 1348)
+        self.assertEqual(alignment.tlen, -219)
+        self.assertEqual(alignment.annotations["MF"], 18)
+        self.assertEqual(alignment.annotations["Aq"], 27)
+
+    def test_sam_comparison(self):
+        alignments1 = Align.parse("SamBam/ex1_header.bam", "bam")
+        alignments2 = Align.parse("SamBam/ex1_header.sam", "sam")
+        self.assertAlignmentsEqual(alignments1, alignments2)
+
+    def test_ex1(self):
+        # ex1.bam has no header text, only the binary reference sequences
+        alignments = Align.parse("SamBam/ex1.bam", "bam")
+        self.assertEqual(alignments.metadata, {})
+        self.assertEqual([target.id for target in alignments.targets], ["chr1", "chr2"])
+        self.assertEqual([len(target) for target in alignments.targets], [1575, 1584])
+        self.assertEqual(len(list(alignments)), 3270)
+
+    def test_writing(self):
+        alignments = Align.parse("SamBam/ex1_header.bam", "bam")
+        stream = BytesIO()
+        n = Align.write(alignments, stream, "bam")
+        self.assertEqual(n, 3270)
+        stream.seek(0)
+        alignments = Align.parse(stream, "bam")
+        self.assertEqual(alignments.metadata["HD"], {"VN": "1.3", "SO": "coordinate"})
+        self.assertAlignmentsEqual(
+            alignments, Align.parse("SamBam/ex1_header.bam", "bam")
+        )
+
+    def test_writing_tags(self):
+        target = SeqRecord(Seq("AACCGGTTAC"), id="chr1")
+        query = SeqRecord(Seq("CCGGTA"), id="read1")
+        query.letter_annotations["phred_quality"] = [30, 31, 32, 33, 34, 35]
+        alignment = Alignment([target, query], np.array([[2, 8, 10], [0, 6, 6]]))
+        alignment.score = 6
+        alignment.annotations = {
+            "XA": "x",
+            "XB": -300,
+            "XC": 70000,
+            "XF": 1.5,
+            "XH": b"\x1a\xe3",
+            "XZ": "text",
+            "XI": np.array([-1, 2, 3]),
+            "XJ": np.array([0.5, 2.25]),
+        }
+        stream = BytesIO()
+        self.assertEqual(Align.write([alignment], stream, "bam"), 1)
+        stream.seek(0)
+        alignments = Align.parse(stream, "bam")
+        self.assertEqual(len(alignments.targets), 1)
+        self.assertEqual(alignments.targets[0].id, "chr1")
+        self.assertEqual(len(alignments.targets[0]), 10)
+        alignment = next(alignments)
+        self.assertEqual(alignment.sequences[1].seq, "CCGGTA")
+        self.assertEqual(
+            alignment.sequences[1].letter_annotations["phred_quality"],
+            [30, 31, 32, 33, 34, 35],
+        )
+        self.assertTrue(
+            np.array_equal(alignment.coordinates, np.array([[2, 8, 10], [0, 6, 6]]))
+        )
+        self.assertEqual(alignment.score, 6)
+        annotations = alignment.annotations
+        self.assertEqual(annotations["XA"], "x")
+        self.assertEqual(annotations["XB"], -300)
+        self.assertEqual(annotations["XC"], 70000)
+        self.assertEqual(annotations["XF"], 1.5)
+        self.assertEqual(annotations["XH"], b"\x1a\xe3")
+        self.assertEqual(annotations["XZ"], "text")
+        self.assertTrue(np.array_equal(annotations["XI"], [-1, 2, 3]))
+        self.assertTrue(np.array_equal(annotations["XJ"], [0.5, 2.25]))
+
+    def test_long_cigar(self):
+        # more than 65535 CIGAR operations are stored in the CG tag
+        n = 40000
+        target = SeqRecord(Seq("AC" * n), id="chr1")
+        query = SeqRecord(Seq("A" * n), id="read1")
+        coordinates = np.zeros((2, 2 * n + 1), int)
+        coordinates[0, 1:] = np.arange(1, 2 * n + 1)
+        coordinates[1, 1:] = np.arange(2, 2 * n + 2) // 2
+        alignment = Alignment([target, query], coordinates)
+        stream = BytesIO()
+        Align.write([alignment], stream, "bam")
+        stream.seek(0)
+        alignment = next(Align.parse(stream, "bam"))
+        self.assertTrue(np.array_equal(alignment.coordinates, coordinates))
+
+    def test_bai(self):
+        with open("SamBam/ex1_header.bam", "rb") as stream:
+            index = bam.build_bai(stream)
+        self.assertEqual(len(index), 2)
+        bins, intervals = index[1]
+        self.assertEqual(sorted(bins), [4681, 37450])
+        self.assertEqual(bins[37450][1], (1789, 17))
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "ex1_header.bai")
+            bam.write_bai(filename, index)
+            self.assertEqual(bam.read_bai(filename), index)
+
+    def test_bai_unsorted(self):
+        stream = BytesIO()
+        alignments = list(Align.parse("SamBam/ex1_header.bam", "bam"))
+        mapped = [
+            alignment for alignment in alignments if alignment.coordinates is not None
+        ]
+        Align.write(mapped[::-1], stream, "bam")
+        stream.seek(0)
+        with self.assertRaises(ValueError) as cm:
+            bam.build_bai(stream)
+        self.assertEqual(str(cm.exception), "BAM file is not sorted by coordinate")
+
+    def check_search(self, alignments, all_alignments):
+        def key(alignment):
+            if alignment.coordinates is None:
+                return (alignment.sequences[1].id, alignment.rnext, alignment.pnext)
+            return (
+                alignment.sequences[1].id,
+                alignment.sequences[0].id,
+                alignment.coordinates[0, 0],
+            )
+
+        for chromosome, start, end in (
+            ("chr1", 0, 1575),
+            ("chr1", 100, 101),
+            ("chr1", 1000, 1200),
+            ("chr2", 1500, 1584),
+            ("chr2", 0, 10),
+            ("chr2", 800, 801),
+        ):
+            expected = []
+            for alignment in all_alignments:
+                if alignment.coordinates is None:
+                    # unmapped reads are placed at the position of their mate
+                    if getattr(alignment, "rnext", None) != chromosome:
+                        continue
+                    alignment_start = alignment.pnext
+                    alignment_end = alignment_start + 1
+                else:
+                    if alignment.sequences[0].id != chromosome:
+                        continue
+                    alignment_start = alignment.coordinates[0, 0]
+                    alignment_end = alignment.coordinates[0, -1]
+                if alignment_start < end and alignment_end > start:
+                    expected.append(key(alignment))
+            found = [key(a) for a in alignments.search(chromosome, start, end)]
+            self.assertEqual(found, expected)
+        self.assertEqual(len(list(alignments.search("chr1"))), 1464)
+        self.assertEqual(len(list(alignments.search("chr2", 1000))), 62)
+        self.assertEqual(len(list(alignments.search())), 3270)
+        with self.assertRaises(ValueError) as cm:
+            next(alignments.search("chr3"))
+        self.assertEqual(str(cm.exception), "Failed to find chr3 in alignments")
+
+    def test_search(self):
+        all_alignments = list(Align.parse("SamBam/ex1_header.bam", "bam"))
+        # build the index in memory
+        alignments = Align.parse("SamBam/ex1_header.bam", "bam")
+        self.check_search(alignments, all_alignments)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "ex1_header.bam")
+            Align.write(all_alignments, filename, "bam")
+            with open(filename, "rb") as stream:
+                index = bam.build_bai(stream)
+            bam.write_bai(filename + ".bai", index)
+            # use the index file next to the BAM file
+            alignments = Align.parse(filename, "bam")
+            self.check_search(alignments, all_alignments)
+            self.assertEqual(alignments._bai, index)
+            alignments._stream.close()
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
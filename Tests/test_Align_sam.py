@@ -3,6 +3,7 @@
 # license.  Please see the LICENSE file that should have been included
 # as part of this package.
 """Tests for Align.sam module."""
+import pickle
 import unittest
 from io import StringIO
 
@@ -8534,6 +8535,134 @@ class TestAlign_sambam(unittest.TestCase):
         self.assertEqual(n, 200)
 
 
+class TestAlign_tags(unittest.TestCase):
+    def test_writing_tags(self):
+        target = SeqRecord(Seq("AACCGGTTAC"), id="chr1")
+        query = SeqRecord(Seq("CCGGTA"), id="read1")
+        alignment = Alignment([target, query], np.array([[2, 8], [0, 6]]))
+        alignment.annotations = {
+            "XH": b"\x1a\xe3",
+            "XI": np.array([-1, 2, 3]),
+            "XJ": np.array([0.5, 2.25]),
+        }
+        line = alignment.format("sam")
+        self.assertEqual(
+            line.split("\t")[11:],
+            ["XH:H:1AE3", "XI:B:i,-1,2,3", "XJ:B:f,0.5,2.25\n"],
+        )
+        stream = StringIO(line)
+        alignment = next(Align.parse(stream, "sam"))
+        annotations = alignment.annotations
+        self.assertEqual(annotations["XH"], b"\x1a\xe3")
+        self.assertTrue(np.array_equal(annotations["XI"], [-1, 2, 3]))
+        self.assertTrue(np.array_equal(annotations["XJ"], [0.5, 2.25]))
+
+
+class TestAlign_lazy(unittest.TestCase):
+    def test_lazy(self):
+        alignments1 = Align.parse("SamBam/ex1_header.sam", "sam")
+        alignments2 = Align.parse("SamBam/ex1_header.sam", "sam", lazy=True)
+        for alignment1, alignment2 in zip(alignments1, alignments2):
+            self.assertEqual(alignment1.flag, alignment2.flag)
+            # the tags are decoded separately from the coordinates
+            self.assertEqual(
+                getattr(alignment1, "annotations", None),
+                getattr(alignment2, "annotations", None),
+            )
+            self.assertNotIn("coordinates", alignment2.__dict__)
+            if alignment1.coordinates is None:
+                self.assertIsNone(alignment2.coordinates)
+            else:
+                self.assertTrue(
+                    np.array_equal(alignment1.coordinates, alignment2.coordinates)
+                )
+                self.assertEqual(alignment1.target.id, alignment2.target.id)
+            self.assertEqual(alignment1.query.id, alignment2.query.id)
+            self.assertEqual(alignment1.query.seq, alignment2.query.seq)
+            self.assertEqual(sorted(vars(alignment1)), sorted(vars(alignment2)))
+
+    def test_fields(self):
+        alignments = Align.parse(
+            "SamBam/ex1_header.sam", "sam", fields=["flag", "mapq", "NM"]
+        )
+        n = 0
+        for alignment in alignments:
+            n += 1
+            self.assertIsNone(alignment.coordinates)
+            self.assertEqual(alignment.sequences, [None, None])
+            self.assertFalse(hasattr(alignment, "rnext"))
+            self.assertFalse(hasattr(alignment, "score"))
+            annotations = getattr(alignment, "annotations", {})
+            self.assertLessEqual(set(annotations), {"NM"})
+        self.assertEqual(n, 3270)
+        self.assertEqual(alignment.flag, 83)
+        self.assertEqual(alignment.mapq, 68)
+        self.assertEqual(alignment.annotations, {"NM": 2})
+        alignments = Align.parse(
+            "SamBam/ex1_header.sam", "sam", fields=["coordinates", "tlen"]
+        )
+        alignment = next(alignments)
+        self.assertIsNone(alignment.coordinates)
+        alignment = next(alignments)
+        self.assertTrue(
+            np.array_equal(alignment.coordinates, np.array([[99, 134], [0, 35]]))
+        )
+        self.assertEqual(alignment.query.id, "EAS56_57:6:190:289:82")
+        self.assertFalse(hasattr(alignment, "flag"))
+        self.assertFalse(hasattr(alignment, "annotations"))
+        with self.assertRaises(ValueError) as cm:
+            Align.parse("SamBam/ex1_header.sam", "sam", fields=["flags"])
+        self.assertEqual(str(cm.exception), "Unknown field 'flags'")
+
+    def test_assignment_before_decoding(self):
+        line = "read1\t0\tchr1\t3\t255\t6M\t*\t0\t0\tCCGGTA\t*\tAS:i:7\tNM:i:1\n"
+        alignment = next(Align.parse(StringIO(line), "sam", lazy=True))
+        alignment.score = 99
+        self.assertTrue(
+            np.array_equal(alignment.coordinates, np.array([[2, 8], [0, 6]]))
+        )
+        self.assertEqual(alignment.score, 99)
+        self.assertEqual(alignment.annotations, {"NM": 1})
+        alignment = next(Align.parse(StringIO(line), "sam", lazy=True))
+        alignment.annotations = {"XY": "user"}
+        self.assertEqual(alignment.score, 7)
+        self.assertEqual(alignment.annotations, {"XY": "user"})
+        self.assertEqual(alignment.query.seq, "CCGGTA")
+        self.assertEqual(alignment.annotations, {"XY": "user"})
+
+    def test_pickle(self):
+        alignments1 = Align.parse("SamBam/ex1_header.sam", "sam")
+        alignments2 = Align.parse("SamBam/ex1_header.sam", "sam", lazy=True)
+        alignments2 = list(alignments2)
+        # undecoded alignments should not keep the file open
+        self.assertFalse(hasattr(alignments2[0]._iterator, "_stream"))
+        alignments2 = pickle.loads(pickle.dumps(alignments2))
+        for alignment1, alignment2 in zip(alignments1, alignments2):
+            self.assertEqual(sorted(vars(alignment1)), sorted(vars(alignment2)))
+            self.assertEqual(alignment1.query.seq, alignment2.query.seq)
+            if alignment1.coordinates is None:
+                self.assertIsNone(alignment2.coordinates)
+            else:
+                self.assertTrue(
+                    np.array_equal(alignment1.coordinates, alignment2.coordinates)
+                )
+            self.assertEqual(
+                getattr(alignment1, "annotations", None),
+                getattr(alignment2, "annotations", None),
+            )
+
+    def test_no_score(self):
+        line = "read1\t0\tchr1\t3\t255\t6M\t*\t0\t0\tCCGGTA\t*\tNM:i:1\n"
+        alignment = next(Align.parse(StringIO(line), "sam", lazy=True))
+        self.assertFalse(hasattr(alignment, "score"))
+        self.assertFalse(hasattr(alignment, "score"))
+        self.assertEqual(alignment.annotations, {"NM": 1})
+        self.assertNotIn("coordinates", alignment.__dict__)
+        self.assertEqual(alignment.query.seq, "CCGGTA")
+        self.assertIn("coordinates", alignment.__dict__)
+        self.assertFalse(hasattr(alignment, "score"))
+
+
 class TestAlign_clipping(unittest.TestCase):
     def test_6M(self):
         """Test alignment starting at non-zero position."""
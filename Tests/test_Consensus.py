@@ -157,6 +157,26 @@ class BootstrapTest(unittest.TestCase):
         self.assertEqual(len(trees), 100)
         self.assertIsInstance(trees[0], BaseTree.Tree)
 
+    def test_bootstrap_trees_workers(self):
+        calculator = DistanceCalculator("blosum62")
+        constructor = DistanceTreeConstructor(calculator)
+        for alignment in (self.msa, self.alignment):
+            trees = Consensus.bootstrap_trees(alignment, 10, constructor, seed=1)
+            expected = [tree.format("newick") for tree in trees]
+            trees = Consensus.bootstrap_trees(
+                alignment, 10, constructor, workers=2, seed=1
+            )
+            self.assertEqual([tree.format("newick") for tree in trees], expected)
+        tree = Consensus.bootstrap_consensus(
+            self.alignment,
+            10,
+            constructor,
+            Consensus.majority_consensus,
+            workers=2,
+            seed=1,
+        )
+        self.assertIsInstance(tree, BaseTree.Tree)
+
     def test_bootstrap_consensus_msa(self):
         calculator = DistanceCalculator("blosum62")
         constructor = DistanceTreeConstructor(calculator, "nj")
@@ -12,6 +12,8 @@ import pathlib
 import unittest
 import warnings
 
+import numpy as np
+
 from Bio.PDB import PDBParser
 from Bio.PDB.SASA import ShrakeRupley
 
@@ -104,6 +106,39 @@ class TestShrakeRupley(unittest.TestCase):
             atom_sum = sum(a.sasa for a in c.get_atoms())
             self.assertAlmostEqual(atom_sum, c.sasa, places=2)
 
+    def test_workers(self):
+        """Run Shrake-Rupley in multiple processes."""
+        m1 = copy.deepcopy(self.model)  # modifies atom.sasa
+        m2 = copy.deepcopy(self.model)
+
+        sasa = ShrakeRupley()
+        sasa.compute(m1, level="C")
+        sasa.compute(m2, level="C", workers=2)
+
+        self.assertGreater(len(m1), 1)
+        for c1, c2 in zip(m1, m2):
+            self.assertEqual(c1.sasa, c2.sasa)
+        for a1, a2 in zip(m1.get_atoms(), m2.get_atoms()):
+            self.assertEqual(a1.sasa, a2.sasa)
+
+    def test_buried_points(self):
+        """Compare the accessible points with a direct calculation."""
+        m = copy.deepcopy(self.model)  # modifies atom.sasa
+
+        sasa = ShrakeRupley(n_points=30)
+        sasa.compute(m)
+
+        atoms = list(m.get_atoms())
+        coords = np.array([a.coord for a in atoms], float)
+        radii = np.array([sasa.radii_dict[a.element] for a in atoms]) + 1.40
+        for i in range(0, len(atoms), 97):
+            points = sasa._sphere * radii[i] + coords[i]
+            distances = np.linalg.norm(points[:, None, :] - coords[None, :, :], axis=2)
+            distances[:, i] = np.inf
+            accessible = np.all(distances > radii, axis=1).sum()
+            area = accessible * radii[i] * radii[i] * 4 * np.pi / 30
+            self.assertAlmostEqual(atoms[i].sasa, area, places=6)
+
     # Exceptions
     def test_fail_probe_radius(self):
         """Raise exception on bad probe_radius parameter."""
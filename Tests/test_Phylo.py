@@ -5,12 +5,18 @@
 
 """Unit tests for the Bio.Phylo module."""
 
+import copy
 import os
+import pickle
 import tempfile
 import unittest
+import warnings
 from io import StringIO
 
+from Bio import BiopythonDeprecationWarning
 from Bio import Phylo
+from Bio.Phylo import Newick
+from Bio.Phylo import NewickIO
 from Bio.Phylo import PhyloXML
 
 # Example Newick and Nexus files
@@ -48,6 +54,76 @@ class IOTests(unittest.TestCase):
         tree = Phylo.read(EX_NEWICK2, "newick", comments_are_confidence=True)
         self.assertEqual(tree.root.confidence, 100)
 
+    def test_newick_read_compact(self):
+        """Read Newick trees as compact trees, and skipping annotations."""
+        tree = Phylo.read(EX_NEWICK2, "newick")
+        compact = Phylo.read(EX_NEWICK2, "newick", compact=True)
+        self.assertIsInstance(compact, Newick.CompactTree)
+        self.assertEqual(len(compact), len(list(tree.find_clades())))
+        self.assertEqual(compact.parents[0], -1)
+        self.assertEqual(compact.to_tree().format("newick"), tree.format("newick"))
+        tree = Phylo.read(StringIO("((A:1,B:2)90:1[x],C:3);"), "newick")
+        self.assertEqual(tree.root.clades[0].confidence, 90)
+        self.assertEqual(tree.root.clades[0].comment, "x")
+        tree = Phylo.read(
+            StringIO("((A:1,B:2)90:1[x],C:3);"), "newick", topology_only=True
+        )
+        self.assertEqual(tree.root.clades[0].name, "90")
+        self.assertIsNone(tree.root.clades[0].confidence)
+        self.assertIsNone(tree.root.clades[0].comment)
+        self.assertEqual(tree.total_branch_length(), 0)
+        compact = Phylo.read(
+            StringIO("((A:1,B:2)90:1[x],C:3);"),
+            "newick",
+            topology_only=True,
+            compact=True,
+        )
+        self.assertEqual(compact.parents.tolist(), [-1, 0, 1, 1, 0])
+        self.assertEqual(compact.names, [None, "90", "A", "B", "C"])
+        self.assertEqual(compact.comments, {})
+
+    def test_newick_parser_deprecated_methods(self):
+        """Call the deprecated Newick parser methods if overridden."""
+
+        class CustomParser(NewickIO.Parser):
+            def new_clade(self, parent=None):
+                clade = super().new_clade(parent)
+                clade.comment = "new"
+                return clade
+
+            def process_clade(self, clade):
+                if not clade.name:
+                    clade.name = "inner"
+                return super().process_clade(clade)
+
+        text = "((A:1,B:2)90:1[x],C:3);"
+        with self.assertWarns(BiopythonDeprecationWarning):
+            parser = CustomParser(StringIO(text))
+        tree = next(parser.parse())
+        expected = Phylo.read(StringIO(text), "newick")
+        self.assertEqual(
+            [clade.name for clade in tree.find_clades()],
+            ["inner", None, "A", "B", "C"],
+        )
+        self.assertEqual(
+            [clade.comment for clade in tree.find_clades()],
+            ["new", "x", "new", "new", "new"],
+        )
+        self.assertEqual(tree.root.clades[0].confidence, 90)
+        self.assertEqual(tree.total_branch_length(), expected.total_branch_length())
+        with self.assertWarns(BiopythonDeprecationWarning):
+            parser = CustomParser(StringIO(text))
+        tree = next(parser.parse(topology_only=True))
+        self.assertEqual(tree.root.clades[0].name, "90")
+        self.assertEqual(tree.total_branch_length(), 0)
+        with self.assertWarns(BiopythonDeprecationWarning):
+            parser = CustomParser(StringIO(text))
+        with self.assertRaises(ValueError):
+            next(parser.parse(compact=True))
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", BiopythonDeprecationWarning)
+            NewickIO.Parser(StringIO(text))
+
     def test_newick_read_single3(self):
         """Read Nexus file with one tree."""
         tree = Phylo.read(EX_NEXUS2, "nexus")
@@ -401,6 +477,48 @@ class MixinTests(unittest.TestCase):
         self.assertAlmostEqual(t.distance("A", "C"), 0.562)
         self.assertAlmostEqual(t.distance("B", "C"), 0.69)
 
+    def test_build_index(self):
+        """TreeMixin: queries using the index made by build_index()."""
+        t = self.phylogenies[1]
+        index = t.build_index()
+        path = index.get_path("B")
+        self.assertEqual([clade.name for clade in path], [None, "B"])
+        self.assertAlmostEqual(path[0].branch_length, 0.06)
+        self.assertEqual(index.get_path(t.root), [])
+        self.assertIsNone(index.get_path("X"))
+        path = index.trace("A", "C")
+        self.assertEqual(path, [t.clade[0], t.clade, t.clade[1]])
+        self.assertEqual(path, t.trace("A", "C"))
+        self.assertEqual(index.common_ancestor("A", "B"), t.clade[0])
+        self.assertEqual(index.common_ancestor("A", "C"), t.clade)
+        self.assertEqual(index.common_ancestor([]), t.root)
+        self.assertRaises(ValueError, index.common_ancestor, "A", "X")
+        self.assertAlmostEqual(index.distance("A"), 0.162)
+        self.assertAlmostEqual(index.distance("A", "B"), 0.332)
+        self.assertAlmostEqual(index.distance("B", "C"), 0.69)
+        matrix = t.distance_matrix()
+        self.assertEqual(matrix.shape, (3, 3))
+        for i, x in enumerate(t.get_terminals()):
+            for j, y in enumerate(t.get_terminals()):
+                if i != j:
+                    self.assertAlmostEqual(matrix[i, j], t.distance(x, y))
+        # copies of the tree and its index go together
+        t2, index2 = copy.deepcopy((t, index))
+        a, b = t2.get_terminals()[:2]
+        self.assertEqual(index2.get_path(a), t2.get_path(a))
+        self.assertEqual(index2.common_ancestor(a, b), t2.clade[0])
+        t2, index2 = pickle.loads(pickle.dumps((t, index)))
+        self.assertEqual(index2.common_ancestor(*t2.get_terminals()), t2.clade)
+        # the tree's own methods always reflect changes to the tree
+        t = copy.deepcopy(t)
+        index = t.build_index()
+        t.clade[0].branch_length += 1
+        self.assertAlmostEqual(t.distance("A", "C"), 1.562)
+        self.assertAlmostEqual(t.build_index().distance("A", "C"), 1.562)
+        t.collapse(t.clade[0])
+        self.assertEqual(t.get_path("B"), [t.clade[2]])
+        self.assertAlmostEqual(t.build_index().distance("A", "B"), 2.452)
+
     def test_is_bifurcating(self):
         """TreeMixin: is_bifurcating() method."""
         for tree, is_b in zip(
@@ -5,6 +5,7 @@
 
 """Testing code for Restriction enzyme classes of Biopython."""
 
+import random
 import unittest
 
 from Bio import BiopythonWarning
@@ -524,6 +525,24 @@ class RestrictionBatches(unittest.TestCase):
         search = seq / NonComm
         self.assertEqual(search[McrI], [28])
 
+    def test_search_long_sequence(self):
+        """Test batch search of a long sequence against single enzymes."""
+        rng = random.Random(1)
+        seq = Seq("".join(rng.choice("ACGTN") for _ in range(6000)))
+        for linear in (True, False):
+            search = AllEnzymes.search(seq, linear=linear)
+            self.assertEqual(len(search), len(AllEnzymes))
+            for enzyme in AllEnzymes:
+                self.assertEqual(
+                    search[enzyme], enzyme.search(seq, linear=linear), msg=enzyme
+                )
+        seq = Seq(EcoRI.site[3:] + "A" * 6000 + EcoRI.site[:3])
+        self.assertEqual(
+            RestrictionBatch([EcoRI, BsaI]).search(seq), {EcoRI: [], BsaI: []}
+        )
+        search = RestrictionBatch([EcoRI, BsaI]).search(seq, linear=False)
+        self.assertEqual(search, {EcoRI: [6005], BsaI: []})
+
     def test_analysis_restrictions(self):
         """Test Fancier restriction analysis."""
         new_seq = Seq("TTCAAAAAAAAAAAAAAAAAAAAAAAAAAAAGAA")
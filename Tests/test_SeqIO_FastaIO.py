@@ -5,11 +5,17 @@
 # as part of this package.
 """Tests for Bio.SeqIO.FastaIO module."""
 
+import os
+import shutil
+import tempfile
 import unittest
 from io import StringIO
 
+from Bio import bgzf
 from Bio import SeqIO
+from Bio.SeqIO.FastaIO import FastaIndexedReader
 from Bio.SeqIO.FastaIO import FastaTwoLineParser
+from Bio.SeqIO.FastaIO import read_fai
 from Bio.SeqIO.FastaIO import SimpleFastaParser
 
 from Bio import BiopythonDeprecationWarning
@@ -232,6 +238,81 @@ class TestFastaWithComments(unittest.TestCase):
             record = SeqIO.read("Fasta/aster_blast.pro", "fasta")
 
 
+class TestFastaIndexedReader(unittest.TestCase):
+    """Test random access to FASTA files with a samtools style index."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.records = list(SeqIO.parse("GenBank/NC_005816.ffn", "fasta"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, filename, text):
+        filename = os.path.join(self.directory, filename)
+        if filename.endswith(".gz"):
+            with bgzf.BgzfWriter(filename, "wb") as handle:
+                handle.write(text.encode())
+        else:
+            with open(filename, "w", newline="") as handle:
+                handle.write(text)
+        return filename
+
+    def check(self, filename):
+        with FastaIndexedReader(filename) as reader:
+            self.assertEqual(list(reader), [record.id for record in self.records])
+            self.assertEqual(len(reader), len(self.records))
+            for record in self.records:
+                sequence = reader[record.id].seq
+                self.assertEqual(len(sequence), len(record))
+                self.assertEqual(sequence, record.seq)
+                for start, end, step in (
+                    (5, 200, 1),
+                    (59, 61, 1),
+                    (-70, -1, 1),
+                    (0, 150, 7),
+                    (200, 3, -3),
+                ):
+                    self.assertEqual(
+                        sequence[start:end:step], record.seq[start:end:step]
+                    )
+                self.assertEqual(sequence[-1], record.seq[-1])
+            self.assertNotIn("missing", reader)
+
+    def test_plain(self):
+        """Check reading a plain FASTA file, creating and reusing the index."""
+        text = "".join(record.format("fasta") for record in self.records)
+        filename = self.write("example.fasta", text)
+        self.check(filename)
+        index = read_fai(filename + ".fai")
+        self.assertEqual(len(index), len(self.records))
+        offset = text.index("\n") + 1
+        self.assertEqual(index[0][1:], (len(self.records[0]), offset, 60, 61))
+        self.check(filename)
+
+    def test_windows(self):
+        """Check reading a FASTA file with Windows line endings."""
+        text = "".join(record.format("fasta") for record in self.records)
+        filename = self.write("example.fasta", text.replace("\n", "\r\n"))
+        self.check(filename)
+        self.assertEqual(read_fai(filename + ".fai")[0][3:], (60, 62))
+
+    def test_bgzf(self):
+        """Check reading a BGZF compressed FASTA file."""
+        text = "".join(record.format("fasta") for record in self.records)
+        filename = self.write("example.fasta.gz", text)
+        self.check(filename)
+        self.assertTrue(os.path.isfile(filename + ".gzi"))
+        self.check(filename)
+
+    def test_bad_line_length(self):
+        """Check a FASTA file with irregular line lengths is rejected."""
+        filename = self.write("bad.fasta", ">bad\nACGT\nAC\nACGT\n")
+        with self.assertRaisesRegex(ValueError, "Different line length"):
+            FastaIndexedReader(filename)
+        self.assertFalse(os.path.isfile(filename + ".fai"))
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -4,12 +4,15 @@
 # as part of this package.
 """Additional unit tests for Bio.SeqIO.QualityIO (covering FASTQ and QUAL)."""
 
+import array
 import os
 import unittest
 import warnings
 from io import BytesIO
 from io import StringIO
 
+import numpy as np
+
 from test_SeqIO import SeqIOConverterTestBaseClass
 from test_SeqIO import SeqIOTestBaseClass
 
@@ -991,6 +994,147 @@ class TestSFF(unittest.TestCase):
                 self.assertRaises(ValueError, SeqIO.write, record, h, "sff")
 
 
+class TestFastqBatches(unittest.TestCase):
+    """Test reading FASTQ files in batches of arrays."""
+
+    def check_batches(self, filename, fmt, batch_size):
+        records = list(SeqIO.parse(filename, fmt))
+        batches = list(QualityIO.FastqBatchIterator(filename, fmt, batch_size))
+        self.assertEqual(
+            [len(batch) for batch in batches[:-1]],
+            [batch_size] * (len(batches) - 1),
+        )
+        self.assertEqual(sum(len(batch) for batch in batches), len(records))
+        records = iter(records)
+        for batch in batches:
+            self.assertEqual(batch.offsets[0], 0)
+            self.assertEqual(batch.offsets[-1], len(batch.qualities))
+            for i, record in zip(range(len(batch)), records):
+                start, end = batch.offsets[i : i + 2]
+                self.assertEqual(batch.titles[i], record.description)
+                self.assertEqual(
+                    batch.sequences[start:end].tobytes(), bytes(record.seq)
+                )
+                key = batch.q_key
+                qualities = record.letter_annotations[key]
+                self.assertEqual(batch.qualities[start:end].tolist(), qualities)
+                self.assertEqual(batch.lengths[i], len(record))
+                if qualities:
+                    self.assertAlmostEqual(
+                        batch.mean_qualities()[i], sum(qualities) / len(qualities)
+                    )
+                copy = batch[i]
+                self.assertEqual(copy.id, record.id)
+                self.assertEqual(copy.name, record.name)
+                self.assertEqual(copy.description, record.description)
+                self.assertEqual(copy.seq, record.seq)
+                self.assertEqual(copy.letter_annotations, record.letter_annotations)
+
+    def test_batches(self):
+        tests = [
+            ("Quality/example.fastq", "fastq"),
+            ("Quality/tricky.fastq", "fastq"),
+            ("Quality/sanger_faked.fastq", "fastq-sanger"),
+            ("Quality/solexa_faked.fastq", "fastq-solexa"),
+            ("Quality/illumina_faked.fastq", "fastq-illumina"),
+            ("Quality/longreads_as_solexa.fastq", "fastq-solexa"),
+            ("Quality/misc_dna_original_sanger.fastq", "fastq-sanger"),
+            ("Quality/zero_length.fastq", "fastq"),
+        ]
+        for filename, fmt in tests:
+            for batch_size in (1, 2, 1000):
+                with self.subTest(filename=filename, batch_size=batch_size):
+                    self.check_batches(filename, fmt, batch_size)
+
+    def test_errors(self):
+        for filename in (
+            "Quality/error_diff_ids.fastq",
+            "Quality/error_spaces.fastq",
+            "Quality/error_qual_del.fastq",
+            "Quality/error_qual_null.fastq",
+            "Quality/error_trunc_in_qual.fastq",
+        ):
+            batches = QualityIO.FastqBatchIterator(filename, batch_size=2)
+            with self.assertRaises(ValueError, msg=filename):
+                list(batches)
+        batches = QualityIO.FastqBatchIterator(
+            "Quality/solexa_faked.fastq", "fastq-illumina"
+        )
+        with self.assertRaises(QualityIO.InvalidCharError) as cm:
+            next(batches)
+        self.assertEqual(cm.exception.index, 41)
+        with self.assertRaises(ValueError):
+            next(QualityIO.FastqBatchIterator("Quality/example.fastq", "fasta"))
+
+
+class TestQualityTypes(unittest.TestCase):
+    """Test storing quality scores in arrays."""
+
+    def test_quality_types(self):
+        tests = [
+            ("Quality/example.fastq", QualityIO.FastqPhredIterator, "phred_quality"),
+            ("Quality/sanger_93.fastq", QualityIO.FastqPhredIterator, "phred_quality"),
+            (
+                "Quality/solexa_faked.fastq",
+                QualityIO.FastqSolexaIterator,
+                "solexa_quality",
+            ),
+            (
+                "Quality/illumina_faked.fastq",
+                QualityIO.FastqIlluminaIterator,
+                "phred_quality",
+            ),
+            ("Quality/example.qual", QualityIO.QualPhredIterator, "phred_quality"),
+        ]
+        for filename, iterator, key in tests:
+            records = list(iterator(filename))
+            for quality_type, cls in (("array", array.array), ("numpy", np.ndarray)):
+                with self.subTest(filename=filename, quality_type=quality_type):
+                    others = list(iterator(filename, quality_type=quality_type))
+                    self.assertEqual(len(others), len(records))
+                    for record, other in zip(records, others):
+                        qualities = other.letter_annotations[key]
+                        self.assertIsInstance(qualities, cls)
+                        self.assertEqual(
+                            list(qualities), record.letter_annotations[key]
+                        )
+                        formats = ["qual"]
+                        if record.seq.defined:
+                            formats += ["fastq", "fastq-solexa", "fastq-illumina"]
+                        for fmt in formats:
+                            with warnings.catch_warnings():
+                                warnings.simplefilter("ignore", BiopythonWarning)
+                                self.assertEqual(other.format(fmt), record.format(fmt))
+                        sliced = other[5:10] + other[:3]
+                        self.assertIsInstance(sliced.letter_annotations[key], cls)
+                        self.assertEqual(
+                            list(sliced.letter_annotations[key]),
+                            (record[5:10] + record[:3]).letter_annotations[key],
+                        )
+        with self.assertRaises(ValueError):
+            QualityIO.FastqPhredIterator("Quality/example.fastq", quality_type="tuple")
+
+    def test_quality_type_seqio(self):
+        """Pass the quality_type argument through Bio.SeqIO."""
+        for filename, fmt, key in (
+            ("Quality/example.fastq", "fastq", "phred_quality"),
+            ("Quality/solexa_faked.fastq", "fastq-solexa", "solexa_quality"),
+            ("Quality/illumina_faked.fastq", "fastq-illumina", "phred_quality"),
+            ("Quality/example.qual", "qual", "phred_quality"),
+        ):
+            with self.subTest(fmt=fmt):
+                records = SeqIO.parse(filename, fmt)
+                others = SeqIO.parse(filename, fmt, quality_type="numpy")
+                for record, other in zip(records, others):
+                    qualities = other.letter_annotations[key]
+                    self.assertIsInstance(qualities, np.ndarray)
+                    self.assertEqual(list(qualities), record.letter_annotations[key])
+        record = SeqIO.read("Quality/sanger_93.fastq", "fastq", quality_type="array")
+        self.assertIsInstance(record.letter_annotations["phred_quality"], array.array)
+        with self.assertRaises(TypeError):
+            SeqIO.parse("Fasta/f002", "fasta", quality_type="numpy")
+
+
 class NonFastqTests(unittest.TestCase):
 
     def test_fasta_as_fastq(self):
@@ -24,6 +24,7 @@ from seq_tests_common import SeqRecordTestBaseClass
 from test_SeqIO import SeqIOTestBaseClass
 
 from Bio import BiopythonParserWarning
+from Bio import BiopythonWarning
 from Bio import SeqIO
 from Bio.SeqIO._index import _FormatToRandomAccess
 from Bio.SeqRecord import SeqRecord
@@ -798,6 +799,142 @@ if sqlite3:
             d = SeqIO.index_db(":memory:", files, "fasta")
             self.assertEqual(ids, list(d))
 
+        def test_order_index_db_workers(self):
+            """Check index_db using several processes gives the same index."""
+            files = ["GenBank/NC_000932.faa", "GenBank/NC_005816.faa", "Fasta/f002"]
+            d1 = SeqIO.index_db(":memory:", files, "fasta")
+            d2 = SeqIO.index_db(":memory:", files, "fasta", workers=2)
+            self.assertEqual(len(d1), len(d2))
+            self.assertEqual(list(d1), list(d2))
+            for key in d1:
+                self.assertEqual(d1.get_raw(key), d2.get_raw(key))
+            d1.close()
+            d2.close()
+
+    class IndexManyFilesLookups(unittest.TestCase):
+        files = ["GenBank/NC_000932.faa", "GenBank/NC_005816.faa", "Fasta/f002"]
+
+        def setUp(self):
+            self.records = SeqIO.index_db(":memory:", self.files, "fasta")
+
+        def tearDown(self):
+            self.records.close()
+
+        def test_get_many(self):
+            """Check get_many returns the records in the order of the keys."""
+            keys = list(self.records)[::-7]
+            records = self.records.get_many(keys)
+            self.assertEqual(list(records), keys)
+            for key, record in records.items():
+                self.assertEqual(record.id, key)
+                self.assertEqual(record.seq, self.records[key].seq)
+            self.assertEqual(self.records.get_many([]), {})
+            with self.assertRaises(KeyError):
+                self.records.get_many([keys[0], "missing"])
+
+        def test_handle_pool(self):
+            """Check the least recently used handle is closed first."""
+            self.records._max_open = 2
+            first = [next(SeqIO.parse(filename, "fasta")).id for filename in self.files]
+            proxies = self.records._proxies
+            self.records[first[0]]
+            self.records[first[1]]
+            self.records[first[0]]
+            self.assertEqual(list(proxies), [1, 0])
+            self.records.get_raw(first[2])
+            self.assertEqual(list(proxies), [0, 2])
+
+
+class IndexCacheTests(unittest.TestCase):
+    """Test the sidecar index cache of SeqIO.index."""
+
+    def setUp(self):
+        h, self.filename = tempfile.mkstemp(suffix=".faa")
+        os.close(h)
+        with open("GenBank/NC_000932.faa", "rb") as source:
+            with open(self.filename, "wb") as handle:
+                handle.write(source.read())
+        self.cache = self.filename + ".idx"
+
+    def tearDown(self):
+        for filename in (self.filename, self.cache):
+            if os.path.isfile(filename):
+                os.remove(filename)
+
+    def check(self, cached, **kwargs):
+        expected = SeqIO.index(self.filename, "fasta", **kwargs)
+        records = SeqIO.index(self.filename, "fasta", cache=self.cache, **kwargs)
+        self.assertEqual(isinstance(records._offsets, dict), not cached)
+        self.assertEqual(list(expected), list(records))
+        self.assertEqual(len(expected), len(records))
+        for key in expected:
+            self.assertIn(key, records)
+            self.assertEqual(expected.get_raw(key), records.get_raw(key))
+        self.assertNotIn("missing", records)
+        self.assertNotIn(None, records)
+        self.assertIn("cache=", repr(records))
+        expected.close()
+        records.close()
+
+    def test_reload(self):
+        """Check the cache is written and then used."""
+        self.check(cached=False)
+        self.assertTrue(os.path.isfile(self.cache))
+        self.check(cached=True)
+
+    def test_key_function(self):
+        """Check the cache is rebuilt for a different key function."""
+        self.check(cached=False)
+        self.check(cached=False, key_function=str.lower)
+        self.check(cached=True, key_function=str.lower)
+
+    def test_lambda_key_function(self):
+        """Check lambda functions with different code are told apart."""
+        self.check(cached=False, key_function=lambda key: key.upper())
+        self.check(cached=True, key_function=lambda key: key.upper())
+        self.check(cached=False, key_function=lambda key: key.lower())
+        self.check(cached=True, key_function=lambda key: key.lower())
+
+    def test_closure_key_function(self):
+        """Check the cache is not used with a closure as key function."""
+
+        def make_key_function(prefix):
+            return lambda key: prefix + key
+
+        with self.assertWarns(BiopythonWarning):
+            self.check(cached=False, key_function=make_key_function("a"))
+        self.assertFalse(os.path.isfile(self.cache))
+        self.check(cached=False)
+        with self.assertWarns(BiopythonWarning):
+            self.check(cached=False, key_function=make_key_function("b"))
+
+    def test_modified(self):
+        """Check the cache is rebuilt when the indexed file changes."""
+        self.check(cached=False)
+        with open(self.filename, "a") as handle:
+            handle.write(">extra\nACGT\n")
+        self.check(cached=False)
+        self.check(cached=True)
+        stat = os.stat(self.filename)
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.check(cached=False)
+
+    def test_corrupt(self):
+        """Check an invalid cache file is ignored and replaced."""
+        with open(self.cache, "wb") as handle:
+            handle.write(b"not an index")
+        self.check(cached=False)
+        self.check(cached=True)
+
+    def test_non_string_keys(self):
+        """Check a warning is given if the keys cannot be cached."""
+        with self.assertWarns(BiopythonWarning):
+            records = SeqIO.index(
+                self.filename, "fasta", key_function=tuple, cache=self.cache
+            )
+        records.close()
+        self.assertFalse(os.path.isfile(self.cache))
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
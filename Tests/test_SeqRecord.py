@@ -8,6 +8,7 @@ Initially this takes matched tests of GenBank and FASTA files from the NCBI
 and confirms they are consistent using our different parsers.
 """
 
+import array
 import unittest
 
 try:
@@ -419,6 +420,40 @@ Seq('ABCDEFGHIJKLMNOPQRSTUVWZYX')"""
             self.assertEqual(rec.letter_annotations, {"fake": "X" * 26})
             self.assertLessEqual(len(rec.features), len(self.record.features))
 
+    def test_slice_add_arrays(self):
+        """Slice and add with array based per-letter-annotations."""
+        qualities = array.array("b", range(26))
+        rec = SeqRecord(self.record.seq, letter_annotations={"q": qualities})
+        rec = rec[20:] + rec[:5]
+        self.assertEqual(
+            rec.letter_annotations["q"],
+            array.array("b", [20, 21, 22, 23, 24, 25, 0, 1, 2, 3, 4]),
+        )
+        qualities = np.arange(26, dtype=np.int8)
+        rec = SeqRecord(self.record.seq, letter_annotations={"q": qualities})
+        rec = rec[20:] + rec[:5]
+        self.assertIsInstance(rec.letter_annotations["q"], np.ndarray)
+        self.assertEqual(
+            rec.letter_annotations["q"].tolist(),
+            [20, 21, 22, 23, 24, 25, 0, 1, 2, 3, 4],
+        )
+
+    def test_slice_copies_arrays(self):
+        """Check slicing does not share per-letter-annotation arrays."""
+        for qualities in (
+            list(range(26)),
+            array.array("b", range(26)),
+            np.arange(26, dtype=np.int8),
+        ):
+            rec = SeqRecord(self.record.seq, letter_annotations={"q": qualities})
+            sub = rec[2:5]
+            sub.letter_annotations["q"][0] = 99
+            self.assertEqual(rec.letter_annotations["q"][2], 2)
+            self.assertEqual(sub.letter_annotations["q"][0], 99)
+            sub = rec[::-1]
+            sub.letter_annotations["q"][0] = 99
+            self.assertEqual(rec.letter_annotations["q"][25], 25)
+
 
 class SeqRecordMethodsMore(unittest.TestCase):
     """Test SeqRecord methods cont."""
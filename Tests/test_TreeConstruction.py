@@ -5,12 +5,18 @@
 
 """Unit tests for the Bio.Phylo.TreeConstruction module."""
 
+import copy
+import json
 import os
+import pickle
+import random
 import tempfile
 import unittest
 from io import StringIO
 from itertools import combinations
 
+import numpy as np
+
 from Bio import Align
 from Bio import AlignIO
 from Bio import Phylo
@@ -127,6 +133,60 @@ class DistanceMatrixTest(unittest.TestCase):
         self.assertRaises(TypeError, dm.__setitem__, ("Alpha", "Beta"), "a")
         self.assertRaises(TypeError, dm.__setitem__, "Alpha", ["a", "b", "c"])
 
+    def test_numpy_construction(self):
+        square = np.array(
+            [[0, 1, 2, 4], [1, 0, 3, 5], [2, 3, 0, 6], [4, 5, 6, 0]], float
+        )
+        dm = DistanceMatrix(self.names, square)
+        self.assertEqual(dm.matrix, self.matrix)
+        self.assertEqual(dm["Beta"], [1, 0, 3, 5])
+        self.assertEqual(dm["Gamma", "Delta"], 6)
+        self.assertRaises(ValueError, DistanceMatrix, self.names, square[:3, :3])
+        # integer distances are kept until a float is assigned
+        dm = DistanceMatrix(self.names, self.matrix)
+        dm["Alpha", "Beta"] = 0.5
+        self.assertEqual(dm.matrix, [[0], [0.5, 0], [2, 3, 0], [4, 5, 6, 0]])
+        self.assertEqual(dm[0], [0, 0.5, 2, 4])
+
+    def test_matrix_view(self):
+        dm = DistanceMatrix(self.names, self.matrix)
+        row = dm.matrix[2]
+        self.assertIsInstance(row, list)
+        self.assertEqual(dm.matrix[1] + [3], [1, 0, 3])
+        self.assertEqual(dm.matrix[3].copy(), [4, 5, 6, 0])
+        self.assertEqual(dm.matrix[3].index(5), 1)
+        self.assertEqual(dm.matrix[3].count(6), 1)
+        self.assertEqual(json.loads(json.dumps(dm.matrix)), self.matrix)
+        self.assertIs(type(dm["Alpha", "Beta"]), int)
+        dm.matrix[2][1] = 7.5
+        self.assertEqual(dm["Beta", "Gamma"], 7.5)
+        self.assertEqual(row, [2, 7.5, 0])
+        # all distances are stored with the same type
+        self.assertIs(type(dm["Alpha", "Beta"]), float)
+        dm.matrix[3] = [1, 2, 3, 0]
+        self.assertEqual(dm["Delta"], [1, 2, 3, 0])
+        self.assertEqual(dm.matrix, [[0], [1, 0], [2, 7.5, 0], [1, 2, 3, 0]])
+        self.assertEqual(dm.matrix[-1][:2], [1, 2])
+        dm["Gamma", "Alpha"] = 4
+        self.assertEqual(dm.matrix[2], [4, 7.5, 0])
+        dm["Beta"] = [8, 0, 9, 10]
+        self.assertEqual(dm.matrix, [[0], [8, 0], [4, 9, 0], [1, 10, 3, 0]])
+        copied = pickle.loads(pickle.dumps(dm))
+        self.assertEqual(copied.matrix, dm.matrix)
+        copied.matrix[1][0] = 3
+        self.assertEqual(copied["Alpha", "Beta"], 3)
+        self.assertEqual(dm["Alpha", "Beta"], 8)
+        self.assertIs(type(copy.deepcopy(dm.matrix)[1]), list)
+        dm.matrix[1][1] = 0
+        self.assertRaises(ValueError, dm.matrix[1].__setitem__, 1, 5)
+        self.assertRaises(ValueError, dm.matrix.__setitem__, 1, [1, 2, 0])
+        self.assertRaises(IndexError, dm.matrix[1].__getitem__, 2)
+        self.assertRaises(ValueError, dm.matrix.append, [0])
+        self.assertRaises(ValueError, dm.matrix[1].append, 0)
+        self.assertRaises(ValueError, dm.matrix[1].pop)
+        del dm["Beta"]
+        self.assertEqual(dm.matrix, [[0], [4, 0], [1, 3, 0]])
+
     def test_format_phylip(self):
         dm = DistanceMatrix(self.names, self.matrix)
         handle = StringIO()
@@ -203,6 +263,40 @@ class DistanceCalculatorTest(unittest.TestCase):
         self.assertEqual(dmat["Alpha", "Alpha"], 0.0)
         self.assertAlmostEqual(dmat["Alpha", "Gamma"], 4.0 / 5.0)
 
+    def test_pairwise(self):
+        """Compare the distances to those calculated for each pair separately."""
+        aln = Align.read("TreeConstruction/msa.phy", "phylip")
+        msa = AlignIO.read("TreeConstruction/msa.phy", "phylip")
+        aln.sequences[2] = aln.sequences[2][:4] + "-**" + aln.sequences[2][7:]
+        msa[2].seq = aln.sequences[2].seq
+        names = [record.id for record in msa]
+        for model in ("identity", "blastn", "trans", "blosum62", "dayhoff"):
+            for workers in (1, 2):
+                calculator = DistanceCalculator(model, workers=workers)
+                dm = calculator.get_distance(aln)
+                for i, j in combinations(range(len(names)), 2):
+                    self.assertAlmostEqual(
+                        dm[names[i], names[j]],
+                        calculator._pairwise(aln[j], aln[i]),
+                        places=14,
+                    )
+                dm = calculator.get_distance(msa)
+                for i, j in combinations(range(len(names)), 2):
+                    self.assertAlmostEqual(
+                        dm[names[i], names[j]],
+                        calculator._pairwise(msa[i], msa[j]),
+                        places=14,
+                    )
+
+    def test_bad_letter(self):
+        aln = AlignIO.read(StringIO(">Alpha\nA-J--\n>Beta\nAYAYA\n"), "fasta")
+        calculator = DistanceCalculator("blosum62")
+        with self.assertRaises(ValueError) as cm:
+            calculator.get_distance(aln)
+        self.assertEqual(
+            str(cm.exception), "Bad letter 'J' in sequence 'Alpha' at position '2'"
+        )
+
 
 class DistanceTreeConstructorTest(unittest.TestCase):
     """Test DistanceTreeConstructor."""
@@ -283,6 +377,36 @@ class DistanceTreeConstructorTest(unittest.TestCase):
         ref_min_tree = Phylo.read("./TreeConstruction/nj_min.tre", "newick")
         self.assertTrue(Consensus._equal_topology(min_tree, ref_min_tree))
 
+    def test_nj_additive(self):
+        # neighbor joining recovers the distances of a tree
+        random.seed(15)
+        ref_tree = BaseTree.Tree.randomized(60, branch_length=1.0, branch_stdev=0.5)
+        for clade in ref_tree.find_clades(branch_length=True):
+            clade.branch_length = abs(clade.branch_length)
+        terminals = ref_tree.get_terminals()
+        names = [clade.name for clade in terminals]
+        matrix = [
+            [ref_tree.distance(clade1, clade2) for clade2 in terminals[: i + 1]]
+            for i, clade1 in enumerate(terminals)
+        ]
+        tree = self.constructor.nj(DistanceMatrix(names, matrix))
+        self.assertEqual(len(tree.get_terminals()), 60)
+        for i, name1 in enumerate(names):
+            for j, name2 in enumerate(names[:i]):
+                self.assertAlmostEqual(tree.distance(name1, name2), matrix[i][j])
+
+    def test_upgma_random(self):
+        random.seed(15)
+        names = [f"taxon{i}" for i in range(50)]
+        matrix = [[random.random() for j in range(i)] + [0] for i in range(50)]
+        tree = self.constructor.upgma(DistanceMatrix(names, matrix))
+        terminals = [clade.name for clade in tree.get_terminals()]
+        self.assertEqual(sorted(terminals), sorted(names))
+        # all terminal nodes are at the same distance from the root
+        depths = [tree.distance(clade) for clade in tree.get_terminals()]
+        for depth in depths:
+            self.assertAlmostEqual(depth, depths[0])
+
     def test_built_tree_msa(self):
         tree = self.constructor.build_tree(self.msa)
         self.assertIsInstance(tree, BaseTree.Tree)
@@ -400,6 +400,31 @@ class BgzfTests(unittest.TestCase):
             self.assertEqual(offset1, h.tell())
             self.assertEqual(h.read(5), "Magic")
 
+    def test_write_threads(self):
+        """Check writing with multiple threads matches a single thread."""
+        with gzip.open("Quality/example.fastq.bgz", "rb") as h:
+            data = h.read() * 50
+        outputs = []
+        for threads in (1, 4):
+            handle = io.BytesIO()
+            h = bgzf.BgzfWriter(fileobj=handle, threads=threads)
+            offsets = []
+            for i in range(0, len(data), 10000):
+                h.write(data[i : i + 10000])
+                if i % 30000 == 0:
+                    offsets.append(h.tell())
+            h.flush()
+            outputs.append((handle.getvalue(), offsets))
+            h.close()
+        self.assertEqual(outputs[0], outputs[1])
+        with bgzf.BgzfReader(mode="rb", fileobj=io.BytesIO(outputs[1][0])) as h:
+            self.assertEqual(h.read(len(data) + 1), data)
+            for i, offset in zip(range(10000, len(data), 30000), outputs[1][1]):
+                h.seek(offset)
+                self.assertEqual(h.read(100), data[i : i + 100])
+        with self.assertRaises(ValueError):
+            bgzf.BgzfWriter(fileobj=io.BytesIO(), threads=0)
+
     def test_append_mode(self):
         with bgzf.open(self.temp_file, "wb") as h:
             h.write(b">hello\n")
@@ -475,6 +500,123 @@ class BgzfTests(unittest.TestCase):
             self.assertEqual(data[:4], b"\x01\x02\x03\x04")
             self.assertEqual(data[-5:], b"\x01\x02\x03\x04\n")
 
+    def test_lru_cache(self):
+        """Check least recently used blocks are discarded from the cache."""
+        with open("SamBam/ex1.bam", "rb") as h:
+            starts = [values[0] for values in bgzf.BgzfBlocks(h)]
+        with bgzf.BgzfReader("SamBam/ex1.bam", "rb", max_cache=2) as h:
+            self.assertEqual(list(h._buffers), [starts[0]])
+            h.seek(bgzf.make_virtual_offset(starts[1], 0))
+            h.seek(bgzf.make_virtual_offset(starts[0], 0))
+            h.seek(bgzf.make_virtual_offset(starts[2], 0))
+            # Block one was least recently used, so should be gone:
+            self.assertEqual(list(h._buffers), [starts[0], starts[2]])
+            self.assertEqual(h.cache_hits, 1)
+            self.assertEqual(h.cache_misses, 3)
+            h.seek(bgzf.make_virtual_offset(starts[0], 0))
+            self.assertEqual(list(h._buffers), [starts[2], starts[0]])
+            self.assertEqual(h.cache_hits, 2)
+
+    def test_max_cache_bytes(self):
+        """Check the cache respects the limit on decompressed bytes."""
+        with gzip.open("SamBam/ex1.bam", "rb") as h:
+            old = h.read()
+        with bgzf.BgzfReader("SamBam/ex1.bam", "rb", max_cache_bytes=100000) as h:
+            new = h.read(len(old) + 1)
+            self.assertLessEqual(h._cache_bytes, 100000)
+            self.assertLess(len(h._buffers), 8)
+        self.assertEqual(old, new)
+        with self.assertRaises(ValueError):
+            bgzf.BgzfReader("SamBam/ex1.bam", "rb", max_cache_bytes=-1)
+
+    def test_readahead(self):
+        """Check reading with background decompression of the next blocks."""
+        for filename in ("SamBam/ex1.bam", "Quality/example.fastq.bgz"):
+            with gzip.open(filename, "rb") as h:
+                old = h.read()
+            for readahead in (1, 3):
+                with bgzf.BgzfReader(filename, "rb", readahead=readahead) as h:
+                    new = b"".join(h)
+                self.assertEqual(old, new)
+                with bgzf.BgzfReader(filename, "r", readahead=readahead) as h:
+                    new = h.read(len(old) + 1)
+                self.assertEqual(old.decode("latin1"), new)
+        # Now mix random access and sequential reading
+        with open("SamBam/ex1.bam", "rb") as h:
+            blocks = list(bgzf.BgzfBlocks(h))
+        with gzip.open("SamBam/ex1.bam", "rb") as h:
+            old = h.read()
+        with bgzf.BgzfReader("SamBam/ex1.bam", "rb", max_cache=1, readahead=2) as h:
+            for start, raw_len, data_start, data_len in blocks[::-1]:
+                h.seek(bgzf.make_virtual_offset(start, 0))
+                self.assertEqual(h.read(1000), old[data_start : data_start + 1000])
+            start, raw_len, data_start, data_len = blocks[2]
+            h.seek(bgzf.make_virtual_offset(start, 0))
+            self.assertEqual(h.read(len(old)), old[data_start:])
+        with self.assertRaises(ValueError):
+            bgzf.BgzfReader("SamBam/ex1.bam", "rb", readahead=-1)
+
+    def test_gzi(self):
+        """Check building, writing and reading a .gzi index."""
+        for filename in ("SamBam/ex1.bam", "GenBank/NC_000932.gb.bgz"):
+            with open(filename, "rb") as h:
+                blocks = list(bgzf.BgzfBlocks(h))
+                h.seek(0)
+                index = bgzf.build_gzi(h)
+            self.assertEqual(index, [(values[0], values[2]) for values in blocks])
+            bgzf.write_gzi(self.temp_file, index)
+            self.assertEqual(os.path.getsize(self.temp_file), 16 * len(index) - 8)
+            self.assertEqual(bgzf.read_gzi(self.temp_file), index)
+        with self.assertRaises(ValueError):
+            bgzf.write_gzi(self.temp_file, index[1:])
+        with open(self.temp_file, "wb") as h:
+            h.write(b"\x02\x00\x00\x00\x00\x00\x00\x00")
+        with self.assertRaises(ValueError):
+            bgzf.read_gzi(self.temp_file)
+
+    def test_seek_uncompressed(self):
+        """Check seeking to uncompressed offsets using a .gzi index."""
+        filename = "GenBank/NC_000932.gb.bgz"
+        with gzip.open(filename, "rb") as h:
+            old = h.read()
+        with open(filename, "rb") as h:
+            index = bgzf.build_gzi(h)
+        bgzf.write_gzi(self.temp_file, index)
+        offsets = [0, 1, 65535, 65536, 65537, len(old) // 2, len(old) - 10]
+        offsets.extend(uoffset for coffset, uoffset in index)
+        for gzi in (index, self.temp_file):
+            with bgzf.BgzfReader(filename, "rb", gzi=gzi) as h:
+                for offset in offsets:
+                    self.assertEqual(h.seek(offset, uncompressed=True), offset)
+                    self.assertEqual(h.read(20), old[offset : offset + 20])
+        with bgzf.BgzfReader(filename, "rb") as h:
+            with self.assertRaises(ValueError):
+                h.seek(10, uncompressed=True)
+
+    def test_decompress_range(self):
+        """Check decompressing part of the file in parallel."""
+        from concurrent.futures import ProcessPoolExecutor
+
+        filename = "SamBam/ex1.bam"
+        with gzip.open(filename, "rb") as h:
+            old = h.read()
+        ranges = [(0, 0), (0, 10), (65530, 65540), (1000, 300000), (0, len(old))]
+        ranges.append((len(old) - 10, len(old) + 10))
+        with open(filename, "rb") as h:
+            index = bgzf.build_gzi(h)
+            for start, end in ranges:
+                self.assertEqual(bgzf.decompress_range(h, start, end), old[start:end])
+                self.assertEqual(
+                    bgzf.decompress_range(h, start, end, index), old[start:end]
+                )
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                self.assertEqual(
+                    bgzf.decompress_range(h, 100, 400000, index, executor),
+                    old[100:400000],
+                )
+            with self.assertRaises(ValueError):
+                bgzf.decompress_range(h, 10, 5)
+
     def test_BgzfBlocks_TypeError(self):
         """Check get expected TypeError from BgzfBlocks."""
         for mode in ("r", "rb"):
@@ -9,6 +9,7 @@
 """Tests for motifs module."""
 
 import math
+import mmap
 import tempfile
 import unittest
 
@@ -5149,6 +5150,40 @@ class MotifTestPWM(unittest.TestCase):
         self.assertAlmostEqual(result[5], -25.18009186, places=5)
         self.assertTrue(math.isnan(result[6]), f"Expected nan, not {result[6]!r}")
 
+    def test_search(self):
+        """Test if Bio.motifs PSSM search scores both strands in windows."""
+        counts = self.m.counts
+        pwm = counts.normalize(pseudocounts=0.25)
+        pssm = pwm.log_odds()
+        sequence = "AcGTgTGCGtaGTGCGTNACGCACTGCGTCAGCACTACGCGTAGCGTN"
+        length = len(sequence)
+        scores = pssm.calculate(sequence)
+        rcscores = pssm.reverse_complement().calculate(sequence)
+        expected = []
+        for i in range(len(scores)):
+            if scores[i] >= -30:
+                expected.append((i, scores[i]))
+            if rcscores[i] >= -30:
+                expected.append((i - length, rcscores[i]))
+        hits = list(pssm.search(sequence, threshold=-30))
+        self.assertEqual(hits, expected)
+        hits = list(pssm.search(Seq(sequence), threshold=-30, chunksize=5))
+        self.assertEqual(hits, expected)
+        with tempfile.TemporaryFile() as handle:
+            handle.write(sequence.encode())
+            handle.flush()
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                hits = list(pssm.search(data, threshold=-30, chunksize=7))
+                self.assertEqual(hits, expected)
+                hits = list(pssm.search(data, threshold=-30, both=False))
+                self.assertEqual(hits, [hit for hit in expected if hit[0] >= 0])
+        hits = list(pssm.search(sequence, threshold=-30, both=False))
+        self.assertEqual(hits, [hit for hit in expected if hit[0] >= 0])
+        for data in (sequence.encode(), bytearray(sequence.encode())):
+            hits = list(pssm.search(data, threshold=-30, both=False, chunksize=6))
+            self.assertEqual(hits, [hit for hit in expected if hit[0] >= 0])
+        self.assertEqual(list(pssm.search(sequence[:5])), [])
+
     def test_calculate_pseudocounts(self):
         pseudocounts = motifs.jaspar.calculate_pseudocounts(self.m)
         self.assertAlmostEqual(pseudocounts["A"], 1.695582495781317, places=5)
@@ -22424,6 +22424,315 @@ AlignmentCounts object with
         )
 
 
+class TestBatchAlignment(unittest.TestCase):
+    """Test the score_many and align_many methods."""
+
+    targets = ["GAT", "GAACT", "TTT", "ACGTGAACTAG", "GACCT"]
+
+    def check_scores(self, aligner, query, targets, strand="+"):
+        expected = [aligner.score(query, target, strand) for target in targets]
+        scores = aligner.score_many(query, targets, strand)
+        self.assertIsInstance(scores, np.ndarray)
+        self.assertEqual(scores.dtype, np.float64)
+        self.assertEqual(list(scores), expected)
+        scores = aligner.score_many(query, targets, strand, threads=4)
+        self.assertEqual(list(scores), expected)
+
+    def test_score_many(self):
+        aligner = Align.PairwiseAligner()
+        for mode in ("global", "local"):
+            aligner.mode = mode
+            # Needleman-Wunsch / Smith-Waterman
+            self.check_scores(aligner, "GAACT", self.targets)
+            self.check_scores(aligner, "GAACT", self.targets, "-")
+            # Gotoh
+            aligner.open_gap_score = -2
+            aligner.extend_gap_score = -0.5
+            aligner.mismatch_score = -1
+            self.check_scores(aligner, "GAACT", self.targets)
+            # Waterman-Smith-Beyer, scored while holding the GIL
+            aligner.open_gap_score = -2
+            aligner.extend_gap_score = -0.5
+            aligner.insertion_score = lambda i, n: -n * n
+            self.check_scores(aligner, "GAACT", self.targets)
+            aligner = Align.PairwiseAligner()
+        aligner.mode = "fogsaa"
+        aligner.mismatch_score = -1
+        aligner.gap_score = -1
+        self.check_scores(aligner, "GAACT", self.targets[:3])
+
+    def test_score_many_substitution_matrix(self):
+        aligner = Align.PairwiseAligner(scoring="blastp")
+        query = "MKTAYIAKQR"
+        targets = [Seq("MKTAYIAKQ"), "MKAYIAKQRQ", SeqRecord(Seq("MTAYIAR"))]
+        self.check_scores(aligner, query, targets)
+        aligner.mode = "local"
+        self.check_scores(aligner, query, targets)
+        with self.assertRaises(ValueError):
+            aligner.score_many(query, ["MKT?"])
+
+    def test_score_many_objects(self):
+        aligner = Align.PairwiseAligner()
+        query = ["Gly", "Ala", "Thr"]
+        targets = [["Gly", "Thr"], ["Ala", "Ser", "Thr"], ["Ser"]]
+        self.assertEqual(list(aligner.score_many(query, targets)), [2.0, 2.0, 0.0])
+        with self.assertRaises(ValueError):
+            aligner.score_many(query, [["Gly"], []])
+        self.assertEqual(len(aligner.score_many(query, [])), 0)
+
+    def test_align_many(self):
+        aligner = Align.PairwiseAligner(scoring="blastn")
+        query = "GAACTTGCA"
+        pairs = [(query, target) for target in self.targets]
+        for strand in ("+", "-"):
+            for (seqA, seqB), alignments in zip(
+                pairs, aligner.align_many(pairs, strand)
+            ):
+                expected = aligner.align(seqA, seqB, strand)
+                self.assertEqual(alignments.score, expected.score)
+                self.assertEqual(len(alignments), len(expected))
+                self.assertEqual(alignments[0], expected[0])
+                self.assertIs(alignments.sequences[0], seqA)
+        aligner = Align.PairwiseAligner(scoring="blastp")
+        pairs = [("MKTAYIAKQR", "MKAYIAKQRQ"), ("MKTAYIAKQR", "MKT")]
+        scores = [alignments.score for alignments in aligner.align_many(pairs)]
+        self.assertEqual(scores, [aligner.score(*pair) for pair in pairs])
+
+
+class TestBandedAlignment(unittest.TestCase):
+    """Test banded and X-drop alignment."""
+
+    targets = ["GAT", "GAACT", "TTT", "ACGTGAACTAG", "GACCT", "GAACTTGCA"]
+
+    def check_wide_band(self, aligner, query, strand="+"):
+        for target in self.targets:
+            aligner.band = None
+            expected = aligner.align(query, target, strand)
+            score = aligner.score(query, target, strand)
+            aligner.band = len(query) + len(target)
+            alignments = aligner.align(query, target, strand)
+            self.assertEqual(aligner.score(query, target, strand), score)
+            self.assertEqual(alignments.score, score)
+            self.assertEqual(len(alignments), len(expected))
+            self.assertEqual(sorted(alignments), sorted(expected))
+
+    def test_attributes(self):
+        aligner = Align.PairwiseAligner()
+        self.assertIsNone(aligner.band)
+        self.assertEqual(aligner.band_offset, 0)
+        self.assertIsNone(aligner.xdrop)
+        self.assertNotIn("band", str(aligner))
+        aligner.band = 5
+        aligner.band_offset = -2
+        aligner.xdrop = 10
+        self.assertIn("  band: 5", str(aligner))
+        self.assertIn("  band_offset: -2", str(aligner))
+        self.assertIn("  xdrop: 10.000000", str(aligner))
+        with self.assertRaises(ValueError):
+            aligner.band = -1
+        with self.assertRaises(ValueError):
+            aligner.xdrop = -1
+        aligner.band = None
+        aligner.xdrop = None
+        self.assertIsNone(aligner.band)
+        self.assertIsNone(aligner.xdrop)
+
+    def test_wide_band(self):
+        for mode in ("global", "local"):
+            aligner = Align.PairwiseAligner(mode=mode)
+            self.check_wide_band(aligner, "GAACT")
+            aligner.mismatch_score = -1
+            aligner.gap_score = -1
+            self.check_wide_band(aligner, "GAACT")
+            self.check_wide_band(aligner, "GAACT", "-")
+            aligner.open_gap_score = -2
+            aligner.extend_gap_score = -0.5
+            aligner.end_gap_score = 0
+            self.check_wide_band(aligner, "GAACTTGC")
+            aligner = Align.PairwiseAligner(mode=mode, scoring="blastn")
+            self.check_wide_band(aligner, "GAACTTGC")
+            self.check_wide_band(aligner, "GAACTTGC", "-")
+
+    def test_narrow_band(self):
+        aligner = Align.PairwiseAligner(
+            mode="local", match_score=2, mismatch_score=-1, gap_score=-1
+        )
+        self.assertEqual(aligner.score("ACGTTTT", "TTTTACG"), 8.0)
+        aligner.band = 0
+        self.assertEqual(aligner.score("ACGTTTT", "TTTTACG"), 2.0)
+        aligner.band_offset = -3
+        self.assertEqual(aligner.score("ACGTTTT", "TTTTACG"), 8.0)
+        aligner.band_offset = 4
+        alignments = aligner.align("ACGTTTT", "TTTTACG")
+        self.assertEqual(alignments.score, 6.0)
+        self.assertEqual(len(alignments), 1)
+        self.assertTrue(
+            np.array_equal(alignments[0].coordinates, np.array([[0, 3], [4, 7]]))
+        )
+
+    def test_global_band_widening(self):
+        # the band always contains both ends of the alignment
+        aligner = Align.PairwiseAligner(
+            mode="global", match_score=2, mismatch_score=-1, gap_score=-1
+        )
+        aligner.band = 0
+        aligner.band_offset = 10
+        alignments = aligner.align("GAACTTG", "AACTG")
+        self.assertEqual(alignments.score, 8.0)
+        self.assertEqual(aligner.score("GAACTTG", "AACTG"), 8.0)
+        alignment = alignments[0]
+        self.assertEqual(alignment.coordinates[:, 0].tolist(), [0, 0])
+        self.assertEqual(alignment.coordinates[:, -1].tolist(), [7, 5])
+
+    def test_long_sequences(self):
+        rng = np.random.default_rng(seed=1)
+        target = "".join(rng.choice(list("ACGT"), 20000))
+        query = target[:5000] + target[5003:12000] + "GG" + target[12000:]
+        aligner = Align.PairwiseAligner(
+            match_score=1, mismatch_score=-1, open_gap_score=-2, extend_gap_score=-1
+        )
+        aligner.band = 10
+        # 19997 matches, a deletion of 3 and an insertion of 2
+        score = 19997 - 4 - 3
+        self.assertEqual(aligner.score(target, query), score)
+        alignment = aligner.align(target, query)[0]
+        self.assertEqual(alignment.score, score)
+        self.assertEqual(alignment.shape, (2, 20002))
+        aligner.band = None
+        aligner.mode = "local"
+        aligner.xdrop = 10
+        self.assertEqual(aligner.score(target, query), score)
+
+    def test_xdrop(self):
+        aligner = Align.PairwiseAligner(
+            mode="local", match_score=1, mismatch_score=-1, gap_score=-1
+        )
+        target = "ACGTACGTAC" + "TTTTTTTT" + "ACGTAC"
+        query = "ACGTACGTAC" + "GGGGGGGG" + "ACGTAC"
+        self.assertEqual(aligner.score(target, query), 10.0)
+        aligner.xdrop = 100
+        self.assertEqual(aligner.score(target, query), 10.0)
+        self.check_wide_band(aligner, "GAACT")
+        aligner.band = None
+        target = "ACGTAC" + "TTTT" + "ACGTACGTAC"
+        query = "ACGTAC" + "GGGG" + "ACGTACGTAC"
+        self.assertEqual(aligner.score(target, query), 12.0)
+        # the drop of 4 after the first block stops the extension
+        aligner.xdrop = 3
+        alignments = aligner.align(target, query)
+        self.assertEqual(alignments.score, 6.0)
+        self.assertEqual(aligner.score(target, query), 6.0)
+        self.assertEqual(alignments[0].coordinates.tolist(), [[0, 6], [0, 6]])
+
+    def test_unsupported(self):
+        aligner = Align.PairwiseAligner(xdrop=5)
+        with self.assertRaises(ValueError):
+            aligner.score("ACGT", "ACT")
+        with self.assertRaises(ValueError):
+            aligner.align("ACGT", "ACT")
+        aligner = Align.PairwiseAligner(band=5)
+        aligner.deletion_score = lambda i, n: -n
+        with self.assertRaises(ValueError):
+            aligner.score("ACGT", "ACT")
+        aligner = Align.PairwiseAligner(
+            mode="fogsaa", mismatch_score=-1, gap_score=-1, band=5
+        )
+        with self.assertRaises(ValueError):
+            aligner.score("ACGT", "ACT")
+
+    def test_pickle(self):
+        import pickle
+
+        aligner = Align.PairwiseAligner(mode="local", band=3, band_offset=-1, xdrop=7)
+        pickled_aligner = pickle.loads(pickle.dumps(aligner))
+        self.assertEqual(pickled_aligner.band, 3)
+        self.assertEqual(pickled_aligner.band_offset, -1)
+        self.assertEqual(pickled_aligner.xdrop, 7)
+
+
+class TestScoreKernels(unittest.TestCase):
+    """Test the striped SIMD kernels used by the score method."""
+
+    def setUp(self):
+        self.kernels = ["none"]
+        aligner = Align.PairwiseAligner()
+        for simd in ("sse2", "avx2"):
+            try:
+                aligner.simd = simd
+            except ValueError:
+                pass
+            else:
+                self.kernels.append(simd)
+
+    def check_kernels(self, aligner, seqA, seqB, strand="+"):
+        aligner.simd = "none"
+        expected = aligner.score(seqA, seqB, strand)
+        self.assertEqual(aligner.score_kernel, "scalar")
+        for simd in self.kernels[1:]:
+            aligner.simd = simd
+            self.assertEqual(aligner.score(seqA, seqB, strand), expected)
+            self.assertEqual(aligner.score_kernel, simd)
+            scores = aligner.score_many(seqA, [seqB, seqA], strand)
+            self.assertEqual(scores[0], expected)
+            self.assertEqual(aligner.score_kernel, simd)
+
+    def test_attributes(self):
+        aligner = Align.PairwiseAligner()
+        self.assertEqual(aligner.simd, "auto")
+        self.assertIsNone(aligner.score_kernel)
+        aligner.score("GAACT", "GAT")
+        self.assertIn(aligner.score_kernel, ("avx2", "sse2", "scalar"))
+        aligner.simd = "none"
+        self.assertEqual(aligner.simd, "none")
+        aligner.score("GAACT", "GAT")
+        self.assertEqual(aligner.score_kernel, "scalar")
+        with self.assertRaises(ValueError):
+            aligner.simd = "neon"
+        with self.assertRaises(TypeError):
+            aligner.simd = None
+
+    def test_compare(self):
+        rng = np.random.default_rng(seed=0)
+        for length in (1, 3, 8, 9, 31, 100):
+            seqA = "".join(rng.choice(list("ACGT"), length))
+            seqB = seqA[length // 3 :] + "GATTACA" + seqA[: length // 2]
+            for mode in ("global", "local"):
+                aligner = Align.PairwiseAligner(mode=mode, mismatch_score=-1)
+                self.check_kernels(aligner, seqA, seqB)
+                aligner.gap_score = -1
+                self.check_kernels(aligner, seqA, seqB)
+                aligner.open_gap_score = -3
+                self.check_kernels(aligner, seqA, seqB)
+                self.check_kernels(aligner, seqA, seqB, "-")
+                aligner.end_gap_score = 0
+                self.check_kernels(aligner, seqA, seqB)
+                aligner.open_left_insertion_score = -5
+                aligner.open_right_deletion_score = -4
+                self.check_kernels(aligner, seqA, seqB)
+                self.check_kernels(aligner, seqA, seqB, "-")
+                aligner = Align.PairwiseAligner(mode=mode, scoring="blastn")
+                self.check_kernels(aligner, seqA + "NN", "N" + seqB)
+
+    def test_substitution_matrix(self):
+        seqA = "MKTAYIAKQRQISFVKSHFSRQLEERLGLIEVQAPILSRVGDGTQDNLSGAEKAVQVKVKALPDAQ"
+        seqB = "MKTAYIAKQRQISFVKSHFSRQDILDLWIYHTQGYFPDWQNYTPGPGVRYPLTFGWCYKLVP"
+        for mode in ("global", "local"):
+            aligner = Align.PairwiseAligner(mode=mode, scoring="blastp")
+            self.check_kernels(aligner, seqA, seqB)
+            self.check_kernels(aligner, seqB, seqA[:10])
+
+    def test_scalar_fallback(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-0.5)
+        aligner.score("GAACT", "GAT")
+        self.assertEqual(aligner.score_kernel, "scalar")
+        aligner = Align.PairwiseAligner(open_gap_score=-1, extend_gap_score=-2)
+        aligner.score("GAACT", "GAT")
+        self.assertEqual(aligner.score_kernel, "scalar")
+        aligner = Align.PairwiseAligner(band=2)
+        aligner.score("GAACT", "GAT")
+        self.assertEqual(aligner.score_kernel, "scalar")
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
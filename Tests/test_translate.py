@@ -86,6 +86,73 @@ class TestTranscriptionTranslation(unittest.TestCase):
         stop_protein = dna.translate("SGC1", to_stop=True)
         self.assertEqual(stop_protein, "BD")
 
+    def check_lookup(self, sequence, *args, **kwargs):
+        """Compare the lookup table translation to codon by codon."""
+        min_length = Seq._MIN_LOOKUP_LENGTH
+        results = []
+        try:
+            for Seq._MIN_LOOKUP_LENGTH in (len(sequence) + 1, 0):
+                try:
+                    results.append(Seq.translate(sequence, *args, **kwargs))
+                except Exception as e:
+                    results.append((type(e), str(e)))
+        finally:
+            Seq._MIN_LOOKUP_LENGTH = min_length
+        self.assertEqual(results[0], results[1])
+        return results[1]
+
+    def test_lookup_table(self):
+        s = "GAAAATTCATTTTCTTTGGACTTTCTCTGAAATCCGAGTCCTAGGAAAGATGCGTGAGATTCTTCATAT"
+        self.assertEqual(
+            self.check_lookup(s * 10, "SGC8", to_stop=True),
+            "ENSFSLDFLWNPSPSNDAWDSSY" * 10,
+        )
+        self.assertEqual(len(self.check_lookup(s * 10)), 230)
+        self.assertEqual(len(self.check_lookup(s.lower() * 10, table=2)), 230)
+        self.assertEqual(len(self.check_lookup(s.replace("T", "U") * 10)), 230)
+        self.check_lookup("RATGATTARAATYTAXNNTANNCC" * 20, "Vertebrate Mitochondrial")
+        self.check_lookup("RATGATTARAATYTAXNNTANNCC" * 20, 1, "@", to_stop=True)
+        gapped = "ATG---AAA" * 30 + "TAG"
+        self.assertEqual(self.check_lookup(gapped, gap="-"), "M-K" * 30 + "*")
+        self.assertEqual(self.check_lookup(gapped, gap="-", cds=True), "M-K" * 30)
+        # Errors should be the same too
+        self.assertEqual(
+            self.check_lookup(gapped),
+            (Seq.CodonTable.TranslationError, "Codon '---' is invalid"),
+        )
+        self.assertEqual(
+            self.check_lookup("ATGTAG" * 50, cds=True),
+            (
+                Seq.CodonTable.TranslationError,
+                "Extra in frame stop codon 'TAG' found.",
+            ),
+        )
+        self.assertEqual(self.check_lookup("ATGAAA" * 50, gap=""), "MK" * 50)
+        self.assertEqual(
+            self.check_lookup(gapped, gap=""),
+            (Seq.CodonTable.TranslationError, "Codon '---' is invalid"),
+        )
+        self.check_lookup("ATG" * 100 + "TA?" + "TAG")
+        self.check_lookup("ATG" * 100 + "TAG" + "TA?", to_stop=True)
+
+    def test_six_frames(self):
+        s = "GAAAATTCATTTTCTTTGGACTTTCTCTGAAATCCGAGTCCTAGGAAAGATGCGTGAGATTCTTCATATT"
+        rc = Seq.reverse_complement(s)
+        expected = (
+            Seq.translate(s[:69]),
+            Seq.translate(s[1:70]),
+            Seq.translate(s[2:68]),
+            Seq.translate(rc[:69]),
+            Seq.translate(rc[1:70]),
+            Seq.translate(rc[2:68]),
+        )
+        self.assertEqual(Seq.translate_six_frames(s), expected)
+        frames = Seq.translate_six_frames(Seq.Seq(s), to_stop=True)
+        self.assertIsInstance(frames[0], Seq.Seq)
+        self.assertEqual(frames, tuple(p.split("*")[0] for p in expected))
+        frames = Seq.translate_six_frames(Seq.MutableSeq(s * 10), table=2)
+        self.assertEqual(frames[0], Seq.translate(s * 10, table=2))
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)